@@ -10,6 +10,7 @@ import re
 
 # Import Salt libs
 import salt.loader
+import salt.utils.beacons
 import salt.utils.event
 import salt.utils.minion
 from salt.ext.six.moves import map
@@ -40,6 +41,28 @@ class Beacon(object):
                 - files:
                     - /etc/fstab: {}
                     - /var/cache/foo: {}
+
+        The metrics read through :func:`salt.utils.beacons.sample` are taken
+        once and shared by all the beacons. With ``beacons_batch_event`` set,
+        all the beacons which fired are returned as a single event.
+        '''
+        with salt.utils.beacons.tick():
+            ret = self._run_beacons(config, grains)
+        if ret and self.opts.get('beacons_batch_event', False):
+            ret = [self._batch_event(ret)]
+        return ret
+
+    def _batch_event(self, events):
+        '''
+        Return one event carrying the events of all the beacons which fired
+        '''
+        return {'tag': 'salt/beacon/{0}/batch/'.format(self.opts['id']),
+                'data': {'id': self.opts['id'], 'events': events},
+                'beacon_name': 'batch'}
+
+    def _run_beacons(self, config, grains):
+        '''
+        Run the configured beacons and return their events
         '''
         ret = []
         b_config = copy.deepcopy(config)
@@ -12,6 +12,7 @@ from __future__ import absolute_import, unicode_literals
 import logging
 import re
 
+import salt.utils.beacons
 import salt.utils.platform
 
 # Import Third Party Libs
@@ -85,10 +86,12 @@ def beacon(config):
     it will override the previously defined threshold.
 
     '''
-    parts = psutil.disk_partitions(all=True)
+    parts = salt.utils.beacons.sample('disk_partitions',
+                                      psutil.disk_partitions, True)
     ret = []
     for mounts in config:
         mount = next(iter(mounts))
+        monitor_usage = salt.utils.beacons.parse_percent(mounts[mount])
 
         # Because we're using regular expressions
         # if our mount doesn't end with a $, insert one.
@@ -110,16 +113,13 @@ def beacon(config):
                 _mount = part.mountpoint
 
                 try:
-                    _current_usage = psutil.disk_usage(_mount)
+                    _current_usage = salt.utils.beacons.sample(
+                        'disk_usage', psutil.disk_usage, _mount)
                 except OSError:
                     log.warning('%s is not a valid mount point.', _mount)
                     continue
 
                 current_usage = _current_usage.percent
-                monitor_usage = mounts[mount]
-                if '%' in monitor_usage:
-                    monitor_usage = re.sub('%', '', monitor_usage)
-                monitor_usage = float(monitor_usage)
                 if current_usage >= monitor_usage:
                     ret.append({'diskusage': current_usage, 'mount': _mount})
     return ret
@@ -9,6 +9,7 @@ import logging
 import os
 
 # Import Salt libs
+import salt.utils.beacons
 import salt.utils.platform
 from salt.ext.six.moves import map
 
@@ -121,7 +122,7 @@ def beacon(config):
         _config['onchangeonly'] = False
 
     ret = []
-    avgs = os.getloadavg()
+    avgs = salt.utils.beacons.sample('loadavg', os.getloadavg)
     avg_keys = ['1m', '5m', '15m']
     avg_dict = dict(zip(avg_keys, avgs))
 
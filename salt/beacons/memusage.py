@@ -10,9 +10,11 @@ Beacon to monitor memory usage.
 # Import Python libs
 from __future__ import absolute_import, unicode_literals
 import logging
-import re
 from salt.ext.six.moves import map
 
+# Import Salt libs
+import salt.utils.beacons
+
 # Import Third Party Libs
 try:
     import psutil
@@ -69,13 +71,11 @@ def beacon(config):
     _config = {}
     list(map(_config.update, config))
 
-    _current_usage = psutil.virtual_memory()
+    _current_usage = salt.utils.beacons.sample('virtual_memory',
+                                               psutil.virtual_memory)
 
     current_usage = _current_usage.percent
-    monitor_usage = _config['percent']
-    if '%' in monitor_usage:
-        monitor_usage = re.sub('%', '', monitor_usage)
-    monitor_usage = float(monitor_usage)
+    monitor_usage = salt.utils.beacons.parse_percent(_config['percent'])
     if current_usage >= monitor_usage:
         ret.append({'memusage': current_usage})
     return ret
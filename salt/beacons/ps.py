@@ -7,6 +7,9 @@ Send events covering process status
 from __future__ import absolute_import, unicode_literals
 import logging
 
+# Import Salt libs
+import salt.utils.beacons
+
 # Import third party libs
 # pylint: disable=import-error
 try:
@@ -50,6 +53,13 @@ def validate(config):
     return True, 'Valid beacon configuration'
 
 
+def _process_names():
+    '''
+    Return the names of the running processes
+    '''
+    return set(proc.name() for proc in psutil.process_iter())
+
+
 def beacon(config):
     '''
     Scan for processes and fire events
@@ -68,11 +78,7 @@ def beacon(config):
     processes are running or stopped.
     '''
     ret = []
-    procs = []
-    for proc in psutil.process_iter():
-        _name = proc.name()
-        if _name not in procs:
-            procs.append(_name)
+    procs = salt.utils.beacons.sample('process_names', _process_names)
 
     _config = {}
     list(map(_config.update, config))
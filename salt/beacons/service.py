@@ -9,6 +9,9 @@ from __future__ import absolute_import, unicode_literals
 import os
 import logging
 import time
+
+# Import Salt libs
+import salt.utils.beacons
 from salt.ext.six.moves import map
 
 log = logging.getLogger(__name__)  # pylint: disable=invalid-name
@@ -111,7 +114,10 @@ def beacon(config):
 
         service_config = _config['services'][service]
 
-        ret_dict[service] = {'running': __salt__['service.status'](service)}
+        ret_dict[service] = {
+            'running': salt.utils.beacons.sample(
+                'service.status', __salt__['service.status'], service)
+        }
         ret_dict['service_name'] = service
         ret_dict['tag'] = service
         currtime = time.time()
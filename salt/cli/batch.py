@@ -99,6 +99,88 @@ def batch_get_eauth(kwargs):
     return eauth
 
 
+def _batch_running(local, opts, jid):
+    '''
+    Return whether any of the targeted minions is still running the job of a
+    server-side batch
+    '''
+    running = local.cmd(
+        opts['tgt'],
+        'saltutil.find_job',
+        [jid],
+        tgt_type=opts.get('selected_target_option') or opts.get('tgt_type', 'glob'),
+        timeout=opts['gather_job_timeout'])
+    return any(running.values()) if isinstance(running, dict) else False
+
+
+def server_side_batch(local, opts, eauth=None, quiet=False):
+    '''
+    Hand the batch run over to the master and yield the returns as they
+    arrive. The master keeps the moving window going on its own, so the run
+    carries on even if this process goes away; progress is published on the
+    ``salt/batch/<jid>/*`` events and the returns land in the job cache under
+    a single jid.
+    '''
+    kwargs = {'batch': opts['batch'],
+              'gather_job_timeout': opts['gather_job_timeout']}
+    if opts.get('batch_wait'):
+        kwargs['batch_delay'] = opts['batch_wait']
+    if eauth:
+        kwargs.update(eauth)
+    pub_data = local.run_job(
+        opts['tgt'],
+        opts['fun'],
+        opts['arg'],
+        opts.get('selected_target_option') or opts.get('tgt_type', 'glob'),
+        ret=opts.get('return', ''),
+        timeout=opts['timeout'],
+        listen=True,
+        **kwargs)
+    if not pub_data or not pub_data.get('jid'):
+        if not quiet:
+            salt.utils.stringutils.print_cli('No minions matched the target.')
+        return
+    jid = pub_data['jid']
+    if not quiet:
+        salt.utils.stringutils.print_cli(
+            'Batch job {0} is running on the master, follow it with '
+            '"salt-run jobs.lookup_jid {0}"\n'.format(jid))
+
+    ret_tag = 'salt/job/{0}/ret/'.format(jid)
+    batch_tag = 'salt/batch/{0}/'.format(jid)
+    done_tag = batch_tag + 'done'
+    # Without any news of the batch for this long, make sure it is still
+    # running rather than waiting forever for a done event which was lost
+    silence = opts['timeout'] + opts['gather_job_timeout']
+    last_seen = time.time()
+    while True:
+        event = local.event.get_event(wait=opts['timeout'], tag='salt/', full=True)
+        if event is None or not event['tag'].startswith((ret_tag, batch_tag)):
+            if time.time() - last_seen > silence:
+                if not _batch_running(local, opts, jid):
+                    raise salt.exceptions.SaltClientError(
+                        'Lost track of batch job {0}, look up its results with '
+                        '"salt-run jobs.lookup_jid {0}"'.format(jid))
+                last_seen = time.time()
+            continue
+        last_seen = time.time()
+        tag, data = event['tag'], event['data']
+        if tag == done_tag:
+            if not quiet:
+                for minion in sorted(data.get('timedout_minions', ())):
+                    salt.utils.stringutils.print_cli('Minion {0} did not return.'.format(minion))
+            return
+        if not tag.startswith(ret_tag) or 'return' not in data:
+            continue
+        ret = data['return']
+        if 'retcode' in data and isinstance(ret, dict) and 'retcode' not in ret:
+            ret['retcode'] = data['retcode']
+        if opts.get('raw'):
+            yield data
+        else:
+            yield {data['id']: ret}
+
+
 class Batch(object):
     '''
     Manage the execution of batch runs
@@ -40,6 +40,16 @@ class BatchAsync(object):
              "down_minions": self.down_minions
            }
 
+    Each time a minion returns, a `progress` event is fired:
+        - tag: salt/batch/<batch-jid>/progress
+        - data: {
+             "done": len(self.done_minions),
+             "active": len(self.active),
+             "pending": <minions not started yet>,
+             "timedout": len(self.timedout_minions),
+             "down": len(self.down_minions)
+         }
+
     When the batch ends, an `done` event is fired:
         - tag: salt/batch/<batch-jid>/done
         - data: {
@@ -117,6 +127,7 @@ class BatchAsync(object):
                     if minion in self.active:
                         self.active.remove(minion)
                         self.done_minions.add(minion)
+                        self.fire_progress()
                         # call later so that we maybe gather more returns
                         self.event.io_loop.call_later(self.batch_delay, self.schedule_next)
 
@@ -198,6 +209,21 @@ class BatchAsync(object):
             self.event.fire_event(data, "salt/batch/{0}/start".format(self.batch_jid))
             yield self.schedule_next()
 
+    def fire_progress(self):
+        pending = self.minions.difference(
+            self.done_minions).difference(
+            self.active).difference(
+            self.timedout_minions)
+        data = {
+            "done": len(self.done_minions),
+            "active": len(self.active),
+            "pending": len(pending),
+            "timedout": len(self.timedout_minions),
+            "down": len(self.down_minions),
+            "metadata": self.metadata
+        }
+        self.event.fire_event(data, "salt/batch/{0}/progress".format(self.batch_jid))
+
     def end_batch(self):
         data = {
             "available_minions": self.minions,
@@ -213,16 +239,33 @@ class BatchAsync(object):
     def schedule_next(self):
         next_batch = self._get_next()
         if next_batch:
-            yield self.local.run_job_async(
-                next_batch,
-                self.opts['fun'],
-                self.opts['arg'],
-                'list',
-                raw=self.opts.get('raw', False),
-                ret=self.opts.get('return', ''),
-                gather_job_timeout=self.opts['gather_job_timeout'],
-                jid=self.batch_jid,
-                metadata=self.metadata,
-                **self.eauth)
-            self.event.io_loop.call_later(self.opts['timeout'], self.find_job, set(next_batch))
+            # Claim the slots before publishing so that a concurrent
+            # schedule_next does not hand them out a second time
             self.active = self.active.union(next_batch)
+            try:
+                yield self.local.run_job_async(
+                    next_batch,
+                    self.opts['fun'],
+                    self.opts['arg'],
+                    'list',
+                    raw=self.opts.get('raw', False),
+                    ret=self.opts.get('return', ''),
+                    gather_job_timeout=self.opts['gather_job_timeout'],
+                    jid=self.batch_jid,
+                    metadata=self.metadata,
+                    **self.eauth)
+            except Exception as exc:  # pylint: disable=broad-except
+                log.error(
+                    'Failed to publish batch %s to %s: %s',
+                    self.batch_jid, ', '.join(sorted(next_batch)), exc)
+                # Give the slots back and report these minions as timed out
+                # instead of waiting for returns which will never come
+                self.active = self.active.difference(next_batch)
+                self.timedout_minions = self.timedout_minions.union(next_batch)
+                self.fire_progress()
+                if self.done_minions == self.minions.difference(self.timedout_minions):
+                    self.end_batch()
+                else:
+                    self.event.io_loop.call_later(self.batch_delay, self.schedule_next)
+                return
+            self.event.io_loop.call_later(self.opts['timeout'], self.find_job, set(next_batch))
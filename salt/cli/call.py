@@ -5,7 +5,6 @@ import os
 import salt.utils.parsers
 from salt.utils.verify import verify_log
 from salt.config import _expand_glob_path
-import salt.cli.caller
 import salt.defaults.exitcodes
 
 
@@ -18,6 +17,10 @@ class SaltCall(salt.utils.parsers.SaltCallOptionParser):
         '''
         Execute the salt call!
         '''
+        # The caller pulls in the loader, crypto and transport; defer it
+        # until the arguments have been parsed
+        import salt.cli.caller
+
         self.parse_args()
 
         if self.options.file_root:
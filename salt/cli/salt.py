@@ -5,6 +5,7 @@ from __future__ import absolute_import, print_function, unicode_literals
 import sys
 sys.modules['pkg_resources'] = None
 import os
+import itertools
 
 # Import Salt libs
 import salt.defaults.exitcodes
@@ -187,6 +188,10 @@ class SaltCMD(salt.utils.parsers.SaltCMDOptionParser):
                     ret_, out, retcode = self._format_ret(full_ret)
                     ret.update(ret_)
                 self._output_ret(ret, out, retcode=retcode)
+            elif self.config.get('cli_stream_output'):
+                if self.options.verbose:
+                    kwargs['verbose'] = True
+                ret = self._stream_output(cmd_func, kwargs, retcodes, errors)
             else:
                 if self.options.verbose:
                     kwargs['verbose'] = True
@@ -272,6 +277,23 @@ class SaltCMD(salt.utils.parsers.SaltCMDOptionParser):
 
             self._output_ret(ret, '')
 
+        elif self.options.batch_server_side:
+            import salt.output
+            self.config['batch'] = self.options.batch
+            retcode = 0
+            try:
+                for res in salt.cli.batch.server_side_batch(
+                        self.local_client, self.config, eauth=eauth):
+                    for minion, ret in six.iteritems(res):
+                        salt.output.display_output({minion: ret}, None, self.config)
+                        job_retcode = salt.utils.job.get_retcode(ret)
+                        if job_retcode > retcode:
+                            retcode = job_retcode
+            except (SaltClientError, AuthenticationError, AuthorizationError) as exc:
+                sys.stderr.write('ERROR: {0}\n'.format(exc))
+                sys.exit(2)
+            sys.exit(retcode)
+
         else:
             try:
                 self.config['batch'] = self.options.batch
@@ -361,6 +383,44 @@ class SaltCMD(salt.utils.parsers.SaltCMDOptionParser):
                                   'Requested job was still run but output cannot be displayed.\n')
         salt.output.update_progress(self.config, progress, self.progress_bar, out)
 
+    def _stream_output(self, cmd_func, kwargs, retcodes, errors):
+        '''
+        Print the returns through the streaming outputters as they come in.
+        Only what the returns summary needs is kept for each minion, which is
+        returned.
+        '''
+        import salt.output
+        summary = {}
+
+        def _returns():
+            for full_ret in cmd_func(**kwargs):
+                try:
+                    ret_, out, retcode = self._format_ret(full_ret)
+                except KeyError:
+                    errors.append(full_ret)
+                    continue
+                retcodes.append(retcode)
+                for minion, data in six.iteritems(full_ret):
+                    minion_ret = data['ret']
+                    if not (isinstance(minion_ret, six.string_types)
+                            and minion_ret.startswith('Minion did not return')):
+                        minion_ret = None
+                    summary[minion] = {'ret': minion_ret,
+                                       'retcode': self._get_retcode(data)}
+                yield ret_, out
+
+        returns = _returns()
+        try:
+            first, out = next(returns)
+        except StopIteration:
+            sys.stderr.write('ERROR: No return received\n')
+            sys.exit(2)
+        salt.output.display_output_stream(
+            itertools.chain([first], (ret_ for ret_, _ in returns)),
+            out=out,
+            opts=self.config)
+        return summary
+
     def _output_ret(self, ret, out, retcode=0):
         '''
         Print the output from a single return to the terminal
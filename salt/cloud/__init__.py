@@ -26,6 +26,7 @@ from salt.exceptions import (
 )
 
 # Import salt libs
+import salt.cache
 import salt.config
 import salt.client
 import salt.loader
@@ -56,6 +57,15 @@ from salt.ext.six.moves import input  # pylint: disable=import-error,redefined-b
 # Get logging started
 log = logging.getLogger(__name__)
 
+# Keys of the output of a driver's create function which are recorded in the
+# query cache, these are the ones list_nodes returns
+QUERY_CACHE_NODE_KEYS = ('id', 'image', 'size', 'state', 'private_ips',
+                         'public_ips')
+
+# The listings a VM created by salt-cloud is added to from its create output,
+# the full and select listings hold more than that output tells
+QUERY_CACHE_PARTIAL_QUERIES = ('list_nodes', 'list_nodes_min')
+
 
 def communicator(func):
     '''Warning, this is a picklable decorator !'''
@@ -182,6 +192,115 @@ def enter_mainloop(target,
     return ret
 
 
+class QueryCache(object):
+    '''
+    Persistent cache of the node listings of the cloud providers, kept in the
+    ``cloud/queries`` banks of the salt cache.
+
+    A listing is reused for ``query_cache_ttl`` seconds, which can be set in
+    the main cloud configuration or per provider. With ``query_cache_first``
+    a stored listing is reused whatever its age. VMs created or destroyed by
+    salt-cloud are recorded next to the listings and applied on top of them,
+    so the next run sees them without listing the provider again. Creating a
+    VM drops the full and select listings, as the create output does not hold
+    all of their data.
+    '''
+    def __init__(self, opts):
+        self.opts = opts
+        self._cache = None
+
+    @property
+    def cache(self):
+        if self._cache is None:
+            self._cache = salt.cache.factory(self.opts)
+        return self._cache
+
+    @staticmethod
+    def _bank(alias, driver, kind):
+        return 'cloud/queries/{0}/{1}/{2}'.format(alias, driver, kind)
+
+    def ttl(self, alias, driver):
+        '''
+        Return the number of seconds the listings of a provider are reused for
+        '''
+        details = self.opts.get('providers', {}).get(alias, {}).get(driver, {})
+        return details.get('query_cache_ttl',
+                           self.opts.get('query_cache_ttl', 0)) or 0
+
+    def enabled(self, alias, driver):
+        '''
+        Return whether the listings of a provider are cached
+        '''
+        return bool(self.opts.get('query_cache_first') or
+                    self.ttl(alias, driver) > 0)
+
+    def fetch(self, alias, driver, query):
+        '''
+        Return the cached result of ``query`` on a provider, or ``None`` if
+        the provider has to be queried
+        '''
+        if not self.enabled(alias, driver):
+            return None
+        listing = self.cache.fetch(self._bank(alias, driver, 'nodes'), query)
+        if not listing:
+            return None
+        if not self.opts.get('query_cache_first') and \
+                time.time() - listing['time'] > self.ttl(alias, driver):
+            return None
+        nodes = listing['nodes']
+        bank = self._bank(alias, driver, 'changes')
+        for name in self.cache.list(bank):
+            change = self.cache.fetch(bank, name)
+            if not change or change['time'] < listing['time']:
+                continue
+            if change['node'] is None:
+                nodes.pop(name, None)
+            else:
+                nodes[name] = change['node']
+        log.debug('Using the cached %s listing of %s:%s', query, alias, driver)
+        return nodes
+
+    def store(self, alias, driver, query, nodes, started):
+        '''
+        Store the result of ``query`` on a provider. ``started`` is the time
+        the query was sent, VMs created or destroyed after that are applied
+        on top of the stored listing.
+        '''
+        if not self.enabled(alias, driver):
+            return
+        nodes_bank = self._bank(alias, driver, 'nodes')
+        self.cache.store(nodes_bank, query, {'time': started, 'nodes': nodes})
+        # The changes are shared by the listings of all of the queries, keep
+        # them until none of the listings was taken before them
+        oldest = started
+        for name in self.cache.list(nodes_bank):
+            listing = self.cache.fetch(nodes_bank, name)
+            if listing:
+                oldest = min(oldest, listing['time'])
+        bank = self._bank(alias, driver, 'changes')
+        for name in self.cache.list(bank):
+            change = self.cache.fetch(bank, name)
+            if not change or change['time'] < oldest:
+                self.cache.flush(bank, name)
+
+    def update(self, alias, driver, name, node=None):
+        '''
+        Record that the VM ``name`` was created, with the listing data
+        ``node``, or destroyed if ``node`` is ``None``
+        '''
+        if not self.enabled(alias, driver):
+            return
+        if node is not None:
+            # Have the provider listed again for the listings the VM can't
+            # be added to
+            nodes_bank = self._bank(alias, driver, 'nodes')
+            for query in self.cache.list(nodes_bank):
+                if query not in QUERY_CACHE_PARTIAL_QUERIES:
+                    self.cache.flush(nodes_bank, query)
+        self.cache.store(self._bank(alias, driver, 'changes'), name,
+                         {'time': time.time(), 'node': node})
+
+
 class CloudClient(object):
     '''
     The client class to wrap cloud interactions
@@ -528,6 +647,7 @@ class Cloud(object):
         self.clouds = salt.loader.clouds(self.opts)
         self.__filter_non_working_providers()
         self.__cached_provider_queries = {}
+        self.query_cache = QueryCache(self.opts)
 
     def get_configured_providers(self):
         '''
@@ -656,22 +776,29 @@ class Cloud(object):
         self.__cached_provider_queries[query] = pmap
         return pmap
 
-    def map_providers_parallel(self, query='list_nodes', cached=False):
+    def map_providers_parallel(self, query='list_nodes', cached=False,
+                               providers=None):
         '''
         Return a mapping of what named VMs are running on what VM providers
         based on what providers are defined in the configuration and VMs
 
-        Same as map_providers but query in parallel.
+        Same as map_providers but query in parallel. Only the provider aliases
+        in ``providers`` are queried, if it is given, and providers with a
+        fresh entry in the persistent query cache are not queried at all.
         '''
-        if cached is True and query in self.__cached_provider_queries:
-            return self.__cached_provider_queries[query]
+        cache_key = query if providers is None else (query, frozenset(providers))
+        if cached is True and cache_key in self.__cached_provider_queries:
+            return self.__cached_provider_queries[cache_key]
 
         opts = self.opts.copy()
         multiprocessing_data = []
+        output = {}
 
         # Optimize Providers
         opts['providers'] = self._optimize_providers(opts['providers'])
         for alias, drivers in six.iteritems(opts['providers']):
+            if providers is not None and alias not in providers:
+                continue
             # Make temp query for this driver to avoid overwrite next
             this_query = query
             for driver, details in six.iteritems(drivers):
@@ -686,6 +813,12 @@ class Cloud(object):
                     log.error('Public cloud provider %s is not available', driver)
                     continue
 
+                nodes = self.query_cache.fetch(alias, driver, this_query)
+                if nodes is not None:
+                    if nodes:
+                        output.setdefault(alias, {})[driver] = nodes
+                    continue
+
                 multiprocessing_data.append({
                     'fun': fun,
                     'opts': opts,
@@ -693,35 +826,39 @@ class Cloud(object):
                     'alias': alias,
                     'driver': driver
                 })
-        output = {}
-        if not multiprocessing_data:
-            return output
-
-        data_count = len(multiprocessing_data)
-        pool = multiprocessing.Pool(data_count < 10 and data_count or 10,
-                                    init_pool_worker)
-        parallel_pmap = enter_mainloop(_run_parallel_map_providers_query,
-                                       multiprocessing_data,
-                                       pool=pool)
-        for alias, driver, details in parallel_pmap:
-            if not details:
-                # There's no providers details?! Skip it!
-                continue
-            if alias not in output:
-                output[alias] = {}
-            output[alias][driver] = details
 
-        self.__cached_provider_queries[query] = output
+        if multiprocessing_data:
+            queries = dict(((data['alias'], data['driver']), data['query'])
+                           for data in multiprocessing_data)
+            started = time.time()
+            data_count = len(multiprocessing_data)
+            pool = multiprocessing.Pool(data_count < 10 and data_count or 10,
+                                        init_pool_worker)
+            parallel_pmap = enter_mainloop(_run_parallel_map_providers_query,
+                                           multiprocessing_data,
+                                           pool=pool)
+            for alias, driver, details in parallel_pmap:
+                if not details:
+                    # There's no providers details?! Skip it!
+                    continue
+                self.query_cache.store(
+                    alias, driver, queries[(alias, driver)], details, started)
+                if alias not in output:
+                    output[alias] = {}
+                output[alias][driver] = details
+
+        self.__cached_provider_queries[cache_key] = output
         return output
 
     def get_running_by_names(self, names, query='list_nodes', cached=False,
-                             profile=None):
+                             profile=None, providers=None):
         if isinstance(names, six.string_types):
             names = [names]
 
         matches = {}
         handled_drivers = {}
-        mapped_providers = self.map_providers_parallel(query, cached=cached)
+        mapped_providers = self.map_providers_parallel(query, cached=cached,
+                                                       providers=providers)
         for alias, drivers in six.iteritems(mapped_providers):
             for driver, vms in six.iteritems(drivers):
                 if driver not in handled_drivers:
@@ -1037,6 +1174,8 @@ class Cloud(object):
             if not ret:
                 continue
 
+            self.query_cache.update(alias, driver, name)
+
             vm_ = {
                 'name': name,
                 'profile': None,
@@ -1259,40 +1398,15 @@ class Cloud(object):
                 __active_provider_name__=':'.join([alias, driver])
             ):
                 output = self.clouds[func](vm_)
-            if output is not False and 'sync_after_install' in self.opts:
-                if self.opts['sync_after_install'] not in (
-                        'all', 'modules', 'states', 'grains'):
-                    log.error('Bad option for sync_after_install')
+            if isinstance(output, dict) and output:
+                self.query_cache.update(alias, driver, vm_['name'],
+                                        _query_cache_node(vm_['name'], output))
+            if output is not False and 'sync_after_install' in self.opts \
+                    and not (isinstance(output, dict) and 'deferred_deploy' in output):
+                # A deferred deploy is synced by the map once it ran, see
+                # Map._run_deferred_deploys
+                if not _sync_after_install(self.opts, vm_['name']):
                     return output
-
-                # A small pause helps the sync work more reliably
-                time.sleep(3)
-
-                start = int(time.time())
-                while int(time.time()) < start + 60:
-                    # We'll try every <timeout> seconds, up to a minute
-                    mopts_ = salt.config.DEFAULT_MASTER_OPTS
-                    conf_path = '/'.join(self.opts['conf_file'].split('/')[:-1])
-                    mopts_.update(
-                        salt.config.master_config(
-                            os.path.join(conf_path,
-                                         'master')
-                        )
-                    )
-
-                    client = salt.client.get_local_client(mopts=mopts_)
-
-                    ret = client.cmd(
-                        vm_['name'],
-                        'saltutil.sync_{0}'.format(self.opts['sync_after_install']),
-                        timeout=self.opts['timeout']
-                    )
-                    if ret:
-                        log.info(
-                            six.u('Synchronized the following dynamic modules: '
-                                  '  {0}').format(ret)
-                        )
-                        break
         except KeyError as exc:
             log.exception(
                 'Failed to create VM %s. Configuration value %s needs '
@@ -1651,9 +1765,25 @@ class Map(Cloud):
         Cloud.__init__(self, opts)
         self.rendered_map = self.read()
 
+    def map_provider_aliases(self):
+        '''
+        Return the aliases of the providers the VMs of the map live on
+        '''
+        aliases = set()
+        for profile_name, nodes in six.iteritems(self.rendered_map):
+            profile = self.opts['profiles'].get(profile_name)
+            if profile is None:
+                continue
+            for overrides in six.itervalues(nodes):
+                provider = (overrides or {}).get('provider') or profile.get('provider')
+                if provider:
+                    aliases.add(provider.split(':')[0])
+        return aliases
+
     def interpolated_map(self, query='list_nodes', cached=False):
         rendered_map = self.read().copy()
         interpolated_map = {}
+        providers = self.map_provider_aliases()
 
         for profile, mapped_vms in six.iteritems(rendered_map):
             names = set(mapped_vms)
@@ -1670,7 +1800,10 @@ class Map(Cloud):
                 interpolated_map['Errors'][profile] = msg
                 continue
 
-            matching = self.get_running_by_names(names, query, cached)
+            matching = self.get_running_by_names(names, query, cached,
+                                                 providers=providers)
+            # The providers were listed for the first profile already
+            cached = True
             for alias, drivers in six.iteritems(matching):
                 for driver, vms in six.iteritems(drivers):
                     for vm_name, vm_details in six.iteritems(vms):
@@ -1907,7 +2040,12 @@ class Map(Cloud):
         Create a data map of what to execute on
         '''
         ret = {'create': {}}
-        pmap = self.map_providers_parallel(cached=cached)
+        if self.opts.get('hard'):
+            # A hard map destroys the VMs of every provider
+            pmap = self.map_providers_parallel(cached=cached)
+        else:
+            pmap = self.map_providers_parallel(
+                cached=cached, providers=self.map_provider_aliases())
         exist = set()
         defined = set()
         rendered_map = copy.deepcopy(self.rendered_map)
@@ -2207,6 +2345,10 @@ class Map(Cloud):
                 'is disabled. All ssh output will be logged though'
             )
             opts['display_ssh_output'] = False
+            if self.opts.get('map_overlap_deploy', False):
+                # The create workers return as soon as the VMs exist and
+                # _run_deferred_deploys deploys them when they are reachable
+                opts['defer_deploy'] = True
 
         local_master = master_name is None
 
@@ -2264,6 +2406,8 @@ class Map(Cloud):
             log.info('Cloud pool size: %s', pool_size)
             output_multip = enter_mainloop(
                 _create_multiprocessing, parallel_data, pool_size=pool_size)
+            if opts.get('defer_deploy', False):
+                self._run_deferred_deploys(output_multip, opts, pool_size)
             # We have deployed in parallel, now do start action in
             # correct order based on dependencies.
             if self.opts['start_action']:
@@ -2292,6 +2436,71 @@ class Map(Cloud):
 
         return output
 
+    def _run_deferred_deploys(self, output_multip, opts, pool_size):
+        '''
+        Deploy the VMs created by a parallel map run whose deploy was left to
+        the map. The ports of all of them are watched at once and every VM is
+        handed to the deploy pool as soon as it is reachable, so the deploys
+        overlap with the VMs that are still booting. The pool also runs the
+        ``sync_after_install`` of each VM right after its deploy.
+        '''
+        deferred = {}
+        for obj in output_multip:
+            for name, out in six.iteritems(obj):
+                if isinstance(out, dict) and 'deferred_deploy' in out:
+                    deferred[name] = (out, out.pop('deferred_deploy'))
+        if not deferred:
+            return
+
+        waiter = salt.utils.cloud.ReadinessWaiter()
+        results = {}
+        pool = multiprocessing.Pool(pool_size, init_pool_worker)
+
+        def _deploy(name):
+            log.info('Deploying Salt on %s', name)
+            results[name] = pool.apply_async(
+                deploy_multiprocessing,
+                ({'opts': opts,
+                  'name': name,
+                  'deploy_kwargs': deferred[name][1]},))
+
+        try:
+            for name, (_, deploy_kwargs) in six.iteritems(deferred):
+                if deploy_kwargs.get('gateway'):
+                    # deploy_script checks the host through the gateway
+                    _deploy(name)
+                    continue
+                timeout = 900
+                if deploy_kwargs.get('win_installer'):
+                    timeout = deploy_kwargs.get('port_timeout', 15) * 60
+                waiter.add(name,
+                           deploy_kwargs['host'],
+                           deploy_kwargs['port'],
+                           timeout=timeout)
+            waiter.run(callback=_deploy)
+            pool.close()
+            for name, (out, deploy_kwargs) in six.iteritems(deferred):
+                if name not in results:
+                    out['Error'] = {
+                        'Not Deployed': 'Port {0} on {1} did not become '
+                                        'reachable'.format(deploy_kwargs['port'],
+                                                           deploy_kwargs['host'])
+                    }
+                    continue
+                try:
+                    out.update(results[name].get())
+                except Exception as exc:
+                    log.error(
+                        'Failed to deploy \'%s\'. Error: %s',
+                        name, exc, exc_info_on_loglevel=logging.DEBUG
+                    )
+                    out['Error'] = str(exc)
+        except BaseException:
+            pool.terminate()
+            raise
+        finally:
+            pool.join()
+
 
 def init_pool_worker():
     '''
@@ -2330,6 +2539,69 @@ def create_multiprocessing(parallel_data, queue=None):
     }
 
 
+def _sync_after_install(opts, name):
+    '''
+    Sync the dynamic modules named by ``sync_after_install`` to the newly
+    deployed minion ``name``. Returns ``False`` if the option is not valid.
+    '''
+    if opts['sync_after_install'] not in ('all', 'modules', 'states', 'grains'):
+        log.error('Bad option for sync_after_install')
+        return False
+
+    # A small pause helps the sync work more reliably
+    time.sleep(3)
+
+    start = int(time.time())
+    while int(time.time()) < start + 60:
+        # We'll try every <timeout> seconds, up to a minute
+        mopts_ = salt.config.DEFAULT_MASTER_OPTS
+        conf_path = '/'.join(opts['conf_file'].split('/')[:-1])
+        mopts_.update(
+            salt.config.master_config(
+                os.path.join(conf_path,
+                             'master')
+            )
+        )
+
+        client = salt.client.get_local_client(mopts=mopts_)
+
+        ret = client.cmd(
+            name,
+            'saltutil.sync_{0}'.format(opts['sync_after_install']),
+            timeout=opts['timeout']
+        )
+        if ret:
+            log.info(
+                six.u('Synchronized the following dynamic modules: '
+                      '  {0}').format(ret)
+            )
+            break
+    return True
+
+
+def deploy_multiprocessing(parallel_data):
+    '''
+    This function will be called from another process to run the deploy of a
+    VM created by a parallel map run once it is reachable.
+    '''
+    salt.utils.crypt.reinit_crypto()
+
+    opts = parallel_data['opts']
+    try:
+        output = salt.utils.cloud.run_deferred_deploy(
+            parallel_data['deploy_kwargs'], opts)
+    except SaltCloudException as exc:
+        log.error(
+            'Failed to deploy \'%s\'. Error: %s',
+            parallel_data['name'], exc, exc_info_on_loglevel=logging.DEBUG
+        )
+        return {'Error': str(exc)}
+    if output.get('deployed') and 'sync_after_install' in opts:
+        # Cloud.create leaves the sync of a deferred deploy to here
+        _sync_after_install(opts, parallel_data['name'])
+    return salt.utils.data.simple_types_filter(output)
+
+
 def destroy_multiprocessing(parallel_data, queue=None):
     '''
     This function will be called from another process when running a map in
@@ -2363,6 +2635,18 @@ def destroy_multiprocessing(parallel_data, queue=None):
     }
 
 
+def _query_cache_node(name, output):
+    '''
+    Return the listing entry to record in the query cache for a VM created
+    with the given create output
+    '''
+    node = dict((key, output[key]) for key in QUERY_CACHE_NODE_KEYS
+                if key in output)
+    node.setdefault('name', name)
+    node.setdefault('state', 'running')
+    return salt.utils.data.simple_types_filter(node)
+
+
 def run_parallel_map_providers_query(data, queue=None):
     '''
     This function will be called from another process when building the
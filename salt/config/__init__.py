@@ -32,7 +32,6 @@ import salt.utils.user
 import salt.utils.validate.path
 import salt.utils.xdg
 import salt.utils.yaml
-import salt.utils.zeromq
 import salt.syspaths
 import salt.exceptions
 import salt.defaults.exitcodes
@@ -313,6 +312,21 @@ VALID_OPTS = immutabletypes.freeze({
     # Order of preference for optimized .pyc files (PY3 only)
     'optimization_order': list,
 
+    # Cache the module discovery and __virtual__ results of the loader in the cachedir
+    'loader_cache': bool,
+
+    # Seconds after which the loader cache is rebuilt even if nothing changed
+    'loader_cache_ttl': int,
+
+    # Cache the results of read-only execution module functions on disk
+    'exec_cache': bool,
+
+    # Map of function name globs to the seconds their results are cached
+    'exec_cache_ttl': dict,
+
+    # Map of function name globs to the cached functions they invalidate
+    'exec_cache_invalidate': dict,
+
     # Refuse to load these modules
     'disable_modules': list,
 
@@ -381,6 +395,21 @@ VALID_OPTS = immutabletypes.freeze({
     # The chunk size to use when streaming files with the file server
     'file_buffer_size': int,
 
+    # Megabytes of served file chunks each MWorker keeps, 0 disables the cache
+    'fileserver_chunk_cache': int,
+
+    # Megabytes of gzipped file chunks shared by the MWorkers on disk, 0 does
+    # not share them
+    'fileserver_chunk_cache_disk': int,
+
+    # Number of threads file.directory uses to enforce recursive ownership and
+    # mode across subdirectories, 0 or 1 to do it in the state's own thread
+    'file_recurse_workers': int,
+
+    # Keep the installed packages reported by the pkg modules in the cachedir
+    # and reuse them until the package database changes
+    'pkg_inventory_cache': bool,
+
     # The TCP port on which minion events should be published if ipc_mode is TCP
     'tcp_pub_port': int,
 
@@ -560,6 +589,21 @@ VALID_OPTS = immutabletypes.freeze({
     # Events matching a tag in this list should never be sent to an event returner.
     'event_return_blacklist': list,
 
+    # Flush queued events to the event returners at least this often, in seconds
+    'event_return_flush_interval': int,
+
+    # Seconds to wait for the event returners to write out queued events on shutdown
+    'event_return_flush_timeout': int,
+
+    # Hand events to each event returner from a background thread with a bounded queue
+    'event_return_async': bool,
+
+    # The number of event batches queued per event returner before they are journaled to disk
+    'event_return_async_queue': int,
+
+    # Fire the salt/event_return/stats event this often, in seconds
+    'event_return_stats_interval': int,
+
     # default match type for filtering events tags: startswith, endswith, find, regex, fnmatch
     'event_match_type': six.string_types,
 
@@ -690,6 +734,8 @@ VALID_OPTS = immutabletypes.freeze({
     'git_pillar_passphrase': six.string_types,
     'git_pillar_refspecs': list,
     'git_pillar_includes': bool,
+    'git_pillar_fetch_workers': int,
+    'git_pillar_fetch_backoff': int,
     'git_pillar_verify_config': bool,
     # NOTE: gitfs_base, gitfs_mountpoint, and gitfs_root omitted here because
     # their values could conceivably be loaded as non-string types, which is OK
@@ -710,6 +756,8 @@ VALID_OPTS = immutabletypes.freeze({
     'gitfs_ref_types': list,
     'gitfs_refspecs': list,
     'gitfs_disable_saltenv_mapping': bool,
+    'gitfs_fetch_workers': int,
+    'gitfs_fetch_backoff': int,
     'hgfs_remotes': list,
     'hgfs_mountpoint': six.string_types,
     'hgfs_root': six.string_types,
@@ -752,8 +800,46 @@ VALID_OPTS = immutabletypes.freeze({
     # Pillar cache backend. Defaults to `disk` which stores caches in the master cache
     'pillar_cache_backend': six.string_types,
 
+    # Cache the rendered results of individual pillar SLS files
+    'pillar_sls_cache': bool,
+
+    # Pillar SLS cache TTL, in seconds. Has no effect unless `pillar_sls_cache` is True
+    'pillar_sls_cache_ttl': int,
+
+    # Grains which pillar SLS files depend upon. If set, rendered pillar SLS
+    # files are shared between minions with the same values for these grains.
+    'pillar_sls_cache_grains': list,
+
+    # Mapping of ext_pillar names to the TTL, in seconds, to cache their results
+    'ext_pillar_cache_ttl': dict,
+
+    # The maximum number of cached results kept for each kind of pillar
+    # source, 0 disables the limit
+    'pillar_source_cache_max_entries': int,
+
+    # Number of threads used to run the external pillars configured in
+    # `ext_pillar_concurrent`. Set to 0 to run all external pillars in order.
+    'ext_pillar_workers': int,
+
+    # Mapping of the names of external pillars which do not depend on the
+    # pillar data from preceding external pillars, to per-source options
+    # (`timeout` and `on_error`), for running them concurrently
+    'ext_pillar_concurrent': dict,
+
     'pillar_safe_render_error': bool,
 
+    # Maximum number of pillar compiles which may run at once across all of
+    # the master's worker processes. Set to 0 for no limit.
+    'pillar_compile_concurrency': int,
+
+    # Number of seconds a pillar request waits for a free compile slot before
+    # the minion is told to retry later. Set to 0 to wait indefinitely.
+    'pillar_compile_queue_timeout': int,
+
+    # Number of times a minion retries a pillar request which the master was
+    # too busy to compile
+    'pillar_busy_retries': int,
+
     # When creating a pillar, there are several strategies to choose from when
     # encountering duplicate values
     'pillar_source_merging_strategy': six.string_types,
@@ -859,6 +945,9 @@ VALID_OPTS = immutabletypes.freeze({
     # reply from executions.
     'minion_data_cache': bool,
 
+    # Keep materialized per-function views of the mine on the master
+    'mine_views': bool,
+
     # The number of seconds between AES key rotations on the master
     'publish_session': int,
 
@@ -1010,6 +1099,15 @@ VALID_OPTS = immutabletypes.freeze({
     # The length that the syndic event queue must hit before events are popped off and forwarded
     'syndic_jid_forward_cache_hwm': int,
 
+    # The maximum number of minion returns a syndic sends upstream in one request, 0 for no limit
+    'syndic_return_batch_size': int,
+
+    # Compress the return batches a syndic sends upstream, zlib or zstd
+    'syndic_return_compression': (type(None), six.string_types),
+
+    # Only send the state results which changed since the previous run upstream from a syndic
+    'syndic_return_delta': bool,
+
     # Salt SSH configuration
     'ssh_passwd': six.string_types,
     'ssh_port': six.string_types,
@@ -1035,6 +1133,10 @@ VALID_OPTS = immutabletypes.freeze({
     # Instructs the salt CLI to print a summary of a minion responses before returning
     'cli_summary': bool,
 
+    # Instructs the salt CLI to stream the minion returns through the outputter as
+    # they come in instead of formatting every return on its own
+    'cli_stream_output': bool,
+
     # The maximum number of minion connections allowed by the master. Can have performance
     # implications in large setups.
     'max_minions': int,
@@ -1105,6 +1207,9 @@ VALID_OPTS = immutabletypes.freeze({
     # Minion de-dup jid cache max size
     'minion_jid_queue_hwm': int,
 
+    # Persist the minion de-dup jid cache across restarts
+    'minion_jid_queue_persist': bool,
+
     # Minion data cache driver (one of satl.cache.* modules)
     'cache': six.string_types,
     # Enables a fast in-memory cache booster and sets the expiration time.
@@ -1143,6 +1248,9 @@ VALID_OPTS = immutabletypes.freeze({
     # to the master is attempted.
     'beacons_before_connect': bool,
 
+    # Send all the beacons which fired on one evaluation as a single event
+    'beacons_batch_event': bool,
+
     # Controls whether the scheduler is set up before a connection
     # to the master is attempted.
     'scheduler_before_connect': bool,
@@ -1268,11 +1376,19 @@ DEFAULT_MINION_OPTS = immutabletypes.freeze({
     'pillar_source_merging_strategy': 'smart',
     'pillar_merge_lists': False,
     'pillar_includes_override_sls': False,
+    'pillar_busy_retries': 10,
     # ``pillar_cache``, ``pillar_cache_ttl`` and ``pillar_cache_backend``
     # are not used on the minion but are unavoidably in the code path
     'pillar_cache': False,
     'pillar_cache_ttl': 3600,
     'pillar_cache_backend': 'disk',
+    'pillar_sls_cache': False,
+    'pillar_sls_cache_ttl': 3600,
+    'pillar_sls_cache_grains': [],
+    'ext_pillar_cache_ttl': {},
+    'pillar_source_cache_max_entries': 1000,
+    'ext_pillar_workers': 0,
+    'ext_pillar_concurrent': {},
     'extension_modules': os.path.join(salt.syspaths.CACHE_DIR, 'minion', 'extmods'),
     'state_top': 'top.sls',
     'state_top_saltenv': None,
@@ -1336,6 +1452,8 @@ DEFAULT_MINION_OPTS = immutabletypes.freeze({
     'git_pillar_passphrase': '',
     'git_pillar_refspecs': _DFLT_REFSPECS,
     'git_pillar_includes': True,
+    'git_pillar_fetch_workers': 1,
+    'git_pillar_fetch_backoff': 0,
     'gitfs_remotes': [],
     'gitfs_mountpoint': '',
     'gitfs_root': '',
@@ -1356,9 +1474,32 @@ DEFAULT_MINION_OPTS = immutabletypes.freeze({
     'gitfs_ref_types': ['branch', 'tag', 'sha'],
     'gitfs_refspecs': _DFLT_REFSPECS,
     'gitfs_disable_saltenv_mapping': False,
+    'gitfs_fetch_workers': 1,
+    'gitfs_fetch_backoff': 0,
     'unique_jid': False,
     'hash_type': 'sha256',
     'optimization_order': [0, 1, 2],
+    'loader_cache': False,
+    'loader_cache_ttl': 3600,
+    'exec_cache': False,
+    'exec_cache_ttl': {},
+    'exec_cache_invalidate': {
+        'pkg.install': ['pkg.*'],
+        'pkg.remove': ['pkg.*'],
+        'pkg.purge': ['pkg.*'],
+        'pkg.upgrade': ['pkg.*'],
+        'pkg.refresh_db': ['pkg.*'],
+        'pkg.mod_repo': ['pkg.*'],
+        'pkg.del_repo': ['pkg.*'],
+        'pkg.hold': ['pkg.*'],
+        'pkg.unhold': ['pkg.*'],
+        'service.start': ['service.*'],
+        'service.stop': ['service.*'],
+        'service.restart': ['service.*'],
+        'service.reload': ['service.*'],
+        'service.enable': ['service.*'],
+        'service.disable': ['service.*'],
+    },
     'disable_modules': [],
     'disable_returners': [],
     'whitelist_modules': [],
@@ -1416,6 +1557,8 @@ DEFAULT_MINION_OPTS = immutabletypes.freeze({
     'state_auto_order': True,
     'state_events': False,
     'state_aggregate': False,
+    'file_recurse_workers': 4,
+    'pkg_inventory_cache': True,
     'snapper_states': False,
     'snapper_states_config': 'root',
     'acceptance_wait_time': 10,
@@ -1499,9 +1642,11 @@ DEFAULT_MINION_OPTS = immutabletypes.freeze({
     'proxy_password': '',
     'proxy_port': 0,
     'minion_jid_queue_hwm': 100,
+    'minion_jid_queue_persist': False,
     'ssl': None,
     'multifunc_ordered': False,
     'beacons_before_connect': False,
+    'beacons_batch_event': False,
     'scheduler_before_connect': False,
     'cache': 'localfs',
     'salt_cp_chunk_size': 65536,
@@ -1592,6 +1737,8 @@ DEFAULT_MASTER_OPTS = immutabletypes.freeze({
     'git_pillar_passphrase': '',
     'git_pillar_refspecs': _DFLT_REFSPECS,
     'git_pillar_includes': True,
+    'git_pillar_fetch_workers': 1,
+    'git_pillar_fetch_backoff': 0,
     'git_pillar_verify_config': True,
     'gitfs_remotes': [],
     'gitfs_mountpoint': '',
@@ -1613,6 +1760,8 @@ DEFAULT_MASTER_OPTS = immutabletypes.freeze({
     'gitfs_ref_types': ['branch', 'tag', 'sha'],
     'gitfs_refspecs': _DFLT_REFSPECS,
     'gitfs_disable_saltenv_mapping': False,
+    'gitfs_fetch_workers': 1,
+    'gitfs_fetch_backoff': 0,
     'hgfs_remotes': [],
     'hgfs_mountpoint': '',
     'hgfs_root': '',
@@ -1649,9 +1798,18 @@ DEFAULT_MASTER_OPTS = immutabletypes.freeze({
     'pillar_source_merging_strategy': 'smart',
     'pillar_merge_lists': False,
     'pillar_includes_override_sls': False,
+    'pillar_compile_concurrency': 0,
+    'pillar_compile_queue_timeout': 0,
     'pillar_cache': False,
     'pillar_cache_ttl': 3600,
     'pillar_cache_backend': 'disk',
+    'pillar_sls_cache': False,
+    'pillar_sls_cache_ttl': 3600,
+    'pillar_sls_cache_grains': [],
+    'ext_pillar_cache_ttl': {},
+    'pillar_source_cache_max_entries': 1000,
+    'ext_pillar_workers': 0,
+    'ext_pillar_concurrent': {},
     'ping_on_rotate': False,
     'peer': {},
     'preserve_minion_cache': False,
@@ -1679,6 +1837,8 @@ DEFAULT_MASTER_OPTS = immutabletypes.freeze({
     'file_recv': False,
     'file_recv_max_size': 100,
     'file_buffer_size': 1048576,
+    'fileserver_chunk_cache': 0,
+    'fileserver_chunk_cache_disk': 1024,
     'file_ignore_regex': [],
     'file_ignore_glob': [],
     'fileserver_backend': ['roots'],
@@ -1689,6 +1849,8 @@ DEFAULT_MASTER_OPTS = immutabletypes.freeze({
     'max_open_files': 100000,
     'hash_type': 'sha256',
     'optimization_order': [0, 1, 2],
+    'loader_cache': False,
+    'loader_cache_ttl': 3600,
     'conf_file': os.path.join(salt.syspaths.CONFIG_DIR, 'master'),
     'open_mode': False,
     'auto_accept': False,
@@ -1707,6 +1869,7 @@ DEFAULT_MASTER_OPTS = immutabletypes.freeze({
     'job_cache_store_endtime': False,
     'minion_data_cache': True,
     'enforce_mine_cache': False,
+    'mine_views': False,
     'ipc_mode': _DFLT_IPC_MODE,
     'ipc_write_buffer': _DFLT_IPC_WBUFFER,
     'ipc_so_rcvbuf': None,
@@ -1740,6 +1903,11 @@ DEFAULT_MASTER_OPTS = immutabletypes.freeze({
     'event_return_queue': 0,
     'event_return_whitelist': [],
     'event_return_blacklist': [],
+    'event_return_flush_interval': 0,
+    'event_return_flush_timeout': 5,
+    'event_return_async': False,
+    'event_return_async_queue': 100,
+    'event_return_stats_interval': 0,
     'event_match_type': 'startswith',
     'runner_returns': True,
     'serial': 'msgpack',
@@ -1793,6 +1961,9 @@ DEFAULT_MASTER_OPTS = immutabletypes.freeze({
     'gather_job_timeout': 10,
     'syndic_event_forward_timeout': 0.5,
     'syndic_jid_forward_cache_hwm': 100,
+    'syndic_return_batch_size': 0,
+    'syndic_return_compression': None,
+    'syndic_return_delta': False,
     'regen_thin': False,
     'ssh_passwd': '',
     'ssh_priv_passwd': '',
@@ -1810,6 +1981,7 @@ DEFAULT_MASTER_OPTS = immutabletypes.freeze({
     'sqlite_queue_dir': os.path.join(salt.syspaths.CACHE_DIR, 'master', 'queues'),
     'queue_dirs': [],
     'cli_summary': False,
+    'cli_stream_output': False,
     'max_minions': 0,
     'master_sign_key_name': 'master_sign',
     'master_sign_pubkey': False,
@@ -1910,6 +2082,12 @@ DEFAULT_CLOUD_OPTS = immutabletypes.freeze({
     'log_rotate_backup_count': 0,
     'bootstrap_delay': None,
     'cache': 'localfs',
+    # Seconds provider node listings are reused across runs, 0 disables
+    'query_cache_ttl': 0,
+    # Reuse stored provider node listings whatever their age
+    'query_cache_first': False,
+    # Deploy the VMs of parallel map runs as soon as they are reachable
+    'map_overlap_deploy': False,
 })
 
 DEFAULT_API_OPTS = immutabletypes.freeze({
@@ -4161,8 +4339,10 @@ def client_config(path, env_var='SALT_CLIENT_CONFIG', defaults=None):
 
     # Make sure the master_uri is set
     if 'master_uri' not in opts:
+        # Imported here to keep zmq out of the CLI startup path
+        from salt.utils.zeromq import ip_bracket
         opts['master_uri'] = 'tcp://{ip}:{port}'.format(
-            ip=salt.utils.zeromq.ip_bracket(opts['interface']),
+            ip=ip_bracket(opts['interface']),
             port=opts['ret_port']
         )
 
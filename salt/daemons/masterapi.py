@@ -476,6 +476,7 @@ class RemoteFuncs(object):
         self._file_hash = fs_.file_hash
         self._file_list = fs_.file_list
         self._file_list_emptydirs = fs_.file_list_emptydirs
+        self._file_manifest = fs_.file_manifest
         self._dir_list = fs_.dir_list
         self._symlink_list = fs_.symlink_list
         self._file_envs = fs_.envs
@@ -643,6 +644,18 @@ class RemoteFuncs(object):
                 greedy=False
                 )
         minions = _res['minions']
+        if self.opts.get('mine_views', False):
+            views = salt.utils.minions.MineViews(self.opts, self.cache)
+            try:
+                ret, etag = views.lookup(minions, functions_allowed, _ret_dict)
+            except salt.exceptions.FileLockError as exc:
+                log.warning('Unable to read the mine views: %s', exc)
+            else:
+                if 'if_none_match' not in load:
+                    return ret
+                if load['if_none_match'] == etag:
+                    return {'__mine_etag__': etag}
+                return {'__mine_etag__': etag, '__mine_data__': ret}
         for minion in minions:
             fdata = self.cache.fetch('minions/{0}'.format(minion), 'mine')
 
@@ -667,12 +680,19 @@ class RemoteFuncs(object):
         if self.opts.get('minion_data_cache', False) or self.opts.get('enforce_mine_cache', False):
             cbank = 'minions/{0}'.format(load['id'])
             ckey = 'mine'
+            mine_views = self.opts.get('mine_views', False)
+            old = {}
+            if not load.get('clear', False) or mine_views:
+                old = self.cache.fetch(cbank, ckey)
             if not load.get('clear', False):
-                data = self.cache.fetch(cbank, ckey)
-                if isinstance(data, dict):
+                if isinstance(old, dict):
+                    data = dict(old)
                     data.update(load['data'])
                     load['data'] = data
             self.cache.store(cbank, ckey, load['data'])
+            if mine_views:
+                salt.utils.minions.MineViews(self.opts, self.cache).update(
+                    load['id'], old, load['data'])
         return True
 
     def _mine_delete(self, load):
@@ -689,8 +709,12 @@ class RemoteFuncs(object):
                 if not isinstance(data, dict):
                     return False
                 if load['fun'] in data:
+                    old = dict(data)
                     del data[load['fun']]
                     self.cache.store(cbank, ckey, data)
+                    if self.opts.get('mine_views', False):
+                        salt.utils.minions.MineViews(self.opts, self.cache).update(
+                            load['id'], old, data)
             except OSError:
                 return False
         return True
@@ -702,7 +726,11 @@ class RemoteFuncs(object):
         if not skip_verify and 'id' not in load:
             return False
         if self.opts.get('minion_data_cache', False) or self.opts.get('enforce_mine_cache', False):
-            return self.cache.flush('minions/{0}'.format(load['id']), 'mine')
+            cbank = 'minions/{0}'.format(load['id'])
+            if self.opts.get('mine_views', False):
+                salt.utils.minions.MineViews(self.opts, self.cache).update(
+                    load['id'], self.cache.fetch(cbank, 'mine'), {})
+            return self.cache.flush(cbank, 'mine')
         return True
 
     def _file_recv(self, load):
@@ -311,6 +311,13 @@ class Client(object):
         '''
         return {}
 
+    def file_manifest(self, saltenv='base', prefix=''):
+        '''
+        Return a dict mapping the files under ``prefix`` to their hash, size
+        and mode, or None if the file server cannot provide it in one request
+        '''
+        return None
+
     def is_cached(self, path, saltenv='base', cachedir=None):
         '''
         Returns the full path to a file if it is cached locally on the minion
@@ -1301,6 +1308,20 @@ class RemoteClient(Client):
         return salt.utils.data.decode(self.channel.send(load)) if six.PY2 \
             else self.channel.send(load)
 
+    def file_manifest(self, saltenv='base', prefix=''):
+        '''
+        Return a dict mapping the files under ``prefix`` on the master to
+        their hash, size and mode, or None when the master is too old to
+        provide it
+        '''
+        load = {'saltenv': saltenv,
+                'prefix': prefix,
+                'cmd': '_file_manifest'}
+        ret = self.channel.send(load)
+        if not isinstance(ret, dict):
+            return None
+        return salt.utils.data.decode(ret) if six.PY2 else ret
+
     def __hash_and_stat_file(self, path, saltenv='base'):
         '''
         Common code for hashing and stating files
@@ -6,19 +6,27 @@ File server pluggable modules and generic backend functions
 # Import python libs
 from __future__ import absolute_import, print_function, unicode_literals
 
+import collections
 import errno
 import fnmatch
+import hashlib
 import logging
 import os
 import re
+import shutil
+import stat
 import sys
 import time
 
 # Import salt libs
 import salt.loader
+import salt.utils.atomicfile
 import salt.utils.data
 import salt.utils.files
+import salt.utils.gzip_util
+import salt.utils.hashutils
 import salt.utils.path
+import salt.utils.stringutils
 import salt.utils.url
 import salt.utils.versions
 from salt.utils.args import get_function_argspec as _argspec
@@ -340,6 +348,294 @@ def clear_lock(clear_func, role, remote=None, lock_type='update'):
     return clear_func(remote=remote, lock_type=lock_type)
 
 
+class ChunkCache(object):
+    '''
+    Cache of the chunks served to the minions by the fileserver backends,
+    enabled with the ``fileserver_chunk_cache`` option. When many minions
+    fetch the same file, every chunk is read and gzipped once instead of once
+    per minion:
+
+    - the served files are kept open per version (path, mtime and size), so
+      a chunk request does not open the file again;
+    - the chunks are kept in a LRU bounded to ``fileserver_chunk_cache``
+      megabytes;
+    - gzipped chunks are also written to ``<cachedir>/file_chunks`` under the
+      hash of the file, so the other MWorkers pick them up instead of
+      compressing them again. These are bounded to
+      ``fileserver_chunk_cache_disk`` megabytes by :py:meth:`prune`, which
+      the Maintenance process of the master runs.
+    '''
+    # Number of files kept open
+    max_files = 32
+
+    def __init__(self, opts):
+        self.opts = opts
+        self.buffer_size = opts['file_buffer_size']
+        self.hash_type = opts.get('hash_type', 'sha256')
+        self.max_size = int(opts.get('fileserver_chunk_cache') or 0) * 1024 * 1024
+        self.max_disk_size = int(opts.get('fileserver_chunk_cache_disk', 1024) or 0) * 1024 * 1024
+        self.cache_dir = os.path.join(opts['cachedir'], 'file_chunks')
+        self.size = 0
+        self.disk_size = 0
+        self.size_path = os.path.join(self.cache_dir, '.size')
+        self.size_mtime = None
+        self.chunks = collections.OrderedDict()
+        self.files = collections.OrderedDict()
+        self.hashes = {}
+
+    def _open(self, fpath):
+        '''
+        Return the key of the current version of a file and a tuple of its
+        open file object and whether it is binary
+        '''
+        st = os.stat(fpath)
+        key = (fpath, st.st_mtime, st.st_size)
+        entry = self.files.pop(key, None)
+        if entry is None:
+            for old in [fkey for fkey in self.files if fkey[0] == fpath]:
+                self.files.pop(old)[0].close()
+                self.hashes.pop(old, None)
+            entry = (salt.utils.files.fopen(fpath, 'rb'),
+                     salt.utils.files.is_binary(fpath))
+            while len(self.files) >= self.max_files:
+                old, (fp_, _) = self.files.popitem(last=False)
+                fp_.close()
+                self.hashes.pop(old, None)
+        self.files[key] = entry
+        return key, entry
+
+    def _file_hash(self, key):
+        '''
+        Return the hash of a version of a file, the chunks of that version are
+        shared on disk under it
+        '''
+        fhash = self.hashes.get(key)
+        if fhash is None:
+            fhash = self.hashes[key] = salt.utils.hashutils.get_hash(
+                key[0], self.hash_type)
+        return fhash
+
+    def _disk_path(self, key):
+        fpath, mtime, size, loc, gzip, decode = key
+        return os.path.join(
+            self.cache_dir,
+            hashlib.sha256(salt.utils.stringutils.to_bytes(fpath)).hexdigest(),
+            self._file_hash((fpath, mtime, size)),
+            '{0}-{1}-{2:d}'.format(loc, gzip, decode))
+
+    def _load(self, key):
+        path = self._disk_path(key)
+        try:
+            with salt.utils.files.fopen(path, 'rb') as fp_:
+                data = fp_.read()
+            # The least recently used chunks are pruned first
+            os.utime(path, None)
+            return data
+        except (IOError, OSError):
+            return None
+
+    def _fits(self, size):
+        '''
+        Return whether ``size`` more bytes fit on disk, going by the size
+        measured by the last :py:meth:`prune` plus what was stored since
+        '''
+        try:
+            mtime = os.stat(self.size_path).st_mtime
+        except OSError:
+            mtime = None
+        if mtime != self.size_mtime:
+            self.size_mtime = mtime
+            try:
+                with salt.utils.files.fopen(self.size_path, 'rb') as fp_:
+                    self.disk_size = int(fp_.read())
+            except (IOError, OSError, ValueError):
+                self.disk_size = 0
+        return self.disk_size + size <= self.max_disk_size
+
+    def _dump(self, key, data):
+        if not self._fits(len(data)):
+            # Keep it in memory until the next prune makes room
+            return
+        path = self._disk_path(key)
+        version_dir = os.path.dirname(path)
+        file_dir = os.path.dirname(version_dir)
+        try:
+            if not os.path.isdir(version_dir):
+                if os.path.isdir(file_dir):
+                    # Chunks of an older version of the file are of no use
+                    # anymore
+                    for name in os.listdir(file_dir):
+                        if name != 'path':
+                            shutil.rmtree(os.path.join(file_dir, name),
+                                          ignore_errors=True)
+                os.makedirs(version_dir)
+                # Remember which file the chunks belong to for prune()
+                with salt.utils.atomicfile.atomic_open(
+                        os.path.join(file_dir, 'path'), 'wb') as fp_:
+                    fp_.write(salt.utils.stringutils.to_bytes(key[0]))
+            with salt.utils.atomicfile.atomic_open(path, 'wb') as fp_:
+                fp_.write(data)
+        except (IOError, OSError) as exc:
+            log.debug('Unable to cache a chunk of %s: %s', key[0], exc)
+            return
+        self.disk_size += len(data)
+
+    def _disk_chunks(self, prune=False):
+        '''
+        Return a list of the mtime, size and path of the chunks stored on
+        disk. With ``prune`` the chunks of files which were deleted or whose
+        hash changed are removed instead of listed.
+        '''
+        chunks = []
+        hashes = {}
+        try:
+            file_dirs = os.listdir(self.cache_dir)
+        except OSError:
+            return chunks
+        for name in file_dirs:
+            if name.startswith('.'):
+                continue
+            file_dir = os.path.join(self.cache_dir, name)
+            current = None
+            if prune:
+                try:
+                    with salt.utils.files.fopen(os.path.join(file_dir, 'path'), 'rb') as fp_:
+                        fpath = salt.utils.stringutils.to_unicode(fp_.read())
+                    st = os.stat(fpath)
+                    # Only hash the files which changed since the last prune
+                    fkey = (fpath, st.st_mtime, st.st_size)
+                    current = hashes[fkey] = self.hashes.get(fkey) \
+                        or salt.utils.hashutils.get_hash(fpath, self.hash_type)
+                except (IOError, OSError):
+                    # The file was deleted
+                    shutil.rmtree(file_dir, ignore_errors=True)
+                    continue
+            try:
+                versions = os.listdir(file_dir)
+            except OSError:
+                continue
+            for version in versions:
+                version_dir = os.path.join(file_dir, version)
+                if version == 'path':
+                    continue
+                if prune and version != current:
+                    shutil.rmtree(version_dir, ignore_errors=True)
+                    continue
+                try:
+                    for chunk in os.listdir(version_dir):
+                        path = os.path.join(version_dir, chunk)
+                        st = os.stat(path)
+                        chunks.append((st.st_mtime, st.st_size, path))
+                except OSError:
+                    continue
+        if prune:
+            self.hashes = hashes
+        return chunks
+
+    def prune(self):
+        '''
+        Remove the chunks stored on disk for files which were deleted or
+        whose hash changed, then the least recently used chunks until the
+        rest fits in ``fileserver_chunk_cache_disk`` megabytes. This hashes
+        the changed files, so it runs in the Maintenance process and not on
+        the request path.
+        '''
+        chunks = self._disk_chunks(prune=True)
+        size = sum(csize for _, csize, _ in chunks)
+        if size > self.max_disk_size:
+            chunks.sort()
+            for _, csize, path in chunks:
+                if size <= self.max_disk_size:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+                size -= csize
+        self.disk_size = size
+        # Tell the MWorkers how much room is left
+        try:
+            with salt.utils.atomicfile.atomic_open(self.size_path, 'wb') as fp_:
+                fp_.write(salt.utils.stringutils.to_bytes(six.text_type(size)))
+        except (IOError, OSError) as exc:
+            log.debug('Unable to record the size of the chunk cache: %s', exc)
+
+    def _remember(self, key, data):
+        if len(data) > self.max_size:
+            return
+        self.chunks[key] = data
+        self.size += len(data)
+        while self.size > self.max_size:
+            self.size -= len(self.chunks.popitem(last=False)[1])
+
+    def read(self, fpath, loc, gzip=None, decode=False):
+        '''
+        Return the chunk of ``fpath`` starting at ``loc``
+        '''
+        key, (fp_, binary) = self._open(fpath)
+        decode = bool(decode and six.PY3 and not binary)
+        key += (loc, gzip or None, decode)
+        data = self.chunks.pop(key, None)
+        if data is not None:
+            # Move it to the most recently used end
+            self.chunks[key] = data
+            return data
+        shared = gzip and self.max_disk_size
+        if shared:
+            data = self._load(key)
+        if data is None:
+            fp_.seek(loc)
+            data = fp_.read(self.buffer_size)
+            if data and decode:
+                data = data.decode(__salt_system_encoding__)
+            if gzip and data:
+                data = salt.utils.gzip_util.compress(data, gzip)
+                if shared:
+                    self._dump(key, data)
+        self._remember(key, data)
+        return data
+
+
+_CHUNK_CACHE = None
+
+
+def _chunk_cache(opts):
+    global _CHUNK_CACHE
+    if _CHUNK_CACHE is None:
+        _CHUNK_CACHE = ChunkCache(opts)
+    return _CHUNK_CACHE
+
+
+def prune_chunk_cache(opts):
+    '''
+    Prune the chunks the :py:class:`ChunkCache` stored on disk, run by the
+    Maintenance process of the master
+    '''
+    if opts.get('fileserver_chunk_cache') \
+            and opts.get('fileserver_chunk_cache_disk', 1024):
+        _chunk_cache(opts).prune()
+
+
+def read_chunk(opts, fpath, loc, gzip=None, decode=False):
+    '''
+    Read the chunk of a file starting at ``loc`` for the ``serve_file``
+    function of a fileserver backend, gzipped if ``gzip`` is set and decoded
+    on Python 3 when ``decode`` is set and the file is not binary. The chunks
+    go through the :py:class:`ChunkCache` when ``fileserver_chunk_cache`` is
+    set.
+    '''
+    if opts.get('fileserver_chunk_cache'):
+        return _chunk_cache(opts).read(fpath, loc, gzip=gzip, decode=decode)
+    with salt.utils.files.fopen(fpath, 'rb') as fp_:
+        fp_.seek(loc)
+        data = fp_.read(opts['file_buffer_size'])
+        if data and decode and six.PY3 and not salt.utils.files.is_binary(fpath):
+            data = data.decode(__salt_system_encoding__)
+        if gzip and data:
+            data = salt.utils.gzip_util.compress(data, gzip)
+    return data
+
+
 class Fileserver(object):
     '''
     Create a fileserver wrapper object that wraps the fileserver functions and
@@ -435,6 +731,17 @@ class Fileserver(object):
                         'The {0} fileserver cache was successfully cleared'
                         .format(fsb)
                     )
+        chunk_dir = os.path.join(self.opts['cachedir'], 'file_chunks')
+        if os.path.isdir(chunk_dir):
+            log.debug('Clearing the fileserver chunk cache')
+            try:
+                shutil.rmtree(chunk_dir)
+            except OSError as exc:
+                errors.append(
+                    'Unable to clear the fileserver chunk cache: {0}'.format(exc)
+                )
+            else:
+                cleared.append('The fileserver chunk cache was successfully cleared')
         return cleared, errors
 
     def lock(self, back=None, remote=None):
@@ -493,14 +800,20 @@ class Fileserver(object):
     def update(self, back=None):
         '''
         Update all of the enabled fileserver backends which support the update
-        function, or
+        function, or the named backend(s) only. Returns a dictionary mapping
+        each backend to the data returned by its update function, for those
+        backends which return any (such as gitfs' per-remote fetch statistics).
         '''
         back = self.backends(back)
+        ret = {}
         for fsb in back:
             fstr = '{0}.update'.format(fsb)
             if fstr in self.servers:
                 log.debug('Updating %s fileserver cache', fsb)
-                self.servers[fstr]()
+                data = self.servers[fstr]()
+                if data is not None:
+                    ret[fsb] = data
+        return ret
 
     def update_intervals(self, back=None):
         '''
@@ -793,6 +1106,39 @@ class Fileserver(object):
             ret = [f for f in ret if f.startswith(prefix)]
         return sorted(ret)
 
+    @ensure_unicode_args
+    def file_manifest(self, load):
+        '''
+        Return the hash, size and mode of every file under a prefix, so a
+        client can tell which files it needs to fetch from a single request.
+        The size and mode are None for the backends which do not stat files.
+        '''
+        if 'env' in load:
+            # "env" is not supported; Use "saltenv".
+            load.pop('env')
+
+        ret = {}
+        if 'saltenv' not in load:
+            return ret
+        if not isinstance(load['saltenv'], six.string_types):
+            load['saltenv'] = six.text_type(load['saltenv'])
+
+        for path in self.file_list({'saltenv': load['saltenv'],
+                                    'prefix': load.get('prefix', '')}):
+            hash_info, stat_result = self.file_hash_and_stat(
+                {'path': path, 'saltenv': load['saltenv']})
+            if not hash_info:
+                continue
+            entry = {'hsum': hash_info.get('hsum'),
+                     'hash_type': hash_info.get('hash_type'),
+                     'size': None,
+                     'mode': None}
+            if stat_result:
+                entry['mode'] = stat.S_IMODE(stat_result[0])
+                entry['size'] = stat_result[6]
+            ret[path] = entry
+        return ret
+
     @ensure_unicode_args
     def file_list_emptydirs(self, load):
         '''
@@ -128,9 +128,10 @@ def lock(remote=None):
 
 def update(remotes=None):
     '''
-    Execute a git fetch on all of the repos
+    Execute a git fetch on all of the repos, and return per-remote fetch
+    statistics
     '''
-    _gitfs().update(remotes)
+    return _gitfs().update(remotes)
 
 
 def update_intervals():
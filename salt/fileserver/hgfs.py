@@ -65,7 +65,6 @@ except ImportError:
 # Import salt libs
 import salt.utils.data
 import salt.utils.files
-import salt.utils.gzip_util
 import salt.utils.hashutils
 import salt.utils.stringutils
 import salt.utils.url
@@ -759,15 +758,14 @@ def serve_file(load, fnd):
     ret['dest'] = fnd['rel']
     gzip = load.get('gzip', None)
     fpath = os.path.normpath(fnd['path'])
-    with salt.utils.files.fopen(fpath, 'rb') as fp_:
-        fp_.seek(load['loc'])
-        data = fp_.read(__opts__['file_buffer_size'])
-        if data and six.PY3 and not salt.utils.files.is_binary(fpath):
-            data = data.decode(__salt_system_encoding__)
-        if gzip and data:
-            data = salt.utils.gzip_util.compress(data, gzip)
-            ret['gzip'] = gzip
-        ret['data'] = data
+    data = salt.fileserver.read_chunk(__opts__,
+                                      fpath,
+                                      load['loc'],
+                                      gzip=gzip,
+                                      decode=True)
+    if gzip and data:
+        ret['gzip'] = gzip
+    ret['data'] = data
     return ret
 
 
@@ -36,16 +36,12 @@ import logging
 # Import salt libs
 import salt.fileserver
 import salt.utils.files
-import salt.utils.gzip_util
 import salt.utils.hashutils
 import salt.utils.path
 import salt.utils.stringutils
 import salt.utils.url
 import salt.utils.versions
 
-# Import third party libs
-from salt.ext import six
-
 log = logging.getLogger(__name__)
 
 
@@ -140,15 +136,14 @@ def serve_file(load, fnd):
     # AP
     # May I sleep here to slow down serving of big files?
     # How many threads are serving files?
-    with salt.utils.files.fopen(fpath, 'rb') as fp_:
-        fp_.seek(load['loc'])
-        data = fp_.read(__opts__['file_buffer_size'])
-        if data and six.PY3 and not salt.utils.files.is_binary(fpath):
-            data = data.decode(__salt_system_encoding__)
-        if gzip and data:
-            data = salt.utils.gzip_util.compress(data, gzip)
-            ret['gzip'] = gzip
-        ret['data'] = data
+    data = salt.fileserver.read_chunk(__opts__,
+                                      fpath,
+                                      load['loc'],
+                                      gzip=gzip,
+                                      decode=True)
+    if gzip and data:
+        ret['gzip'] = gzip
+    ret['data'] = data
     return ret
 
 
@@ -26,7 +26,6 @@ import logging
 import salt.fileserver
 import salt.utils.event
 import salt.utils.files
-import salt.utils.gzip_util
 import salt.utils.hashutils
 import salt.utils.path
 import salt.utils.platform
@@ -130,13 +129,13 @@ def serve_file(load, fnd):
     ret['dest'] = fnd['rel']
     gzip = load.get('gzip', None)
     fpath = os.path.normpath(fnd['path'])
-    with salt.utils.files.fopen(fpath, 'rb') as fp_:
-        fp_.seek(load['loc'])
-        data = fp_.read(__opts__['file_buffer_size'])
-        if gzip and data:
-            data = salt.utils.gzip_util.compress(data, gzip)
-            ret['gzip'] = gzip
-        ret['data'] = data
+    data = salt.fileserver.read_chunk(__opts__,
+                                      fpath,
+                                      load['loc'],
+                                      gzip=gzip)
+    if gzip and data:
+        ret['gzip'] = gzip
+    ret['data'] = data
     return ret
 
 
@@ -90,7 +90,6 @@ import logging
 import salt.fileserver as fs
 import salt.modules
 import salt.utils.files
-import salt.utils.gzip_util
 import salt.utils.hashutils
 import salt.utils.versions
 
@@ -240,15 +239,14 @@ def serve_file(load, fnd):
 
     ret['dest'] = _trim_env_off_path([fnd['path']], load['saltenv'])[0]
 
-    with salt.utils.files.fopen(cached_file_path, 'rb') as fp_:
-        fp_.seek(load['loc'])
-        data = fp_.read(__opts__['file_buffer_size'])
-        if data and six.PY3 and not salt.utils.files.is_binary(cached_file_path):
-            data = data.decode(__salt_system_encoding__)
-        if gzip and data:
-            data = salt.utils.gzip_util.compress(data, gzip)
-            ret['gzip'] = gzip
-        ret['data'] = data
+    data = fs.read_chunk(__opts__,
+                         cached_file_path,
+                         load['loc'],
+                         gzip=gzip,
+                         decode=True)
+    if gzip and data:
+        ret['gzip'] = gzip
+    ret['data'] = data
     return ret
 
 
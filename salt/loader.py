@@ -11,6 +11,7 @@ import os
 import re
 import sys
 import time
+import hashlib
 import logging
 import inspect
 import tempfile
@@ -25,18 +26,22 @@ from zipimport import zipimporter
 import salt.config
 import salt.defaults.events
 import salt.defaults.exitcodes
+import salt.payload
 import salt.syspaths
 import salt.utils.args
+import salt.utils.atomicfile
 import salt.utils.context
 import salt.utils.data
 import salt.utils.dictupdate
 import salt.utils.event
 import salt.utils.files
+import salt.utils.json
 import salt.utils.lazy
 import salt.utils.odict
 import salt.utils.platform
 import salt.utils.versions
 import salt.utils.stringutils
+import salt.version
 from salt.exceptions import LoaderError
 from salt.template import check_render_pipe_str
 from salt.utils.decorators import Depends
@@ -259,6 +264,10 @@ def minion_mods(
         static_modules=static_modules,
     )
 
+    if opts.get('exec_cache'):
+        from salt.utils.cache import ExecCache
+        ret.exec_cache = ExecCache(opts)
+
     ret.pack['__salt__'] = ret
 
     # Load any provider overrides from the configuration file providers option
@@ -1273,6 +1282,8 @@ class LazyLoader(salt.utils.lazy.LazyDict):
         self.loaded_modules = {}  # mapping of module_name -> dict_of_functions
         self.loaded_files = set()  # TODO: just remove them from file_mapping?
         self.static_modules = static_modules if static_modules else []
+        # salt.utils.cache.ExecCache wrapping the functions as they are loaded
+        self.exec_cache = None
 
         if virtual_funcs is None:
             virtual_funcs = []
@@ -1297,6 +1308,12 @@ class LazyLoader(salt.utils.lazy.LazyDict):
             self.suffix_map[suffix] = (suffix, mode, kind)
             self.suffix_order.append(suffix)
 
+        # Persistent record of the file mapping and of the __virtual__
+        # outcomes, see loader_cache
+        self._discovery = None
+        self._discovery_dirty = False
+        self._discovery_providers = {}
+
         self._lock = threading.RLock()
         self._refresh_file_mapping()
 
@@ -1389,6 +1406,18 @@ class LazyLoader(salt.utils.lazy.LazyDict):
         else:
             self.suffix_map[''] = ('', '', imp.PKG_DIRECTORY)
 
+        if not self._load_discovery_cache():
+            self._scan_file_mapping()
+            if self.opts.get('loader_cache', False):
+                self._init_discovery_cache()
+        for smod in self.static_modules:
+            f_noext = smod.split('.')[-1]
+            self.file_mapping[f_noext] = (smod, '.o', 0)
+
+    def _scan_file_mapping(self):
+        '''
+        Build the file mapping from the contents of the module dirs
+        '''
         # create mapping of filename (without suffix) to (path, suffix)
         # The files are added in order of priority, so order *must* be retained.
         self.file_mapping = salt.utils.odict.OrderedDict()
@@ -1515,9 +1544,153 @@ class LazyLoader(salt.utils.lazy.LazyDict):
 
                 except OSError:
                     continue
-        for smod in self.static_modules:
-            f_noext = smod.split('.')[-1]
-            self.file_mapping[f_noext] = (smod, '.o', 0)
+
+    def _discovery_cache_path(self):
+        dirs_hash = hashlib.sha256(
+            salt.utils.stringutils.to_bytes(repr(self.module_dirs))).hexdigest()
+        return os.path.join(
+            self.opts['cachedir'],
+            'loader',
+            '{0}-{1}.p'.format(self.tag, dirs_hash[:16]))
+
+    # Options which change at runtime without changing what loads
+    _discovery_volatile_opts = frozenset((
+        'grains', 'pillar', 'logger', 'master_ip', 'master_uri', 'master_list',
+        'schedule', 'beacons', 'mine_functions',
+    ))
+
+    def _discovery_cache_key(self):
+        '''
+        Return a key which changes whenever the outcome of scanning the
+        module dirs or of the __virtual__ functions may have changed
+        '''
+        def _mtimes(paths):
+            ret = []
+            for path in paths:
+                try:
+                    ret.append((path, os.stat(path).st_mtime))
+                except OSError:
+                    ret.append((path, None))
+            return ret
+
+        mod_dirs = []
+        for mod_dir in self.module_dirs:
+            mod_dirs.extend((mod_dir, os.path.join(mod_dir, '__pycache__')))
+        # New python libraries and binaries can make __virtual__ succeed
+        search_path = list(sys.path) + os.environ.get('PATH', '').split(os.pathsep)
+        grains = self.opts.get('grains', {})
+        if isinstance(grains, ThreadLocalProxy):
+            grains = ThreadLocalProxy.unproxy(grains)
+        grains_hash = hashlib.sha256(salt.utils.stringutils.to_bytes(
+            salt.utils.json.dumps(grains, sort_keys=True, default=repr))).hexdigest()
+        # __virtual__ functions look at the config too. Read the raw values,
+        # looking them up in a CopyOnWriteDict would copy them.
+        opts = dict((key, val) for key, val in dict.items(self.opts)
+                    if key not in self._discovery_volatile_opts)
+        opts_hash = hashlib.sha256(salt.utils.stringutils.to_bytes(
+            salt.utils.json.dumps(opts, sort_keys=True, default=repr))).hexdigest()
+        proxytype = None
+        if isinstance(self.opts.get('proxy'), dict):
+            proxytype = self.opts['proxy'].get('proxytype')
+        return hashlib.sha256(salt.utils.stringutils.to_bytes(repr((
+            salt.version.__version__,
+            sys.version,
+            self.tag,
+            _mtimes(mod_dirs),
+            _mtimes(search_path),
+            grains_hash,
+            opts_hash,
+            proxytype,
+            sorted(self.disabled),
+            sorted(self.suffix_map),
+            sorted(self.pack),
+            self.virtual_enable,
+            self.virtual_funcs,
+            self.opts.get('optimization_order'),
+        )))).hexdigest()
+
+    def _init_discovery_cache(self):
+        self._discovery = {
+            'key': self._discovery_cache_key(),
+            'time': time.time(),
+            'file_mapping': [[name] + list(entry)
+                             for name, entry in six.iteritems(self.file_mapping)],
+            'modules': {},
+        }
+        self._discovery_providers = {}
+        self._discovery_dirty = True
+
+    def _load_discovery_cache(self):
+        '''
+        Restore the file mapping and the known __virtual__ outcomes from the
+        discovery cache, return False if there is no valid cache
+        '''
+        if not self.opts.get('loader_cache', False) or 'cachedir' not in self.opts:
+            self._discovery = None
+            return False
+        key = self._discovery_cache_key()
+        if self._discovery is not None and self._discovery['key'] == key:
+            # Nothing changed since we loaded or built it, keep what has been
+            # recorded in the meantime
+            self.file_mapping = salt.utils.odict.OrderedDict(
+                (entry[0], tuple(entry[1:])) for entry in self._discovery['file_mapping'])
+            return True
+        self._discovery = None
+        path = self._discovery_cache_path()
+        try:
+            with salt.utils.files.fopen(path, 'rb') as fp_:
+                data = salt.payload.Serial(self.opts).load(fp_)
+        except (IOError, OSError):
+            return False
+        except Exception as exc:  # pylint: disable=broad-except
+            log.debug('Unable to read the loader cache %s: %s', path, exc)
+            return False
+        if not isinstance(data, dict) \
+                or data.get('key') != key \
+                or time.time() - data.get('time', 0) > self.opts.get('loader_cache_ttl', 3600):
+            return False
+        self.file_mapping = salt.utils.odict.OrderedDict(
+            (entry[0], tuple(entry[1:])) for entry in data['file_mapping'])
+        self._discovery = data
+        self._discovery_dirty = False
+        self._discovery_providers = {}
+        for name, entry in six.iteritems(data['modules']):
+            if entry[0]:
+                for mod_name in entry[1]:
+                    self._discovery_providers.setdefault(mod_name, []).append(name)
+        return True
+
+    def _save_discovery_cache(self):
+        if self._discovery is None or not self._discovery_dirty:
+            return
+        path = self._discovery_cache_path()
+        try:
+            if not os.path.isdir(os.path.dirname(path)):
+                os.makedirs(os.path.dirname(path))
+            with salt.utils.atomicfile.atomic_open(path, 'wb') as fp_:
+                salt.payload.Serial(self.opts).dump(self._discovery, fp_)
+            self._discovery_dirty = False
+        except (IOError, OSError) as exc:
+            log.debug('Unable to write the loader cache %s: %s', path, exc)
+
+    def _remember_module(self, name, loaded, info, module_name=None):
+        '''
+        Record that the file ``name`` loaded as the modules in ``info``, or
+        failed to load as ``module_name`` for the reason in ``info``
+        '''
+        if self._discovery is None:
+            return
+        if loaded:
+            entry = [loaded, info]
+        else:
+            if info is not None:
+                info = six.text_type(info)
+            entry = [loaded, info, module_name or name]
+        self._discovery['modules'][name] = entry
+        if loaded:
+            for mod_name in info:
+                self._discovery_providers.setdefault(mod_name, []).append(name)
+        self._discovery_dirty = True
 
     def clear(self):
         '''
@@ -1556,6 +1729,10 @@ class LazyLoader(salt.utils.lazy.LazyDict):
             self.context_dict['pillar'] = pillar
             self.pack['__pillar__'] = salt.utils.context.NamespacedDictWrapper(self.context_dict, 'pillar')
 
+        if isinstance(opts, salt.utils.context.CopyOnWriteDict):
+            # Looking up every option would copy all of them from the base
+            return opts.view(exclude=('logger',))
+
         mod_opts = {}
         for key, val in list(opts.items()):
             if key == 'logger':
@@ -1567,6 +1744,11 @@ class LazyLoader(salt.utils.lazy.LazyDict):
         '''
         Iterate over all file_mapping files in order of closeness to mod_name
         '''
+        # do we already know which files provide it?
+        for name in self._discovery_providers.get(mod_name, ()):
+            if name in self.file_mapping:
+                yield name
+
         # do we have an exact match?
         if mod_name in self.file_mapping:
             yield mod_name
@@ -1598,6 +1780,14 @@ class LazyLoader(salt.utils.lazy.LazyDict):
         mod = None
         fpath, suffix = self.file_mapping[name][:2]
         self.loaded_files.add(name)
+        if self._discovery is not None:
+            known = self._discovery['modules'].get(name)
+            if known is not None and not known[0]:
+                # Known not to load until something changes
+                self.missing_modules[name] = known[1]
+                if len(known) > 2:
+                    self.missing_modules[known[2]] = known[1]
+                return False
         fpath_dirname = os.path.dirname(fpath)
         try:
             sys.path.append(fpath_dirname)
@@ -1694,6 +1884,7 @@ class LazyLoader(salt.utils.lazy.LazyDict):
                 self.tag, name, exc_info=True
             )
             self.missing_modules[name] = exc
+            self._remember_module(name, False, exc)
             return False
         except Exception as error:
             log.error(
@@ -1723,7 +1914,18 @@ class LazyLoader(salt.utils.lazy.LazyDict):
         finally:
             sys.path.remove(fpath_dirname)
 
-        if hasattr(mod, '__opts__'):
+        if hasattr(mod, '__opts__') \
+                and isinstance(self.opts, salt.utils.context.CopyOnWriteDict):
+            # Updating the module's options would look up, and so copy, all
+            # of ours. Layer the options only the module has under a view.
+            mod_opts = self.opts
+            for key in mod.__opts__:
+                if key not in self.opts:
+                    if mod_opts is self.opts:
+                        mod_opts = self.opts.view()
+                    mod_opts[key] = mod.__opts__[key]
+            mod.__opts__ = mod_opts
+        elif hasattr(mod, '__opts__'):
             mod.__opts__.update(self.opts)
         else:
             mod.__opts__ = self.opts
@@ -1770,6 +1972,7 @@ class LazyLoader(salt.utils.lazy.LazyDict):
                     # If a module has information about why it could not be loaded, record it
                     self.missing_modules[module_name] = virtual_err
                     self.missing_modules[name] = virtual_err
+                    self._remember_module(name, False, virtual_err, module_name)
                     return False
         else:
             virtual_aliases = ()
@@ -1787,6 +1990,7 @@ class LazyLoader(salt.utils.lazy.LazyDict):
                     err_string = 'not a proxy_minion enabled module'
                     self.missing_modules[module_name] = err_string
                     self.missing_modules[name] = err_string
+                    self._remember_module(name, False, err_string, module_name)
                     return False
 
         if getattr(mod, '__load__', False) is not False:
@@ -1826,14 +2030,17 @@ class LazyLoader(salt.utils.lazy.LazyDict):
                     full_funcname = '.'.join((tgt_mod, funcname))
                 except TypeError:
                     full_funcname = '{0}.{1}'.format(tgt_mod, funcname)
+                tgt_func = func
+                if self.exec_cache is not None:
+                    tgt_func = self.exec_cache.wrap(full_funcname, func)
                 # Save many references for lookups
                 # Careful not to overwrite existing (higher priority) functions
                 if full_funcname not in self._dict:
-                    self._dict[full_funcname] = func
+                    self._dict[full_funcname] = tgt_func
                 if funcname not in mod_dict[tgt_mod]:
-                    setattr(mod_dict[tgt_mod], funcname, func)
-                    mod_dict[tgt_mod][funcname] = func
-                    self._apply_outputter(func, mod)
+                    setattr(mod_dict[tgt_mod], funcname, tgt_func)
+                    mod_dict[tgt_mod][funcname] = tgt_func
+                    self._apply_outputter(tgt_func, mod)
 
         # enforce depends
         try:
@@ -1846,6 +2053,8 @@ class LazyLoader(salt.utils.lazy.LazyDict):
 
         for tgt_mod in mod_names:
             self.loaded_modules[tgt_mod] = mod_dict[tgt_mod]
+        if self._discovery is not None and name not in self._discovery['modules']:
+            self._remember_module(name, True, mod_names)
         return True
 
     def _load(self, key):
@@ -1898,6 +2107,7 @@ class LazyLoader(salt.utils.lazy.LazyDict):
                         self._refresh_file_mapping()
                         reloaded = True
                     continue
+            self._save_discovery_cache()
 
         return ret
 
@@ -1912,6 +2122,7 @@ class LazyLoader(salt.utils.lazy.LazyDict):
                 self._load_module(name)
 
             self.loaded = True
+            self._save_discovery_cache()
 
     def reload_modules(self):
         with self._lock:
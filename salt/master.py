@@ -44,6 +44,7 @@ import salt.wheel
 import salt.minion
 import salt.key
 import salt.acl
+import salt.cache
 import salt.engines
 import salt.daemons.masterapi
 import salt.defaults.exitcodes
@@ -65,6 +66,7 @@ import salt.utils.process
 import salt.utils.schedule
 import salt.utils.ssdp
 import salt.utils.stringutils
+import salt.utils.syndic
 import salt.utils.user
 import salt.utils.verify
 import salt.utils.zeromq
@@ -103,6 +105,9 @@ class SMaster(object):
     Create a simple salt-master, this will generate the top-level master
     '''
     secrets = {}  # mapping of key -> {'secret': multiprocessing type, 'reload': FUNCTION}
+    # Semaphore limiting the number of pillar compiles running at once across
+    # all of the MWorkers, see pillar_compile_concurrency
+    pillar_compile_slots = None
 
     def __init__(self, opts):
         '''
@@ -114,9 +119,10 @@ class SMaster(object):
         self.master_key = salt.crypt.MasterKeys(self.opts)
         self.key = self.__prep_key()
 
-    # We need __setstate__ and __getstate__ to also pickle 'SMaster.secrets'.
-    # Otherwise, 'SMaster.secrets' won't be copied over to the spawned process
-    # on Windows since spawning processes on Windows requires pickling.
+    # We need __setstate__ and __getstate__ to also pickle 'SMaster.secrets'
+    # and 'SMaster.pillar_compile_slots'. Otherwise, they won't be copied over
+    # to the spawned process on Windows since spawning processes on Windows
+    # requires pickling.
     # These methods are only used when pickling so will not be used on
     # non-Windows platforms.
     def __setstate__(self, state):
@@ -124,12 +130,14 @@ class SMaster(object):
         self.master_key = state['master_key']
         self.key = state['key']
         SMaster.secrets = state['secrets']
+        SMaster.pillar_compile_slots = state['pillar_compile_slots']
 
     def __getstate__(self):
         return {'opts': self.opts,
                 'master_key': self.master_key,
                 'key': self.key,
-                'secrets': SMaster.secrets}
+                'secrets': SMaster.secrets,
+                'pillar_compile_slots': SMaster.pillar_compile_slots}
 
     def __prep_key(self):
         '''
@@ -223,6 +231,8 @@ class Maintenance(salt.utils.process.SignalHandlingMultiprocessingProcess):
 
         # init things that need to be done after the process is forked
         self._post_fork_init()
+        # Avoid circular import
+        import salt.fileserver
 
         # Make Start Times
         last = int(time.time())
@@ -235,6 +245,9 @@ class Maintenance(salt.utils.process.SignalHandlingMultiprocessingProcess):
                 salt.daemons.masterapi.clean_expired_tokens(self.opts)
                 salt.daemons.masterapi.clean_pub_auth(self.opts)
                 salt.daemons.masterapi.clean_proc_dir(self.opts)
+                if self.opts.get('pillar_compile_concurrency'):
+                    salt.utils.master.PillarCompilePool(self.opts).clean()
+                salt.fileserver.prune_chunk_cache(self.opts)
             self.handle_git_pillar()
             self.handle_schedule()
             self.handle_key_cache()
@@ -671,6 +684,13 @@ class Master(SMaster):
                 ),
                 'reload': salt.crypt.Crypticle.generate_key_string
             }
+            if self.opts['pillar_compile_concurrency']:
+                SMaster.pillar_compile_slots = multiprocessing.BoundedSemaphore(
+                    self.opts['pillar_compile_concurrency'])
+            if self.opts['mine_views']:
+                # The views were not maintained while the master was down
+                # (or the option was off), let them be rebuilt on first use
+                salt.cache.factory(self.opts).flush(salt.utils.minions.MineViews.bank)
             log.info('Creating master process manager')
             # Since there are children having their own ProcessManager we should wait for kill more time.
             self.process_manager = salt.utils.process.ProcessManager(wait_for_kill=5)
@@ -739,6 +759,7 @@ class Master(SMaster):
                 kwargs['log_queue'] = log_queue
                 kwargs['log_queue_level'] = salt.log.setup.get_multiprocessing_logging_level()
                 kwargs['secrets'] = SMaster.secrets
+                kwargs['pillar_compile_slots'] = SMaster.pillar_compile_slots
 
             self.process_manager.add_process(
                 ReqServer,
@@ -827,7 +848,8 @@ class ReqServer(salt.utils.process.SignalHandlingMultiprocessingProcess):
     Starts up the master request server, minions send results to this
     interface.
     '''
-    def __init__(self, opts, key, mkey, secrets=None, **kwargs):
+    def __init__(self, opts, key, mkey, secrets=None, pillar_compile_slots=None,
+                 **kwargs):
         '''
         Create a request server
 
@@ -844,6 +866,7 @@ class ReqServer(salt.utils.process.SignalHandlingMultiprocessingProcess):
         # Prepare the AES key
         self.key = key
         self.secrets = secrets
+        self.pillar_compile_slots = pillar_compile_slots
 
     # __setstate__ and __getstate__ are only used on Windows.
     # We do this so that __init__ will be invoked on Windows in the child
@@ -855,6 +878,7 @@ class ReqServer(salt.utils.process.SignalHandlingMultiprocessingProcess):
             state['key'],
             state['mkey'],
             secrets=state['secrets'],
+            pillar_compile_slots=state['pillar_compile_slots'],
             log_queue=state['log_queue'],
             log_queue_level=state['log_queue_level']
         )
@@ -865,6 +889,7 @@ class ReqServer(salt.utils.process.SignalHandlingMultiprocessingProcess):
             'key': self.key,
             'mkey': self.master_key,
             'secrets': self.secrets,
+            'pillar_compile_slots': self.pillar_compile_slots,
             'log_queue': self.log_queue,
             'log_queue_level': self.log_queue_level
         }
@@ -884,6 +909,8 @@ class ReqServer(salt.utils.process.SignalHandlingMultiprocessingProcess):
         salt.log.setup.setup_multiprocessing_logging(self.log_queue)
         if self.secrets is not None:
             SMaster.secrets = self.secrets
+        if self.pillar_compile_slots is not None:
+            SMaster.pillar_compile_slots = self.pillar_compile_slots
 
         dfn = os.path.join(self.opts['cachedir'], '.dfn')
         if os.path.isfile(dfn):
@@ -986,9 +1013,10 @@ class MWorker(salt.utils.process.SignalHandlingMultiprocessingProcess):
         self.stats = collections.defaultdict(lambda: {'mean': 0, 'latency': 0, 'runs': 0})
         self.stat_clock = time.time()
 
-    # We need __setstate__ and __getstate__ to also pickle 'SMaster.secrets'.
-    # Otherwise, 'SMaster.secrets' won't be copied over to the spawned process
-    # on Windows since spawning processes on Windows requires pickling.
+    # We need __setstate__ and __getstate__ to also pickle 'SMaster.secrets'
+    # and 'SMaster.pillar_compile_slots'. Otherwise, they won't be copied over
+    # to the spawned process on Windows since spawning processes on Windows
+    # requires pickling.
     # These methods are only used when pickling so will not be used on
     # non-Windows platforms.
     def __setstate__(self, state):
@@ -1003,6 +1031,7 @@ class MWorker(salt.utils.process.SignalHandlingMultiprocessingProcess):
         self.key = state['key']
         self.k_mtime = state['k_mtime']
         SMaster.secrets = state['secrets']
+        SMaster.pillar_compile_slots = state['pillar_compile_slots']
 
     def __getstate__(self):
         return {
@@ -1012,6 +1041,7 @@ class MWorker(salt.utils.process.SignalHandlingMultiprocessingProcess):
             'key': self.key,
             'k_mtime': self.k_mtime,
             'secrets': SMaster.secrets,
+            'pillar_compile_slots': SMaster.pillar_compile_slots,
             'log_queue': self.log_queue,
             'log_queue_level': self.log_queue_level
         }
@@ -1172,6 +1202,12 @@ class AESFuncs(object):
         )
         self.__setup_fileserver()
         self.masterapi = salt.daemons.masterapi.RemoteFuncs(opts)
+        # Holds the previous state runs of delta-encoded syndic returns
+        self.cache = salt.cache.factory(opts)
+        self.pillar_pool = None
+        if self.opts.get('pillar_compile_concurrency'):
+            self.pillar_pool = salt.utils.master.PillarCompilePool(
+                self.opts, SMaster.pillar_compile_slots)
 
     def __setup_fileserver(self):
         '''
@@ -1186,6 +1222,7 @@ class AESFuncs(object):
         self._file_hash_and_stat = self.fs_.file_hash_and_stat
         self._file_list = self.fs_.file_list
         self._file_list_emptydirs = self.fs_.file_list_emptydirs
+        self._file_manifest = self.fs_.file_manifest
         self._dir_list = self.fs_.dir_list
         self._symlink_list = self.fs_.symlink_list
         self._file_envs = self.fs_.file_envs
@@ -1528,6 +1565,34 @@ class AESFuncs(object):
             return False
         load['grains']['id'] = load['id']
 
+        if self.pillar_pool is None:
+            data = self._compile_pillar(load)
+        else:
+            # Only minions which know to retry can be told to come back later,
+            # older minions would treat the reply as an empty pillar.
+            timeout = self.opts['pillar_compile_queue_timeout'] \
+                if load.get('pillar_busy_retry') else None
+            data = self.pillar_pool.compile(
+                load, functools.partial(self._compile_pillar, load), timeout)
+            if data is None:
+                log.info(
+                    'Pillar compile queue is full, asking minion %s to retry',
+                    load['id']
+                )
+                return {'__pillar_busy__': self.opts['pillar_compile_queue_timeout']}
+        if self.opts.get('minion_data_cache', False):
+            self.masterapi.cache.store('minions/{0}'.format(load['id']),
+                                       'data',
+                                       {'grains': load['grains'],
+                                        'pillar': data})
+            if self.opts.get('minion_data_cache_events') is True:
+                self.event.fire_event({'Minion data cache refresh': load['id']}, tagify(load['id'], 'refresh', 'minion'))
+        return data
+
+    def _compile_pillar(self, load):
+        '''
+        Compile the pillar data for a minion's pillar request
+        '''
         pillar = salt.pillar.get_pillar(
             self.opts,
             load['grains'],
@@ -1539,13 +1604,6 @@ class AESFuncs(object):
             extra_minion_data=load.get('extra_minion_data'))
         data = pillar.compile_pillar()
         self.fs_.update_opts()
-        if self.opts.get('minion_data_cache', False):
-            self.masterapi.cache.store('minions/{0}'.format(load['id']),
-                                       'data',
-                                       {'grains': load['grains'],
-                                        'pillar': data})
-            if self.opts.get('minion_data_cache_events') is True:
-                self.event.fire_event({'Minion data cache refresh': load['id']}, tagify(load['id'], 'refresh', 'minion'))
         return data
 
     def _minion_event(self, load):
@@ -1641,14 +1699,25 @@ class AESFuncs(object):
         individual minions.
 
         :param dict load: The minion payload
+
+        :rtype: dict
+        :return: The jids and minions of delta-encoded state returns which
+                 could not be restored and have to be sent again in full
         '''
-        loads = load.get('load')
-        if not isinstance(loads, list):
-            loads = [load]  # support old syndics not aggregating returns
+        try:
+            loads = salt.utils.syndic.unpack(self.opts, load)
+        except Exception as exc:
+            log.error('Unable to read the returns sent by syndic %s: %s',
+                      load.get('id'), exc)
+            return False
+        rets = []
+        resend = []
         for load in loads:
             # Verify the load
             if any(key not in load for key in ('return', 'jid', 'id')):
                 continue
+            decoder = salt.utils.syndic.DeltaDecoder(self.cache, load['id'])
+            resend.extend([load['jid'], minion] for minion in decoder.decode(load))
             # if we have a load, save it
             if load.get('load'):
                 fstr = '{0}.save_load'.format(self.opts['master_job_cache'])
@@ -1678,7 +1747,23 @@ class AESFuncs(object):
                     ret['out'] = load['out']
                 if 'sig' in load:
                     ret['sig'] = load['sig']
+                rets.append(ret)
+
+        # Signed returns have to be verified one by one, store the rest in
+        # one go
+        batch = []
+        for ret in rets:
+            if 'sig' in ret or self.opts['require_minion_sign_messages']:
                 self._return(ret)
+            else:
+                batch.append(ret)
+        try:
+            salt.utils.job.store_jobs(
+                self.opts, batch, event=self.event, mminion=self.mminion)
+        except salt.exceptions.SaltCacheError:
+            log.error('Could not store job information for syndic returns')
+        if resend:
+            return {'resend': resend}
 
     def minion_runner(self, clear_load):
         '''
@@ -712,13 +712,8 @@ def handle_decoded_payload(self, data):
 
     # Don't duplicate jobs
     log.trace('Started JIDs: %s', self.jid_queue)
-    if self.jid_queue is not None:
-        if data['jid'] in self.jid_queue:
-            return
-        else:
-            self.jid_queue.append(data['jid'])
-            if len(self.jid_queue) > self.opts['minion_jid_queue_hwm']:
-                self.jid_queue.pop(0)
+    if self.jid_queue is not None and not self.jid_queue.add(data['jid']):
+        return
 
     if isinstance(data['fun'], six.string_types):
         if data['fun'] == 'sys.reload_modules':
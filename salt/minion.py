@@ -87,6 +87,7 @@ import salt.utils.platform
 import salt.utils.process
 import salt.utils.schedule
 import salt.utils.ssdp
+import salt.utils.syndic
 import salt.utils.user
 import salt.utils.zeromq
 import salt.defaults.events
@@ -952,7 +953,7 @@ class MinionManager(MinionBase):
         self.auth_wait = self.opts['acceptance_wait_time']
         self.max_auth_wait = self.opts['acceptance_wait_time_max']
         self.minions = []
-        self.jid_queue = []
+        self.jid_queue = salt.utils.minion.jid_queue(self.opts)
 
         install_zmq()
         self.io_loop = ZMQDefaultLoop.current()
@@ -1014,7 +1015,7 @@ class MinionManager(MinionBase):
             masters = [masters]
 
         for master in masters:
-            s_opts = copy.deepcopy(self.opts)
+            s_opts = salt.utils.context.CopyOnWriteDict(self.opts)
             s_opts['master'] = master
             s_opts['multimaster'] = True
             minion = self._create_minion_object(s_opts,
@@ -1130,7 +1131,7 @@ class Minion(MinionBase):
         # Flag meaning minion has finished initialization including first connect to the master.
         # True means the Minion is fully functional and ready to handle events.
         self.ready = False
-        self.jid_queue = [] if jid_queue is None else jid_queue
+        self.jid_queue = salt.utils.minion.jid_queue(opts, jid_queue)
         self.periodic_callbacks = {}
 
         if io_loop is None:
@@ -1396,7 +1397,7 @@ class Minion(MinionBase):
         self.utils = salt.loader.utils(opts, proxy=proxy)
 
         if opts.get('multimaster', False):
-            s_opts = copy.deepcopy(opts)
+            s_opts = salt.utils.context.CopyOnWriteDict(opts)
             functions = salt.loader.minion_mods(s_opts, utils=self.utils, proxy=proxy,
                                                 loaded_base_name=self.loaded_base_name, notify=notify)
         else:
@@ -1514,13 +1515,8 @@ class Minion(MinionBase):
 
         # Don't duplicate jobs
         log.trace('Started JIDs: %s', self.jid_queue)
-        if self.jid_queue is not None:
-            if data['jid'] in self.jid_queue:
-                return
-            else:
-                self.jid_queue.append(data['jid'])
-                if len(self.jid_queue) > self.opts['minion_jid_queue_hwm']:
-                    self.jid_queue.pop(0)
+        if self.jid_queue is not None and not self.jid_queue.add(data['jid']):
+            return
 
         if isinstance(data['fun'], six.string_types):
             if data['fun'] == 'sys.reload_modules':
@@ -2116,8 +2112,15 @@ class Minion(MinionBase):
                 # Local job cache has been enabled
                 salt.utils.minion.cache_jobs(self.opts, load['jid'], ret)
 
-        load = {'cmd': ret_cmd,
-                'load': list(six.itervalues(jids))}
+        if ret_cmd == '_syndic_return':
+            # Bounded, optionally compressed and delta-encoded batches
+            payloads = salt.utils.syndic.pack(
+                self.opts,
+                list(six.itervalues(jids)),
+                encoder=getattr(self, 'delta_encoder', None))
+        else:
+            payloads = [{'cmd': ret_cmd,
+                         'load': list(six.itervalues(jids))}]
 
         def timeout_handler(*_):
             log.warning(
@@ -2130,13 +2133,17 @@ class Minion(MinionBase):
 
         if sync:
             try:
-                ret_val = self._send_req_sync(load, timeout=timeout)
+                replies = [self._send_req_sync(load, timeout=timeout)
+                           for load in payloads]
             except SaltReqTimeoutError:
                 timeout_handler()
                 return ''
+            ret_val = replies[0] if len(replies) == 1 else replies
         else:
             with tornado.stack_context.ExceptionStackContext(timeout_handler):
-                ret_val = self._send_req_async(load, timeout=timeout, callback=lambda f: None)  # pylint: disable=unexpected-keyword-arg
+                futures = [self._send_req_async(load, timeout=timeout, callback=lambda f: None)  # pylint: disable=unexpected-keyword-arg
+                           for load in payloads]
+            ret_val = futures[0] if len(futures) == 1 else tornado.gen.multi(futures)
 
         log.trace('ret_val = %s', ret_val)  # pylint: disable=no-member
         return ret_val
@@ -2965,12 +2972,20 @@ class Syndic(Minion):
         self.jids = {}
         self.raw_events = []
         self.pub_future = None
+        # State returns are delta-encoded against what this master has seen
+        self.delta_encoder = None
+        if self.opts.get('syndic_return_delta'):
+            self.delta_encoder = salt.utils.syndic.DeltaEncoder()
 
     def _handle_decoded_payload(self, data):
         '''
         Override this method if you wish to handle the decoded data
         differently.
         '''
+        # Don't forward the same publish twice when it is re-delivered
+        if 'jid' in data and not self.jid_queue.add(data['jid']):
+            log.trace('Already forwarded jid %s, ignoring', data['jid'])
+            return
         # TODO: even do this??
         data['to'] = int(data.get('to', self.opts['timeout'])) - 1
         # Only forward the command if it didn't originate from ourselves
@@ -3122,6 +3137,8 @@ class SyndicManager(MinionBase):
 
         self._has_master = threading.Event()
         self.jid_forward_cache = set()
+        # Shared by all syndics so a publish is forwarded only once
+        self.jid_queue = salt.utils.minion.jid_queue(self.opts)
 
         if io_loop is None:
             install_zmq()
@@ -3179,6 +3196,7 @@ class SyndicManager(MinionBase):
                                 timeout=self.SYNDIC_CONNECT_TIMEOUT,
                                 safe=False,
                                 io_loop=self.io_loop,
+                                jid_queue=self.jid_queue,
                                 )
                 yield syndic.connect_master(failed=failed)
                 # set up the syndic to handle publishes (specifically not event forwarding)
@@ -3285,6 +3303,9 @@ class SyndicManager(MinionBase):
                     # Add not sent data to the delayed list and try the next master
                     self.delayed.extend(data)
                     continue
+                else:
+                    self._handle_pub_reply(master, future.result(), data)
+                    del self.pub_futures[master]
             future = getattr(syndic_future.result(), func)(values,
                                                            '_syndic_return',
                                                            timeout=self._return_retry_timer(),
@@ -3294,6 +3315,39 @@ class SyndicManager(MinionBase):
         # Loop done and didn't exit: wasn't sent, try again later
         return False
 
+    def _handle_pub_reply(self, master, reply, data):
+        '''
+        Look at the master's answer to a batch of returns. When it could not
+        restore a delta-encoded state return, queue that return again in full.
+        '''
+        replies = reply if isinstance(reply, list) else [reply]
+        resend = set()
+        for item in replies:
+            if isinstance(item, dict):
+                resend.update(tuple(entry) for entry in item.get('resend', []))
+        if not resend:
+            return
+        syndic_future = self._syndics.get(master)
+        encoder = None
+        if syndic_future is not None and syndic_future.done() and not syndic_future.exception():
+            encoder = syndic_future.result().delta_encoder
+        for job_ret in data:
+            jid = job_ret.get('__jid__')
+            minions = [minion for minion in job_ret
+                       if not minion.startswith('__') and (jid, minion) in resend]
+            if not minions:
+                continue
+            log.debug('Sending the full return of job %s for %s to %s again',
+                      jid, ', '.join(minions), master)
+            retry = dict((key, value) for key, value in six.iteritems(job_ret)
+                         if key.startswith('__') or key in minions)
+            # The job load was already stored with the first send
+            retry['__load__'] = {}
+            if encoder is not None:
+                for minion in minions:
+                    encoder.forget(minion, job_ret.get('__fun__'))
+            self.delayed.append(retry)
+
     def iter_master_options(self, master_id=None):
         '''
         Iterate (in order) over your options for master
@@ -3405,6 +3459,10 @@ class SyndicManager(MinionBase):
 
     def _forward_events(self):
         log.trace('Forwarding events')  # pylint: disable=no-member
+        for master, (future, data) in list(six.iteritems(self.pub_futures)):
+            if future.done() and not future.exception():
+                self._handle_pub_reply(master, future.result(), data)
+                del self.pub_futures[master]
         if self.raw_events:
             events = self.raw_events
             self.raw_events = []
@@ -73,6 +73,8 @@ except ImportError:
 # pylint: enable=import-error
 
 APT_LISTS_PATH = "/var/lib/apt/lists"
+APT_PKGCACHE = '/var/cache/apt/pkgcache.bin'
+DPKG_STATUS = '/var/lib/dpkg/status'
 
 # Source format for urllib fallback on PPA handling
 LP_SRC_FORMAT = 'deb http://ppa.launchpad.net/{0}/{1}/ubuntu {2} main'
@@ -344,6 +346,9 @@ def refresh_db(cache_valid_time=0, failhard=False, **kwargs):
             log.warning("could not stat cache directory due to: %s", exp)
 
     call = _call_apt(['apt-get', '-q', 'update'], scope=False)
+    # The package lists changed, the stamp of the stored apt-cache dump may
+    # not tell if they were rewritten within the same second
+    salt.utils.pkg.clear_inventory(__opts__, 'apt_repo')
     if call['retcode'] != 0:
         comment = ''
         if 'stderr' in call:
@@ -1213,6 +1218,53 @@ def unhold(name=None, pkgs=None, sources=None, **kwargs):  # pylint: disable=W06
     return ret
 
 
+def _query_pkgs():
+    '''
+    Return the installed, removed and purge_desired packages as recorded by
+    dpkg
+    '''
+    ret = {'installed': {}, 'removed': {}, 'purge_desired': {}}
+    cmd = ['dpkg-query', '--showformat',
+           '${Status} ${Package} ${Version} ${Architecture}\n', '-W']
+
+    out = __salt__['cmd.run_stdout'](
+            cmd,
+            output_loglevel='trace',
+            python_shell=False)
+    # Typical lines of output:
+    # install ok installed zsh 4.3.17-1ubuntu1 amd64
+    # deinstall ok config-files mc 3:4.8.1-2ubuntu1 amd64
+    for line in out.splitlines():
+        cols = line.split()
+        try:
+            linetype, status, name, version_num, arch = \
+                [cols[x] for x in (0, 2, 3, 4, 5)]
+        except (ValueError, IndexError):
+            continue
+        if __grains__.get('cpuarch', '') == 'x86_64':
+            osarch = __grains__.get('osarch', '')
+            if arch != 'all' and osarch == 'amd64' and osarch != arch:
+                name += ':{0}'.format(arch)
+        if cols:
+            if ('install' in linetype or 'hold' in linetype) and \
+                    'installed' in status:
+                __salt__['pkg_resource.add_pkg'](ret['installed'],
+                                                 name,
+                                                 version_num)
+            elif 'deinstall' in linetype:
+                __salt__['pkg_resource.add_pkg'](ret['removed'],
+                                                 name,
+                                                 version_num)
+            elif 'purge' in linetype and status == 'installed':
+                __salt__['pkg_resource.add_pkg'](ret['purge_desired'],
+                                                 name,
+                                                 version_num)
+
+    for pkglist_type in ('installed', 'removed', 'purge_desired'):
+        __salt__['pkg_resource.sort_pkglist'](ret[pkglist_type])
+    return ret
+
+
 def list_pkgs(versions_as_list=False,
               removed=False,
               purge_desired=False,
@@ -1238,6 +1290,10 @@ def list_pkgs(versions_as_list=False,
             function.
 
 
+    .. versionchanged:: Neon
+        The result is kept in the minion cachedir until the package database
+        changes, see :conf_minion:`pkg_inventory_cache`.
+
     CLI Example:
 
     .. code-block:: bash
@@ -1260,45 +1316,12 @@ def list_pkgs(versions_as_list=False,
             __salt__['pkg_resource.stringify'](ret)
         return ret
 
-    ret = {'installed': {}, 'removed': {}, 'purge_desired': {}}
-    cmd = ['dpkg-query', '--showformat',
-           '${Status} ${Package} ${Version} ${Architecture}\n', '-W']
-
-    out = __salt__['cmd.run_stdout'](
-            cmd,
-            output_loglevel='trace',
-            python_shell=False)
-    # Typical lines of output:
-    # install ok installed zsh 4.3.17-1ubuntu1 amd64
-    # deinstall ok config-files mc 3:4.8.1-2ubuntu1 amd64
-    for line in out.splitlines():
-        cols = line.split()
-        try:
-            linetype, status, name, version_num, arch = \
-                [cols[x] for x in (0, 2, 3, 4, 5)]
-        except (ValueError, IndexError):
-            continue
-        if __grains__.get('cpuarch', '') == 'x86_64':
-            osarch = __grains__.get('osarch', '')
-            if arch != 'all' and osarch == 'amd64' and osarch != arch:
-                name += ':{0}'.format(arch)
-        if cols:
-            if ('install' in linetype or 'hold' in linetype) and \
-                    'installed' in status:
-                __salt__['pkg_resource.add_pkg'](ret['installed'],
-                                                 name,
-                                                 version_num)
-            elif 'deinstall' in linetype:
-                __salt__['pkg_resource.add_pkg'](ret['removed'],
-                                                 name,
-                                                 version_num)
-            elif 'purge' in linetype and status == 'installed':
-                __salt__['pkg_resource.add_pkg'](ret['purge_desired'],
-                                                 name,
-                                                 version_num)
-
-    for pkglist_type in ('installed', 'removed', 'purge_desired'):
-        __salt__['pkg_resource.sort_pkglist'](ret[pkglist_type])
+    # Taken before querying dpkg, see salt.utils.pkg.write_inventory
+    stamp = salt.utils.pkg.inventory_stamp([DPKG_STATUS])
+    ret = salt.utils.pkg.read_inventory(__opts__, 'dpkg', stamp)
+    if ret is None:
+        ret = _query_pkgs()
+        salt.utils.pkg.write_inventory(__opts__, 'dpkg', stamp, ret)
 
     __context__['pkg.list_pkgs'] = copy.deepcopy(ret)
 
@@ -1536,6 +1559,11 @@ def list_repo_pkgs(*args, **kwargs):  # pylint: disable=unused-import
                       '1.9.15-0ubuntu1']
         }
 
+    .. versionchanged:: Neon
+        When no packages are passed, the result is kept in the minion cachedir
+        until the apt lists or the package database change, see
+        :conf_minion:`pkg_inventory_cache`.
+
     CLI Examples:
 
     .. code-block:: bash
@@ -1546,9 +1574,15 @@ def list_repo_pkgs(*args, **kwargs):  # pylint: disable=unused-import
     if args:
         # Get only information about packages in args
         cmd = ['apt-cache', 'show'] + [arg for arg in args]
+        stamp = None
     else:
         # Get information about all available packages
         cmd = ['apt-cache', 'dump']
+        stamp = salt.utils.pkg.inventory_stamp(
+            [APT_LISTS_PATH, APT_PKGCACHE, DPKG_STATUS])
+        ret = salt.utils.pkg.read_inventory(__opts__, 'apt_repo', stamp)
+        if ret is not None:
+            return ret
 
     out = _call_apt(cmd, scope=False, ignore_retcode=True)
 
@@ -1571,6 +1605,7 @@ def list_repo_pkgs(*args, **kwargs):  # pylint: disable=unused-import
         if comps[0] == 'Version:':
             ret.setdefault(pkg_name, []).append(comps[1])
 
+    salt.utils.pkg.write_inventory(__opts__, 'apt_repo', stamp, ret)
     return ret
 
 
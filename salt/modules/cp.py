@@ -691,6 +691,22 @@ def list_master(saltenv='base', prefix=''):
     return _client().file_list(saltenv, prefix)
 
 
+def list_master_manifest(saltenv='base', prefix=''):
+    '''
+    .. versionadded:: Neon
+
+    Return the hash, size and mode of the files stored on the master under
+    ``prefix``, or None if the master cannot provide them in one request
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        salt '*' cp.list_master_manifest prefix=files/etc
+    '''
+    return _client().file_manifest(saltenv, prefix)
+
+
 def list_master_dirs(saltenv='base', prefix=''):
     '''
     List all of the directories stored on the master
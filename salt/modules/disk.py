@@ -81,6 +81,7 @@ def _clean_flags(args, caller):
     return flags
 
 
+@salt.utils.decorators.exec_cache(ttl=30)
 def usage(args=None):
     '''
     Return usage information for volumes mounted on this minion
@@ -160,6 +161,7 @@ def usage(args=None):
     return ret
 
 
+@salt.utils.decorators.exec_cache(ttl=30)
 def inodeusage(args=None):
     '''
     Return inode usage information for volumes mounted on this minion
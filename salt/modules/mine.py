@@ -332,7 +332,17 @@ def get(tgt,
             'fun': fun,
             'tgt_type': tgt_type,
     }
+    # Masters keeping mine views reply "unchanged" when the etag of the
+    # result we already have still matches, reuse it for the rest of the job
+    cache_key = repr((tgt, fun, tgt_type))
+    cached = __context__.setdefault('mine.get', {}).get(cache_key)
+    load['if_none_match'] = cached['etag'] if cached else None
     ret = _mine_get(load, __opts__)
+    if isinstance(ret, dict) and '__mine_etag__' in ret:
+        if '__mine_data__' in ret:
+            cached = {'etag': ret['__mine_etag__'], 'data': ret['__mine_data__']}
+            __context__['mine.get'][cache_key] = cached
+        ret = copy.deepcopy(cached['data']) if cached else {}
     if exclude_minion:
         if __opts__['id'] in ret:
             del ret[__opts__['id']]
@@ -13,6 +13,7 @@ import os
 import socket
 
 # Import salt libs
+import salt.utils.decorators
 import salt.utils.decorators.path
 import salt.utils.functools
 import salt.utils.files
@@ -1009,6 +1010,7 @@ def arp():
     return ret
 
 
+@salt.utils.decorators.exec_cache(ttl=60)
 def interfaces():
     '''
     Return a dictionary of information about all the interfaces on the minion
@@ -47,6 +47,7 @@ import salt.payload
 import salt.runner
 import salt.state
 import salt.utils.args
+import salt.utils.cache
 import salt.utils.event
 import salt.utils.extmods
 import salt.utils.files
@@ -1204,6 +1205,24 @@ def clear_cache(days=-1):
     return True
 
 
+def clear_exec_cache(pattern='*'):
+    '''
+    Drop the cached results of the execution module functions matching
+    ``pattern``, see the :conf_minion:`exec_cache` option.
+
+    .. versionadded:: Neon
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        salt '*' saltutil.clear_exec_cache
+        salt '*' saltutil.clear_exec_cache 'pkg.*'
+    '''
+    salt.utils.cache.ExecCache(__opts__).invalidate(pattern)
+    return True
+
+
 def clear_job_cache(hours=24):
     '''
     Forcibly removes job cache folders and files on a minion.
@@ -67,6 +67,15 @@ log = logging.getLogger(__name__)
 
 __HOLD_PATTERN = r'[\w+]+(?:[.-][^-]+)*'
 
+# Files of the rpm database whose stat validates the persistent inventory,
+# for the Berkeley DB, ndb and sqlite backends
+RPMDB_PATHS = (
+    '/var/lib/rpm/Packages',
+    '/var/lib/rpm/Packages.db',
+    '/var/lib/rpm/rpmdb.sqlite',
+    '/usr/lib/sysimage/rpm/rpmdb.sqlite',
+)
+
 # Define the module's virtual name
 __virtualname__ = 'pkg'
 
@@ -644,6 +653,10 @@ def list_pkgs(versions_as_list=False, **kwargs):
 
             .. versionadded:: 2018.3.0
 
+    .. versionchanged:: Neon
+        The result is kept in the minion cachedir until the package database
+        changes, see :conf_minion:`pkg_inventory_cache`.
+
     CLI Example:
 
     .. code-block:: bash
@@ -665,38 +678,44 @@ def list_pkgs(versions_as_list=False, **kwargs):
     contextkey = 'pkg.list_pkgs'
 
     if contextkey not in __context__:
-        ret = {}
-        cmd = ['rpm', '-qa', '--queryformat',
-               salt.utils.pkg.rpm.QUERYFORMAT.replace('%{REPOID}', '(none)') + '\n']
-        output = __salt__['cmd.run'](cmd,
-                                     python_shell=False,
-                                     output_loglevel='trace')
-        for line in output.splitlines():
-            pkginfo = salt.utils.pkg.rpm.parse_pkginfo(
-                line,
-                osarch=__grains__['osarch']
-            )
-            if pkginfo is not None:
-                # see rpm version string rules available at https://goo.gl/UGKPNd
-                pkgver = pkginfo.version
-                epoch = ''
-                release = ''
-                if ':' in pkgver:
-                    epoch, pkgver = pkgver.split(":", 1)
-                if '-' in pkgver:
-                    pkgver, release = pkgver.split("-", 1)
-                all_attr = {
-                    'epoch': epoch,
-                    'version': pkgver,
-                    'release': release,
-                    'arch': pkginfo.arch,
-                    'install_date': pkginfo.install_date,
-                    'install_date_time_t': pkginfo.install_date_time_t
-                }
-                __salt__['pkg_resource.add_pkg'](ret, pkginfo.name, all_attr)
-
-        for pkgname in ret:
-            ret[pkgname] = sorted(ret[pkgname], key=lambda d: d['version'])
+        # Taken before querying rpm, see salt.utils.pkg.write_inventory
+        stamp = salt.utils.pkg.inventory_stamp(RPMDB_PATHS)
+        ret = salt.utils.pkg.read_inventory(__opts__, 'rpm', stamp)
+        if ret is None:
+            ret = {}
+            cmd = ['rpm', '-qa', '--queryformat',
+                   salt.utils.pkg.rpm.QUERYFORMAT.replace('%{REPOID}', '(none)') + '\n']
+            output = __salt__['cmd.run'](cmd,
+                                         python_shell=False,
+                                         output_loglevel='trace')
+            for line in output.splitlines():
+                pkginfo = salt.utils.pkg.rpm.parse_pkginfo(
+                    line,
+                    osarch=__grains__['osarch']
+                )
+                if pkginfo is not None:
+                    # see rpm version string rules available at https://goo.gl/UGKPNd
+                    pkgver = pkginfo.version
+                    epoch = ''
+                    release = ''
+                    if ':' in pkgver:
+                        epoch, pkgver = pkgver.split(":", 1)
+                    if '-' in pkgver:
+                        pkgver, release = pkgver.split("-", 1)
+                    all_attr = {
+                        'epoch': epoch,
+                        'version': pkgver,
+                        'release': release,
+                        'arch': pkginfo.arch,
+                        'install_date': pkginfo.install_date,
+                        'install_date_time_t': pkginfo.install_date_time_t
+                    }
+                    __salt__['pkg_resource.add_pkg'](ret, pkginfo.name, all_attr)
+
+            for pkgname in ret:
+                ret[pkgname] = sorted(ret[pkgname], key=lambda d: d['version'])
+
+            salt.utils.pkg.write_inventory(__opts__, 'rpm', stamp, ret)
 
         __context__[contextkey] = ret
 
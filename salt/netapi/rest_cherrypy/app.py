@@ -1437,7 +1437,7 @@ class Jobs(LowDataAdapter):
         'tools.salt_auth.on': True,
     })
 
-    def GET(self, jid=None, timeout=''):
+    def GET(self, jid=None, timeout='', limit=None, cursor=None):
         '''
         A convenience URL for getting lists of previously run jobs or getting
         the return from a single job
@@ -1446,6 +1446,12 @@ class Jobs(LowDataAdapter):
 
             List jobs or show a single job from the job cache.
 
+            :query limit: return a page of at most this many jobs together
+                with the ``cursor`` of the next page, see
+                :py:func:`jobs.list_jobs_page <salt.runners.jobs.list_jobs_page>`
+                (new in Neon)
+            :query cursor: the cursor returned with the previous page
+
             :reqheader X-Auth-Token: |req_token|
             :reqheader Accept: |req_accept|
 
@@ -1524,6 +1530,10 @@ class Jobs(LowDataAdapter):
         lowstate = {'client': 'runner'}
         if jid:
             lowstate.update({'fun': 'jobs.list_job', 'jid': jid})
+        elif limit:
+            lowstate.update({'fun': 'jobs.list_jobs_page',
+                             'limit': limit,
+                             'cursor': cursor})
         else:
             lowstate.update({'fun': 'jobs.list_jobs'})
 
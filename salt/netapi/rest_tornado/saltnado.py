@@ -1300,6 +1300,12 @@ class JobsSaltAPIHandler(SaltAPIHandler):  # pylint: disable=W0223
 
             List jobs or show a single job from the job cache.
 
+            :query limit: return a page of at most this many jobs together
+                with the ``cursor`` of the next page, see
+                :py:func:`jobs.list_jobs_page <salt.runners.jobs.list_jobs_page>`
+                (new in Neon)
+            :query cursor: the cursor returned with the previous page
+
             :status 200: |200|
             :status 401: |401|
             :status 406: |406|
@@ -1383,6 +1389,13 @@ class JobsSaltAPIHandler(SaltAPIHandler):  # pylint: disable=W0223
                 'jid': jid,
                 'client': 'runner',
             }]
+        elif self.get_argument('limit', None):
+            self.lowstate = [{
+                'fun': 'jobs.list_jobs_page',
+                'limit': self.get_argument('limit'),
+                'cursor': self.get_argument('cursor', None),
+                'client': 'runner',
+            }]
         else:
             self.lowstate = [{
                 'fun': 'jobs.list_jobs',
@@ -132,13 +132,100 @@ def display_output(data, out=None, opts=None, **kwargs):
             raise exc
 
 
+def display_output_stream(items, out=None, opts=None, **kwargs):
+    '''
+    Print the passed data incrementally using the desired output.
+
+    ``items`` is an iterable of single minion returns (``{minion: ret}``).
+    Each return is handed to the outputter's ``stream`` function as soon as
+    it is available and the resulting chunks are written out immediately, so
+    neither the returns nor the formatted output are held in memory.
+    Outputters without a ``stream`` function format every return on its own
+    with their regular ``output`` function.
+    '''
+    if opts is None:
+        opts = {}
+    printer = get_stream_printer(out, opts, **kwargs)
+
+    output_filename = opts.get('output_file', None)
+    ofh = None
+    fh_opened = False
+    if output_filename:
+        if not hasattr(output_filename, 'write'):
+            ofh = salt.utils.files.fopen(output_filename, 'a')  # pylint: disable=resource-leakage
+            fh_opened = True
+        else:
+            # Filehandle/file-like object
+            ofh = output_filename
+    try:
+        for chunk in printer(items, **kwargs):
+            if chunk is None:
+                continue
+            chunk = six.text_type(chunk).rstrip()
+            if not chunk:
+                continue
+            if ofh is not None:
+                ofh.write(salt.utils.stringutils.to_str(chunk))
+                ofh.write('\n')
+                ofh.flush()
+            else:
+                salt.utils.stringutils.print_cli(chunk)
+                sys.stdout.flush()
+    except IOError as exc:
+        # Only raise if it's NOT a broken pipe
+        if exc.errno != errno.EPIPE:
+            raise exc
+    finally:
+        if fh_opened:
+            ofh.close()
+
+
+def get_stream_printer(out, opts=None, **kwargs):
+    '''
+    Return a streaming printer function. It takes an iterable of single
+    minion returns and yields the chunks of text to print.
+    '''
+    if opts is None:
+        opts = {}
+    outputters, out = _get_outputters(out, opts, **kwargs)
+    if out not in outputters:
+        if out != 'grains':
+            log.error('Invalid outputter %s specified, falling back to nested', out)
+        out = 'nested'
+    stream = '{0}.stream'.format(out)
+    # The wrapper only exposes the output functions, look the stream
+    # function up on the loader itself
+    if stream in outputters._dict:
+        return outputters._dict[stream]
+    printout = outputters[out]
+
+    def _stream(items, **kwargs):
+        for item in items:
+            yield printout(item, **kwargs)
+    return _stream
+
+
 def get_printout(out, opts=None, **kwargs):
     '''
     Return a printer function
     '''
     if opts is None:
         opts = {}
+    outputters, out = _get_outputters(out, opts, **kwargs)
+    if out not in outputters:
+        # Since the grains outputter was removed we don't need to fire this
+        # error when old minions are asking for it
+        if out != 'grains':
+            log.error('Invalid outputter %s specified, falling back to nested', out)
+        return outputters['nested']
+    return outputters[out]
 
+
+def _get_outputters(out, opts, **kwargs):
+    '''
+    Work out which outputter to use and return it along with the outputter
+    loader
+    '''
     if 'output' in opts and opts['output'] != 'highstate':
         # new --out option, but don't choke when using --out=highstate at CLI
         # See Issue #29796 for more information.
@@ -188,14 +275,7 @@ def get_printout(out, opts=None, **kwargs):
         else:
             pass
 
-    outputters = salt.loader.outputters(opts)
-    if out not in outputters:
-        # Since the grains outputter was removed we don't need to fire this
-        # error when old minions are asking for it
-        if out != 'grains':
-            log.error('Invalid outputter %s specified, falling back to nested', out)
-        return outputters['nested']
-    return outputters[out]
+    return salt.loader.outputters(opts), out
 
 
 def out_format(data, out, opts=None, **kwargs):
@@ -169,8 +169,9 @@ def output(data, **kwargs):  # pylint: disable=unused-argument
         data = data.pop('data')
 
     indent_level = kwargs.get('indent_level', 1)
+    summary = kwargs.get('_summary')
     ret = [
-        _format_host(host, hostdata, indent_level=indent_level)[0]
+        _format_host(host, hostdata, indent_level=indent_level, summary=summary)[0]
         for host, hostdata in six.iteritems(data)
     ]
     if ret:
@@ -183,10 +184,92 @@ def output(data, **kwargs):  # pylint: disable=unused-argument
     return ''
 
 
-def _format_host(host, data, indent_level=1):
+def stream(data, **kwargs):
+    '''
+    Streaming version of the highstate outputter. Every minion return is
+    formatted as soon as it comes in and only the result counts are kept, the
+    totals over all minions are printed once the last return has been seen.
+    '''
+    summary = {}
+    for item in data:
+        yield output(item, _summary=summary, **kwargs)
+    if summary.get('hosts', 0) > 1:
+        yield _format_totals(summary)
+
+
+def _format_totals(summary):
+    '''
+    Format the result counts gathered over several minions by _format_host
+    '''
+    colors = salt.utils.color.get_colors(
+            __opts__.get('color'),
+            __opts__.get('color_theme'))
+    colorfmt = '{0}{1}{2[ENDC]}'
+    num_failed = summary.get(False, 0)
+    rows = [
+        ('Failed', num_failed, colors['RED'] if num_failed else colors['CYAN']),
+    ]
+    if summary.get('warnings'):
+        rows.append(('Warnings', summary['warnings'], colors['LIGHT_RED']))
+    if summary.get('failed_hosts'):
+        rows.append(('Minions failed to compile', summary['failed_hosts'], colors['LIGHT_RED']))
+    succeeded = summary.get(True, 0) + summary.get(None, 0)
+    total = succeeded + num_failed
+    count_max_len = len(six.text_type(max([total] + [row[1] for row in rows])))
+    label_max_len = max(len(row[0]) for row in rows + [('Total states run',)])
+    line_max_len = label_max_len + count_max_len + 2  # +2 for ': '
+
+    def _counts(label, count):
+        return '{0}: {1:>{2}}'.format(label, count, line_max_len - (len(label) + 2))
+
+    changestats = []
+    if summary.get(None, 0) > 0:
+        changestats.append(
+            colorfmt.format(colors['LIGHT_YELLOW'],
+                            'unchanged={0}'.format(summary[None]),
+                            colors))
+    if summary.get('changed', 0) > 0:
+        changestats.append(
+            colorfmt.format(colors['GREEN'],
+                            'changed={0}'.format(summary['changed']),
+                            colors))
+    changestats = ' ({0})'.format(', '.join(changestats)) if changestats else ''
+
+    lines = [
+        colorfmt.format(
+            colors['CYAN'],
+            '\nSummary for {0} minions\n{1}'.format(summary['hosts'], '-' * line_max_len),
+            colors),
+        colorfmt.format(colors['GREEN'], _counts('Succeeded', succeeded), colors) + changestats,
+    ]
+    for label, count, color in rows:
+        lines.append(colorfmt.format(color, _counts(label, count), colors))
+    lines.append(colorfmt.format(
+        colors['CYAN'],
+        '{0}\n{1}'.format('-' * line_max_len, _counts('Total states run', total)),
+        colors))
+    if __opts__.get('state_output_profile', True):
+        sum_duration = summary.get('duration', 0)
+        duration_unit = 'ms'
+        if sum_duration > 999:
+            sum_duration /= 1000
+            duration_unit = 's'
+        lines.append(colorfmt.format(
+            colors['CYAN'],
+            '{0} {1}'.format(
+                _counts('Total run time', '{0:.3f}'.format(sum_duration)),
+                duration_unit),
+            colors))
+    return '\n'.join(lines)
+
+
+def _format_host(host, data, indent_level=1, summary=None):
     '''
     Main highstate formatter. can be called recursively if a nested highstate
     contains other highstates (ie in an orchestration)
+
+    When a ``summary`` dict is passed, the result counts of this host are
+    added to it.
     '''
     host = salt.utils.data.decode(host)
 
@@ -505,6 +588,15 @@ def _format_host(host, data, indent_level=1):
                 duration_unit)
             hstrs.append(colorfmt.format(colors['CYAN'], total_duration, colors))
 
+    if summary is not None:
+        summary['hosts'] = summary.get('hosts', 0) + 1
+        if isinstance(data, list):
+            summary['failed_hosts'] = summary.get('failed_hosts', 0) + 1
+        for key, count in six.iteritems(rcounts):
+            summary[key] = summary.get(key, 0) + count
+        summary['changed'] = summary.get('changed', 0) + nchanges
+        summary['duration'] = summary.get('duration', 0) + sum(rdurations)
+
     if strip_colors:
         host = salt.output.strip_esc_sequence(host)
     hstrs.insert(0, ('{0}{1}:{2[ENDC]}'.format(hcolor, host, colors)))
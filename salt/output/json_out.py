@@ -28,6 +28,12 @@ single-line output format and to parse each line individually. Example output
     {"mike": {"en0": {"hwaddr": "02:48:a2:4b:70:a0", ...}}}
     {"phill": {"en0": {"hwaddr": "02:1d:cc:a2:33:55", ...}}}
     {"stuart": {"en0": {"hwaddr": "02:9a:e0:ea:9e:3c", ...}}}
+
+When the output is streamed (``--stream-output``), every minion return is
+written as a single line of JSON, regardless of ``output_indent``, so the
+result can be consumed as `JSON Lines`_ while the job is still running.
+
+.. _`JSON Lines`: http://jsonlines.org/
 '''
 from __future__ import absolute_import, print_function, unicode_literals
 
@@ -90,3 +96,21 @@ def output(data, **kwargs):  # pylint: disable=unused-argument
         log.debug('An error occurred while outputting JSON', exc_info=True)
     # Return valid JSON for unserializable objects
     return salt.utils.json.dumps({})
+
+
+def stream(data, **kwargs):  # pylint: disable=unused-argument
+    '''
+    Print each minion return as one line of JSON as soon as it comes in
+    '''
+    for item in data:
+        try:
+            yield salt.utils.json.dumps(item, default=repr)
+        except UnicodeDecodeError as exc:
+            log.error('Unable to serialize output to json')
+            yield salt.utils.json.dumps(
+                {'error': 'Unable to serialize output to json',
+                 'message': six.text_type(exc)}
+            )
+        except TypeError:
+            log.debug('An error occurred while outputting JSON', exc_info=True)
+            yield salt.utils.json.dumps({})
@@ -16,6 +16,9 @@ Example output::
         list:
           - Hello
           - World
+
+When the output is streamed (``--stream-output``), every minion return is
+written as its own YAML document, starting with ``---``.
 '''
 from __future__ import absolute_import, print_function, unicode_literals
 
@@ -35,11 +38,10 @@ def __virtual__():
     return __virtualname__
 
 
-def output(data, **kwargs):  # pylint: disable=unused-argument
+def _params():
     '''
-    Print out YAML using the block mode
+    Return the dumper arguments for the configured ``output_indent``
     '''
-
     params = {}
     if 'output_indent' not in __opts__:
         # default indentation
@@ -51,11 +53,35 @@ def output(data, **kwargs):  # pylint: disable=unused-argument
     else:  # no indentation
         params.update(default_flow_style=True,
                       indent=0)
+    return params
+
+
+def output(data, **kwargs):  # pylint: disable=unused-argument
+    '''
+    Print out YAML using the block mode
+    '''
     try:
-        return salt.utils.yaml.safe_dump(data, **params)
+        return salt.utils.yaml.safe_dump(data, **_params())
     except Exception as exc:
         import pprint
         log.exception(
             'Exception %s encountered when trying to serialize %s',
             exc, pprint.pformat(data)
         )
+
+
+def stream(data, **kwargs):  # pylint: disable=unused-argument
+    '''
+    Print out each minion return as a separate YAML document as soon as it
+    comes in
+    '''
+    params = _params()
+    for item in data:
+        try:
+            yield salt.utils.yaml.safe_dump(item, explicit_start=True, **params)
+        except Exception as exc:
+            import pprint
+            log.exception(
+                'Exception %s encountered when trying to serialize %s',
+                exc, pprint.pformat(item)
+            )
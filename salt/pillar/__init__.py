@@ -7,15 +7,23 @@ Render the pillar data
 from __future__ import absolute_import, print_function, unicode_literals
 import copy
 import fnmatch
+import hashlib
 import os
+import re
 import collections
 import logging
+import multiprocessing
+import random
+import threading
+import time
 import tornado.gen
 import sys
 import traceback
 import inspect
+from multiprocessing.pool import ThreadPool
 
 # Import salt libs
+import salt.cache
 import salt.loader
 import salt.fileclient
 import salt.minion
@@ -26,9 +34,13 @@ import salt.utils.cache
 import salt.utils.crypt
 import salt.utils.data
 import salt.utils.dictupdate
+import salt.utils.files
+import salt.utils.json
+import salt.utils.stringutils
 import salt.utils.url
-from salt.exceptions import SaltClientError
+from salt.exceptions import SaltClientError, TimeoutError
 from salt.template import compile_template
+from salt.utils.context import CopyOnWriteDict
 from salt.utils.odict import OrderedDict
 from salt.version import __version__
 # Even though dictupdate is imported, invoking salt.utils.dictupdate.merge here
@@ -41,6 +53,11 @@ from salt.ext import six
 
 log = logging.getLogger(__name__)
 
+# Template statements pulling in other files, whose changes the pillar SLS
+# cache cannot see
+TEMPLATE_DEPENDENCY_RE = re.compile(
+    br'{%-?\s*(?:include|import|from|extends|import_yaml|import_json|import_text)\b')
+
 
 def get_pillar(opts, grains, minion_id, saltenv=None, ext=None, funcs=None,
                pillar_override=None, pillarenv=None, extra_minion_data=None):
@@ -88,6 +105,29 @@ class RemotePillarMixin(object):
     '''
     Common remote pillar functionality
     '''
+    def _busy_delay(self, ret_pillar, tries):
+        '''
+        If the master replied that its pillar compile queue is full, return the
+        number of seconds to wait before retrying. Returns None if the reply is
+        not a busy reply, and raises SaltClientError once the retries
+        configured by ``pillar_busy_retries`` have been used up.
+        '''
+        if not isinstance(ret_pillar, dict) \
+                or list(ret_pillar) != ['__pillar_busy__']:
+            return None
+        if tries >= self.opts.get('pillar_busy_retries', 10):
+            msg = 'Master is too busy to compile pillar, giving up after ' \
+                  '{0} retries'.format(tries)
+            log.error(msg)
+            raise SaltClientError(msg)
+        # Add jitter so that the minions turned away at the same time don't
+        # all come back at once
+        delay = max(ret_pillar['__pillar_busy__'], 1)
+        delay += random.uniform(0, delay)
+        log.info('Master is too busy to compile pillar, retrying in %.1f '
+                 'seconds', delay)
+        return delay
+
     def get_ext_pillar_extra_minion_data(self, opts):
         '''
         Returns the extra data from the minion's opts dict (the config file).
@@ -170,17 +210,25 @@ class AsyncRemotePillar(RemotePillarMixin):
                 'pillar_override': self.pillar_override,
                 'extra_minion_data': self.extra_minion_data,
                 'ver': '2',
+                'pillar_busy_retry': True,
                 'cmd': '_pillar'}
         if self.ext:
             load['ext'] = self.ext
-        try:
-            ret_pillar = yield self.channel.crypted_transfer_decode_dictentry(
-                load,
-                dictkey='pillar',
-            )
-        except Exception:
-            log.exception('Exception getting pillar:')
-            raise SaltClientError('Exception getting pillar.')
+        tries = 0
+        while True:
+            try:
+                ret_pillar = yield self.channel.crypted_transfer_decode_dictentry(
+                    load,
+                    dictkey='pillar',
+                )
+            except Exception:
+                log.exception('Exception getting pillar:')
+                raise SaltClientError('Exception getting pillar.')
+            delay = self._busy_delay(ret_pillar, tries)
+            if delay is None:
+                break
+            tries += 1
+            yield tornado.gen.sleep(delay)
 
         if not isinstance(ret_pillar, dict):
             msg = ('Got a bad pillar from master, type {0}, expecting dict: '
@@ -240,12 +288,20 @@ class RemotePillar(RemotePillarMixin):
                 'pillar_override': self.pillar_override,
                 'extra_minion_data': self.extra_minion_data,
                 'ver': '2',
+                'pillar_busy_retry': True,
                 'cmd': '_pillar'}
         if self.ext:
             load['ext'] = self.ext
-        ret_pillar = self.channel.crypted_transfer_decode_dictentry(load,
-                                                                    dictkey='pillar',
-                                                                    )
+        tries = 0
+        while True:
+            ret_pillar = self.channel.crypted_transfer_decode_dictentry(load,
+                                                                        dictkey='pillar',
+                                                                        )
+            delay = self._busy_delay(ret_pillar, tries)
+            if delay is None:
+                break
+            tries += 1
+            time.sleep(delay)
 
         if not isinstance(ret_pillar, dict):
             log.error(
@@ -373,6 +429,128 @@ class PillarCache(object):
         return pillar_data
 
 
+class PillarSourceCache(object):
+    '''
+    Cache the results of individual pillar sources (rendered pillar SLS files
+    and external pillars), so that a recompile only needs to re-render the
+    sources which have changed.
+
+    Results are stored in the master's data cache (see the :conf_master:`cache`
+    option), so they are shared between worker processes. Each result is
+    stored under a key which hashes everything the result depends on, so stale
+    entries are never returned, they simply stop being used and expire.
+
+    Hit/miss counts and the time spent in each source are kept in ``stats``
+    for the current compile, and can be persisted per-minion using
+    ``store_stats()`` to be reported by the ``pillar.source_cache_stats``
+    runner.
+
+    Expired entries are removed when they are read, and each kind of result
+    is capped at ``pillar_source_cache_max_entries`` entries, the oldest
+    ones being removed first.
+    '''
+    bank = 'pillar_source_cache'
+
+    def __init__(self, opts):
+        self.opts = opts
+        self.cache = salt.cache.factory(opts)
+        self.stats = {}
+        # External pillars may be run concurrently (see ext_pillar_workers)
+        self._lock = threading.Lock()
+
+    def hash_data(self, data):
+        '''
+        Return a stable hash of the passed data structure
+        '''
+        try:
+            serialized = salt.utils.json.dumps(data, sort_keys=True, default=repr)
+        except TypeError:
+            # Keys of mixed types cannot be sorted
+            serialized = salt.utils.json.dumps(data, default=repr)
+        return hashlib.sha256(
+            salt.utils.stringutils.to_bytes(serialized)).hexdigest()
+
+    def record(self, source, hit, duration):
+        '''
+        Update the hit/miss counters and the time spent for a source
+        '''
+        with self._lock:
+            stats = self.stats.setdefault(
+                source, {'hits': 0, 'misses': 0, 'time': 0.0})
+            stats['hits' if hit else 'misses'] += 1
+            stats['time'] = round(stats['time'] + duration, 6)
+
+    def fetch(self, kind, key, ttl):
+        '''
+        Return a tuple of a boolean indicating whether or not a cached result
+        was found, and the cached result. Results older than ``ttl`` seconds
+        are ignored, a ``ttl`` of 0 disables expiration.
+        '''
+        bank = '/'.join((self.bank, kind))
+        try:
+            cached = self.cache.fetch(bank, key)
+        except Exception as exc:
+            log.error('Failed to read pillar source cache %s/%s: %s',
+                      bank, key, exc)
+            return False, None
+        if not cached or 'data' not in cached:
+            return False, None
+        if ttl and time.time() - cached.get('time', 0) > ttl:
+            self._flush(bank, key)
+            return False, None
+        return True, cached['data']
+
+    def _flush(self, bank, key):
+        try:
+            self.cache.flush(bank, key)
+        except Exception as exc:
+            log.error('Failed to remove pillar source cache %s/%s: %s',
+                      bank, key, exc)
+
+    def prune(self, kind, ttl=0):
+        '''
+        Remove the oldest results of a kind once there are more than
+        ``pillar_source_cache_max_entries`` of them, along with the results
+        older than ``ttl`` seconds
+        '''
+        max_entries = self.opts.get('pillar_source_cache_max_entries', 1000)
+        if not max_entries:
+            return
+        bank = '/'.join((self.bank, kind))
+        try:
+            keys = self.cache.list(bank)
+        except Exception as exc:
+            log.error('Failed to list pillar source cache %s: %s', bank, exc)
+            return
+        if len(keys) <= max_entries:
+            return
+        updated = sorted(
+            (self.cache.updated(bank, key) or 0, key) for key in keys)
+        now = time.time()
+        excess = len(updated) - max_entries
+        for idx, (mtime, key) in enumerate(updated):
+            if idx >= excess and not (ttl and now - mtime > ttl):
+                break
+            self._flush(bank, key)
+
+    def store(self, kind, key, data):
+        '''
+        Store a result in the cache
+        '''
+        bank = '/'.join((self.bank, kind))
+        try:
+            self.cache.store(bank, key, {'time': time.time(), 'data': data})
+        except Exception as exc:
+            log.error('Failed to write pillar source cache %s/%s: %s',
+                      bank, key, exc)
+
+    def store_stats(self, minion_id):
+        '''
+        Persist the stats for the most recent compile for a minion
+        '''
+        self.store('stats', minion_id, self.stats)
+
+
 class Pillar(object):
     '''
     Read over the pillar top files and render the pillar data
@@ -405,7 +583,7 @@ class Pillar(object):
 
         self.matchers = salt.loader.matchers(self.opts)
         self.rend = salt.loader.render(self.opts, self.functions)
-        ext_pillar_opts = copy.deepcopy(self.opts)
+        ext_pillar_opts = CopyOnWriteDict(self.opts)
         # Keep the incoming opts ID intact, ie, the master id
         if 'id' in opts:
             ext_pillar_opts['id'] = opts['id']
@@ -423,6 +601,11 @@ class Pillar(object):
         if not isinstance(self.extra_minion_data, dict):
             self.extra_minion_data = {}
             log.error('Extra minion data must be a dictionary')
+        self.source_cache = None
+        self._sls_cache_context = None
+        if self.opts.get('pillar_sls_cache') \
+                or self.opts.get('ext_pillar_cache_ttl'):
+            self.source_cache = PillarSourceCache(self.opts)
         self._closing = False
 
     def __valid_on_demand_ext_pillar(self, opts):
@@ -472,7 +655,7 @@ class Pillar(object):
         '''
         The options need to be altered to conform to the file client
         '''
-        opts = copy.deepcopy(opts_in)
+        opts = CopyOnWriteDict(opts_in)
         opts['file_client'] = 'local'
         if not grains:
             opts['grains'] = {}
@@ -746,15 +929,7 @@ class Pillar(object):
                 return None, mods, errors
         state = None
         try:
-            state = compile_template(fn_,
-                                     self.rend,
-                                     self.opts['renderer'],
-                                     self.opts['renderer_blacklist'],
-                                     self.opts['renderer_whitelist'],
-                                     saltenv,
-                                     sls,
-                                     _pillar_rend=True,
-                                     **defaults)
+            state = self._render_sls(fn_, saltenv, sls, defaults)
         except Exception as exc:
             msg = 'Rendering SLS \'{0}\' failed, render error:\n{1}'.format(
                 sls, exc
@@ -857,12 +1032,89 @@ class Pillar(object):
                                         self.opts.get('pillar_merge_lists', False))
         return state, mods, errors
 
+    def _sls_cache_key(self, fn_, saltenv, sls, defaults):
+        '''
+        Return the key under which the rendered result of a pillar SLS file is
+        cached. This hashes the file contents along with the grains and opts
+        that the render could depend upon. Returns ``None`` for templates
+        which pull in other files, those are not cached.
+        '''
+        with salt.utils.files.fopen(fn_, 'rb') as fp_:
+            contents = fp_.read()
+        if TEMPLATE_DEPENDENCY_RE.search(contents):
+            return None
+        if self._sls_cache_context is None:
+            grains = self.opts.get('grains') or {}
+            cache_grains = self.opts.get('pillar_sls_cache_grains')
+            if cache_grains:
+                # The SLS files are known to depend only on these grains, so
+                # the rendered results can be shared between minions.
+                context = {'grains': dict((x, grains.get(x))
+                                          for x in cache_grains)}
+            else:
+                context = {'id': self.minion_id, 'grains': grains}
+            context.update({
+                'pillar': self.opts.get('pillar', {}),
+                'pillar_override': self.pillar_override,
+                'saltenv': self.opts.get('saltenv'),
+                'pillarenv': self.opts.get('pillarenv'),
+                'renderer': self.opts['renderer'],
+            })
+            self._sls_cache_context = self.source_cache.hash_data(context)
+        file_hash = hashlib.new(self.opts.get('hash_type', 'md5'),
+                                contents).hexdigest()
+        return self.source_cache.hash_data(
+            [sls, saltenv, file_hash, self._sls_cache_context, defaults])
+
+    def _render_sls(self, fn_, saltenv, sls, defaults):
+        '''
+        Render a single pillar SLS file, using the pillar source cache if
+        enabled by the ``pillar_sls_cache`` option
+        '''
+        if self.source_cache is None or not self.opts.get('pillar_sls_cache'):
+            return compile_template(fn_,
+                                    self.rend,
+                                    self.opts['renderer'],
+                                    self.opts['renderer_blacklist'],
+                                    self.opts['renderer_whitelist'],
+                                    saltenv,
+                                    sls,
+                                    _pillar_rend=True,
+                                    **defaults)
+        start = time.time()
+        source = 'sls:{0}:{1}'.format(saltenv, sls)
+        key = self._sls_cache_key(fn_, saltenv, sls, defaults)
+        ttl = self.opts.get('pillar_sls_cache_ttl', 0)
+        hit, state = False, None
+        if key is not None:
+            hit, state = self.source_cache.fetch('sls', key, ttl)
+        if not hit:
+            state = compile_template(fn_,
+                                     self.rend,
+                                     self.opts['renderer'],
+                                     self.opts['renderer_blacklist'],
+                                     self.opts['renderer_whitelist'],
+                                     saltenv,
+                                     sls,
+                                     _pillar_rend=True,
+                                     **defaults)
+            if key is not None:
+                self.source_cache.store('sls', key, state)
+                self.source_cache.prune('sls', ttl)
+        self.source_cache.record(source, hit, time.time() - start)
+        return state
+
     def render_pillar(self, matches, errors=None):
         '''
         Extract the sls pillar files from the matches and render them into the
         pillar
         '''
-        pillar = copy.copy(self.pillar_override)
+        # The data the SLS files are rendered against may have changed since
+        # the last render (e.g. when using ext_pillar_first)
+        self._sls_cache_context = None
+        # The pillar data is accumulated in place, it must not share any
+        # data with the pillar override
+        pillar = copy.deepcopy(self.pillar_override)
         if errors is None:
             errors = []
         for saltenv, pstates in six.iteritems(matches):
@@ -904,10 +1156,35 @@ class Pillar(object):
                         pstate,
                         self.merge_strategy,
                         self.opts.get('renderer', 'yaml'),
-                        self.opts.get('pillar_merge_lists', False))
+                        self.opts.get('pillar_merge_lists', False),
+                        in_place=True)
 
         return pillar, errors
 
+    def _cached_external_pillar_data(self, pillar, val, key):
+        '''
+        Run an external pillar, using the pillar source cache if a TTL for it
+        is configured in the ``ext_pillar_cache_ttl`` option
+        '''
+        if self.source_cache is None:
+            return self._external_pillar_data(pillar, val, key)
+        start = time.time()
+        source = 'ext_pillar:{0}'.format(key)
+        ttl = (self.opts.get('ext_pillar_cache_ttl') or {}).get(key)
+        if not ttl:
+            ext = self._external_pillar_data(pillar, val, key)
+            self.source_cache.record(source, False, time.time() - start)
+            return ext
+        cache_key = self.source_cache.hash_data(
+            [key, self.minion_id, val, pillar, self.extra_minion_data])
+        hit, ext = self.source_cache.fetch('ext_pillar', cache_key, ttl)
+        if not hit:
+            ext = self._external_pillar_data(pillar, val, key)
+            self.source_cache.store('ext_pillar', cache_key, ext)
+            self.source_cache.prune('ext_pillar', ttl)
+        self.source_cache.record(source, hit, time.time() - start)
+        return ext
+
     def _external_pillar_data(self, pillar, val, key):
         '''
         Builds actual pillar data structure and updates the ``pillar`` variable
@@ -944,6 +1221,63 @@ class Pillar(object):
                                             val)
         return ext
 
+    def _start_concurrent_ext_pillars(self, pillar):
+        '''
+        Start the external pillars configured in ``ext_pillar_concurrent`` on
+        a thread pool. These do not depend on the pillar data accumulated from
+        the external pillars which precede them, so they are all passed the
+        pillar data as it was before any external pillars were run.
+
+        Returns a tuple of the thread pool (or None if nothing was started)
+        and a dict mapping the index of each started external pillar in the
+        ``ext_pillar`` config to its async result and deadline.
+        '''
+        workers = self.opts.get('ext_pillar_workers', 0)
+        concurrent = self.opts.get('ext_pillar_concurrent') or {}
+        if not workers or not concurrent:
+            return None, {}
+        exclude = self.opts.get('exclude_ext_pillar', [])
+        runs = []
+        for idx, run in enumerate(self.opts['ext_pillar']):
+            if not isinstance(run, dict) or len(run) != 1:
+                continue
+            key, val = next(six.iteritems(run))
+            if key in concurrent and key in self.ext_pillars \
+                    and key not in exclude:
+                runs.append((idx, key, val))
+        if not runs:
+            return None, {}
+
+        log.debug('Running ext_pillars %s concurrently using %d workers',
+                  ', '.join(x[1] for x in runs), workers)
+        pool = ThreadPool(min(workers, len(runs)))
+        pending = {}
+        for idx, key, val in runs:
+            timeout = (concurrent[key] or {}).get('timeout')
+            deadline = time.time() + timeout if timeout else None
+            # Every source gets its own copy, an external pillar changing the
+            # pillar data it was passed must not affect the others
+            pending[idx] = (
+                pool.apply_async(self._cached_external_pillar_data,
+                                 (copy.deepcopy(pillar), val, key)),
+                deadline,
+            )
+        return pool, pending
+
+    def _wait_concurrent_ext_pillar(self, key, result, deadline):
+        '''
+        Wait for the result of an external pillar started by
+        _start_concurrent_ext_pillars(), re-raising any exception it raised.
+        '''
+        if deadline is None:
+            return result.get()
+        try:
+            return result.get(max(deadline - time.time(), 0))
+        except multiprocessing.TimeoutError:
+            raise TimeoutError(
+                'Timed out after {0} seconds'.format(
+                    self.opts['ext_pillar_concurrent'][key]['timeout']))
+
     def ext_pillar(self, pillar, errors=None):
         '''
         Render the external pillar data
@@ -976,6 +1310,9 @@ class Pillar(object):
             log.critical(errors[-1])
             return pillar, errors
         ext = None
+        # The external pillars are merged in place into a copy of the pillar
+        # data passed in
+        pillar = copy.deepcopy(pillar)
         # Bring in CLI pillar data
         if self.pillar_override:
             pillar = merge(
@@ -983,51 +1320,86 @@ class Pillar(object):
                 self.pillar_override,
                 self.merge_strategy,
                 self.opts.get('renderer', 'yaml'),
-                self.opts.get('pillar_merge_lists', False))
+                self.opts.get('pillar_merge_lists', False),
+                in_place=True)
 
-        for run in self.opts['ext_pillar']:
-            if not isinstance(run, dict):
-                errors.append('The "ext_pillar" option is malformed')
-                log.critical(errors[-1])
-                return {}, errors
-            if next(six.iterkeys(run)) in self.opts.get('exclude_ext_pillar', []):
-                continue
-            for key, val in six.iteritems(run):
-                if key not in self.ext_pillars:
-                    log.critical(
-                        'Specified ext_pillar interface %s is unavailable',
-                        key
-                    )
+        pool, pending = self._start_concurrent_ext_pillars(pillar)
+        concurrent = self.opts.get('ext_pillar_concurrent') or {}
+        try:
+            # Results are merged in the configured order, regardless of the
+            # order in which concurrently-run external pillars finish.
+            for idx, run in enumerate(self.opts['ext_pillar']):
+                if not isinstance(run, dict):
+                    errors.append('The "ext_pillar" option is malformed')
+                    log.critical(errors[-1])
+                    return {}, errors
+                if next(six.iterkeys(run)) in self.opts.get('exclude_ext_pillar', []):
                     continue
-                try:
-                    ext = self._external_pillar_data(pillar,
-                                                     val,
-                                                     key)
-                except Exception as exc:
-                    errors.append(
-                        'Failed to load ext_pillar {0}: {1}'.format(
-                            key,
-                            exc.__str__(),
+                for key, val in six.iteritems(run):
+                    if key not in self.ext_pillars:
+                        log.critical(
+                            'Specified ext_pillar interface %s is unavailable',
+                            key
                         )
+                        continue
+                    try:
+                        if idx in pending:
+                            ext = self._wait_concurrent_ext_pillar(
+                                key, *pending[idx])
+                        else:
+                            ext = self._cached_external_pillar_data(pillar,
+                                                                    val,
+                                                                    key)
+                    except Exception as exc:
+                        if (concurrent.get(key) or {}).get('on_error') == 'ignore':
+                            log.warning(
+                                'Ignoring failure to load ext_pillar \'%s\': %s',
+                                key, exc
+                            )
+                            continue
+                        errors.append(
+                            'Failed to load ext_pillar {0}: {1}'.format(
+                                key,
+                                exc.__str__(),
+                            )
+                        )
+                        log.error(
+                            'Exception caught loading ext_pillar \'%s\':\n%s',
+                            key, ''.join(traceback.format_tb(sys.exc_info()[2]))
+                        )
+                if ext:
+                    pillar = merge(
+                        pillar,
+                        ext,
+                        self.merge_strategy,
+                        self.opts.get('renderer', 'yaml'),
+                        self.opts.get('pillar_merge_lists', False),
+                        in_place=True)
+                    ext = None
+        finally:
+            if pool is not None:
+                pool.close()
+                now = time.time()
+                stuck = [idx for idx, (result, deadline) in six.iteritems(pending)
+                         if not result.ready()
+                         and deadline is not None and deadline <= now]
+                if stuck:
+                    # There is no way to interrupt an external pillar which
+                    # timed out, joining would wait for it after all
+                    log.warning(
+                        'Leaving %d timed out ext_pillar(s) running in the '
+                        'background', len(stuck)
                     )
-                    log.error(
-                        'Exception caught loading ext_pillar \'%s\':\n%s',
-                        key, ''.join(traceback.format_tb(sys.exc_info()[2]))
-                    )
-            if ext:
-                pillar = merge(
-                    pillar,
-                    ext,
-                    self.merge_strategy,
-                    self.opts.get('renderer', 'yaml'),
-                    self.opts.get('pillar_merge_lists', False))
-                ext = None
+                else:
+                    pool.join()
         return pillar, errors
 
     def compile_pillar(self, ext=True):
         '''
         Render the pillar data and return
         '''
+        if self.source_cache is not None:
+            self.source_cache.stats = {}
         top, top_errors = self.get_top()
         if ext:
             if self.opts.get('ext_pillar_first', False):
@@ -1079,6 +1451,9 @@ class Pillar(object):
         if decrypt_errors:
             pillar.setdefault('_errors', []).extend(decrypt_errors)
 
+        if self.source_cache is not None:
+            self.source_cache.store_stats(self.minion_id)
+
         return pillar
 
     def decrypt_pillar(self, pillar):
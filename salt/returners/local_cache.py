@@ -12,7 +12,6 @@ import logging
 import os
 import shutil
 import time
-import bisect
 
 # Import salt libs
 import salt.payload
@@ -53,6 +52,25 @@ def _job_dir():
     return os.path.join(__opts__['cachedir'], 'jobs')
 
 
+def _read_load(serial, load_path):
+    '''
+    Return the job load stored in ``load_path``, or None if it can't be read
+    '''
+    if not os.path.isfile(load_path):
+        return None
+
+    with salt.utils.files.fopen(load_path, 'rb') as rfh:
+        try:
+            job = serial.load(rfh)
+        except Exception:
+            log.exception('Failed to deserialize %s', load_path)
+            return None
+        if not job:
+            log.error('Deserialization of job succeded but there is no data in %s', load_path)
+            return None
+        return job
+
+
 def _walk_through(job_dir):
     '''
     Walk though the jid dir and look for jobs
@@ -66,22 +84,51 @@ def _walk_through(job_dir):
             continue
 
         for final in os.listdir(t_path):
-            load_path = os.path.join(t_path, final, LOAD_P)
-
-            if not os.path.isfile(load_path):
+            job = _read_load(serial, os.path.join(t_path, final, LOAD_P))
+            if job is None:
                 continue
+            jid = job['jid']
+            yield jid, job, t_path, final
 
-            with salt.utils.files.fopen(load_path, 'rb') as rfh:
-                try:
-                    job = serial.load(rfh)
-                except Exception:
-                    log.exception('Failed to deserialize %s', load_path)
-                    continue
-                if not job:
-                    log.error('Deserialization of job succeded but there is no data in %s', load_path)
+
+def _iter_jobs(job_dir, low=None, high=None):
+    '''
+    Yield the jid and load of the jobs within the jid bounds, newest first.
+    The jids are taken from the small ``jid`` file prep_jid writes, so only
+    the loads of the jobs which are actually consumed get deserialized.
+    '''
+    serial = salt.payload.Serial(__opts__)
+    jids = []
+    loaded = {}
+    for top in os.listdir(job_dir):
+        t_path = os.path.join(job_dir, top)
+
+        if not os.path.isdir(t_path):
+            continue
+
+        for final in os.listdir(t_path):
+            jid_dir = os.path.join(t_path, final)
+            try:
+                with salt.utils.files.fopen(os.path.join(jid_dir, 'jid'), 'rb') as fn_:
+                    jid = salt.utils.stringutils.to_unicode(fn_.read()).strip()
+            except (IOError, OSError):
+                jid = None
+            if not jid:
+                # Jobs saved without prep_jid only have their load
+                job = _read_load(serial, os.path.join(jid_dir, LOAD_P))
+                if job is None:
                     continue
                 jid = job['jid']
-                yield jid, job, t_path, final
+                loaded[jid] = job
+            if salt.utils.jid.in_jid_bounds(jid, low, high):
+                jids.append((jid, jid_dir))
+
+    for jid, jid_dir in sorted(jids, reverse=True):
+        job = loaded.pop(jid, None)
+        if job is None:
+            job = _read_load(serial, os.path.join(jid_dir, LOAD_P))
+        if job is not None:
+            yield jid, job
 
 
 #TODO: add to returner docs-- this is a new one
@@ -141,6 +188,30 @@ def returner(load):
         load['jid'] = prep_jid(nocache=load.get('nocache', False))
 
     jid_dir = salt.utils.jid.jid_dir(load['jid'], _job_dir(), __opts__['hash_type'])
+    return _store_return(serial, jid_dir, load)
+
+
+def returner_batch(loads):
+    '''
+    Return a batch of job returns to the local job cache, the job directory of
+    every jid is only looked up once
+    '''
+    serial = salt.payload.Serial(__opts__)
+    job_dir = _job_dir()
+    jid_dirs = {}
+    for load in loads:
+        if load['jid'] == 'req':
+            load['jid'] = prep_jid(nocache=load.get('nocache', False))
+        if load['jid'] not in jid_dirs:
+            jid_dirs[load['jid']] = salt.utils.jid.jid_dir(
+                load['jid'], job_dir, __opts__['hash_type'])
+        _store_return(serial, jid_dirs[load['jid']], load)
+
+
+def _store_return(serial, jid_dir, load):
+    '''
+    Write a single minion return into the given job directory
+    '''
     if os.path.exists(os.path.join(jid_dir, 'nocache')):
         return
 
@@ -387,26 +458,42 @@ def get_jids():
     return ret
 
 
-def get_jids_filter(count, filter_find_job=True):
+def get_jids_filter(count=None,
+                    filter_find_job=True,
+                    start_time=None,
+                    end_time=None,
+                    fun=None,
+                    user=None,
+                    tgt=None,
+                    cursor=None):
     '''
     Return a list of all jobs information filtered by the given criteria.
     :param int count: show not more than the count of most recent jobs
     :param bool filter_find_jobs: filter out 'saltutil.find_job' jobs
-    '''
-    keys = []
-    ret = []
-    for jid, job, _, _ in _walk_through(_job_dir()):
-        job = salt.utils.jid.format_jid_instance_ext(jid, job)
-        if filter_find_job and job['Function'] == 'saltutil.find_job':
-            continue
-        i = bisect.bisect(keys, jid)
-        if len(keys) == count and i == 0:
-            continue
-        keys.insert(i, jid)
-        ret.insert(i, job)
-        if len(keys) > count:
-            del keys[0]
-            del ret[0]
+    :param start_time: only jobs started at or after this datetime or jid
+    :param end_time: only jobs started at or before this datetime or jid
+    :param fun: glob or list of globs the job function has to match
+    :param user: glob or list of globs the job user has to match
+    :param tgt: glob or list of globs the job target has to match
+    :param str cursor: only jobs older than this jid, pass the oldest jid of
+        the previous page to get the next one
+
+    .. versionchanged:: Neon
+        Added the filter and the ``cursor`` arguments
+    '''
+    low, high = salt.utils.jid.jid_bounds(start_time, end_time, cursor)
+    ret = salt.utils.jid.filter_jobs(
+        _iter_jobs(_job_dir(), low, high),
+        count=count,
+        filter_find_job=filter_find_job,
+        fun=fun,
+        user=user,
+        tgt=tgt)
+    if __opts__.get('job_cache_store_endtime'):
+        for job in ret:
+            endtime = get_endtime(job['JID'])
+            if endtime:
+                job['EndTime'] = endtime
     return ret
 
 
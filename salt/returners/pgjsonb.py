@@ -417,6 +417,72 @@ def get_jids():
         return ret
 
 
+def _iter_jobs(filter_find_job=True, low=None, high=None, batch_size=500):
+    '''
+    Yield the jid and load of the jobs within the jid bounds, newest first,
+    fetching them from the database in batches
+    '''
+    while True:
+        where = []
+        params = []
+        if filter_find_job:
+            where.append("(load->>'fun') IS DISTINCT FROM 'saltutil.find_job'")
+        if low is not None:
+            where.append('jid >= %s')
+            params.append(low)
+        if high is not None:
+            where.append('jid < %s')
+            params.append(high)
+        sql = '''SELECT jid, load FROM jids
+                 {0}
+                 ORDER BY jid DESC LIMIT {1}'''.format(
+                     'WHERE ' + ' AND '.join(where) if where else '',
+                     int(batch_size))
+        with _get_serv(ret=None, commit=True) as cur:
+            cur.execute(sql, params)
+            data = cur.fetchall()
+        for jid, load in data:
+            yield jid, load
+        if len(data) < batch_size:
+            return
+        high = data[-1][0]
+
+
+def get_jids_filter(count=None,
+                    filter_find_job=True,
+                    start_time=None,
+                    end_time=None,
+                    fun=None,
+                    user=None,
+                    tgt=None,
+                    cursor=None):
+    '''
+    Return a list of the most recent jobs matching the given criteria
+
+    .. versionadded:: Neon
+
+    :param int count: show not more than the count of most recent jobs
+    :param bool filter_find_jobs: filter out 'saltutil.find_job' jobs
+    :param start_time: only jobs started at or after this datetime or jid
+    :param end_time: only jobs started at or before this datetime or jid
+    :param fun: glob or list of globs the job function has to match
+    :param user: glob or list of globs the job user has to match
+    :param tgt: glob or list of globs the job target has to match
+    :param str cursor: only jobs older than this jid, pass the oldest jid of
+        the previous page to get the next one
+    '''
+    low, high = salt.utils.jid.jid_bounds(start_time, end_time, cursor)
+    # Without globs to match here a single query returns the whole page
+    batch_size = count if count and not (fun or user or tgt) else 500
+    return salt.utils.jid.filter_jobs(
+        _iter_jobs(filter_find_job, low, high, batch_size),
+        count=count,
+        filter_find_job=filter_find_job,
+        fun=fun,
+        user=user,
+        tgt=tgt)
+
+
 def get_minions():
     '''
     Return a list of minions
@@ -109,6 +109,7 @@ Required python modules: psycopg2
 
 # Import python libs
 from __future__ import absolute_import, print_function, unicode_literals
+import ast
 import logging
 import re
 import sys
@@ -412,6 +413,102 @@ def get_jids():
     return ret
 
 
+def _load_tgt(load):
+    '''
+    Return the target of a job load. save_load stores a list target as its
+    string representation, turn it back into a list so that the targets are
+    matched one by one.
+    '''
+    tgt = load.get('tgt')
+    if load.get('tgt_type') == 'list' and isinstance(tgt, six.string_types) \
+            and tgt.startswith('['):
+        try:
+            tgt = ast.literal_eval(tgt)
+        except (ValueError, SyntaxError):
+            pass
+    return tgt
+
+
+def _iter_jobs(filter_find_job=True, low=None, high=None, batch_size=500):
+    '''
+    Yield the jid and load of the jobs within the jid bounds, newest first,
+    fetching them from the database in batches
+    '''
+    conn = _get_conn()
+    if conn is None:
+        return
+    cur = conn.cursor()
+    try:
+        while True:
+            where = []
+            params = []
+            if filter_find_job:
+                where.append("fun IS DISTINCT FROM 'saltutil.find_job'")
+            if __opts__['keep_jobs'] != 0:
+                # Like get_jids, leave out the jobs past the keep_jobs window
+                where.append("started > NOW() - %s * INTERVAL '1 HOUR'")
+                params.append(int(__opts__['keep_jobs']))
+            if low is not None:
+                where.append('jid >= %s')
+                params.append(low)
+            if high is not None:
+                where.append('jid < %s')
+                params.append(high)
+            sql = '''SELECT ''' \
+                  '''jid, tgt_type, cmd, tgt, kwargs, ret, username, arg, fun ''' \
+                  '''FROM jids {0} ORDER BY jid DESC LIMIT {1}'''.format(
+                      'WHERE ' + ' AND '.join(where) if where else '',
+                      int(batch_size))
+            cur.execute(sql, params)
+            data = cur.fetchall()
+            for row in data:
+                load = _build_dict(row)
+                load['arg'] = salt.utils.json.loads(load['arg'] or '[]')
+                load['tgt'] = _load_tgt(load)
+                yield load['jid'], load
+            if len(data) < batch_size:
+                return
+            high = data[-1][0]
+    finally:
+        cur.close()
+        conn.close()
+
+
+def get_jids_filter(count=None,
+                    filter_find_job=True,
+                    start_time=None,
+                    end_time=None,
+                    fun=None,
+                    user=None,
+                    tgt=None,
+                    cursor=None):
+    '''
+    Return a list of the most recent jobs matching the given criteria
+
+    .. versionadded:: Neon
+
+    :param int count: show not more than the count of most recent jobs
+    :param bool filter_find_jobs: filter out 'saltutil.find_job' jobs
+    :param start_time: only jobs started at or after this datetime or jid
+    :param end_time: only jobs started at or before this datetime or jid
+    :param fun: glob or list of globs the job function has to match
+    :param user: glob or list of globs the job user has to match
+    :param tgt: glob or list of globs the job target has to match
+    :param str cursor: only jobs older than this jid, pass the oldest jid of
+        the previous page to get the next one
+    '''
+    low, high = salt.utils.jid.jid_bounds(start_time, end_time, cursor)
+    # Without globs to match here a single query returns the whole page
+    batch_size = count if count and not (fun or user or tgt) else 500
+    return salt.utils.jid.filter_jobs(
+        _iter_jobs(filter_find_job, low, high, batch_size),
+        count=count,
+        filter_find_job=filter_find_job,
+        fun=fun,
+        user=user,
+        tgt=tgt)
+
+
 def clean_old_jobs():
     '''
     Clean out the old jobs from the job cache
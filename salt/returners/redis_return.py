@@ -107,6 +107,7 @@ import salt.utils.platform
 
 # Import 3rd-party libs
 from salt.ext import six
+from salt.ext.six.moves import range  # pylint: disable=import-error,redefined-builtin
 try:
     import redis
     HAS_REDIS = True
@@ -289,6 +290,54 @@ def get_jids():
     return ret
 
 
+def get_jids_filter(count=None,
+                    filter_find_job=True,
+                    start_time=None,
+                    end_time=None,
+                    fun=None,
+                    user=None,
+                    tgt=None,
+                    cursor=None):
+    '''
+    Return a list of the most recent jobs matching the given criteria. The
+    jids are taken from the key names so only the loads of the jobs within
+    the time range and before the cursor are fetched.
+
+    .. versionadded:: Neon
+
+    :param int count: show not more than the count of most recent jobs
+    :param bool filter_find_jobs: filter out 'saltutil.find_job' jobs
+    :param start_time: only jobs started at or after this datetime or jid
+    :param end_time: only jobs started at or before this datetime or jid
+    :param fun: glob or list of globs the job function has to match
+    :param user: glob or list of globs the job user has to match
+    :param tgt: glob or list of globs the job target has to match
+    :param str cursor: only jobs older than this jid, pass the oldest jid of
+        the previous page to get the next one
+    '''
+    serv = _get_serv(ret=None)
+    low, high = salt.utils.jid.jid_bounds(start_time, end_time, cursor)
+    jids = sorted(
+        (key[len('load:'):] for key in serv.keys('load:*')
+         if salt.utils.jid.in_jid_bounds(key[len('load:'):], low, high)),
+        reverse=True)
+
+    def _jobs(batch_size=100):
+        for idx in range(0, len(jids), batch_size):
+            batch = jids[idx:idx + batch_size]
+            for jid, load in zip(batch, serv.mget(['load:{0}'.format(jid) for jid in batch])):
+                if load is not None:
+                    yield jid, salt.utils.json.loads(load)
+
+    return salt.utils.jid.filter_jobs(
+        _jobs(),
+        count=count,
+        filter_find_job=filter_find_job,
+        fun=fun,
+        user=user,
+        tgt=tgt)
+
+
 def get_minions():
     '''
     Return a list of minions
@@ -322,7 +322,7 @@ def empty_dir_list(saltenv='base', backend=None):
     return fileserver.file_list_emptydirs(load=load)
 
 
-def update(backend=None):
+def update(backend=None, stats=False):
     '''
     Update the fileserver cache. If no backend is provided, then the cache for
     all configured backends will be updated.
@@ -341,15 +341,25 @@ def update(backend=None):
             comma-separated list. In earlier versions, they needed to be passed
             as a python list (ex: ``backend="['roots', 'git']"``)
 
+    stats : False
+        If ``True``, return the data reported by each backend's update instead
+        of ``True``. For :mod:`gitfs <salt.fileserver.gitfs>`, this includes
+        the fetch duration, bytes received and failure count for each remote.
+
+        .. versionadded:: Neon
+
     CLI Example:
 
     .. code-block:: bash
 
         salt-run fileserver.update
         salt-run fileserver.update backend=roots,git
+        salt-run fileserver.update backend=git stats=True
     '''
     fileserver = salt.fileserver.Fileserver(__opts__)
-    fileserver.update(back=backend)
+    ret = fileserver.update(back=backend)
+    if stats:
+        return ret
     return True
 
 
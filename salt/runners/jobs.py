@@ -219,6 +219,7 @@ def list_jobs(ext_source=None,
               search_metadata=None,
               search_function=None,
               search_target=None,
+              search_user=None,
               start_time=None,
               end_time=None,
               display_progress=False):
@@ -277,6 +278,12 @@ def list_jobs(ext_source=None,
 
                 salt-run jobs.list_jobs search_target='db*,myminion'
 
+    search_user
+        Can be passed as a string or a list. Returns jobs which were run by
+        the specified user. Globbing is allowed.
+
+        .. versionadded:: Neon
+
     start_time
         Accepts any timestamp supported by the dateutil_ Python module (if this
         module is not installed, this argument will be ignored). Returns jobs
@@ -297,6 +304,11 @@ def list_jobs(ext_source=None,
         salt-run jobs.list_jobs search_function='test.*' search_target='localhost' search_metadata='{"bar": "foo"}'
         salt-run jobs.list_jobs start_time='2015, Mar 16 19:00' end_time='2015, Mar 18 22:00'
 
+    .. versionchanged:: Neon
+        When the returner implements the filters of ``get_jids_filter`` the
+        jobs are filtered by the returner, use
+        :py:func:`jobs.list_jobs_page <salt.runners.jobs.list_jobs_page>` to
+        fetch a single page.
     '''
     returner = _get_returner((
         __opts__['ext_job_cache'],
@@ -310,6 +322,22 @@ def list_jobs(ext_source=None,
         )
     mminion = salt.minion.MasterMinion(__opts__)
 
+    get_jids_filter = _get_jids_filter(mminion, returner)
+    if get_jids_filter is not None and not search_metadata:
+        # Without a limit the returner gathers every matching job in a
+        # single pass over the job cache
+        mret, _ = _fetch_page(get_jids_filter,
+                              limit=None,
+                              filter_find_job=False,
+                              search_function=search_function,
+                              search_target=search_target,
+                              search_user=search_user,
+                              start_time=start_time,
+                              end_time=end_time)
+        if outputter:
+            return {'outputter': outputter, 'data': mret}
+        return mret
+
     ret = mminion.returners['{0}.get_jids'.format(returner)]()
 
     mret = {}
@@ -344,6 +372,13 @@ def list_jobs(ext_source=None,
                     if fnmatch.fnmatch(ret[item]['Function'], key):
                         _match = True
 
+        if search_user and _match:
+            _match = False
+            if 'User' in ret[item]:
+                for key in salt.utils.args.split_input(search_user):
+                    if fnmatch.fnmatch(ret[item]['User'], key):
+                        _match = True
+
         if start_time and _match:
             _match = False
             if DATEUTIL_SUPPORT:
@@ -379,6 +414,83 @@ def list_jobs(ext_source=None,
         return mret
 
 
+def list_jobs_page(limit=100,
+                   cursor=None,
+                   ext_source=None,
+                   filter_find_job=True,
+                   search_function=None,
+                   search_target=None,
+                   search_user=None,
+                   start_time=None,
+                   end_time=None):
+    '''
+    .. versionadded:: Neon
+
+    Return one page of the most recent jobs matching the filters, filtered by
+    the returner through its ``get_jids_filter`` function. The result holds
+    the ``jobs`` of the page by jid and the ``cursor`` to pass in to get the
+    next, older, page. The cursor is ``None`` on the last page.
+
+    limit : 100
+        The number of jobs in a page
+
+    cursor
+        The cursor returned with the previous page
+
+    ext_source
+        The external job cache to use. Default: `None`.
+
+    filter_find_job : True
+        Leave out the ``saltutil.find_job`` jobs
+
+    The ``search_function``, ``search_target``, ``search_user``,
+    ``start_time`` and ``end_time`` filters work like in
+    :py:func:`jobs.list_jobs <salt.runners.jobs.list_jobs>`.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        salt-run jobs.list_jobs_page limit=50 search_function='state.*'
+        salt-run jobs.list_jobs_page limit=50 cursor=20190614124602563432
+    '''
+    returner = _get_returner((
+        __opts__['ext_job_cache'],
+        ext_source,
+        __opts__['master_job_cache']
+    ))
+    mminion = salt.minion.MasterMinion(__opts__)
+
+    get_jids_filter = _get_jids_filter(mminion, returner)
+    if get_jids_filter is None:
+        # Slice the page out of all of the jobs
+        jobs = list_jobs(ext_source=ext_source,
+                         search_function=search_function,
+                         search_target=search_target,
+                         search_user=search_user,
+                         start_time=start_time,
+                         end_time=end_time)
+        jids = sorted(
+            (jid for jid, job in six.iteritems(jobs)
+             if (cursor is None or jid < six.text_type(cursor))
+             and not (filter_find_job
+                      and job.get('Function') == 'saltutil.find_job')),
+            reverse=True)
+        page = jids[:int(limit)]
+        return {'jobs': dict((jid, jobs[jid]) for jid in page),
+                'cursor': page[-1] if len(jids) > len(page) else None}
+    jobs, cursor = _fetch_page(get_jids_filter,
+                               limit=int(limit),
+                               cursor=cursor,
+                               filter_find_job=filter_find_job,
+                               search_function=search_function,
+                               search_target=search_target,
+                               search_user=search_user,
+                               start_time=start_time,
+                               end_time=end_time)
+    return {'jobs': jobs, 'cursor': cursor}
+
+
 def list_jobs_filter(count,
                      filter_find_job=True,
                      ext_source=None,
@@ -548,6 +660,65 @@ def _get_returner(returner_types):
             return returner
 
 
+def _get_jids_filter(mminion, returner):
+    '''
+    Return the ``get_jids_filter`` function of a returner if it supports the
+    filter and cursor arguments
+    '''
+    fun = '{0}.get_jids_filter'.format(returner)
+    if fun not in mminion.returners:
+        return None
+    try:
+        argspec = salt.utils.args.get_function_argspec(mminion.returners[fun])
+    except TypeError:
+        return None
+    if 'cursor' not in argspec.args:
+        return None
+    return mminion.returners[fun]
+
+
+def _parse_time(value):
+    '''
+    Parse a time filter for ``get_jids_filter``
+    '''
+    if not value:
+        return None
+    if not DATEUTIL_SUPPORT:
+        log.error('\'dateutil\' library not available, skipping time filter.')
+        return None
+    return dateutil_parser.parse(value)
+
+
+def _fetch_page(get_jids_filter,
+                limit,
+                cursor=None,
+                filter_find_job=True,
+                search_function=None,
+                search_target=None,
+                search_user=None,
+                start_time=None,
+                end_time=None):
+    '''
+    Fetch a page of jobs from a returner, returns the jobs by jid and the
+    cursor of the next page
+    '''
+    jobs = get_jids_filter(limit,
+                           filter_find_job=filter_find_job,
+                           start_time=_parse_time(start_time),
+                           end_time=_parse_time(end_time),
+                           fun=search_function,
+                           user=search_user,
+                           tgt=search_target,
+                           cursor=cursor)
+    ret = {}
+    for job in jobs:
+        jid = job.pop('JID')
+        ret[jid] = job
+    # The next page starts below the oldest job of this one
+    next_cursor = min(ret) if limit and len(ret) >= limit else None
+    return ret, next_cursor
+
+
 def _format_job_instance(job):
     '''
     Helper to format a job instance
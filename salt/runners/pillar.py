@@ -5,6 +5,7 @@ Functions to interact with the pillar compiler on the master
 from __future__ import absolute_import, print_function, unicode_literals
 
 # Import salt libs
+import salt.cache
 import salt.pillar
 import salt.loader
 import salt.utils.minions
@@ -120,3 +121,38 @@ def show_pillar(minion='*', **kwargs):
     __salt__['salt.cmd']('sys.reload_modules')
 
     return compiled_pillar
+
+
+def source_cache_stats(minion=None):
+    '''
+    .. versionadded:: Neon
+
+    Returns the pillar source cache hits, misses and the time spent (in
+    seconds) for each pillar SLS file and external pillar, as recorded during
+    the most recent pillar compile. If no minion is specified, the stats for
+    all minions are summed up, which shows which pillar sources dominate
+    pillar compile time.
+
+    Stats are only recorded when :conf_master:`pillar_sls_cache` or
+    :conf_master:`ext_pillar_cache_ttl` is configured.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        salt-run pillar.source_cache_stats
+        salt-run pillar.source_cache_stats minion=www.example.com
+    '''
+    cache = salt.cache.factory(__opts__)
+    bank = '/'.join((salt.pillar.PillarSourceCache.bank, 'stats'))
+    minions = [minion] if minion else cache.list(bank)
+    ret = {}
+    for minion_id in minions:
+        data = cache.fetch(bank, minion_id).get('data') or {}
+        for source, stats in data.items():
+            total = ret.setdefault(
+                source, {'hits': 0, 'misses': 0, 'time': 0.0})
+            total['hits'] += stats.get('hits', 0)
+            total['misses'] += stats.get('misses', 0)
+            total['time'] = round(total['time'] + stats.get('time', 0), 6)
+    return ret
@@ -53,6 +53,7 @@ from salt.exceptions import (
     SaltRenderError,
     SaltReqTimeoutError
 )
+from salt.utils.context import CopyOnWriteDict
 from salt.utils.odict import OrderedDict, DefaultOrderedDict
 # Explicit late import to avoid circular import. DO NOT MOVE THIS.
 import salt.utils.yamlloader as yamlloader
@@ -133,6 +134,18 @@ STATE_RUNTIME_KEYWORDS = frozenset([
 
 STATE_INTERNAL_KEYWORDS = STATE_REQUISITE_KEYWORDS.union(STATE_REQUISITE_IN_KEYWORDS).union(STATE_RUNTIME_KEYWORDS)
 
+# Chunks with any of these keywords decide at runtime whether or how they run,
+# so a mod_aggregate function never merges them with other chunks
+AGGREGATE_EXCLUDED_KEYWORDS = STATE_REQUISITE_KEYWORDS.difference(
+    ['require', 'listen']).union([
+        'check_cmd',
+        'onlyif',
+        'unless',
+        'retry',
+        'parallel',
+        '__prereq__',
+    ])
+
 
 def _odict_hashable(self):
     return id(self)
@@ -758,6 +771,9 @@ class State(object):
         self.active = set()
         self.mod_init = set()
         self.pre = {}
+        # Tags of the chunks merged into another chunk by a mod_aggregate,
+        # mapped to the tag of the chunk which runs them
+        self.aggregated = {}
         self.__run_num = 0
         self.jid = jid
         self.instance_id = six.text_type(id(self))
@@ -826,6 +842,33 @@ class State(object):
                     return
                 self.mod_init.add(low['state'])
 
+    def _aggregate_candidates(self, low, running, chunks):
+        '''
+        Return the chunks of the state of ``low`` which can run together with
+        it right now: chunks which did not run yet, which only depend on
+        requisites that already succeeded and which have no conditions of
+        their own. Returns an empty list if ``low`` itself is conditional.
+        '''
+        def _conditional(chunk):
+            return any(key in chunk for key in AGGREGATE_EXCLUDED_KEYWORDS)
+
+        if _conditional(low):
+            return []
+        candidates = []
+        for chunk in chunks:
+            if chunk.get('state') != low['state'] or chunk.get('__agg__'):
+                continue
+            if chunk.get('aggregate') is False or _conditional(chunk):
+                continue
+            tag = _gen_tag(chunk)
+            if tag in running or tag in self.active:
+                continue
+            if chunk is not low and 'require' in chunk \
+                    and self.check_requisite(chunk, running, chunks)[0] != 'met':
+                continue
+            candidates.append(chunk)
+        return candidates
+
     def _mod_aggregate(self, low, running, chunks):
         '''
         Execute the aggregation systems to runtime modify the low chunk
@@ -840,13 +883,35 @@ class State(object):
         if low['state'] in agg_opt and not low.get('__agg__'):
             agg_fun = '{0}.mod_aggregate'.format(low['state'])
             if agg_fun in self.states:
+                candidates = self._aggregate_candidates(low, running, chunks)
+                if not candidates:
+                    return low
                 try:
-                    low = self.states[agg_fun](low, chunks, running)
+                    low = self.states[agg_fun](low, candidates, running)
                     low['__agg__'] = True
                 except TypeError:
                     log.error('Failed to execute aggregate for state %s', low['state'])
+                else:
+                    tag = _gen_tag(low)
+                    for chunk in candidates:
+                        if chunk is not low and chunk.get('__agg__'):
+                            self.aggregated[_gen_tag(chunk)] = tag
         return low
 
+    def _aggregated_ret(self, low, running):
+        '''
+        Return the result of a chunk which was merged into another chunk, as
+        derived by the ``mod_aggregate_ret`` function of the state from the
+        result of that chunk. Returns None if the chunk has to run by itself.
+        '''
+        agg_tag = self.aggregated.get(_gen_tag(low))
+        if agg_tag is None or not running or agg_tag not in running:
+            return None
+        agg_fun = '{0}.mod_aggregate_ret'.format(low['state'])
+        if agg_fun not in self.states:
+            return None
+        return self.states[agg_fun](low, running[agg_tag])
+
     def _run_check(self, low_data):
         '''
         Check that unless doesn't return 0, and that onlyif returns a 0.
@@ -1973,8 +2038,11 @@ class State(object):
 
             if 'result' not in ret or ret['result'] is False:
                 self.states.inject_globals = inject_globals
+                agg_ret = self._aggregated_ret(low, running)
                 if self.mocked:
                     ret = mock_ret(cdata)
+                elif agg_ret is not None:
+                    ret = agg_ret
                 else:
                     # Execute the state function
                     if not low.get('__prereq__') and low.get('parallel'):
@@ -2249,6 +2317,7 @@ class State(object):
         '''
         Iterate over a list of chunks and call them, checking for requires.
         '''
+        self.aggregated = {}
         # Check for any disabled states
         disabled = {}
         if 'state_runs_disabled' in self.opts['grains']:
@@ -4322,7 +4391,7 @@ class MasterHighState(HighState):
     def __init__(self, master_opts, minion_opts, grains, id_,
                  saltenv=None):
         # Force the fileclient to be local
-        opts = copy.deepcopy(minion_opts)
+        opts = CopyOnWriteDict(minion_opts)
         opts['file_client'] = 'local'
         opts['file_roots'] = master_opts['master_roots']
         opts['renderer'] = master_opts['renderer']
@@ -288,15 +288,19 @@ import os
 import posixpath
 import re
 import shutil
+import stat
 import sys
+import threading
 import time
 import traceback
 from collections import Iterable, Mapping, defaultdict
 from datetime import datetime, date   # python3 problem in the making?
+from multiprocessing.pool import ThreadPool
 
 # Import salt libs
 import salt.loader
 import salt.payload
+import salt.utils.atomicfile
 import salt.utils.data
 import salt.utils.dateutils
 import salt.utils.dictdiffer
@@ -436,9 +440,13 @@ def _gen_recurse_managed_files(
         exclude_pat=None,
         maxdepth=None,
         include_empty=False,
+        master_files=None,
         **kwargs):
     '''
     Generate the list of files managed by a recurse state
+
+    ``master_files`` is the list of files under the source when it is already
+    known, to avoid listing them from the master again.
     '''
 
     # Convert a relative path generated from salt master paths to an OS path
@@ -489,7 +497,10 @@ def _gen_recurse_managed_files(
     if not srcpath.endswith(posixpath.sep):
         # we're searching for things that start with this *directory*.
         srcpath = srcpath + posixpath.sep
-    fns_ = __salt__['cp.list_master'](senv, srcpath)
+    if master_files is None:
+        fns_ = __salt__['cp.list_master'](senv, srcpath)
+    else:
+        fns_ = sorted(master_files)
 
     # If we are instructed to keep symlinks, then process them.
     if keep_symlinks:
@@ -718,7 +729,15 @@ def _check_directory(name,
     Check what changes need to be made on a directory
     '''
     changes = {}
-    if recurse or clean:
+    ids = None
+    if recurse:
+        try:
+            recurse_set = _get_recurse_set(recurse)
+        except (TypeError, ValueError) as exc:
+            return False, '{0}'.format(exc), changes
+        ids = _recurse_ids(user if 'user' in recurse_set else None,
+                           group if 'group' in recurse_set else None)
+    if clean or (recurse and ids is None):
         assert max_depth is None or not clean
         # walk path only once and store the result
         walk_l = list(_depth_limited_walk(name, max_depth))
@@ -730,10 +749,6 @@ def _check_directory(name,
     # Preserve rootdir_mode before going into recurse
     rootdir_mode = mode
     if recurse:
-        try:
-            recurse_set = _get_recurse_set(recurse)
-        except (TypeError, ValueError) as exc:
-            return False, '{0}'.format(exc), changes
         if 'user' not in recurse_set:
             user = None
         if 'group' not in recurse_set:
@@ -742,7 +757,12 @@ def _check_directory(name,
             mode = None
         check_files = 'ignore_files' not in recurse_set
         check_dirs = 'ignore_dirs' not in recurse_set
-        for root, dirs, files in walk_l:
+        if ids is not None:
+            changes.update(_check_recurse_perms(
+                name, user, group, mode,
+                file_mode if mode is not None else None,
+                ids, max_depth, check_files, check_dirs, follow_symlinks))
+        for root, dirs, files in walk_l if ids is None else []:
             if check_files:
                 for fname in files:
                     fchange = {}
@@ -3101,6 +3121,259 @@ def _depth_limited_walk(top, max_depth=None):
         yield (six.text_type(root), list(dirs), list(files))
 
 
+def _recurse_ids(user, group):
+    '''
+    Resolve the user and group to recursively enforce to a uid and gid, so
+    the tree can be checked against plain stat results. Returns None when the
+    fast path cannot be used: on Windows, without os.scandir or when the user
+    or group does not exist.
+    '''
+    if salt.utils.platform.is_windows() or not hasattr(os, 'scandir'):
+        return None
+    uid = gid = None
+    if user is not None:
+        uid = __salt__['file.user_to_uid'](user)
+        if not isinstance(uid, six.integer_types):
+            return None
+    if group is not None:
+        gid = __salt__['file.group_to_gid'](group)
+        if not isinstance(gid, six.integer_types):
+            return None
+    return uid, gid
+
+
+def _scan_tree(top,
+               visit,
+               max_depth=None,
+               check_files=True,
+               check_dirs=True,
+               follow_symlinks=False):
+    '''
+    Call ``visit(path, is_dir, stat_result)`` for the files and directories
+    under ``top`` (following the same rules as ``_depth_limited_walk``) and
+    return the list of ``(path, result)`` for which it returned something.
+
+    The tree is read with os.scandir, and the subdirectories of ``top`` are
+    spread over ``file_recurse_workers`` threads.
+    '''
+    def _visit(path, is_dir, entry):
+        try:
+            st = entry.stat(follow_symlinks=follow_symlinks)
+        except OSError:
+            # Vanished while walking
+            return None
+        result = visit(path, is_dir, st)
+        return None if result is None else (path, result)
+
+    def _scan(root, depth, visit_root=None):
+        found = []
+        if visit_root is not None:
+            found.append(_visit(root, True, visit_root))
+        stack = [(root, depth)]
+        while stack:
+            path, depth = stack.pop()
+            descend = max_depth is None or depth < max_depth
+            try:
+                entries = list(os.scandir(path))
+            except OSError:
+                continue
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if is_dir:
+                    if not descend:
+                        continue
+                    if check_dirs:
+                        found.append(_visit(entry.path, True, entry))
+                    if not entry.is_symlink():
+                        stack.append((entry.path, depth + 1))
+                elif check_files:
+                    found.append(_visit(entry.path, False, entry))
+        return [x for x in found if x is not None]
+
+    top = salt.utils.stringutils.to_unicode(top)
+    workers = __opts__.get('file_recurse_workers', 0)
+    if not workers or workers < 2 or (max_depth is not None and max_depth < 1):
+        return sorted(_scan(top, 0))
+
+    # Scan the subdirectories of top concurrently, the time is mostly spent
+    # in stat/chown/chmod syscalls which release the GIL
+    found = []
+    subdirs = []
+    try:
+        entries = list(os.scandir(top))
+    except OSError:
+        entries = []
+    for entry in entries:
+        try:
+            is_dir = entry.is_dir()
+        except OSError:
+            is_dir = False
+        if is_dir and not entry.is_symlink():
+            subdirs.append(entry)
+        elif is_dir and check_dirs:
+            found.append(_visit(entry.path, True, entry))
+        elif not is_dir and check_files:
+            found.append(_visit(entry.path, False, entry))
+    found = [x for x in found if x is not None]
+    if subdirs:
+        pool = ThreadPool(min(workers, len(subdirs)))
+        try:
+            for result in pool.map(
+                    lambda entry: _scan(entry.path, 1, entry if check_dirs else None),
+                    subdirs):
+                found.extend(result)
+        finally:
+            pool.close()
+            pool.join()
+    return sorted(found)
+
+
+def _mode_bits(mode):
+    '''
+    Return the permission bits of a normalized mode, or None
+    '''
+    mode = salt.utils.files.normalize_mode(mode)
+    if mode is None:
+        return None
+    return int(mode, 8)
+
+
+def _check_recurse_perms(name,
+                         user,
+                         group,
+                         dir_mode,
+                         file_mode,
+                         ids,
+                         max_depth=None,
+                         check_files=True,
+                         check_dirs=True,
+                         follow_symlinks=False):
+    '''
+    Fast path of the recursive check in ``_check_directory``: compare the
+    stat results of the tree against the target uid, gid and mode once
+    resolved to numbers, instead of calling ``file.stats`` on every path.
+    '''
+    uid, gid = ids
+    dir_bits = _mode_bits(dir_mode)
+    file_bits = _mode_bits(file_mode)
+
+    def _visit(path, is_dir, st):
+        fchange = {}
+        if uid is not None and st.st_uid != uid:
+            fchange['user'] = user
+        if gid is not None and st.st_gid != gid:
+            fchange['group'] = group
+        bits = dir_bits if is_dir else file_bits
+        # The mode of a symlink is not managed unless following them
+        if bits is not None and stat.S_IMODE(st.st_mode) != bits \
+                and (follow_symlinks or not stat.S_ISLNK(st.st_mode)):
+            fchange['mode'] = salt.utils.files.normalize_mode(dir_mode) \
+                if is_dir else file_mode
+        return fchange or None
+
+    return dict(_scan_tree(name, _visit, max_depth, check_files, check_dirs,
+                           follow_symlinks))
+
+
+def _enforce_recurse_perms(paths,
+                           ret,
+                           user,
+                           group,
+                           dir_mode,
+                           file_mode,
+                           ids,
+                           follow_symlinks=False,
+                           test=False):
+    '''
+    Fix the ownership and mode of the paths found by ``_check_recurse_perms``
+    with chown/chmod calls. The changes are reported in ``ret`` the way
+    ``file.check_perms`` reports them, aggregated over all the paths. With
+    ``test`` the changes are only reported. Returns the list of errors.
+    '''
+    uid, gid = ids
+    dir_bits = _mode_bits(dir_mode)
+    file_bits = _mode_bits(file_mode)
+
+    def _fix(path):
+        try:
+            st = os.stat(path) if follow_symlinks else os.lstat(path)
+        except OSError:
+            return set(), None
+        is_link = stat.S_ISLNK(st.st_mode)
+        if is_link and not follow_symlinks:
+            try:
+                is_dir = os.path.isdir(path)
+            except OSError:
+                is_dir = False
+        else:
+            is_dir = stat.S_ISDIR(st.st_mode)
+        bits = dir_bits if is_dir else file_bits
+        if is_link and not follow_symlinks:
+            bits = None
+        done = set()
+        try:
+            chown_uid = uid if uid is not None and st.st_uid != uid else -1
+            chown_gid = gid if gid is not None and st.st_gid != gid else -1
+            if (chown_uid != -1 or chown_gid != -1) and test:
+                done.update(kind for kind, cid in (('user', chown_uid),
+                                                   ('group', chown_gid))
+                            if cid != -1)
+            elif chown_uid != -1 or chown_gid != -1:
+                if is_link and not follow_symlinks:
+                    os.lchown(path, chown_uid, chown_gid)
+                else:
+                    os.chown(path, chown_uid, chown_gid)
+                    # chown resets the suid and sgid bits
+                    st = os.stat(path)
+                if chown_uid != -1:
+                    done.add('user')
+                if chown_gid != -1:
+                    done.add('group')
+            if bits is not None and stat.S_IMODE(st.st_mode) != bits:
+                if not test:
+                    os.chmod(path, bits)
+                done.add('dir_mode' if is_dir else 'file_mode')
+        except OSError as exc:
+            return done, 'Failed to set ownership or mode of {0}: {1}'.format(
+                path, exc.strerror)
+        return done, None
+
+    workers = __opts__.get('file_recurse_workers', 0)
+    if workers and workers > 1 and len(paths) > 1:
+        pool = ThreadPool(min(workers, len(paths)))
+        try:
+            results = pool.map(_fix, paths, chunksize=256)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        results = [_fix(path) for path in paths]
+
+    done = set()
+    errors = []
+    for changed, error in results:
+        done.update(changed)
+        if error is not None:
+            errors.append(error)
+    if isinstance(ret['changes'], dict):
+        if 'user' in done:
+            ret['changes']['user'] = __salt__['file.uid_to_user'](uid) \
+                if isinstance(user, six.integer_types) else user
+        if 'group' in done:
+            ret['changes']['group'] = __salt__['file.gid_to_group'](gid) \
+                if isinstance(group, six.integer_types) else group
+        if 'file_mode' in done:
+            ret['changes']['mode'] = salt.utils.files.normalize_mode(file_mode)
+        elif 'dir_mode' in done:
+            ret['changes']['mode'] = salt.utils.files.normalize_mode(dir_mode)
+    if errors:
+        ret['result'] = False
+    return errors
+
+
 def directory(name,
               user=None,
               group=None,
@@ -3499,14 +3772,6 @@ def directory(name,
                 name, ret, user, group, dir_mode, None, follow_symlinks)
 
     errors = []
-    if recurse or clean:
-        # walk path only once and store the result
-        walk_l = list(_depth_limited_walk(name, max_depth))
-        # root: (dirs, files) structure, compatible for python2.6
-        walk_d = {}
-        for i in walk_l:
-            walk_d[i[0]] = (i[1], i[2])
-
     recurse_set = None
     if recurse:
         try:
@@ -3515,6 +3780,19 @@ def directory(name,
             ret['result'] = False
             ret['comment'] = '{0}'.format(exc)
             # NOTE: Should this be enough to stop the whole check altogether?
+    ids = None
+    if recurse_set:
+        ids = _recurse_ids(user if 'user' in recurse_set else None,
+                           group if 'group' in recurse_set else None)
+
+    if clean or (recurse_set and ids is None):
+        # walk path only once and store the result
+        walk_l = list(_depth_limited_walk(name, max_depth))
+        # root: (dirs, files) structure, compatible for python2.6
+        walk_d = {}
+        for i in walk_l:
+            walk_d[i[0]] = (i[1], i[2])
+
     if recurse_set:
         if 'user' in recurse_set:
             if user or isinstance(user, int):
@@ -3560,7 +3838,15 @@ def directory(name,
         check_files = 'ignore_files' not in recurse_set
         check_dirs = 'ignore_dirs' not in recurse_set
 
-        for root, dirs, files in walk_l:
+        if ids is not None:
+            # _check_directory already found the paths which need fixing
+            errors.extend(_enforce_recurse_perms(
+                [path for path, change in six.iteritems(pchanges)
+                 if path != name
+                 and any(key in change for key in ('user', 'group', 'mode'))],
+                ret, user, group, dir_mode, file_mode, ids, follow_symlinks))
+
+        for root, dirs, files in walk_l if ids is None else []:
             if check_files:
                 for fn_ in files:
                     full = os.path.join(root, fn_)
@@ -3638,6 +3924,172 @@ def directory(name,
     return ret
 
 
+def _recurse_record_path(name):
+    '''
+    Path of the record of the files last written or verified by a manifest
+    based recurse state into ``name``
+    '''
+    return os.path.join(
+        __opts__['cachedir'], 'file_recurse',
+        salt.utils.hashutils.sha256_digest(name) + '.p')
+
+
+def _load_recurse_record(name):
+    path = _recurse_record_path(name)
+    try:
+        with salt.utils.files.fopen(path, 'rb') as fp_:
+            record = salt.payload.Serial(__opts__).load(fp_)
+    except (IOError, OSError, ValueError):
+        return {}
+    return record if isinstance(record, dict) else {}
+
+
+def _save_recurse_record(name, record):
+    path = _recurse_record_path(name)
+    try:
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        with salt.utils.atomicfile.atomic_open(path, 'wb') as fp_:
+            salt.payload.Serial(__opts__).dump(record, fp_)
+    except (IOError, OSError) as exc:
+        log.warning('Unable to write the file.recurse record %s: %s', path, exc)
+
+
+def _fetch_manifest_files(fetch, saltenv, keep_source=True):
+    '''
+    Download the ``(dest, source, hash_info)`` files in ``fetch`` into the
+    minion cache, check their hash and copy them into place. The downloads
+    are spread over ``file_recurse_workers`` threads, each with its own file
+    client. Returns a dict of the errors per destination.
+    '''
+    import salt.fileclient
+    local = threading.local()
+    clients = []
+    # New files get the mode file.managed gives them when no mode is set
+    new_mode = (0o777 ^ salt.utils.files.get_umask()) & 0o666
+
+    def _get(item):
+        dest, source, hash_info = item
+        is_new = not os.path.exists(dest)
+        client = getattr(local, 'client', None)
+        if client is None:
+            client = local.client = salt.fileclient.get_file_client(__opts__)
+            clients.append(client)
+        try:
+            cached = client.cache_file(source, saltenv)
+            if not cached:
+                return dest, 'Source file {0} not found'.format(source)
+            hsum = salt.utils.hashutils.get_hash(cached, hash_info['hash_type'])
+            if hsum != hash_info['hsum']:
+                return dest, 'Source file {0} changed while fetching it'.format(source)
+            salt.utils.files.copyfile(cached, dest, '', __opts__['cachedir'])
+            if is_new:
+                os.chmod(dest, new_mode)
+            if not keep_source:
+                salt.utils.files.remove(cached)
+        except (IOError, OSError, CommandExecutionError) as exc:
+            return dest, 'Unable to fetch {0}: {1}'.format(source, exc)
+        return dest, None
+
+    workers = __opts__.get('file_recurse_workers', 0)
+    try:
+        if workers and workers > 1 and len(fetch) > 1:
+            pool = ThreadPool(min(workers, len(fetch)))
+            try:
+                results = pool.map(_get, fetch)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            results = [_get(item) for item in fetch]
+    finally:
+        for client in clients:
+            client.destroy()
+    return dict((dest, error) for dest, error in results if error)
+
+
+def _manage_manifest_files(name,
+                           files,
+                           manifest,
+                           saltenv,
+                           user,
+                           group,
+                           file_mode,
+                           ids,
+                           replace=True,
+                           keep_source=True):
+    '''
+    Manage the files of a recurse state from the manifest of the source: the
+    local files are compared with it by size, then by the recorded mtime and
+    hash, and only hashed when that is not enough. The changed files are
+    fetched concurrently and their ownership and mode are set in bulk.
+
+    Returns a tuple of the changes and comments per path, the files which
+    must go through file.managed instead, and the aggregated ownership and
+    mode changes.
+    '''
+    test = __opts__['test']
+    record = _load_recurse_record(name)
+    new_record = {}
+    changes = {}
+    comments = {}
+    fallback = []
+    fetch = []
+    for dest, source in files:
+        info = manifest.get(salt.utils.url.parse(source)[0])
+        if info is None:
+            fallback.append((dest, source))
+            continue
+        try:
+            dest_st = os.stat(dest)
+        except OSError:
+            dest_st = None
+        if dest_st is not None and not stat.S_ISREG(dest_st.st_mode):
+            # Something else is in the way, let file.managed deal with it
+            fallback.append((dest, source))
+            continue
+        if dest_st is None:
+            changes[dest] = {'diff': 'New file'}
+        elif not replace:
+            continue
+        elif info['size'] is not None and dest_st.st_size != info['size']:
+            changes[dest] = {'diff': 'Replace file'}
+        else:
+            known = record.get(dest)
+            if known == [dest_st.st_size, dest_st.st_mtime, info['hsum']]:
+                new_record[dest] = known
+                continue
+            hsum = salt.utils.hashutils.get_hash(dest, info['hash_type'])
+            if hsum == info['hsum']:
+                new_record[dest] = [dest_st.st_size, dest_st.st_mtime, hsum]
+                continue
+            changes[dest] = {'diff': 'Replace file'}
+        fetch.append((dest, source, info))
+
+    if not test and fetch:
+        errors = _fetch_manifest_files(fetch, saltenv, keep_source)
+        for dest, error in six.iteritems(errors):
+            changes.pop(dest, None)
+            comments[dest] = error
+        for dest, source, info in fetch:
+            if dest not in errors:
+                try:
+                    dest_st = os.stat(dest)
+                except OSError:
+                    continue
+                new_record[dest] = [dest_st.st_size, dest_st.st_mtime, info['hsum']]
+    if not test:
+        _save_recurse_record(name, new_record)
+
+    perms = {'changes': {}, 'result': True}
+    perm_errors = _enforce_recurse_perms(
+        [dest for dest, _ in files if dest not in comments],
+        perms, user, group, None, file_mode, ids, test=test)
+    if perm_errors:
+        comments[name] = '\n'.join(perm_errors)
+    return changes, comments, fallback, perms['changes']
+
+
 def recurse(name,
             source,
             keep_source=True,
@@ -3663,6 +4115,7 @@ def recurse(name,
             win_perms=None,
             win_deny_perms=None,
             win_inheritance=True,
+            manifest=False,
             **kwargs):
     '''
     Recurse through a subdirectory on the master and copy said subdirectory
@@ -3862,6 +4315,23 @@ def recurse(name,
         True to inherit permissions from parent, otherwise False
 
         .. versionadded:: 2017.7.7
+
+    manifest : False
+        Get the hash, size and mode of all the files under the source from the
+        master in a single request instead of checking every file with
+        :py:func:`file.managed <salt.states.file.managed>`. The local files
+        are compared by size and by the mtime recorded when they were last
+        written, and only hashed when that is not enough. The changed files
+        are fetched concurrently using :conf_minion:`file_recurse_workers`
+        threads, then their ownership and mode are set in bulk. No diffs are
+        reported for the changed files.
+
+        This is not supported together with ``template``, ``backup``,
+        ``file_mode: keep`` or on Windows. The files are then managed one by
+        one, as they also are when the master is too old to provide the
+        manifest.
+
+        .. versionadded:: Neon
     '''
     if 'env' in kwargs:
         # "env" is not supported; Use "saltenv".
@@ -4057,6 +4527,21 @@ def recurse(name,
             require=None)
         merge_ret(path, _ret)
 
+    manifest_data = ids = None
+    if manifest:
+        if template or backup or keep_mode \
+                or salt.utils.platform.is_windows():
+            log.debug(
+                'file.recurse %s: the manifest mode does not support '
+                'templates, backups, file_mode keep or Windows, managing '
+                'the files one by one', name
+            )
+        else:
+            ids = _recurse_ids(user, group)
+            if ids is not None:
+                manifest_data = __salt__['cp.list_master_manifest'](
+                    senv, srcpath + '/')
+
     mng_files, mng_dirs, mng_symlinks, keep = _gen_recurse_managed_files(
         name,
         source,
@@ -4064,7 +4549,8 @@ def recurse(name,
         include_pat,
         exclude_pat,
         maxdepth,
-        include_empty)
+        include_empty,
+        master_files=manifest_data)
 
     for srelpath, ltarget in mng_symlinks:
         _ret = symlink(os.path.join(name, srelpath),
@@ -4079,6 +4565,24 @@ def recurse(name,
         merge_ret(os.path.join(name, srelpath), _ret)
     for dirname in mng_dirs:
         manage_directory(dirname)
+    if manifest_data is not None:
+        m_changes, m_comments, mng_files, perm_changes = _manage_manifest_files(
+            name, mng_files, manifest_data, senv, user, group, file_mode, ids,
+            replace, keep_source)
+        for path, changes in six.iteritems(m_changes):
+            if __opts__['test']:
+                merge_ret(path, {'result': None,
+                                 'comment': 'The file {0} is set to be '
+                                            'changed'.format(path),
+                                 'changes': changes})
+            else:
+                merge_ret(path, {'result': True, 'comment': '', 'changes': changes})
+        for path, comment in six.iteritems(m_comments):
+            merge_ret(path, {'result': False, 'comment': comment, 'changes': {}})
+        if perm_changes:
+            ret['changes'].setdefault(name, {}).update(perm_changes)
+            if __opts__['test'] and ret['result'] is True:
+                ret['result'] = None
     for dest, src in mng_files:
         manage_file(dest, src, replace)
 
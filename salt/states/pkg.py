@@ -81,6 +81,7 @@ import os
 import re
 
 # Import Salt libs
+import salt.utils.data
 import salt.utils.pkg
 import salt.utils.platform
 import salt.utils.versions
@@ -91,6 +92,7 @@ from salt.exceptions import (
     CommandExecutionError, MinionError, SaltInvocationError
 )
 from salt.modules.pkg_resource import _repack_pkgs
+from salt.state import STATE_INTERNAL_KEYWORDS as _STATE_INTERNAL_KEYWORDS
 
 # Import 3rd-party libs
 from salt.ext import six
@@ -141,6 +143,9 @@ if salt.utils.platform.is_windows():
 
 log = logging.getLogger(__name__)
 
+# Arguments which differ between pkg chunks merged by mod_aggregate
+_AGGREGATE_IGNORED = ('name', 'names', 'pkgs', 'sources', 'version', 'aggregate')
+
 
 def __virtual__():
     '''
@@ -3266,10 +3271,27 @@ def mod_init(low):
     return False
 
 
+def _aggregate_opts(chunk):
+    '''
+    Return the arguments of a pkg chunk which have to match for it to be
+    merged with another chunk into a single package manager transaction
+    '''
+    return dict(
+        (key, val) for key, val in six.iteritems(chunk)
+        if key not in _AGGREGATE_IGNORED and key not in _STATE_INTERNAL_KEYWORDS
+        and not key.startswith('__')
+    )
+
+
 def mod_aggregate(low, chunks, running):
     '''
     The mod_aggregate function which looks up all packages in the available
-    low chunks and merges them into a single pkgs ref in the present low data
+    low chunks and merges them into a single pkgs ref in the present low data.
+
+    Only chunks of the same function called with the same arguments are
+    merged, so the packages are resolved and installed or removed in one
+    transaction. The merged chunks are answered from the result of the
+    present low data by :py:func:`mod_aggregate_ret`.
     '''
     pkgs = []
     pkg_type = None
@@ -3281,6 +3303,7 @@ def mod_aggregate(low, chunks, running):
     ]
     if low.get('fun') not in agg_enabled:
         return low
+    low_opts = _aggregate_opts(low)
     for chunk in chunks:
         tag = __utils__['state.gen_tag'](chunk)
         if tag in running:
@@ -3292,8 +3315,8 @@ def mod_aggregate(low, chunks, running):
             # Check for the same function
             if chunk.get('fun') != low.get('fun'):
                 continue
-            # Check for the same repo
-            if chunk.get('fromrepo') != low.get('fromrepo'):
+            # Check for the same repo and the same options
+            if _aggregate_opts(chunk) != low_opts:
                 continue
             # Check first if 'sources' was passed so we don't aggregate pkgs
             # and sources together.
@@ -3312,7 +3335,9 @@ def mod_aggregate(low, chunks, running):
                         pkgs.extend(chunk['pkgs'])
                         chunk['__agg__'] = True
                     elif 'name' in chunk:
-                        version = chunk.pop('version', None)
+                        # Leave the version in place, the chunk runs by
+                        # itself if the aggregated run does not succeed
+                        version = chunk.get('version')
                         if version is not None:
                             pkgs.append({chunk['name']: version})
                         else:
@@ -3326,6 +3351,32 @@ def mod_aggregate(low, chunks, running):
     return low
 
 
+def mod_aggregate_ret(low, ret):
+    '''
+    Return the result of a pkg chunk which :py:func:`mod_aggregate` merged
+    into another chunk, from the result of that chunk. The changes of the
+    packages of this chunk are picked out of the aggregated changes.
+
+    Returns ``None`` unless the aggregated run succeeded, the chunk then runs
+    by itself so it reports its own errors.
+    '''
+    if ret.get('result') is not True:
+        return None
+    if 'sources' in low:
+        names = list(salt.utils.data.repack_dictlist(low['sources']))
+    elif 'pkgs' in low:
+        names = list(salt.utils.data.repack_dictlist(low['pkgs']))
+    else:
+        names = [low['name']]
+    changes = ret.get('changes') or {}
+    return {'name': low['name'],
+            'result': True,
+            'changes': dict((name, changes[name]) for name in names
+                            if name in changes),
+            'comment': 'Handled together with the other packages of '
+                       'pkg state \'{0}\''.format(ret.get('name', ''))}
+
+
 def mod_watch(name, **kwargs):
     '''
     Install/reinstall a package based on a watch requisite
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+'''
+Sampling of the host metrics shared by the beacons.
+
+Several beacons read the same metrics, e.g. a ``diskusage`` and a renamed
+second ``diskusage`` beacon both list the partitions, or many ``service``
+beacons ask for the status of the same service. While the minion evaluates
+its beacons, every metric read through :func:`sample` is taken at most once
+and the value is shared by all the beacons of that evaluation. Outside of an
+evaluation :func:`sample` reads the metric every time.
+'''
+
+# Import Python libs
+from __future__ import absolute_import, print_function, unicode_literals
+import contextlib
+import logging
+
+log = logging.getLogger(__name__)
+
+
+class Sampler(object):
+    '''
+    Cache of the metrics sampled during one evaluation of the beacons
+    '''
+    def __init__(self):
+        self.samples = None
+
+    @contextlib.contextmanager
+    def tick(self):
+        '''
+        Share the samples taken inside this context
+        '''
+        self.samples = {}
+        try:
+            yield self
+        finally:
+            self.samples = None
+
+    def sample(self, name, func, *args):
+        '''
+        Return ``func(*args)``, reusing the value taken earlier in the same
+        tick under the same name and arguments
+        '''
+        if self.samples is None:
+            return func(*args)
+        key = (name,) + args
+        if key not in self.samples:
+            self.samples[key] = func(*args)
+        else:
+            log.trace('Reusing beacon sample %s%s', name, args)
+        return self.samples[key]
+
+
+SAMPLER = Sampler()
+
+
+def tick():
+    '''
+    Share the metrics sampled by all the beacons run inside this context
+    '''
+    return SAMPLER.tick()
+
+
+def sample(name, func, *args):
+    '''
+    Read a metric through the shared sampler, see :meth:`Sampler.sample`
+    '''
+    return SAMPLER.sample(name, func, *args)
+
+
+def parse_percent(value):
+    '''
+    Turn a percent threshold such as ``63%`` or ``63`` into a float
+    '''
+    return float('{0}'.format(value).replace('%', '').strip())
@@ -7,7 +7,13 @@ from __future__ import absolute_import, print_function, unicode_literals
 import os
 import re
 import time
+import errno
+import fnmatch
+import functools
+import hashlib
+import inspect
 import logging
+import shutil
 try:
     import salt.utils.msgpack as msgpack
 except ImportError:
@@ -16,11 +22,15 @@ except ImportError:
 # Import salt libs
 import salt.config
 import salt.payload
+import salt.utils.args
+import salt.utils.atomicfile
 import salt.utils.data
 import salt.utils.dictupdate
 import salt.utils.files
+import salt.utils.stringutils
 
 # Import third party libs
+from salt.ext import six
 from salt.ext.six.moves import range  # pylint: disable=import-error,redefined-builtin
 from salt.utils.zeromq import zmq
 
@@ -363,6 +373,142 @@ def context_cache(func):
     return context_cache_wrap
 
 
+class ExecCache(object):
+    '''
+    Cache the results of read-only execution module functions on disk, so
+    they are shared by every job process of the minion until their TTL runs
+    out or a function which changes the system invalidates them.
+
+    A function is cached when it is decorated with
+    :py:func:`salt.utils.decorators.exec_cache` or matches a pattern in the
+    ``exec_cache_ttl`` option. Functions decorated with
+    :py:func:`salt.utils.decorators.invalidates_exec_cache` or listed in
+    ``exec_cache_invalidate`` drop the matching cached results when they run.
+    '''
+    def __init__(self, opts):
+        self.opts = opts
+        self.cache_dir = os.path.join(opts['cachedir'], 'exec_cache')
+        self.serial = salt.payload.Serial(opts)
+        self.ttls = opts.get('exec_cache_ttl') or {}
+        self.invalidations = opts.get('exec_cache_invalidate') or {}
+
+    def _ttl(self, name, func):
+        for pattern, ttl in six.iteritems(self.ttls):
+            if fnmatch.fnmatch(name, pattern):
+                return ttl
+        return getattr(func, '__exec_cache_ttl__', 0)
+
+    def _invalidates(self, name, func):
+        patterns = list(getattr(func, '__exec_cache_invalidates__', ()))
+        for pattern, targets in six.iteritems(self.invalidations):
+            if fnmatch.fnmatch(name, pattern):
+                if isinstance(targets, six.string_types):
+                    targets = [targets]
+                patterns.extend(targets)
+        return patterns
+
+    def _path(self, name, args, kwargs):
+        key = hashlib.sha256(salt.utils.stringutils.to_bytes(
+            repr((args, sorted(six.iteritems(kwargs)))))).hexdigest()
+        return os.path.join(self.cache_dir, name, '{0}.p'.format(key))
+
+    def fetch(self, name, args, kwargs):
+        '''
+        Return a tuple of whether a live result was found and the result
+        '''
+        path = self._path(name, args, kwargs)
+        try:
+            with salt.utils.files.fopen(path, 'rb') as fp_:
+                data = self.serial.load(fp_)
+        except (IOError, OSError):
+            return False, None
+        except Exception:
+            log.debug('Unable to read cached result %s', path, exc_info=True)
+            return False, None
+        if not isinstance(data, dict) or data.get('expires', 0) < time.time():
+            return False, None
+        return True, data.get('return')
+
+    def store(self, name, args, kwargs, ret, ttl):
+        '''
+        Store the result of a function call
+        '''
+        path = self._path(name, args, kwargs)
+        try:
+            payload = self.serial.dumps({'expires': time.time() + ttl, 'return': ret})
+        except Exception:
+            log.debug('Unable to cache the result of %s', name, exc_info=True)
+            return
+        try:
+            try:
+                os.makedirs(os.path.dirname(path))
+            except OSError as exc:
+                if exc.errno != errno.EEXIST:
+                    raise
+            with salt.utils.atomicfile.atomic_open(path, 'wb') as fp_:
+                fp_.write(payload)
+        except (IOError, OSError) as exc:
+            log.debug('Unable to cache the result of %s: %s', name, exc)
+
+    def invalidate(self, patterns='*'):
+        '''
+        Drop the cached results of the functions matching the patterns
+        '''
+        if isinstance(patterns, six.string_types):
+            patterns = [patterns]
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return
+        for name in names:
+            if any(fnmatch.fnmatch(name, pattern) for pattern in patterns):
+                log.debug('Invalidating the cached results of %s', name)
+                shutil.rmtree(os.path.join(self.cache_dir, name), ignore_errors=True)
+
+    def wrap(self, name, func):
+        '''
+        Wrap a loaded function if it is cached or invalidates cached results,
+        otherwise return it unchanged
+        '''
+        ttl = self._ttl(name, func)
+        invalidates = self._invalidates(name, func)
+        if not ttl and not invalidates:
+            return func
+        try:
+            accepts_kwargs = salt.utils.args.get_function_argspec(func).keywords is not None
+        except (TypeError, ValueError):
+            accepts_kwargs = True
+
+        @functools.wraps(func)
+        def wrapped(*args, **kwargs):
+            if not accepts_kwargs:
+                # The wrapper hides the argspec on Python 2, do not pass on
+                # the publish data the minion adds for functions taking kwargs
+                kwargs = dict((key, val) for key, val in six.iteritems(kwargs)
+                              if not key.startswith('__pub_'))
+            if ttl:
+                key_kwargs = dict((key, val) for key, val in six.iteritems(kwargs)
+                                  if not key.startswith('__'))
+                hit, ret = self.fetch(name, args, key_kwargs)
+                if hit:
+                    log.trace('Returning cached result of %s', name)
+                    return ret
+                ret = func(*args, **kwargs)
+                self.store(name, args, key_kwargs, ret, ttl)
+                return ret
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.invalidate(invalidates)
+
+        if six.PY3:
+            try:
+                wrapped.__signature__ = inspect.signature(func)  # pylint: disable=no-member
+            except (TypeError, ValueError):
+                pass
+        return wrapped
+
+
 # test code for the CacheCli
 if __name__ == '__main__':
 
@@ -21,6 +21,8 @@ import logging
 import pipes
 import traceback
 import copy
+import datetime
+import random
 import re
 import uuid
 
@@ -90,6 +92,9 @@ from salt.exceptions import (
 from salt.ext import six
 from salt.ext.six.moves import range  # pylint: disable=import-error,redefined-builtin,W0611
 from jinja2 import Template
+import tornado.gen
+import tornado.ioloop
+import tornado.tcpclient
 
 # Let's import pwd and catch the ImportError. We'll raise it if this is not
 # Windows. This import has to be below where we import salt.utils.platform!
@@ -623,6 +628,15 @@ def bootstrap(vm_, opts=None):
         del event_kwargs['password']
     ret['deploy_kwargs'] = event_kwargs
 
+    if opts.get('defer_deploy') and deploy_config is not False \
+            and not inline_script_config:
+        # Cloud.run_map waits for all the VMs of the map at once and runs
+        # the deploy with run_deferred_deploy once this VM is reachable
+        deferred = dict(deploy_kwargs)
+        del deferred['opts']
+        ret['deferred_deploy'] = deferred
+        return ret
+
     fire_event(
         'event',
         'executing deploy script',
@@ -668,6 +682,47 @@ def bootstrap(vm_, opts=None):
     }
 
 
+def run_deferred_deploy(deploy_kwargs, opts):
+    '''
+    Run a deploy that :func:`bootstrap` left to the caller because
+    ``defer_deploy`` was set, returning the same data bootstrap would have.
+    '''
+    deploy_kwargs = dict(deploy_kwargs, opts=opts)
+    name = deploy_kwargs['name']
+    event_kwargs = dict((key, val) for key, val in six.iteritems(deploy_kwargs)
+                        if key not in ('opts', 'minion_pem', 'minion_pub',
+                                       'sudo_password', 'password'))
+    fire_event(
+        'event',
+        'executing deploy script',
+        'salt/cloud/{0}/deploying'.format(name),
+        args={'kwargs': salt.utils.data.simple_types_filter(event_kwargs)},
+        sock_dir=opts.get(
+            'sock_dir',
+            os.path.join(__opts__['sock_dir'], 'master')),
+        transport=opts.get('transport', 'zeromq')
+    )
+
+    if deploy_kwargs.get('win_installer'):
+        deployed = deploy_windows(**deploy_kwargs)
+    else:
+        deployed = deploy_script(**deploy_kwargs)
+
+    if deployed is not False:
+        ret = {'deployed': True}
+        if deployed is not True:
+            ret.update(deployed)
+        log.info('Salt installed on %s', name)
+        return ret
+
+    log.error('Failed to start Salt on host %s', name)
+    return {
+        'Error': {
+            'Not Deployed': 'Failed to start Salt on host {0}'.format(name)
+        }
+    }
+
+
 def ssh_usernames(vm_, opts, default_users=None):
     '''
     Return the ssh_usernames. Defaults to a built-in list of users for trying.
@@ -699,6 +754,97 @@ def ssh_usernames(vm_, opts, default_users=None):
     return usernames
 
 
+def backoff_delay(trycount, interval=1, max_interval=10):
+    '''
+    Return how long to sleep before the next attempt of a retry loop: the
+    interval doubles with every try up to ``max_interval``, or ``interval``
+    if that is larger, and a random jitter spreads the retries of many hosts
+    polled at the same time.
+    '''
+    delay = min(max(interval, max_interval),
+                interval * 2 ** max(trycount - 1, 0))
+    return random.uniform(delay / 2.0, delay)
+
+
+class ReadinessWaiter(object):
+    '''
+    Wait for TCP ports on many hosts at once.
+
+    All the ports are probed concurrently from a single IO loop, every host
+    retrying with :func:`backoff_delay` until it accepts a connection or its
+    timeout expires.
+
+    .. code-block:: python
+
+        waiter = ReadinessWaiter()
+        waiter.add('web1', '10.0.0.4', 22)
+        waiter.add('win1', '10.0.0.5', 445, timeout=300)
+        ready = waiter.run()  # {'web1': True, 'win1': False}
+    '''
+    def __init__(self, interval=1, max_interval=10, connect_timeout=5):
+        self.interval = interval
+        self.max_interval = max_interval
+        self.connect_timeout = connect_timeout
+        self.targets = {}
+
+    def add(self, key, host, port=22, timeout=900):
+        '''
+        Wait for ``port`` on ``host``, the result is reported under ``key``
+        '''
+        self.targets[key] = (host, int(port), timeout)
+
+    def run(self, callback=None):
+        '''
+        Wait for all the targets and return a dict mapping every key to
+        whether its port became reachable. ``callback`` is called with the key
+        of every target as soon as it is reachable.
+        '''
+        if not self.targets:
+            return {}
+        io_loop = tornado.ioloop.IOLoop()
+        try:
+            return io_loop.run_sync(lambda: self._wait_all(callback))
+        finally:
+            io_loop.close(all_fds=True)
+
+    @tornado.gen.coroutine
+    def _wait_all(self, callback):
+        client = tornado.tcpclient.TCPClient()
+        keys = list(self.targets)
+        results = yield [self._wait(client, key, callback) for key in keys]
+        raise tornado.gen.Return(dict(zip(keys, results)))
+
+    @tornado.gen.coroutine
+    def _wait(self, client, key, callback):
+        host, port, timeout = self.targets[key]
+        deadline = time.time() + timeout
+        log.debug('Attempting connection to host %s on port %s', host, port)
+        trycount = 0
+        while True:
+            trycount += 1
+            try:
+                stream = yield tornado.gen.with_timeout(
+                    datetime.timedelta(seconds=self.connect_timeout),
+                    client.connect(host, port))
+                stream.close()
+                break
+            except (IOError, socket.error, tornado.gen.TimeoutError) as exc:
+                log.debug('Caught exception in ReadinessWaiter: %s', exc)
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                log.error('Port connection to %s on port %s timed out: %s',
+                          host, port, timeout)
+                raise tornado.gen.Return(False)
+            yield tornado.gen.sleep(
+                min(remaining,
+                    backoff_delay(trycount, self.interval, self.max_interval)))
+            log.debug('Retrying connection to host %s on port %s (try %s)',
+                      host, port, trycount)
+        if callback is not None:
+            callback(key)
+        raise tornado.gen.Return(True)
+
+
 def wait_for_fun(fun, timeout=900, **kwargs):
     '''
     Wait until a function finishes, or times out
@@ -714,7 +860,7 @@ def wait_for_fun(fun, timeout=900, **kwargs):
                 return response
         except Exception as exc:
             log.debug('Caught exception in wait_for_fun: %s', exc)
-            time.sleep(1)
+            time.sleep(backoff_delay(trycount))
             log.debug('Retrying function %s on  (try %s)', fun, trycount)
         if time.time() - start > timeout:
             log.error('Function timed out: %s', timeout)
@@ -770,7 +916,7 @@ def wait_for_port(host, port=22, timeout=900, gateway=None):
             break
         except socket.error as exc:
             log.debug('Caught exception in wait_for_port: %s', exc)
-            time.sleep(1)
+            time.sleep(backoff_delay(trycount))
             if time.time() - start > timeout:
                 log.error('Port connection timed out: %s', timeout)
                 return False
@@ -1093,7 +1239,7 @@ def wait_for_winrm(host, port, username, password, timeout=900, use_ssl=True, ve
             'Retrying WinRM connection to host %s on port %s (try %s)',
             host, port, trycount
         )
-        time.sleep(1)
+        time.sleep(backoff_delay(trycount))
 
 
 def validate_windows_cred_winexe(host,
@@ -1188,7 +1334,7 @@ def wait_for_passwd(host, port=22, ssh_timeout=15, username='root',
             if status != 0:
                 connectfail = True
                 if trycount < maxtries:
-                    time.sleep(trysleep)
+                    time.sleep(backoff_delay(trycount, trysleep))
                     continue
 
                 log.error('Authentication failed: status code %s', status)
@@ -1201,7 +1347,7 @@ def wait_for_passwd(host, port=22, ssh_timeout=15, username='root',
         except Exception:
             if trycount >= maxtries:
                 return False
-            time.sleep(trysleep)
+            time.sleep(backoff_delay(trycount, trysleep))
 
 
 def deploy_windows(host,
@@ -251,3 +251,143 @@ class NamespacedDictWrapper(MutableMapping, dict):
 
     def __str__(self):
         return self._dict().__str__()
+
+
+class CopyOnWriteDict(dict):
+    '''
+    A dict layered on top of a shared ``base`` dict, used to derive a modified
+    set of options without deep-copying all of them.
+
+    The top level keys of ``base`` are copied by reference. Mutable values
+    (dicts, lists and sets) are deep-copied the first time they are looked up
+    through this dict, so the nested data of ``base`` is never changed from
+    here and options which are never looked at are never copied. ``base``
+    must not be changed by its owner while the overlay is in use.
+
+    It inherits from dict so it can be serialized through msgpack and
+    passed on to code checking for a dict. ``__iter__`` is overridden so that
+    ``dict(cow)``, ``dict.update`` and ``**cow`` look the values up through
+    ``__getitem__`` instead of taking them straight from the dict storage.
+    Use :py:meth:`view` where a shallow copy would be made, e.g. by the
+    loader for the ``__opts__`` of the modules.
+    '''
+    _MUTABLE = (dict, list, set)
+
+    def __init__(self, base, **overrides):  # pylint: disable=W0231
+        dict.__init__(self)
+        if isinstance(base, CopyOnWriteDict):
+            # Take the values as they are stored, without copying them
+            dict.update(self, dict.items(base))
+        else:
+            dict.update(self, base)
+        # Keys whose value is private to this dict and can be handed out as is
+        self._owned = set()
+        # The dict a view looks its values up in, see view()
+        self._parent = None
+        # The shared values of the keys whose value was copied
+        self._origin = {}
+        self.update(overrides)
+
+    def _source(self, key):
+        '''
+        Return the value ``key`` was taken from before it was copied
+        '''
+        if key in self._origin:
+            return self._origin[key]
+        return dict.get(self, key)
+
+    def _own(self, key, value):
+        if key not in self._owned:
+            parent = self._parent
+            if parent is not None and key in parent and parent._source(key) is value:
+                # Share the value with the parent, like a shallow copy does
+                value = parent[key]
+                dict.__setitem__(self, key, value)
+            elif isinstance(value, self._MUTABLE):
+                self._origin[key] = value
+                value = copy.deepcopy(value)
+                dict.__setitem__(self, key, value)
+            self._owned.add(key)
+        return value
+
+    def view(self, exclude=()):
+        '''
+        Return a dict standing in for a shallow copy of this one, less the
+        ``exclude`` keys. Its values are only looked up here, and so copied
+        from the base, the first time they are looked up in the view.
+        '''
+        ret = type(self)(self)
+        ret._parent = self
+        for key in exclude:
+            dict.pop(ret, key, None)
+        return ret
+
+    def __getitem__(self, key):
+        return self._own(key, dict.__getitem__(self, key))
+
+    def __setitem__(self, key, val):
+        dict.__setitem__(self, key, val)
+        self._owned.add(key)
+        self._origin.pop(key, None)
+
+    def __delitem__(self, key):
+        dict.__delitem__(self, key)
+        self._owned.discard(key)
+        self._origin.pop(key, None)
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def pop(self, key, *args):
+        if key in self:
+            value = self[key]
+            del self[key]
+            return value
+        return dict.pop(self, key, *args)
+
+    def popitem(self):
+        key = next(iter(self))
+        return key, self.pop(key)
+
+    def clear(self):
+        dict.clear(self)
+        self._owned.clear()
+        self._origin.clear()
+
+    def update(self, *args, **kwargs):
+        for key, val in six.iteritems(dict(*args, **kwargs)):
+            self[key] = val
+
+    def items(self):
+        return [(key, self[key]) for key in self]
+
+    def values(self):
+        return [self[key] for key in self]
+
+    if six.PY2:
+        def iteritems(self):
+            return iter(self.items())
+
+        def itervalues(self):
+            return iter(self.values())
+
+    def copy(self):
+        return type(self)(self)
+
+    __copy__ = copy
+
+    def __deepcopy__(self, memo):
+        return copy.deepcopy(dict(self.items()), memo)
+
+    def __reduce__(self):
+        return (dict, (dict(self.items()),))
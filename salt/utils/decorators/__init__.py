@@ -266,6 +266,47 @@ def memoize(func):
     return _memoize
 
 
+def exec_cache(ttl=60):
+    '''
+    Mark a read-only execution module function whose return may be cached
+    for ``ttl`` seconds and shared between jobs when ``exec_cache`` is enabled
+    in the minion config. The function is not wrapped here, the loader does
+    that when it loads the module.
+
+    .. versionadded:: Neon
+
+    .. code-block:: python
+
+        @salt.utils.decorators.exec_cache(ttl=30)
+        def usage(args=None):
+            ...
+    '''
+    def _decorate(func):
+        func.__exec_cache_ttl__ = ttl
+        return func
+    return _decorate
+
+
+def invalidates_exec_cache(*patterns):
+    '''
+    Mark an execution module function which changes the system, so the
+    cached results of the functions matching ``patterns`` are dropped when it
+    runs.
+
+    .. versionadded:: Neon
+
+    .. code-block:: python
+
+        @salt.utils.decorators.invalidates_exec_cache('disk.*')
+        def wipe(device):
+            ...
+    '''
+    def _decorate(func):
+        func.__exec_cache_invalidates__ = patterns
+        return func
+    return _decorate
+
+
 class _DeprecationDecorator(object):
     '''
     Base mix-in class for the deprecation decorator.
@@ -109,7 +109,86 @@ def merge_overwrite(obj_a, obj_b, merge_lists=False):
     return merge_recurse(obj_a, obj_b, merge_lists=merge_lists)
 
 
-def merge(obj_a, obj_b, strategy='smart', renderer='yaml', merge_lists=False):
+def _update_owned(dest, upd, merge_lists=False):
+    # Same as update(), but everything taken from upd is copied so dest never
+    # ends up sharing data with it
+    if (not isinstance(dest, Mapping)) \
+            or (not isinstance(upd, Mapping)):
+        raise TypeError('Cannot update using non-dict types in dictupdate.update()')
+    for key in list(upd.keys()):
+        val = upd[key]
+        try:
+            dest_subkey = dest.get(key, None)
+        except AttributeError:
+            dest_subkey = None
+        if isinstance(dest_subkey, Mapping) \
+                and isinstance(val, Mapping):
+            dest[key] = _update_owned(dest_subkey, val, merge_lists=merge_lists)
+        elif merge_lists and isinstance(dest_subkey, list) \
+                and isinstance(val, list):
+            dest_subkey.extend([copy.deepcopy(x) for x in val if x not in dest_subkey])
+            dest[key] = dest_subkey
+        else:
+            dest[key] = copy.deepcopy(val)
+    return dest
+
+
+def merge_recurse_into(obj_a, obj_b, merge_lists=False):
+    '''
+    Same result as merge_recurse, but obj_b is merged into obj_a in place
+    instead of into a deep copy of it. obj_a and everything in it must be
+    owned by the caller, obj_b is left untouched.
+    '''
+    return _update_owned(obj_a, obj_b, merge_lists=merge_lists)
+
+
+def merge_aggregate_into(obj_a, obj_b):
+    '''
+    Same result as merge_aggregate, but the top level of obj_a is updated in
+    place instead of being copied. The nested data is never changed.
+    '''
+    if not isinstance(obj_a, dict) or not isinstance(obj_b, dict):
+        return merge_aggregate(obj_a, obj_b)
+    from salt.serializers.yamlex import AggregatedMap, AggregatedSequence
+    from salt.utils.aggregation import aggregate, mark
+    obj_a = mark(obj_a, map_class=AggregatedMap, sequence_class=AggregatedSequence)
+    for key, value in six.iteritems(obj_b):
+        if key in obj_a:
+            # merge_aggregate merges the root level only (level=1)
+            value = aggregate(obj_a[key], value, 0,
+                              map_class=AggregatedMap,
+                              sequence_class=AggregatedSequence)
+        obj_a[key] = value
+    return obj_a
+
+
+def merge_overwrite_into(obj_a, obj_b, merge_lists=False):
+    '''
+    Same result as merge_overwrite, with obj_a updated in place. The values
+    of obj_b replace the ones of obj_a as a whole, so merge_lists has no
+    effect.
+    '''
+    for key in obj_b:
+        obj_a[key] = copy.deepcopy(obj_b[key])
+    return obj_a
+
+
+def merge(obj_a, obj_b, strategy='smart', renderer='yaml', merge_lists=False,
+          in_place=False):
+    '''
+    Merge obj_b into obj_a using the given strategy and return the result.
+
+    With ``in_place=True`` obj_a is an accumulator owned by the caller which
+    may be changed and returned instead of copied. Only use the returned
+    value afterwards.
+    '''
+    if in_place:
+        recurse, overwrite = merge_recurse_into, merge_overwrite_into
+        aggregate = merge_aggregate_into
+    else:
+        recurse, overwrite = merge_recurse, merge_overwrite
+        aggregate = merge_aggregate
+
     if strategy == 'smart':
         if renderer.split('|')[-1] == 'yamlex' or renderer.startswith('yamlex_'):
             strategy = 'aggregate'
@@ -119,22 +198,22 @@ def merge(obj_a, obj_b, strategy='smart', renderer='yaml', merge_lists=False):
     if strategy == 'list':
         merged = merge_list(obj_a, obj_b)
     elif strategy == 'recurse':
-        merged = merge_recurse(obj_a, obj_b, merge_lists)
+        merged = recurse(obj_a, obj_b, merge_lists)
     elif strategy == 'aggregate':
         #: level = 1 merge at least root data
-        merged = merge_aggregate(obj_a, obj_b)
+        merged = aggregate(obj_a, obj_b)
     elif strategy == 'overwrite':
-        merged = merge_overwrite(obj_a, obj_b, merge_lists)
+        merged = overwrite(obj_a, obj_b, merge_lists)
     elif strategy == 'none':
         # If we do not want to merge, there is only one pillar passed, so we can safely use the default recurse,
         # we just do not want to log an error
-        merged = merge_recurse(obj_a, obj_b)
+        merged = recurse(obj_a, obj_b)
     else:
         log.warning(
             'Unknown merging strategy \'%s\', fallback to recurse',
             strategy
         )
-        merged = merge_recurse(obj_a, obj_b)
+        merged = recurse(obj_a, obj_b)
 
     return merged
 
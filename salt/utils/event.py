@@ -60,6 +60,7 @@ import hashlib
 import logging
 import datetime
 import sys
+import threading
 
 try:
     from collections.abc import MutableMapping
@@ -68,6 +69,7 @@ except ImportError:
 
 from multiprocessing.util import Finalize
 from salt.ext.six.moves import range
+from salt.ext.six.moves import queue
 
 # Import third party libs
 from salt.ext import six
@@ -78,6 +80,7 @@ import tornado.iostream
 import salt.config
 import salt.payload
 import salt.utils.asynchronous
+import salt.utils.atomicfile
 import salt.utils.cache
 import salt.utils.dicttrim
 import salt.utils.files
@@ -1178,6 +1181,139 @@ class EventPublisher(salt.utils.process.SignalHandlingMultiprocessingProcess):
         self.close()
 
 
+class EventReturnWriter(threading.Thread):
+    '''
+    Background thread handing batches of events to a single event returner
+
+    Batches are queued on a bounded queue so a slow returner does not stall
+    the reading of the event bus. When the queue is full the batch is written
+    to a journal in ``spill_dir`` instead, and journaled batches are replayed
+    once the returner has caught up and when the writer starts again.
+    '''
+    def __init__(self, name, returner, maxsize=100, spill_dir=None, serial=None):
+        super(EventReturnWriter, self).__init__(
+            name='EventReturnWriter({0})'.format(name))
+        self.daemon = True
+        self.returner_name = name
+        self.returner = returner
+        self.queue = queue.Queue(maxsize)
+        self.spill_dir = spill_dir
+        self.serial = serial or salt.payload.Serial({})
+        self.stats = {'written': 0,
+                      'spilled': 0,
+                      'dropped': 0,
+                      'errors': 0,
+                      'last_flush_latency': 0.0,
+                      'max_flush_latency': 0.0}
+        self._spill_count = 0
+        self._stopping = threading.Event()
+
+    def put(self, events):
+        '''
+        Queue a batch of events, spilling it to disk if the queue is full
+        '''
+        try:
+            self.queue.put_nowait(events)
+        except queue.Full:
+            self._spill(events)
+
+    def get_stats(self):
+        '''
+        Return the queue depth and flush latency of this writer
+        '''
+        ret = dict(self.stats)
+        ret['queue_depth'] = self.queue.qsize()
+        ret['journal_depth'] = len(self._journal())
+        return ret
+
+    def _journal(self):
+        if not self.spill_dir or not os.path.isdir(self.spill_dir):
+            return []
+        return sorted(fn_ for fn_ in os.listdir(self.spill_dir)
+                      if fn_.endswith('.p'))
+
+    def _spill(self, events):
+        if not self.spill_dir:
+            log.error('Event returner %s is falling behind, dropping %d '
+                      'event(s)', self.returner_name, len(events))
+            self.stats['dropped'] += len(events)
+            return
+        self._spill_count += 1
+        path = os.path.join(
+            self.spill_dir,
+            '{0:.6f}-{1:06d}.p'.format(time.time(), self._spill_count))
+        try:
+            if not os.path.isdir(self.spill_dir):
+                os.makedirs(self.spill_dir)
+            with salt.utils.atomicfile.atomic_open(path, 'wb') as fp_:
+                self.serial.dump(events, fp_)
+            self.stats['spilled'] += len(events)
+        except (IOError, OSError) as exc:
+            log.error('Unable to journal %d event(s) for returner %s: %s',
+                      len(events), self.returner_name, exc)
+            self.stats['dropped'] += len(events)
+
+    def _replay(self):
+        for fn_ in self._journal():
+            if not self.queue.empty() and not self._stopping.is_set():
+                # Serve the live events first
+                return
+            path = os.path.join(self.spill_dir, fn_)
+            try:
+                with salt.utils.files.fopen(path, 'rb') as fp_:
+                    events = self.serial.load(fp_)
+                os.remove(path)
+            except (IOError, OSError) as exc:
+                log.error('Unable to replay journaled events from %s: %s',
+                          path, exc)
+                continue
+            self._write(events)
+
+    def _write(self, events):
+        start = time.time()
+        try:
+            self.returner(events)
+            self.stats['written'] += len(events)
+        except Exception as exc:
+            self.stats['errors'] += 1
+            log.error('Could not store events - returner \'%s\' raised '
+                      'exception: %s', self.returner_name, exc)
+            # don't waste processing power unnecessarily on converting a
+            # potentially huge dataset to a string
+            if log.level <= logging.DEBUG:
+                log.debug('Event data that caused an exception: %s', events)
+        latency = time.time() - start
+        self.stats['last_flush_latency'] = latency
+        self.stats['max_flush_latency'] = max(
+            self.stats['max_flush_latency'], latency)
+
+    def run(self):
+        self._replay()
+        while True:
+            try:
+                events = self.queue.get(timeout=1)
+            except queue.Empty:
+                if self._stopping.is_set():
+                    break
+                self._replay()
+                continue
+            self._write(events)
+
+    def stop(self, timeout=5):
+        '''
+        Write out the queued batches within ``timeout`` seconds and journal
+        whatever is left after that
+        '''
+        self._stopping.set()
+        if self.is_alive():
+            self.join(timeout)
+        while True:
+            try:
+                self._spill(self.queue.get_nowait())
+            except queue.Empty:
+                break
+
+
 class EventReturn(salt.utils.process.SignalHandlingMultiprocessingProcess):
     '''
     A dedicated process which listens to the master event bus and queues
@@ -1208,6 +1344,10 @@ class EventReturn(salt.utils.process.SignalHandlingMultiprocessingProcess):
         self.minion = salt.minion.MasterMinion(local_minion_opts)
         self.event_queue = []
         self.stop = False
+        self.flush_interval = self.opts.get('event_return_flush_interval', 0)
+        self.stats_interval = self.opts.get('event_return_stats_interval', 0)
+        self.last_flush = self.last_stats = time.time()
+        self.writers = {}
 
     # __setstate__ and __getstate__ are only used on Windows.
     # We do this so that __init__ will be invoked on Windows in the child
@@ -1231,9 +1371,45 @@ class EventReturn(salt.utils.process.SignalHandlingMultiprocessingProcess):
         # Flush and terminate
         if self.event_queue:
             self.flush_events()
+        self._stop_writers()
         self.stop = True
         super(EventReturn, self)._handle_signals(signum, sigframe)
 
+    def _start_writers(self):
+        '''
+        Start a background writer per configured event returner
+        '''
+        returners = self.opts['event_return']
+        if not isinstance(returners, list):
+            returners = [returners]
+        serial = salt.payload.Serial(self.opts)
+        for r in returners:
+            event_return = '{0}.event_return'.format(r)
+            if event_return not in self.minion.returners:
+                continue
+            writer = EventReturnWriter(
+                r,
+                self.minion.returners[event_return],
+                maxsize=self.opts.get('event_return_async_queue', 100),
+                spill_dir=os.path.join(self.opts['cachedir'], 'event_return', r),
+                serial=serial)
+            writer.start()
+            self.writers[event_return] = writer
+
+    def _stop_writers(self):
+        writers, self.writers = self.writers, {}
+        for writer in six.itervalues(writers):
+            writer.stop(self.opts.get('event_return_flush_timeout', 5))
+
+    def get_stats(self):
+        '''
+        Return the backlog and flush latency of the event returners
+        '''
+        ret = {'pending': len(self.event_queue)}
+        for event_return, writer in six.iteritems(self.writers):
+            ret[event_return] = writer.get_stats()
+        return ret
+
     def flush_events(self):
         if isinstance(self.opts['event_return'], list):
             # Multiple event returners
@@ -1250,9 +1426,12 @@ class EventReturn(salt.utils.process.SignalHandlingMultiprocessingProcess):
                 )
             self._flush_event_single(event_return)
         del self.event_queue[:]
+        self.last_flush = time.time()
 
     def _flush_event_single(self, event_return):
-        if event_return in self.minion.returners:
+        if event_return in self.writers:
+            self.writers[event_return].put(list(self.event_queue))
+        elif event_return in self.minion.returners:
             try:
                 self.minion.returners[event_return](self.event_queue)
             except Exception as exc:
@@ -1273,21 +1452,36 @@ class EventReturn(salt.utils.process.SignalHandlingMultiprocessingProcess):
         '''
         salt.utils.process.appendproctitle(self.__class__.__name__)
         self.event = get_event('master', opts=self.opts, listen=True)
-        events = self.event.iter_events(full=True)
         self.event.fire_event({}, 'salt/event_listen/start')
+        if self.opts.get('event_return_async', False):
+            self._start_writers()
+        # Wake up regularly even on a quiet bus to honour the flush and
+        # stats intervals
+        wait = min([5] + [interval for interval in (self.flush_interval, self.stats_interval)
+                          if interval > 0])
         try:
-            for event in events:
-                if event['tag'] == 'salt/event/exit':
-                    self.stop = True
-                if self._filter(event):
-                    self.event_queue.append(event)
-                if len(self.event_queue) >= self.event_return_queue:
+            while True:
+                event = self.event.get_event(wait=wait, full=True)
+                if event is not None:
+                    if event['tag'] == 'salt/event/exit':
+                        self.stop = True
+                    if self._filter(event):
+                        self.event_queue.append(event)
+                    if len(self.event_queue) >= self.event_return_queue:
+                        self.flush_events()
+                now = time.time()
+                if self.event_queue and self.flush_interval > 0 \
+                        and now - self.last_flush >= self.flush_interval:
                     self.flush_events()
+                if self.stats_interval > 0 and now - self.last_stats >= self.stats_interval:
+                    self.last_stats = now
+                    self.event.fire_event(self.get_stats(), 'salt/event_return/stats')
                 if self.stop:
                     break
         finally:  # flush all we have at this moment
             if self.event_queue:
                 self.flush_events()
+            self._stop_writers()
 
     def _filter(self, event):
         '''
@@ -21,12 +21,12 @@ import time
 import tornado.ioloop
 import weakref
 from datetime import datetime
+from multiprocessing.pool import ThreadPool
 
 # Import salt libs
 import salt.utils.configparser
 import salt.utils.data
 import salt.utils.files
-import salt.utils.gzip_util
 import salt.utils.hashutils
 import salt.utils.itertools
 import salt.utils.path
@@ -36,6 +36,7 @@ import salt.utils.url
 import salt.utils.user
 import salt.utils.versions
 import salt.fileserver
+from salt.config import DEFAULT_INTERVAL as _DEFAULT_INTERVAL
 from salt.config import DEFAULT_MASTER_OPTS as _DEFAULT_MASTER_OPTS
 from salt.utils.odict import OrderedDict
 from salt.utils.process import os_is_running as pid_exists
@@ -451,6 +452,13 @@ class GitProvider(object):
                                             'links',
                                             self.cachedir_basename)
 
+        # Results of the most recent fetch, and bookkeeping used to back off
+        # from remotes which repeatedly fail to fetch.
+        self.fetch_error = None
+        self.fetch_bytes = None
+        self.fetch_failures = 0
+        self.fetch_retry_after = 0
+
         if not os.path.isdir(self.cachedir):
             os.makedirs(self.cachedir)
 
@@ -767,8 +775,12 @@ class GitProvider(object):
         local copy was already up-to-date, return False.
 
         This function requires that a _fetch() function be implemented in a
-        sub-class.
+        sub-class. The sub-class may set ``fetch_bytes`` to the amount of data
+        received, and ``fetch_error`` if the fetch failed without raising an
+        exception.
         '''
+        self.fetch_error = None
+        self.fetch_bytes = None
         try:
             with self.gen_lock(lock_type='update'):
                 log.debug('Fetching %s remote \'%s\'', self.role, self.id)
@@ -1768,14 +1780,17 @@ class Pygit2(GitProvider):
                     self.role, self.id, exc,
                     exc_info=True
                 )
+            self.fetch_error = get_error_message(exc)
             return False
         try:
             # pygit2.Remote.fetch() returns a dict in pygit2 < 0.21.0
             received_objects = fetch_results['received_objects']
+            self.fetch_bytes = fetch_results.get('received_bytes')
         except (AttributeError, TypeError):
             # pygit2.Remote.fetch() returns a class instance in
             # pygit2 >= 0.21.0
             received_objects = fetch_results.received_objects
+            self.fetch_bytes = getattr(fetch_results, 'received_bytes', None)
         if received_objects != 0:
             log.debug(
                 '%s received %s objects for remote \'%s\'',
@@ -2346,8 +2361,42 @@ class GitBase(object):
             errors.extend(failed)
         return cleared, errors
 
+    def _fetch_remote(self, repo):
+        '''
+        Fetch a single remote and return a dictionary of statistics for the
+        fetch (whether or not it changed anything, how long it took, how many
+        bytes were received, and the error if the fetch failed).
+        '''
+        start = time.time()
+        changed = False
+        try:
+            # We can't just use the return value from repo.fetch() to
+            # determine if anything changed, because the data could still have
+            # changed if old remotes were cleared. The caller handles this.
+            changed = bool(repo.fetch())
+        except Exception as exc:
+            log.error(
+                'Exception caught while fetching %s remote \'%s\': %s',
+                self.role, repo.id, exc,
+                exc_info=True
+            )
+            repo.fetch_error = six.text_type(exc)
+        stats = {'changed': changed,
+                 'duration': round(time.time() - start, 3),
+                 'bytes': repo.fetch_bytes}
+        if repo.fetch_error:
+            stats['error'] = repo.fetch_error
+        return stats
+
     def fetch_remotes(self, remotes=None):
         '''
+        .. versionchanged:: Neon
+            Remotes can now be fetched concurrently (see the
+            ``{role}_fetch_workers`` config option), and remotes which fail to
+            fetch repeatedly can be backed off from (see the
+            ``{role}_fetch_backoff`` config option). Per-remote statistics for
+            the fetch are stored in the ``fetch_stats`` attribute.
+
         Fetch all remotes and return a boolean to let the calling function know
         whether or not any remotes were updated in the process of fetching
         '''
@@ -2360,25 +2409,71 @@ class GitBase(object):
             )
             remotes = []
 
-        changed = False
+        workers = self.opts.get('{0}_fetch_workers'.format(self.role), 1)
+        backoff = self.opts.get('{0}_fetch_backoff'.format(self.role), 0)
+        self.fetch_stats = {}
+
+        now = time.time()
+        to_fetch = []
         for repo in self.remotes:
             name = getattr(repo, 'name', None)
-            if not remotes or (repo.id, name) in remotes:
-                try:
-                    if repo.fetch():
-                        # We can't just use the return value from repo.fetch()
-                        # because the data could still have changed if old
-                        # remotes were cleared above. Additionally, we're
-                        # running this in a loop and later remotes without
-                        # changes would override this value and make it
-                        # incorrect.
-                        changed = True
-                except Exception as exc:
-                    log.error(
-                        'Exception caught while fetching %s remote \'%s\': %s',
-                        self.role, repo.id, exc,
-                        exc_info=True
+            if remotes and (repo.id, name) not in remotes:
+                continue
+            if backoff and repo.fetch_retry_after > now:
+                log.debug(
+                    'Skipping fetch of %s remote \'%s\' after %d consecutive '
+                    'failures, next attempt in %d seconds',
+                    self.role, repo.id, repo.fetch_failures,
+                    repo.fetch_retry_after - now
+                )
+                self.fetch_stats[repo.id] = {
+                    'changed': False,
+                    'skipped': True,
+                    'failures': repo.fetch_failures,
+                }
+                continue
+            to_fetch.append(repo)
+
+        workers = min(workers, len(to_fetch))
+        if workers > 1:
+            log.debug(
+                'Fetching %d %s remotes using %d workers',
+                len(to_fetch), self.role, workers
+            )
+            pool = ThreadPool(workers)
+            try:
+                results = pool.map(self._fetch_remote, to_fetch)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            results = [self._fetch_remote(repo) for repo in to_fetch]
+
+        changed = False
+        for repo, stats in zip(to_fetch, results):
+            if 'error' in stats:
+                repo.fetch_failures += 1
+                if backoff and repo.fetch_failures > 1:
+                    interval = getattr(repo, 'update_interval', None) \
+                        or _DEFAULT_INTERVAL
+                    delay = min(
+                        backoff,
+                        interval * 2 ** (repo.fetch_failures - 1)
                     )
+                    repo.fetch_retry_after = time.time() + delay
+                    stats['retry_after'] = delay
+                    log.warning(
+                        '%s remote \'%s\' has failed to fetch %d times in a '
+                        'row, backing off for %d seconds',
+                        self.role, repo.id, repo.fetch_failures, delay
+                    )
+            else:
+                repo.fetch_failures = 0
+                repo.fetch_retry_after = 0
+            stats['failures'] = repo.fetch_failures
+            if stats['changed']:
+                changed = True
+            self.fetch_stats[repo.id] = stats
         return changed
 
     def lock(self, remote=None):
@@ -2410,6 +2505,10 @@ class GitBase(object):
             it will only update matching remotes. This actually matches on
             repo.id
 
+        .. versionchanged:: Neon
+            Per-remote fetch statistics are now included in the fileserver
+            event under the ``remotes`` key, and this data is returned.
+
         Execute a git fetch on all of the repos and perform maintenance on the
         fileserver cache.
         '''
@@ -2420,6 +2519,7 @@ class GitBase(object):
         data['changed'] = self.clear_old_remotes()
         if self.fetch_remotes(remotes=remotes):
             data['changed'] = True
+        data['remotes'] = self.fetch_stats
 
         # A masterless minion will need a new env cache file even if no changes
         # were fetched.
@@ -2458,6 +2558,7 @@ class GitBase(object):
         except (OSError, IOError):
             # Hash file won't exist if no files have yet been served up
             pass
+        return data
 
     def update_intervals(self):
         '''
@@ -2873,15 +2974,14 @@ class GitFS(GitBase):
         ret['dest'] = fnd['rel']
         gzip = load.get('gzip', None)
         fpath = os.path.normpath(fnd['path'])
-        with salt.utils.files.fopen(fpath, 'rb') as fp_:
-            fp_.seek(load['loc'])
-            data = fp_.read(self.opts['file_buffer_size'])
-            if data and six.PY3 and not salt.utils.files.is_binary(fpath):
-                data = data.decode(__salt_system_encoding__)
-            if gzip and data:
-                data = salt.utils.gzip_util.compress(data, gzip)
-                ret['gzip'] = gzip
-            ret['data'] = data
+        data = salt.fileserver.read_chunk(self.opts,
+                                          fpath,
+                                          load['loc'],
+                                          gzip=gzip,
+                                          decode=True)
+        if gzip and data:
+            ret['gzip'] = gzip
+        ret['data'] = data
         return ret
 
     def file_hash(self, load, fnd):
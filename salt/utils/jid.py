@@ -5,6 +5,7 @@ Functions for creating and working with job IDs
 from __future__ import absolute_import, print_function, unicode_literals
 from calendar import month_abbr as months
 import datetime
+import fnmatch
 import hashlib
 import os
 
@@ -119,6 +120,94 @@ def format_jid_instance_ext(jid, job):
     return ret
 
 
+def time_to_jid(value):
+    '''
+    Return the jid of a job started at ``value``, a datetime. Jids sort by
+    their start time, so this is used to bound the jids when filtering jobs by
+    time. Anything else is assumed to be a jid already.
+    '''
+    if isinstance(value, datetime.datetime):
+        return '{0:%Y%m%d%H%M%S%f}'.format(value)
+    return six.text_type(value)
+
+
+def jid_bounds(start_time=None, end_time=None, cursor=None):
+    '''
+    Return a tuple of the lowest (inclusive) and the highest (exclusive) jid of
+    the jobs started between ``start_time`` and ``end_time`` and before the
+    ``cursor`` jid. A bound which is not set is None.
+    '''
+    low = time_to_jid(start_time) if start_time else None
+    high = None
+    if end_time:
+        # ``~`` sorts after the digits and the ``_`` of suffixed jids
+        high = time_to_jid(end_time) + '~'
+    if cursor:
+        cursor = six.text_type(cursor)
+        high = cursor if high is None else min(high, cursor)
+    return low, high
+
+
+def in_jid_bounds(jid, low=None, high=None):
+    '''
+    Check a jid against the bounds returned by :py:func:`jid_bounds`
+    '''
+    jid = six.text_type(jid)
+    return (low is None or jid >= low) and (high is None or jid < high)
+
+
+def _patterns(value):
+    if isinstance(value, six.string_types):
+        return [pat.strip() for pat in value.split(',') if pat.strip()]
+    return [six.text_type(pat) for pat in value]
+
+
+def match_job(job, fun=None, user=None, tgt=None):
+    '''
+    Check a job load against the glob patterns given for its function, user
+    and target, each one a list or a comma separated string. A job targeting a
+    list of minions matches if any of them matches.
+    '''
+    if fun and not any(fnmatch.fnmatch(job.get('fun', ''), pat)
+                       for pat in _patterns(fun)):
+        return False
+    if user and not any(fnmatch.fnmatch(job.get('user', 'root'), pat)
+                        for pat in _patterns(user)):
+        return False
+    if tgt:
+        targets = job.get('tgt', '')
+        if isinstance(targets, six.string_types):
+            targets = [targets]
+        if not any(fnmatch.fnmatch(six.text_type(target), pat)
+                   for target in targets for pat in _patterns(tgt)):
+            return False
+    return True
+
+
+def filter_jobs(jobs, count=None, filter_find_job=True, fun=None, user=None, tgt=None):
+    '''
+    Return the ``count`` most recent jobs matching the filters, formatted with
+    :py:func:`format_jid_instance_ext` and oldest first, from an iterable of
+    ``(jid, load)`` tuples sorted newest first. The iterable is only consumed
+    until enough jobs matched, so returners can hand in a generator which
+    fetches the loads lazily. This backs the ``get_jids_filter`` returner
+    function.
+    '''
+    ret = []
+    for jid, job in jobs:
+        if not job:
+            continue
+        if filter_find_job and job.get('fun') == 'saltutil.find_job':
+            continue
+        if not match_job(job, fun=fun, user=user, tgt=tgt):
+            continue
+        ret.append(format_jid_instance_ext(jid, job))
+        if count and len(ret) >= count:
+            break
+    ret.reverse()
+    return ret
+
+
 def jid_dir(jid, job_dir=None, hash_type='sha256'):
     '''
     Return the jid_dir for the given job id
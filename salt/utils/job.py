@@ -8,27 +8,27 @@ from __future__ import absolute_import, unicode_literals
 import logging
 
 # Import Salt libs
-import salt.minion
 import salt.utils.jid
-import salt.utils.event
 import salt.utils.verify
 
 log = logging.getLogger(__name__)
 
 
-def store_job(opts, load, event=None, mminion=None):
+def _valid_load(opts, load):
     '''
-    Store job information using the configured master_job_cache
+    Return whether a job return can be stored
     '''
-    # Generate EndTime
-    endtime = salt.utils.jid.jid_to_time(salt.utils.jid.gen_jid(opts))
-    # If the return data is invalid, just ignore it
     if any(key not in load for key in ('return', 'jid', 'id')):
         return False
-    if not salt.utils.verify.valid_id(opts, load['id']):
-        return False
-    if mminion is None:
-        mminion = salt.minion.MasterMinion(opts, states=False, rend=False)
+    return salt.utils.verify.valid_id(opts, load['id'])
+
+
+def _store_load(opts, load, mminion, event=None, prep_jid=True):
+    '''
+    Prepare the jid of a job return, fire its events and save its load.
+    Return whether the return itself goes to the master_job_cache.
+    '''
+    import salt.utils.event
 
     job_cache = opts['master_job_cache']
     if load['jid'] == 'req':
@@ -53,7 +53,7 @@ def store_job(opts, load, event=None, mminion=None):
             emsg = "Returner '{0}' does not support function save_load".format(job_cache)
             log.error(emsg)
             raise KeyError(emsg)
-    elif salt.utils.jid.is_jid(load['jid']):
+    elif prep_jid and salt.utils.jid.is_jid(load['jid']):
         # Store the jid
         jidstore_fstr = '{0}.prep_jid'.format(job_cache)
         try:
@@ -73,19 +73,18 @@ def store_job(opts, load, event=None, mminion=None):
     # if you have a job_cache, or an ext_job_cache, don't write to
     # the regular master cache
     if not opts['job_cache'] or opts.get('ext_job_cache'):
-        return
+        return False
 
     # do not cache job results if explicitly requested
     if load.get('jid') == 'nocache':
         log.debug('Ignoring job return with jid for caching %s from %s',
                   load['jid'], load['id'])
-        return
+        return False
 
     # otherwise, write to the master cache
     savefstr = '{0}.save_load'.format(job_cache)
     getfstr = '{0}.get_load'.format(job_cache)
     fstr = '{0}.returner'.format(job_cache)
-    updateetfstr = '{0}.update_endtime'.format(job_cache)
     if 'fun' not in load and load.get('return', {}):
         ret_ = load.get('return', {})
         if 'fun' in ret_:
@@ -108,19 +107,85 @@ def store_job(opts, load, event=None, mminion=None):
             mminion.returners[savefstr](load['jid'], load)
         except KeyError as e:
             log.error("Load does not contain 'jid': %s", e)
+    return True
 
-    mminion.returners[fstr](load)
 
+def store_job(opts, load, event=None, mminion=None):
+    '''
+    Store job information using the configured master_job_cache
+    '''
+    # Imported here, the CLI only needs get_retcode() from this module
+    import salt.minion
+
+    # Generate EndTime
+    endtime = salt.utils.jid.jid_to_time(salt.utils.jid.gen_jid(opts))
+    # If the return data is invalid, just ignore it
+    if not _valid_load(opts, load):
+        return False
+    if mminion is None:
+        mminion = salt.minion.MasterMinion(opts, states=False, rend=False)
+
+    if not _store_load(opts, load, mminion, event=event):
+        return
+
+    job_cache = opts['master_job_cache']
+    mminion.returners['{0}.returner'.format(job_cache)](load)
+
+    updateetfstr = '{0}.update_endtime'.format(job_cache)
     if (opts.get('job_cache_store_endtime')
             and updateetfstr in mminion.returners):
         mminion.returners[updateetfstr](load['jid'], endtime)
 
 
+def store_jobs(opts, loads, event=None, mminion=None):
+    '''
+    Store a batch of job returns using the configured master_job_cache
+
+    When the returner provides ``returner_batch`` all the returns are written
+    with a single call to it, otherwise they are stored one by one.
+    '''
+    import salt.minion
+
+    if mminion is None:
+        mminion = salt.minion.MasterMinion(opts, states=False, rend=False)
+
+    job_cache = opts['master_job_cache']
+    batch_fstr = '{0}.returner_batch'.format(job_cache)
+    if batch_fstr not in mminion.returners:
+        for load in loads:
+            store_job(opts, load, event=event, mminion=mminion)
+        return
+
+    endtime = salt.utils.jid.jid_to_time(salt.utils.jid.gen_jid(opts))
+    prepped = set()
+    batch = []
+    for load in loads:
+        if not _valid_load(opts, load):
+            continue
+        # Prepare every jid only once
+        prep_jid = load['jid'] not in prepped
+        prepped.add(load['jid'])
+        if _store_load(opts, load, mminion, event=event, prep_jid=prep_jid):
+            batch.append(load)
+
+    if not batch:
+        return
+    mminion.returners[batch_fstr](batch)
+
+    updateetfstr = '{0}.update_endtime'.format(job_cache)
+    if (opts.get('job_cache_store_endtime')
+            and updateetfstr in mminion.returners):
+        for jid in set(load['jid'] for load in batch):
+            mminion.returners[updateetfstr](jid, endtime)
+
+
 def store_minions(opts, jid, minions, mminion=None, syndic_id=None):
     '''
     Store additional minions matched on lower-level masters using the configured
     master_job_cache
     '''
+    import salt.minion
+
     if mminion is None:
         mminion = salt.minion.MasterMinion(opts, states=False, rend=False)
     job_cache = opts['master_job_cache']
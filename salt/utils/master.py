@@ -9,9 +9,13 @@
 
 # Import python libs
 from __future__ import absolute_import, unicode_literals
+import glob
+import hashlib
 import os
 import logging
 import signal
+import time
+import uuid
 from threading import Thread, Event
 
 # Import salt libs
@@ -21,6 +25,7 @@ import salt.client
 import salt.pillar
 import salt.utils.atomicfile
 import salt.utils.files
+import salt.utils.json
 import salt.utils.minions
 import salt.utils.platform
 import salt.utils.stringutils
@@ -32,6 +37,11 @@ from salt.utils.cache import CacheCli as cache_cli
 from salt.utils.process import MultiprocessingProcess
 
 # pylint: disable=import-error
+try:
+    import fcntl
+except ImportError:
+    pass
+
 try:
     import salt.utils.psutil_compat as psutil
     HAS_PSUTIL = True
@@ -441,6 +451,11 @@ class MasterPillarUtil(object):
             # to read in the pillar/grains data since they are both stored
             # in the same file, 'data.p'
             grains, pillars = self._get_cached_minion_data(*minion_ids)
+        mine_views = None
+        if (clear_mine or clear_mine_func is not None) \
+                and self.opts.get('mine_views', False):
+            # Keep the mine views in step with the cleared mine data
+            mine_views = salt.utils.minions.MineViews(self.opts, self.cache)
         try:
             c_minions = self.cache.list('minions')
             for minion_id in minion_ids:
@@ -464,18 +479,220 @@ class MasterPillarUtil(object):
                     self.cache.store(bank, 'data', {'pillar': minion_pillar})
                 if clear_mine:
                     # Delete the whole mine file
+                    if mine_views is not None:
+                        mine_views.update(
+                            minion_id, self.cache.fetch(bank, 'mine'), {})
                     self.cache.flush(bank, 'mine')
                 elif clear_mine_func is not None:
                     # Delete a specific function from the mine file
                     mine_data = self.cache.fetch(bank, 'mine')
                     if isinstance(mine_data, dict):
+                        old = dict(mine_data)
                         if mine_data.pop(clear_mine_func, False):
                             self.cache.store(bank, 'mine', mine_data)
+                            if mine_views is not None:
+                                mine_views.update(minion_id, old, mine_data)
         except (OSError, IOError):
             return True
         return True
 
 
+class PillarCompilePool(object):
+    '''
+    Coordinates pillar compiles between the master's worker processes.
+
+    Concurrent requests for the same pillar (the same minion ID, saltenv,
+    pillarenv, grains and overrides) are coalesced into a single compile:
+    while one worker compiles the pillar, the others wait for it and return
+    its result. The number of compiles running at once is limited by
+    ``slots``, a semaphore shared by all of the workers, and a worker which
+    cannot start its compile within the queue timeout gives up, so that a
+    pillar storm cannot tie up every worker.
+
+    A compiled pillar is only written to disk when other workers are waiting
+    for it, and it is removed as soon as the last of them has read it.
+    '''
+    poll_interval = 0.05
+
+    def __init__(self, opts, slots=None):
+        self.opts = opts
+        self.slots = slots
+        self.cachedir = os.path.join(opts['cachedir'], 'pillar_compile')
+        self.serial = salt.payload.Serial(opts)
+        if not os.path.isdir(self.cachedir):
+            try:
+                os.makedirs(self.cachedir, 0o700)
+            except OSError:
+                # Created by another worker
+                pass
+
+    @staticmethod
+    def request_key(load):
+        '''
+        Return the key identifying identical pillar requests
+        '''
+        data = [load.get(x) for x in ('id', 'saltenv', 'env', 'pillarenv',
+                                      'grains', 'pillar_override', 'ext',
+                                      'extra_minion_data')]
+        return hashlib.sha256(salt.utils.stringutils.to_bytes(
+            salt.utils.json.dumps(data, sort_keys=True, default=repr)
+        )).hexdigest()
+
+    def _lock(self, fh_, deadline):
+        '''
+        Take an exclusive lock on the passed file handle, waiting until the
+        deadline (if any). Returns False if the deadline passed.
+        '''
+        if not salt.utils.files.is_fcntl_available(check_sunos=True):
+            return True
+        while True:
+            try:
+                fcntl.flock(fh_.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return True
+            except (IOError, OSError):
+                if deadline is not None and time.time() >= deadline:
+                    return False
+                time.sleep(self.poll_interval)
+
+    @staticmethod
+    def _same_file(fh_, path):
+        '''
+        Whether the open file is still the one at ``path``, a stale lock file
+        may have been removed by clean() while we waited for it
+        '''
+        try:
+            return os.fstat(fh_.fileno()).st_ino == os.stat(path).st_ino
+        except OSError:
+            return False
+
+    def _waiters(self, key):
+        return glob.glob(os.path.join(self.cachedir, key + '.*.w'))
+
+    def _read_result(self, path, since):
+        '''
+        Return the result of a compile which finished after ``since``, or None
+        '''
+        try:
+            with salt.utils.files.fopen(path, 'rb') as fp_:
+                result = self.serial.load(fp_)
+        except (IOError, OSError, ValueError):
+            return None
+        if not isinstance(result, dict) or result.get('time', 0) < since:
+            return None
+        return result.get('pillar')
+
+    def _write_result(self, path, pillar):
+        # The temp file used by atomic_open is only readable by its owner
+        with salt.utils.atomicfile.atomic_open(path, 'wb') as fp_:
+            self.serial.dump({'time': time.time(), 'pillar': pillar}, fp_)
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def compile(self, load, compile_func, timeout=None):
+        '''
+        Return the pillar for the passed load, either by waiting for an
+        identical compile which is already running, or by running
+        ``compile_func``. Returns None if the compile could not be started
+        within ``timeout`` seconds.
+        '''
+        start = time.time()
+        deadline = start + timeout if timeout else None
+        key = self.request_key(load)
+        path = os.path.join(self.cachedir, key + '.p')
+        lock_path = os.path.join(self.cachedir, key + '.lk')
+        waiter = None
+        try:
+            while True:
+                with salt.utils.files.fopen(lock_path, 'a') as lock_fh:
+                    if waiter is None and not self._lock(lock_fh, start):
+                        # An identical compile is running, tell it that its
+                        # result is wanted
+                        waiter = os.path.join(
+                            self.cachedir,
+                            '{0}.{1}.w'.format(key, uuid.uuid4().hex))
+                        with salt.utils.files.fopen(waiter, 'a'):
+                            pass
+                    if waiter is not None and not self._lock(lock_fh, deadline):
+                        return None
+                    if not self._same_file(lock_fh, lock_path):
+                        continue
+                    os.utime(lock_path, None)
+                    if waiter is not None:
+                        pillar = self._read_result(path, start)
+                        self._remove(waiter)
+                        waiter = None
+                        if not self._waiters(key):
+                            self._remove(path)
+                        if pillar is not None:
+                            log.debug('Coalesced pillar compile for minion %s',
+                                      load['id'])
+                            return pillar
+                    return self._compile(load, compile_func, key, path, deadline)
+        finally:
+            if waiter is not None:
+                self._remove(waiter)
+
+    def _compile(self, load, compile_func, key, path, deadline):
+        '''
+        Run the compile while holding the lock for its request
+        '''
+        if self.slots is not None:
+            if deadline is None:
+                self.slots.acquire()
+            elif not self.slots.acquire(
+                    True, max(deadline - time.time(), 0)):
+                return None
+        try:
+            pillar = compile_func()
+        finally:
+            if self.slots is not None:
+                self.slots.release()
+        if self._waiters(key):
+            try:
+                self._write_result(path, pillar)
+            except (IOError, OSError, TypeError) as exc:
+                log.error('Unable to share compiled pillar for minion %s: %s',
+                          load['id'], exc)
+        return pillar
+
+    def clean(self, max_age=300):
+        '''
+        Remove results and waiter markers left behind by workers which died,
+        and lock files which have not been used for ``max_age`` seconds plus
+        the compile queue timeout and are not held
+        '''
+        if not os.path.isdir(self.cachedir):
+            return
+        now = time.time()
+        lock_age = max_age + (self.opts.get('pillar_compile_queue_timeout') or 0)
+        for fn_ in os.listdir(self.cachedir):
+            path = os.path.join(self.cachedir, fn_)
+            try:
+                age = now - os.path.getmtime(path)
+            except OSError:
+                continue
+            if not fn_.endswith('.lk'):
+                if age > max_age:
+                    self._remove(path)
+                continue
+            if age <= lock_age:
+                continue
+            try:
+                with salt.utils.files.fopen(path, 'a') as lock_fh:
+                    # Only reap locks no compile holds, a compile which opened
+                    # the file before it is removed notices and retries
+                    if self._lock(lock_fh, now) \
+                            and self._same_file(lock_fh, path):
+                        self._remove(path)
+            except (IOError, OSError):
+                pass
+
+
 class CacheTimer(Thread):
     '''
     A basic timer class the fires timer-events every second.
@@ -8,9 +8,11 @@ from __future__ import absolute_import, unicode_literals
 import os
 import logging
 import threading
+from collections import OrderedDict
 
 # Import Salt Libs
 import salt.payload
+import salt.utils.atomicfile
 import salt.utils.files
 import salt.utils.platform
 import salt.utils.process
@@ -59,6 +61,107 @@ def cache_jobs(opts, jid, ret):
         fp_.write(serial.dumps(ret))
 
 
+class JidQueue(object):
+    '''
+    Bounded, insertion-ordered set of recently started jids
+
+    Membership tests and insertions are O(1); once more than ``hwm`` jids
+    have been added the oldest ones are evicted. When a ``path`` is given the
+    jids are loaded from it on creation and every addition is appended to
+    it, so a restarted minion still recognizes publishes it already
+    executed. The file is rewritten with the current jids only once it holds
+    twice ``hwm`` of them.
+    '''
+    def __init__(self, hwm, jids=None, path=None):
+        self.hwm = hwm
+        self.path = path
+        self._jids = OrderedDict()
+        # Number of jids in the file at path
+        self._journal_len = 0
+        if path is not None:
+            for jid in self._load():
+                self._insert(jid)
+                self._journal_len += 1
+        for jid in jids or ():
+            self._insert(jid)
+
+    def __contains__(self, jid):
+        return jid in self._jids
+
+    def __iter__(self):
+        return iter(self._jids)
+
+    def __len__(self):
+        return len(self._jids)
+
+    def __eq__(self, other):
+        if isinstance(other, JidQueue):
+            other = list(other)
+        return list(self) == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        return repr(list(self))
+
+    def _insert(self, jid):
+        if jid in self._jids:
+            return False
+        self._jids[jid] = None
+        while len(self._jids) > self.hwm:
+            self._jids.popitem(last=False)
+        return True
+
+    def _load(self):
+        try:
+            with salt.utils.files.fopen(self.path, 'r') as fp_:
+                return [line.rstrip('\n') for line in fp_ if line.strip()]
+        except (IOError, OSError):
+            return []
+
+    def _append(self, jid):
+        '''
+        Append a jid to the file, compacting it when it grew past twice the
+        high water mark
+        '''
+        try:
+            if self._journal_len >= 2 * self.hwm:
+                with salt.utils.atomicfile.atomic_open(self.path, 'w') as fp_:
+                    fp_.writelines('{0}\n'.format(queued) for queued in self._jids)
+                self._journal_len = len(self._jids)
+            else:
+                with salt.utils.files.fopen(self.path, 'a') as fp_:
+                    fp_.write('{0}\n'.format(jid))
+                self._journal_len += 1
+        except (IOError, OSError) as exc:
+            log.warning('Unable to write jid queue to %s: %s', self.path, exc)
+
+    def add(self, jid):
+        '''
+        Add a jid, return False if it was already present
+        '''
+        if not self._insert(jid):
+            return False
+        if self.path is not None:
+            self._append(jid)
+        return True
+
+
+def jid_queue(opts, jids=None):
+    '''
+    Return the JidQueue used to de-duplicate publishes, persisted to the
+    cachedir when ``minion_jid_queue_persist`` is enabled. An existing
+    JidQueue passed as ``jids`` is returned unchanged so it can be shared.
+    '''
+    if isinstance(jids, JidQueue):
+        return jids
+    path = None
+    if opts.get('minion_jid_queue_persist', False):
+        path = os.path.join(opts['cachedir'], 'jid_queue')
+    return JidQueue(opts['minion_jid_queue_hwm'], jids=jids, path=path)
+
+
 def _read_proc_file(path, opts):
     '''
     Return a dict of JID metadata, or None
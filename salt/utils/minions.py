@@ -8,8 +8,10 @@ expected to return
 from __future__ import absolute_import, unicode_literals
 import os
 import fnmatch
+import hashlib
 import re
 import logging
+import uuid
 
 # Import salt libs
 import salt.payload
@@ -20,7 +22,7 @@ import salt.utils.network
 import salt.utils.stringutils
 import salt.utils.versions
 from salt.defaults import DEFAULT_TARGET_DELIM
-from salt.exceptions import CommandExecutionError, SaltCacheError
+from salt.exceptions import CommandExecutionError, FileLockError, SaltCacheError
 import salt.auth.ldap
 import salt.cache
 from salt.ext import six
@@ -1127,6 +1129,110 @@ class CkMinions(object):
         return False
 
 
+class MineViews(object):
+    '''
+    Materialized per-function views of the mine
+
+    Each view is stored in the ``mine_views`` cache bank under the function
+    name and maps minion ids to the data that minion sent for the function,
+    together with a version that changes whenever the view does. The views
+    are updated incrementally as minions send mine data, so looking up a
+    function for many minions costs a single cache fetch.
+    '''
+    bank = 'mine_views'
+
+    def __init__(self, opts, cache=None):
+        self.opts = opts
+        self.cache = cache if cache is not None else salt.cache.factory(opts)
+
+    def _lock_path(self, fun):
+        '''
+        Return the path of the lock guarding the view of a function, so that
+        minions sending data for different functions do not wait for each
+        other
+        '''
+        return os.path.join(
+            self.opts['cachedir'],
+            'mine_views.{0}'.format(hashlib.sha256(
+                salt.utils.stringutils.to_bytes(fun)).hexdigest()))
+
+    def _build(self, fun):
+        '''
+        Build the view for a function from the per-minion mine data
+        '''
+        data = {}
+        for minion in self.cache.list('minions'):
+            mdata = self.cache.fetch('minions/{0}'.format(minion), 'mine')
+            if isinstance(mdata, dict) and fun in mdata:
+                data[minion] = mdata[fun]
+        view = {'version': uuid.uuid4().hex, 'data': data}
+        self.cache.store(self.bank, fun, view)
+        return view
+
+    def get(self, fun):
+        '''
+        Return the view of a function, building it if it does not exist yet
+        '''
+        view = self.cache.fetch(self.bank, fun)
+        if isinstance(view, dict) and 'data' in view:
+            return view
+        with salt.utils.files.wait_lock(self._lock_path(fun), timeout=10):
+            view = self.cache.fetch(self.bank, fun)
+            if isinstance(view, dict) and 'data' in view:
+                return view
+            return self._build(fun)
+
+    def update(self, minion, old, new):
+        '''
+        Apply the change of a minion's mine data from ``old`` to ``new`` to
+        the views of the functions which changed
+        '''
+        old = old if isinstance(old, dict) else {}
+        new = new if isinstance(new, dict) else {}
+        changed = [fun for fun in set(old) | set(new)
+                   if fun not in old or fun not in new or old[fun] != new[fun]]
+        for fun in changed:
+            try:
+                with salt.utils.files.wait_lock(self._lock_path(fun), timeout=10):
+                    view = self.cache.fetch(self.bank, fun)
+                    if not isinstance(view, dict) or 'data' not in view:
+                        # The new data is already in the minion's mine
+                        self._build(fun)
+                        continue
+                    if fun in new:
+                        view['data'][minion] = new[fun]
+                    else:
+                        view['data'].pop(minion, None)
+                    view['version'] = uuid.uuid4().hex
+                    self.cache.store(self.bank, fun, view)
+            except FileLockError as exc:
+                log.error('Unable to update the mine view of %s, flushing '
+                          'it: %s', fun, exc)
+                self.cache.flush(self.bank, fun)
+
+    def lookup(self, minions, functions, ret_dict):
+        '''
+        Return the mine data of ``functions`` for ``minions`` in the format
+        of ``mine.get``, and an etag identifying that result
+        '''
+        minions = set(minions)
+        ret = {}
+        versions = []
+        for fun in sorted(set(functions)):
+            view = self.get(fun)
+            versions.append((fun, view['version']))
+            for minion, data in six.iteritems(view['data']):
+                if minion not in minions:
+                    continue
+                if ret_dict:
+                    ret.setdefault(fun, {})[minion] = data
+                else:
+                    ret[minion] = data
+        etag = hashlib.sha256(salt.utils.stringutils.to_bytes(
+            repr((ret_dict, versions, sorted(minions))))).hexdigest()
+        return ret, etag
+
+
 def mine_get(tgt, fun, tgt_type='glob', opts=None):
     '''
     Gathers the data from the specified minions' mine, pass in the target,
@@ -1150,6 +1256,9 @@ def mine_get(tgt, fun, tgt_type='glob', opts=None):
     else:
         return {}
 
+    if opts.get('mine_views', False):
+        return MineViews(opts, cache).lookup(minions, functions, _ret_dict)[0]
+
     for minion in minions:
         mdata = cache.fetch('minions/{0}'.format(minion), 'mine')
 
@@ -32,7 +32,6 @@ import salt.utils.files
 import salt.utils.path
 import salt.utils.platform
 import salt.utils.stringutils
-import salt.utils.zeromq
 from salt._compat import ipaddress
 from salt.exceptions import SaltClientError, SaltSystemExit
 from salt.utils.decorators.jinja import jinja_filter
@@ -1917,6 +1916,9 @@ def dns_check(addr, port=80, safe=False, ipv6=None, attempt_connect=True):
     Tries to connect to the address before considering it useful. If no address
     can be reached, the first one resolved is used as a fallback.
     '''
+    # Imported here to keep zmq and tornado out of the CLI startup path
+    import salt.utils.zeromq
+
     error = False
     lookup = addr
     seen_ipv6 = False
@@ -39,7 +39,6 @@ import salt.utils.platform
 import salt.utils.process
 import salt.utils.stringutils
 import salt.utils.user
-import salt.utils.win_functions
 import salt.utils.xdg
 import salt.utils.yaml
 from salt.defaults import DEFAULT_TARGET_DELIM
@@ -1002,8 +1001,9 @@ class DaemonMixIn(six.with_metaclass(MixInMeta, object)):
                     err_msg = ('PIDfile could not be deleted: %s',
                                six.text_type(self.config['pidfile']))
                     if salt.utils.platform.is_windows():
-                        user = salt.utils.win_functions.get_current_user()
-                        if salt.utils.win_functions.is_admin(user):
+                        import salt.utils.win_functions as win_functions
+                        user = win_functions.get_current_user()
+                        if win_functions.is_admin(user):
                             logger.info(*err_msg)
                             logger.debug(six.text_type(err))
                     else:
@@ -1055,7 +1055,8 @@ class DaemonMixIn(six.with_metaclass(MixInMeta, object)):
                     return True
             else:
                 # We have no os.getppid() on Windows. Use salt.utils.win_functions.get_parent_pid
-                if self.check_pidfile() and self.is_daemonized(pid) and salt.utils.win_functions.get_parent_pid() != pid:
+                import salt.utils.win_functions as win_functions
+                if self.check_pidfile() and self.is_daemonized(pid) and win_functions.get_parent_pid() != pid:
                     return True
         return False
 
@@ -2086,6 +2087,14 @@ class SaltCMDOptionParser(six.with_metaclass(OptionParserMeta,
             help=('Wait the specified time in seconds after each job is done '
                   'before freeing the slot in the batch for the next one.')
         )
+        self.add_option(
+            '--batch-server-side',
+            default=False,
+            dest='batch_server_side',
+            action='store_true',
+            help=('Let the master drive the batch run. It keeps running if '
+                  'this command is interrupted.')
+        )
         self.add_option(
             '--batch-safe-limit',
             default=0,
@@ -2148,6 +2157,15 @@ class SaltCMDOptionParser(six.with_metaclass(OptionParserMeta,
             action='store_true',
             help=('Display summary information about a salt command.')
         )
+        self.add_option(
+            '--stream-output',
+            dest='cli_stream_output',
+            default=False,
+            action='store_true',
+            help=('Hand each minion return to the outputter as soon as it '
+                  'comes in and write the output incrementally. With the '
+                  'json outputter this prints one JSON document per line.')
+        )
         self.add_option(
             '--metadata',
             default='',
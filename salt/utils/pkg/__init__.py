@@ -10,6 +10,8 @@ import os
 import re
 
 # Import Salt libs
+import salt.payload
+import salt.utils.atomicfile
 import salt.utils.data
 import salt.utils.files
 import salt.utils.versions
@@ -67,6 +69,91 @@ def check_refresh(opts, refresh=None):
     )
 
 
+def inventory_stamp(paths):
+    '''
+    Return the modification time, size and inode of each of ``paths`` that
+    exists, or ``None`` if none of them do. A persistent package inventory is
+    only used while the stamp of the package database it was built from is
+    unchanged.
+    '''
+    stamp = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        stamp.append([path,
+                      getattr(st, 'st_mtime_ns', st.st_mtime),
+                      st.st_size,
+                      st.st_ino])
+    return stamp or None
+
+
+def inventory_path(opts, name):
+    '''
+    Return the location of the persistent package inventory ``name``
+    '''
+    return os.path.join(opts['cachedir'], 'pkg_inventory', '{0}.p'.format(name))
+
+
+def _use_inventory(opts, stamp):
+    return (stamp is not None
+            and 'cachedir' in opts
+            and opts.get('pkg_inventory_cache', True))
+
+
+def read_inventory(opts, name, stamp):
+    '''
+    Return the data of the persistent package inventory ``name`` if it was
+    built for ``stamp``, otherwise ``None``
+    '''
+    if not _use_inventory(opts, stamp):
+        return None
+    path = inventory_path(opts, name)
+    try:
+        with salt.utils.files.fopen(path, 'rb') as fp_:
+            cached = salt.payload.Serial(opts).load(fp_)
+    except (IOError, OSError, ValueError):
+        return None
+    if not isinstance(cached, dict) or cached.get('stamp') != stamp:
+        return None
+    log.trace('Using package inventory %s', path)
+    return cached.get('data')
+
+
+def write_inventory(opts, name, stamp, data):
+    '''
+    Store ``data`` as the persistent package inventory ``name`` for the
+    package database state ``stamp``. The stamp has to be taken before the
+    package database is queried, so a change made while the query runs makes
+    the stored inventory stale instead of wrong.
+    '''
+    if not _use_inventory(opts, stamp):
+        return
+    path = inventory_path(opts, name)
+    try:
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        with salt.utils.atomicfile.atomic_open(path, 'wb') as fp_:
+            salt.payload.Serial(opts).dump({'stamp': stamp, 'data': data}, fp_)
+    except (IOError, OSError) as exc:
+        log.warning('Unable to write package inventory %s: %s', path, exc)
+
+
+def clear_inventory(opts, name):
+    '''
+    Remove the persistent package inventory ``name``
+    '''
+    if 'cachedir' not in opts:
+        return
+    try:
+        os.remove(inventory_path(opts, name))
+    except OSError as exc:
+        if exc.errno != errno.ENOENT:
+            log.warning('Encountered error removing package inventory: %s',
+                        exc.__str__())
+
+
 def split_comparison(version):
     match = re.match(r'^(<=>|!=|>=|<=|>>|<<|<>|>|<|=)?\s?([^<>=]+)$', version)
     if match:
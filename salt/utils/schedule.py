@@ -22,6 +22,7 @@ import itertools
 import threading
 import logging
 import errno
+import heapq
 import random
 import weakref
 
@@ -73,6 +74,19 @@ except ImportError:
 
 log = logging.getLogger(__name__)
 
+_TIME_ELEMENTS = ('seconds', 'minutes', 'hours', 'days')
+_SCHEDULING_ELEMENTS = ('when', 'cron', 'once')
+
+# Option combinations a job can not use together, a job using all the options
+# of any of these sets is ignored
+_INVALID_SCHED_COMBOS = [
+    set(i) for i in itertools.combinations(_SCHEDULING_ELEMENTS, 2)
+]
+_INVALID_TIME_COMBOS = [
+    set(itertools.combinations(itertools.chain([item], _TIME_ELEMENTS), 2))
+    for item in _SCHEDULING_ELEMENTS
+]
+
 
 class Schedule(object):
     '''
@@ -153,6 +167,7 @@ class Schedule(object):
         self.schedule_returner = self.option('schedule_returner')
         # Keep track of the lowest loop interval needed in this variable
         self.loop_interval = six.MAXSIZE
+        self._schedule_changed()
         if not self.standalone:
             clean_proc_dir(opts)
         if cleanup:
@@ -198,6 +213,84 @@ class Schedule(object):
                             del schedule[job][item]
         return schedule
 
+    def _schedule_changed(self):
+        '''
+        Forget the next fire times, the next call to eval evaluates every job
+        '''
+        # Min-heap of (next fire time, job name) of the jobs which only need
+        # to be looked at once their next fire time has come
+        self._fire_heap = None
+        # The fire time of the live heap entry of each job
+        self._fire_times = {}
+        # Jobs which are evaluated on every call to eval
+        self._always_due = set()
+        self._fingerprint = None
+
+    def _fingerprint_schedule(self, schedule):
+        '''
+        Return a cheap fingerprint which changes when jobs are added, removed
+        or replaced in the schedule, or when the pillar or grains are reloaded
+        '''
+        return (frozenset((job, id(data)) for job, data in six.iteritems(schedule)),
+                id(self.opts.get('pillar')),
+                id(self.opts.get('grains')))
+
+    def _due_jobs(self, schedule, now):
+        '''
+        Return the names of the jobs eval has to look at, or None when all of
+        them have to be evaluated because the schedule changed
+        '''
+        fingerprint = self._fingerprint_schedule(schedule)
+        if self._fire_heap is None or fingerprint != self._fingerprint:
+            self._schedule_changed()
+            self._fire_heap = []
+            self._fingerprint = fingerprint
+            return None
+        due = set(self._always_due)
+        # eval compares the fire times at the second, drop the microseconds
+        horizon = now - datetime.timedelta(microseconds=now.microsecond) \
+            + datetime.timedelta(seconds=1)
+        while self._fire_heap and self._fire_heap[0][0] < horizon:
+            fire_time, job = heapq.heappop(self._fire_heap)
+            if self._fire_times.get(job) == fire_time:
+                del self._fire_times[job]
+                due.add(job)
+        return due
+
+    def _track_fire_time(self, job, data):
+        '''
+        Record when eval has to look at a job again after evaluating it
+        '''
+        fire_time = data.get('_next_fire_time') if isinstance(data, dict) else None
+        if not isinstance(fire_time, datetime.datetime) \
+                or data.get('_error') \
+                or data.get('_run_on_start') \
+                or 'run_explicit' in data:
+            self._fire_times.pop(job, None)
+            self._always_due.add(job)
+            return
+        self._always_due.discard(job)
+        if self._fire_times.get(job) != fire_time:
+            self._fire_times[job] = fire_time
+            heapq.heappush(self._fire_heap, (fire_time, job))
+
+    def _iter_due_jobs(self, schedule, now, hidden):
+        '''
+        Yield the jobs of the schedule eval has to look at, and record when
+        to look at them again once eval is done with them
+        '''
+        due = self._due_jobs(schedule, now)
+        evaluated = []
+        try:
+            for job, data in six.iteritems(schedule):
+                if job in hidden or (due is not None and job not in due):
+                    continue
+                evaluated.append(job)
+                yield job, data
+        finally:
+            for job in evaluated:
+                self._track_fire_time(job, schedule[job])
+
     def _check_max_running(self, func, data, opts, now):
         '''
         Return the schedule data structure
@@ -284,6 +377,7 @@ class Schedule(object):
         '''
         Deletes a job from the scheduler. Ignore jobs from pillar
         '''
+        self._schedule_changed()
         # ensure job exists, then delete it
         if name in self.opts['schedule']:
             del self.opts['schedule'][name]
@@ -307,6 +401,7 @@ class Schedule(object):
         '''
         Reset the scheduler to defaults
         '''
+        self._schedule_changed()
         self.skip_function = None
         self.skip_during_range = None
         self.enabled = True
@@ -317,6 +412,7 @@ class Schedule(object):
         '''
         Deletes a job from the scheduler. Ignores jobs from pillar
         '''
+        self._schedule_changed()
         # ensure job exists, then delete it
         for job in list(self.opts['schedule'].keys()):
             if job.startswith(name):
@@ -345,6 +441,7 @@ class Schedule(object):
         the configuration file. See the docs on how YAML is interpreted into
         python data-structures to make sure, you pass correct dictionaries.
         '''
+        self._schedule_changed()
 
         # we don't do any checking here besides making sure its a dict.
         # eval() already does for us and raises errors accordingly
@@ -385,6 +482,7 @@ class Schedule(object):
         '''
         Enable a job in the scheduler. Ignores jobs from pillar
         '''
+        self._schedule_changed()
         # ensure job exists, then enable it
         if name in self.opts['schedule']:
             self.opts['schedule'][name]['enabled'] = True
@@ -405,6 +503,7 @@ class Schedule(object):
         '''
         Disable a job in the scheduler. Ignores jobs from pillar
         '''
+        self._schedule_changed()
         # ensure job exists, then disable it
         if name in self.opts['schedule']:
             self.opts['schedule'][name]['enabled'] = False
@@ -425,6 +524,7 @@ class Schedule(object):
         '''
         Modify a job in the scheduler. Ignores jobs from pillar
         '''
+        self._schedule_changed()
         # ensure job exists, then replace it
         if name in self.opts['schedule']:
             self.delete_job(name, persist)
@@ -473,6 +573,7 @@ class Schedule(object):
         '''
         Enable the scheduler.
         '''
+        self._schedule_changed()
         self.opts['schedule']['enabled'] = True
 
         # Fire the complete event back along with updated list of schedule
@@ -484,6 +585,7 @@ class Schedule(object):
         '''
         Disable the scheduler.
         '''
+        self._schedule_changed()
         self.opts['schedule']['enabled'] = False
 
         # Fire the complete event back along with updated list of schedule
@@ -495,6 +597,7 @@ class Schedule(object):
         '''
         Reload the schedule from saved schedule file.
         '''
+        self._schedule_changed()
         # Remove all jobs from self.intervals
         self.intervals = {}
 
@@ -534,6 +637,7 @@ class Schedule(object):
         Postpone a job in the scheduler.
         Ignores jobs from pillar
         '''
+        self._schedule_changed()
         time = data['time']
         new_time = data['new_time']
         time_fmt = data.get('time_fmt', '%Y-%m-%dT%H:%M:%S')
@@ -564,6 +668,7 @@ class Schedule(object):
         Skip a job at a specific time in the scheduler.
         Ignores jobs from pillar
         '''
+        self._schedule_changed()
         time = data['time']
         time_fmt = data.get('time_fmt', '%Y-%m-%dT%H:%M:%S')
 
@@ -1320,7 +1425,11 @@ class Schedule(object):
                    'skip_function',
                    'skip_during_range',
                    'splay']
-        for job, data in six.iteritems(schedule):
+
+        if not now:
+            now = datetime.datetime.now()
+
+        for job, data in self._iter_due_jobs(schedule, now, _hidden):
 
             # Skip anything that is a global setting
             if job in _hidden:
@@ -1376,38 +1485,22 @@ class Schedule(object):
                     '_run_on_start' not in data:
                 data['_run_on_start'] = True
 
-            if not now:
-                now = datetime.datetime.now()
-
             # Used for quick lookups when detecting invalid option
             # combinations.
             schedule_keys = set(data.keys())
 
-            time_elements = ('seconds', 'minutes', 'hours', 'days')
-            scheduling_elements = ('when', 'cron', 'once')
-
-            invalid_sched_combos = [
-                set(i) for i in itertools.combinations(scheduling_elements, 2)
-            ]
-
-            if any(i <= schedule_keys for i in invalid_sched_combos):
+            if any(i <= schedule_keys for i in _INVALID_SCHED_COMBOS):
                 log.error(
                     'Unable to use "%s" options together. Ignoring.',
-                    '", "'.join(scheduling_elements)
+                    '", "'.join(_SCHEDULING_ELEMENTS)
                 )
                 continue
 
-            invalid_time_combos = []
-            for item in scheduling_elements:
-                all_items = itertools.chain([item], time_elements)
-                invalid_time_combos.append(
-                    set(itertools.combinations(all_items, 2)))
-
-            if any(set(x) <= schedule_keys for x in invalid_time_combos):
+            if any(set(x) <= schedule_keys for x in _INVALID_TIME_COMBOS):
                 log.error(
                     'Unable to use "%s" with "%s" options. Ignoring',
-                    '", "'.join(time_elements),
-                    '", "'.join(scheduling_elements)
+                    '", "'.join(_TIME_ELEMENTS),
+                    '", "'.join(_SCHEDULING_ELEMENTS)
                 )
                 continue
 
@@ -1415,7 +1508,7 @@ class Schedule(object):
                 _handle_run_explicit(data, loop_interval)
                 run = data['run']
 
-            if True in [True for item in time_elements if item in data]:
+            if True in [True for item in _TIME_ELEMENTS if item in data]:
                 _handle_time_elements(data)
             elif 'once' in data:
                 _handle_once(data, loop_interval)
@@ -0,0 +1,305 @@
+# -*- coding: utf-8 -*-
+'''
+Helpers used to forward job returns from a syndic to its master of masters.
+
+The syndic aggregates the returns it sees during
+``syndic_event_forward_timeout`` into ``_syndic_return`` loads. The functions
+in here split those loads into requests of a bounded size, optionally
+compress them and delta-encode state returns against the previous run of the
+same function on the same minion. The master side reverses all of that.
+'''
+
+# Import Python libs
+from __future__ import absolute_import, print_function, unicode_literals
+import copy
+import hashlib
+import logging
+import zlib
+
+# Import Salt libs
+import salt.payload
+import salt.utils.json
+import salt.utils.stringutils
+
+# Import 3rd-party libs
+from salt.ext import six
+
+try:
+    import zstandard
+    HAS_ZSTD = True
+except ImportError:
+    HAS_ZSTD = False
+
+log = logging.getLogger(__name__)
+
+# Functions whose returns are highstate data and can be delta-encoded
+STATE_FUNS = frozenset((
+    'state.apply',
+    'state.highstate',
+    'state.sls',
+    'state.sls_id',
+    'state.top',
+))
+
+# Fields of a state result which change on every run
+VOLATILE_KEYS = ('start_time', 'duration')
+
+DELTA_KEY = '__delta__'
+BASE_KEY = '__delta_base__'
+
+
+def compression_method(opts):
+    '''
+    Return the compression to use for syndic return batches, falling back to
+    zlib when zstd was asked for but is not available
+    '''
+    method = opts.get('syndic_return_compression')
+    if not method:
+        return None
+    if method == 'zstd' and not HAS_ZSTD:
+        log.warning(
+            'syndic_return_compression is set to zstd but the zstandard '
+            'library is not installed, using zlib instead'
+        )
+        return 'zlib'
+    if method not in ('zlib', 'zstd'):
+        log.error('Unknown syndic_return_compression %s, not compressing', method)
+        return None
+    return method
+
+
+def compress(data, method):
+    '''
+    Compress ``data`` with the given method
+    '''
+    if method == 'zstd':
+        return zstandard.ZstdCompressor().compress(data)
+    return zlib.compress(data)
+
+
+def decompress(data, method):
+    '''
+    Decompress ``data`` with the given method
+    '''
+    if method == 'zstd':
+        if not HAS_ZSTD:
+            raise ValueError('Received a zstd compressed syndic return but '
+                             'the zstandard library is not installed')
+        return zstandard.ZstdDecompressor().decompress(data)
+    if method == 'zlib':
+        return zlib.decompress(data)
+    raise ValueError('Unknown syndic return compression {0}'.format(method))
+
+
+def chunk_loads(loads, size):
+    '''
+    Split a list of ``_syndic_return`` loads into lists holding at most
+    ``size`` minion returns each. A load with more returns than that is split
+    into several loads for the same jid, only the first one carries the job
+    load.
+    '''
+    if not size or size <= 0:
+        return [loads] if loads else []
+    chunks = []
+    current = []
+    count = 0
+    for load in loads:
+        returns = list(six.iteritems(load.get('return', {})))
+        first = True
+        while returns or first:
+            room = size - count
+            part = copy.copy(load)
+            if not first:
+                part['load'] = {}
+            part['return'] = dict(returns[:room])
+            returns = returns[room:]
+            first = False
+            current.append(part)
+            count += len(part['return'])
+            if count >= size:
+                chunks.append(current)
+                current = []
+                count = 0
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _strip(state_ret):
+    return dict((key, val) for key, val in six.iteritems(state_ret)
+                if key not in VOLATILE_KEYS)
+
+
+def _digest(data):
+    return hashlib.sha256(
+        salt.utils.stringutils.to_bytes(
+            salt.utils.json.dumps(data, sort_keys=True, default=repr)
+        )
+    ).hexdigest()
+
+
+def _is_state_return(ret):
+    return isinstance(ret, dict) and ret and all(
+        isinstance(val, dict) and '__run_num__' in val
+        for val in six.itervalues(ret))
+
+
+class DeltaEncoder(object):
+    '''
+    Syndic side of the state return delta encoding. It remembers the digest
+    of every state result of the last run of a state function per minion and
+    replaces results which did not change with their volatile fields.
+
+    One encoder is kept per upstream master, since every master keeps its own
+    copy of the previous runs.
+    '''
+    def __init__(self):
+        # {(minion, fun): (base_digest, {state_key: state_digest})}
+        self.bases = {}
+
+    def forget(self, minion, fun):
+        '''
+        Drop the base for a minion, the next return is sent in full
+        '''
+        self.bases.pop((minion, fun), None)
+
+    def encode(self, load):
+        '''
+        Return a copy of a ``_syndic_return`` load with the state returns
+        delta-encoded
+        '''
+        fun = load.get('fun')
+        if fun not in STATE_FUNS:
+            return load
+        load = copy.copy(load)
+        returns = {}
+        for minion, minion_ret in six.iteritems(load.get('return', {})):
+            returns[minion] = self._encode_minion(minion, fun, minion_ret)
+        load['return'] = returns
+        return load
+
+    def _encode_minion(self, minion, fun, minion_ret):
+        ret = minion_ret.get('return') if isinstance(minion_ret, dict) else None
+        if not _is_state_return(ret):
+            self.forget(minion, fun)
+            return minion_ret
+        digests = dict((key, _digest(_strip(val))) for key, val in six.iteritems(ret))
+        new_base = _digest(digests)
+        old = self.bases.get((minion, fun))
+        self.bases[(minion, fun)] = (new_base, digests)
+        encoded = copy.copy(minion_ret)
+        if old is None:
+            encoded[BASE_KEY] = new_base
+            return encoded
+        old_base, old_digests = old
+        same = {}
+        new = {}
+        for key, val in six.iteritems(ret):
+            if old_digests.get(key) == digests[key]:
+                same[key] = dict((vkey, val[vkey]) for vkey in VOLATILE_KEYS if vkey in val)
+            else:
+                new[key] = val
+        encoded['return'] = {DELTA_KEY: {'base': old_base,
+                                         'next': new_base,
+                                         'same': same,
+                                         'new': new}}
+        return encoded
+
+
+class DeltaDecoder(object):
+    '''
+    Master side of the state return delta encoding. The previous runs are
+    kept in the data cache so every worker process can decode a delta.
+    '''
+    def __init__(self, cache, syndic_id):
+        self.cache = cache
+        self.bank = 'syndic/{0}/deltas'.format(syndic_id)
+
+    @staticmethod
+    def _key(minion, fun):
+        return '{0}|{1}'.format(minion, fun)
+
+    def decode(self, load):
+        '''
+        Restore the delta-encoded state returns of a ``_syndic_return`` load
+        in place. Returns the names of the minions whose return could not be
+        restored because the previous run is not known here, those are
+        removed from the load.
+        '''
+        fun = load.get('fun')
+        missing = []
+        for minion, minion_ret in list(six.iteritems(load.get('return', {}))):
+            if not isinstance(minion_ret, dict):
+                continue
+            key = self._key(minion, fun)
+            if BASE_KEY in minion_ret:
+                base = minion_ret.pop(BASE_KEY)
+                self._store(key, base, minion_ret.get('return'))
+                continue
+            ret = minion_ret.get('return')
+            if not isinstance(ret, dict) or DELTA_KEY not in ret:
+                continue
+            delta = ret[DELTA_KEY]
+            stored = self.cache.fetch(self.bank, key) or {}
+            if stored.get('digest') != delta['base']:
+                log.warning(
+                    'Delta encoded return for %s from %s does not match the '
+                    'stored previous run, asking for the full return',
+                    minion, load.get('id')
+                )
+                del load['return'][minion]
+                missing.append(minion)
+                continue
+            states = {}
+            for state_key, volatile in six.iteritems(delta['same']):
+                state = copy.deepcopy(stored['states'][state_key])
+                state.update(volatile)
+                states[state_key] = state
+            states.update(delta['new'])
+            minion_ret['return'] = states
+            self._store(key, delta['next'], states)
+        return missing
+
+    def _store(self, key, digest, states):
+        if not isinstance(states, dict):
+            return
+        self.cache.store(
+            self.bank,
+            key,
+            {'digest': digest,
+             'states': dict((state_key, _strip(val))
+                            for state_key, val in six.iteritems(states))})
+
+
+def pack(opts, loads, encoder=None):
+    '''
+    Turn a list of ``_syndic_return`` loads into the list of request payloads
+    to send to the master
+    '''
+    if encoder is not None:
+        loads = [encoder.encode(load) for load in loads]
+    method = compression_method(opts)
+    serial = salt.payload.Serial(opts) if method else None
+    payloads = []
+    for chunk in chunk_loads(loads, opts.get('syndic_return_batch_size', 0)):
+        if method:
+            payloads.append({'cmd': '_syndic_return',
+                             'id': opts['id'],
+                             'compression': method,
+                             'load': compress(serial.dumps(chunk), method)})
+        else:
+            payloads.append({'cmd': '_syndic_return', 'load': chunk})
+    return payloads
+
+
+def unpack(opts, load):
+    '''
+    Return the list of ``_syndic_return`` loads carried by a request
+    '''
+    loads = load.get('load')
+    if 'compression' in load:
+        loads = salt.payload.Serial(opts).loads(
+            decompress(loads, load['compression']))
+    if not isinstance(loads, list):
+        loads = [load]  # support old syndics not aggregating returns
+    return loads
@@ -42,11 +42,14 @@ try:
 except ImportError:
     HAS_PYSSS = False
 
-try:
-    import salt.utils.win_functions
-    HAS_WIN_FUNCTIONS = True
-except ImportError:
-    HAS_WIN_FUNCTIONS = False
+HAS_WIN_FUNCTIONS = False
+if salt.utils.platform.is_windows():
+    # win_functions pulls in psutil, only load it where it can be used
+    try:
+        import salt.utils.win_functions
+        HAS_WIN_FUNCTIONS = True
+    except ImportError:
+        pass
 
 log = logging.getLogger(__name__)
 
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+'''
+    tests.support.importtime
+    ~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Measure the import cost of the CLI entry points with ``python -X importtime``
+    and compare it against the tracked budget below.
+
+    Run it directly to get a report::
+
+        python tests/support/importtime.py [--check] [module ...]
+
+    ``--check`` makes the script exit non-zero when an entry point goes over
+    its time budget or imports one of the modules listed in ``DEFERRED``.
+'''
+
+# Import python libs
+from __future__ import absolute_import, print_function, unicode_literals
+import os
+import re
+import sys
+import subprocess
+
+CODE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Cumulative import time budget, in milliseconds, for each CLI entry module.
+# These are measured on a warm bytecode cache and leave some headroom, bump
+# them only together with a note on what made the import more expensive.
+BUDGET = {
+    'salt.cli.call': 800,
+    'salt.cli.key': 800,
+    'salt.cli.run': 800,
+    'salt.cli.salt': 800,
+}
+
+# Modules that the CLI entry points must only import once they are actually
+# needed: crypto, transport, the loader and the templating stack.
+DEFERRED = (
+    'Crypto',
+    'Cryptodome',
+    'M2Crypto',
+    'jinja2',
+    'zmq',
+    'salt.client',
+    'salt.crypt',
+    'salt.loader',
+    'salt.minion',
+    'salt.payload',
+    'salt.pillar',
+    'salt.template',
+    'salt.transport',
+    'salt.utils.event',
+)
+
+IMPORTTIME_RE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$')
+
+
+def measure(module, python=None):
+    '''
+    Import ``module`` in a fresh interpreter with ``-X importtime`` and return
+    a tuple of the cumulative import time in milliseconds and the list of
+    modules that were imported along the way.
+    '''
+    cmd = [python or sys.executable, '-X', 'importtime', '-W', 'ignore',
+           '-c', 'import {0}'.format(module)]
+    env = os.environ.copy()
+    env['PYTHONPATH'] = os.pathsep.join(
+        [CODE_DIR] + [p for p in env.get('PYTHONPATH', '').split(os.pathsep) if p])
+    proc = subprocess.Popen(cmd,
+                            cwd=CODE_DIR,
+                            env=env,
+                            stdout=subprocess.PIPE,
+                            stderr=subprocess.PIPE,
+                            universal_newlines=True)
+    _, stderr = proc.communicate()
+    if proc.returncode != 0:
+        raise RuntimeError(
+            'Failed to import {0}:\n{1}'.format(module, stderr))
+    total = 0
+    imported = []
+    for line in stderr.splitlines():
+        match = IMPORTTIME_RE.match(line)
+        if not match:
+            continue
+        cumulative, name = int(match.group(2)), match.group(4)
+        imported.append(name)
+        if name == module:
+            total = cumulative
+    return total / 1000.0, imported
+
+
+def deferred_imports(imported):
+    '''
+    Return the entries of ``DEFERRED`` that show up in ``imported``
+    '''
+    return [
+        mod for mod in DEFERRED
+        if any(name == mod or name.startswith(mod + '.') for name in imported)
+    ]
+
+
+def main(argv):
+    check = '--check' in argv
+    modules = [arg for arg in argv if not arg.startswith('--')] or sorted(BUDGET)
+    failed = False
+    for module in modules:
+        elapsed, imported = measure(module)
+        budget = BUDGET.get(module)
+        leaked = deferred_imports(imported)
+        status = 'ok'
+        if leaked or (budget is not None and elapsed > budget):
+            status = 'OVER'
+            failed = True
+        print('{0:<20} {1:>8.1f}ms  budget {2:>6}  {3}'.format(
+            module, elapsed, '-' if budget is None else '{0}ms'.format(budget), status))
+        if leaked:
+            print('    imports deferred modules: {0}'.format(', '.join(leaked)))
+    return 1 if check and failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
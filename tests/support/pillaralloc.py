@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+'''
+    tests.support.pillaralloc
+    ~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Measure the memory allocated by constructing ``salt.pillar.Pillar``, with
+    its loaders, for a single pillar compile. Once by deep-copying the master
+    options the way ``Pillar`` used to and once through
+    :class:`salt.utils.context.CopyOnWriteDict`.
+
+    Run it directly to get a report::
+
+        python tests/support/pillaralloc.py [--compiles N]
+'''
+
+# Import python libs
+from __future__ import absolute_import, print_function, unicode_literals
+import copy
+import os
+import shutil
+import sys
+import tempfile
+import tracemalloc
+
+CODE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if CODE_DIR not in sys.path:
+    sys.path.insert(0, CODE_DIR)
+
+# Import Salt libs
+import salt.config  # pylint: disable=wrong-import-position
+import salt.pillar  # pylint: disable=wrong-import-position
+from salt.utils.context import CopyOnWriteDict  # pylint: disable=wrong-import-position
+
+
+def master_opts(cachedir, envs=20, ext_pillars=20, nodegroups=200, tops=100):
+    '''
+    Return master options of a realistic size: the defaults plus a number of
+    file and pillar environments, external pillars, nodegroups and master
+    tops.
+    '''
+    opts = copy.deepcopy(salt.config.DEFAULT_MASTER_OPTS)
+    opts['cachedir'] = cachedir
+    opts['extension_modules'] = os.path.join(cachedir, 'extmods')
+    opts['file_roots'] = dict(
+        ('env{0}'.format(idx), ['/srv/salt/env{0}'.format(idx)])
+        for idx in range(envs))
+    opts['pillar_roots'] = dict(
+        ('env{0}'.format(idx), ['/srv/pillar/env{0}'.format(idx)])
+        for idx in range(envs))
+    opts['ext_pillar'] = [
+        {'cmd_yaml': 'cat /etc/salt/pillar{0}.yaml'.format(idx)}
+        for idx in range(ext_pillars)]
+    opts['nodegroups'] = dict(
+        ('group{0}'.format(idx),
+         'L@' + ','.join('minion{0}'.format(num) for num in range(50)))
+        for idx in range(nodegroups))
+    opts['master_tops'] = dict(
+        ('top{0}'.format(idx), {'cmd': '/usr/local/bin/top{0}'.format(idx),
+                                'args': list(range(50))})
+        for idx in range(tops))
+    opts['id'] = 'master'
+    return opts
+
+
+def grains():
+    '''
+    Return a grains dict of a realistic size
+    '''
+    return dict(('grain{0}'.format(idx), ['value'] * 10) for idx in range(100))
+
+
+def _deepcopy_opts(base, **overrides):
+    # How Pillar derived its options before CopyOnWriteDict
+    opts = copy.deepcopy(base)
+    opts.update(overrides)
+    return opts
+
+
+def measure(compiles=20, overlay=True):
+    '''
+    Return the number of bytes still allocated after constructing the
+    ``Pillar`` of ``compiles`` pillar compiles which are all kept alive, like
+    they are while a master worker compiles pillar for many minions.
+    '''
+    cachedir = tempfile.mkdtemp()
+    try:
+        opts = master_opts(cachedir)
+        minion_grains = grains()
+        salt.pillar.CopyOnWriteDict = CopyOnWriteDict if overlay else _deepcopy_opts
+        # Warm up the loader caches shared by all compiles
+        salt.pillar.Pillar(opts, minion_grains, 'minion', 'base')
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            kept = [salt.pillar.Pillar(opts, minion_grains, 'minion', 'base')
+                    for _ in range(compiles)]
+            after = tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+        del kept
+    finally:
+        salt.pillar.CopyOnWriteDict = CopyOnWriteDict
+        shutil.rmtree(cachedir, ignore_errors=True)
+    return after - before
+
+
+def main(argv):
+    compiles = 20
+    if '--compiles' in argv:
+        compiles = int(argv[argv.index('--compiles') + 1])
+    deep = measure(compiles, overlay=False)
+    cow = measure(compiles, overlay=True)
+    print('deepcopy     {0:>10} bytes  {1:>8} per compile'.format(deep, deep // compiles))
+    print('copy-on-write {0:>9} bytes  {1:>8} per compile'.format(cow, cow // compiles))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -5,8 +5,11 @@
 
 # Import python libs
 from __future__ import absolute_import, print_function, unicode_literals
+import itertools
 
 # Import Salt Libs
+import salt.cli.batch
+import salt.exceptions
 from salt.cli.batch import Batch
 
 # Import Salt Testing Libs
@@ -65,3 +68,46 @@ class BatchTestCase(TestCase):
         '''
         ret = Batch.get_bnum(self.batch)
         self.assertEqual(ret, None)
+
+    def test_server_side_batch(self):
+        '''
+        Tests that a server-side batch yields the returns of its jid until
+        the master reports the batch as done
+        '''
+        local = MagicMock()
+        local.run_job.return_value = {'jid': '1234', 'minions': ['foo', 'bar']}
+        local.event.get_event.side_effect = [
+            {'tag': 'salt/job/1234/ret/foo',
+             'data': {'id': 'foo', 'return': {'a': 1}, 'retcode': 2}},
+            None,
+            {'tag': 'salt/job/9999/ret/bar',
+             'data': {'id': 'bar', 'return': True}},
+            {'tag': 'salt/batch/1234/progress', 'data': {'done': 1}},
+            {'tag': 'salt/job/1234/ret/bar',
+             'data': {'id': 'bar', 'return': True}},
+            {'tag': 'salt/batch/1234/done', 'data': {}},
+        ]
+        opts = {'tgt': '*', 'fun': 'test.ping', 'arg': [], 'batch': '1',
+                'timeout': 5, 'gather_job_timeout': 5}
+        ret = list(salt.cli.batch.server_side_batch(local, opts, quiet=True))
+        self.assertEqual(ret, [{'foo': {'a': 1, 'retcode': 2}}, {'bar': True}])
+        self.assertEqual(local.run_job.call_args[1]['batch'], '1')
+
+    def test_server_side_batch_lost(self):
+        '''
+        Tests that a server-side batch which stops reporting ends with an
+        error once none of the minions runs the job anymore
+        '''
+        local = MagicMock()
+        local.run_job.return_value = {'jid': '1234', 'minions': ['foo']}
+        local.event.get_event.return_value = None
+        local.cmd.side_effect = [{'foo': {'jid': '1234'}}, {'foo': {}}]
+        opts = {'tgt': '*', 'fun': 'test.ping', 'arg': [], 'batch': '1',
+                'timeout': 5, 'gather_job_timeout': 5}
+        clock = MagicMock()
+        clock.time.side_effect = itertools.count(0, 11)
+        with patch('salt.cli.batch.time', clock):
+            self.assertRaises(
+                salt.exceptions.SaltClientError,
+                list, salt.cli.batch.server_side_batch(local, opts, quiet=True))
+        self.assertEqual(local.cmd.call_count, 2)
@@ -96,6 +96,7 @@ class AsyncBatchTestCase(AsyncTestCase, TestCase):
         self.batch.opts = {'batch': '2', 'timeout': 5}
         self.batch.event = MagicMock()
         self.batch.metadata = {'mykey': 'myvalue'}
+        self.batch.schedule_next = MagicMock(return_value=MagicMock())
         self.batch.start_batch()
         self.assertEqual(
             self.batch.event.fire_event.call_args[0],
@@ -363,3 +364,54 @@ class AsyncBatchTestCase(AsyncTestCase, TestCase):
             self.batch.event.io_loop.add_callback.call_args[0],
             (self.batch.find_job, {'foo'})
         )
+
+    def test_batch__event_handler_batch_run_return_fires_progress(self):
+        self.batch.event = MagicMock(
+            unpack=MagicMock(return_value=('salt/job/1235/ret/foo', {'id': 'foo'})))
+        self.batch.start()
+        self.batch.minions = {'foo', 'bar', 'baz'}
+        self.batch.active = {'foo', 'bar'}
+        self.batch._BatchAsync__event_handler(MagicMock())
+        data, tag = self.batch.event.fire_event.call_args[0]
+        self.assertEqual(tag, 'salt/batch/1235/progress')
+        self.assertEqual(
+            (data['done'], data['active'], data['pending'], data['timedout']),
+            (1, 1, 1, 0))
+
+    def test_batch_next_claims_slots_before_publish(self):
+        self.batch.event = MagicMock()
+        self.batch.opts['fun'] = 'my.fun'
+        self.batch.opts['arg'] = []
+        self.batch.minions = {'foo', 'bar'}
+        self.batch.batch_size = 1
+        future = tornado.gen.Future()
+        self.batch.local.run_job_async.return_value = future
+        # the publish is still pending when the second slot check runs
+        self.batch.schedule_next()
+        self.batch.schedule_next()
+        self.assertEqual(self.batch.local.run_job_async.call_count, 1)
+        self.assertEqual(len(self.batch.active), 1)
+
+    @tornado.testing.gen_test
+    def test_batch_next_publish_failure(self):
+        self.batch.event = MagicMock()
+        self.batch.opts['fun'] = 'my.fun'
+        self.batch.opts['arg'] = []
+        self.batch.minions = {'foo', 'bar'}
+        self.batch.batch_size = 1
+        self.batch.initialized = True
+        future = tornado.gen.Future()
+        future.set_exception(Exception('publish failed'))
+        self.batch.local.run_job_async.return_value = future
+        yield self.batch.schedule_next()
+        # the slot is given back and the minion is not waited for
+        self.assertEqual(self.batch.active, set())
+        self.assertEqual(len(self.batch.timedout_minions), 1)
+        self.assertEqual(
+            self.batch.event.io_loop.call_later.call_args[0],
+            (self.batch.batch_delay, self.batch.schedule_next))
+        # once every minion failed the batch ends
+        yield self.batch.schedule_next()
+        self.assertEqual(self.batch.timedout_minions, {'foo', 'bar'})
+        self.assertEqual(
+            len(self.batch.event.remove_event_handler.mock_calls), 1)
@@ -5,11 +5,14 @@ from __future__ import absolute_import, print_function, unicode_literals
 from functools import wraps
 import os
 import io
+import shutil
 import stat
+import tempfile
 
 # Import Salt libs
 import salt.config
 import salt.daemons.masterapi as masterapi
+import salt.utils.master
 import salt.utils.platform
 
 # Import Salt Testing Libs
@@ -561,7 +564,18 @@ class FakeCache(object):
         self.data[bank, key] = value
 
     def fetch(self, bank, key):
-        return self.data[bank, key]
+        return self.data.get((bank, key), {})
+
+    def list(self, bank):
+        prefix = bank + '/'
+        return sorted(set(cbank[len(prefix):] for cbank, _ in self.data
+                          if cbank.startswith(prefix)))
+
+    def flush(self, bank, key=None):
+        for cbank, ckey in list(self.data):
+            if cbank == bank and key in (None, ckey):
+                del self.data[cbank, ckey]
+        return True
 
 
 class RemoteFuncsTestCase(TestCase):
@@ -658,3 +672,68 @@ class RemoteFuncsTestCase(TestCase):
                 }
             )
         self.assertDictEqual(ret, dict(ip_addr=dict(webserver='2001:db8::1:3'), ip4_addr=dict(webserver='127.0.0.1')))
+
+    def test_mine_views(self):
+        '''
+        Asserts that with ``mine_views`` the mine data is served from the
+        per-function views, and that an unchanged result is answered with its
+        etag only.
+        '''
+        self.funcs.opts['mine_views'] = True
+        self.funcs.opts['minion_data_cache'] = True
+        self.funcs.opts['cachedir'] = tempfile.mkdtemp(dir=RUNTIME_VARS.TMP)
+        self.addCleanup(shutil.rmtree, self.funcs.opts['cachedir'], ignore_errors=True)
+        self.funcs.cache.store('minions/webserver', 'mine', dict(ip_addr='10.0.0.1'))
+        # builds the view from the existing mine data
+        self.funcs._mine({'id': 'db', 'data': dict(ip_addr='10.0.0.2', foo='bar')})
+        self.assertEqual(
+            self.funcs.cache.fetch('mine_views', 'ip_addr')['data'],
+            dict(webserver='10.0.0.1', db='10.0.0.2'))
+
+        load = {'id': 'requester_minion', 'tgt': '*', 'fun': 'ip_addr',
+                'tgt_type': 'glob', 'if_none_match': None}
+        with patch('salt.utils.minions.CkMinions.check_minions',
+                   MagicMock(return_value=dict(minions=['webserver', 'db'],
+                                               missing=[]))):
+            ret = self.funcs._mine_get(dict(load))
+            self.assertDictEqual(ret['__mine_data__'],
+                                 dict(webserver='10.0.0.1', db='10.0.0.2'))
+            etag = ret['__mine_etag__']
+
+            load['if_none_match'] = etag
+            self.assertDictEqual(self.funcs._mine_get(dict(load)),
+                                 {'__mine_etag__': etag})
+
+            self.funcs._mine_delete({'id': 'db', 'fun': 'ip_addr'})
+            ret = self.funcs._mine_get(dict(load))
+            self.assertNotEqual(ret['__mine_etag__'], etag)
+            self.assertDictEqual(ret['__mine_data__'], dict(webserver='10.0.0.1'))
+
+            del load['if_none_match']
+            self.assertDictEqual(
+                self.funcs._mine_get(dict(load, fun='ip_addr,foo')),
+                dict(ip_addr=dict(webserver='10.0.0.1'), foo=dict(db='bar')))
+
+    def test_mine_views_cleared(self):
+        '''
+        Asserts that clearing the cached mine data of minions also removes it
+        from the mine views.
+        '''
+        self.funcs.opts['mine_views'] = True
+        self.funcs.opts['minion_data_cache'] = True
+        self.funcs.opts['cachedir'] = tempfile.mkdtemp(dir=RUNTIME_VARS.TMP)
+        self.addCleanup(shutil.rmtree, self.funcs.opts['cachedir'], ignore_errors=True)
+        self.funcs._mine({'id': 'webserver', 'data': dict(ip_addr='10.0.0.1', foo='bar')})
+        self.funcs._mine({'id': 'db', 'data': dict(ip_addr='10.0.0.2', foo='baz')})
+
+        pillar_util = salt.utils.master.MasterPillarUtil(
+            'webserver', opts=self.funcs.opts)
+        pillar_util.cache = self.funcs.cache
+        with patch.object(pillar_util, '_tgt_to_list',
+                          MagicMock(return_value=['webserver'])):
+            pillar_util.clear_cached_minion_data(clear_mine_func='foo')
+            self.assertEqual(self.funcs.cache.fetch('mine_views', 'foo')['data'],
+                             dict(db='baz'))
+            pillar_util.clear_cached_minion_data(clear_mine=True)
+        self.assertEqual(self.funcs.cache.fetch('mine_views', 'ip_addr')['data'],
+                         dict(db='10.0.0.2'))
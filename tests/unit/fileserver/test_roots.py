@@ -13,14 +13,16 @@ import tempfile
 from tests.integration import AdaptedConfigurationTestCaseMixin
 from tests.support.mixins import LoaderModuleMockMixin
 from tests.support.unit import TestCase, skipIf
-from tests.support.mock import patch, NO_MOCK, NO_MOCK_REASON
+from tests.support.mock import MagicMock, patch, NO_MOCK, NO_MOCK_REASON
 from tests.support.runtests import RUNTIME_VARS
 from tests.support.paths import TMP
 
 # Import Salt libs
 import salt.fileserver.roots as roots
 import salt.fileclient
+import salt.fileserver
 import salt.utils.files
+import salt.utils.gzip_util
 import salt.utils.hashutils
 import salt.utils.platform
 
@@ -115,6 +117,89 @@ class RootsTest(TestCase, AdaptedConfigurationTestCaseMixin, LoaderModuleMockMix
                 {'data': data,
                  'dest': 'testfile'})
 
+    def test_serve_file_chunk_cache(self):
+        cachedir = tempfile.mkdtemp(dir=RUNTIME_VARS.TMP)
+        self.addCleanup(salt.utils.files.rm_rf, cachedir)
+        fpath = os.path.join(cachedir, 'chunked')
+        with salt.utils.files.fopen(fpath, 'wb') as fp_:
+            fp_.write(b'a' * 10 + b'b' * 10)
+        opts = {'file_buffer_size': 10,
+                'fileserver_chunk_cache': 1,
+                'cachedir': cachedir}
+        fnd = {'path': fpath, 'rel': 'chunked'}
+        with patch.dict(roots.__opts__, opts), \
+                patch.object(salt.fileserver, '_CHUNK_CACHE', None):
+            for _ in range(2):
+                ret = roots.serve_file(
+                    {'saltenv': 'base', 'path': 'chunked', 'loc': 10, 'gzip': 1}, fnd)
+                self.assertEqual(ret['gzip'], 1)
+                self.assertEqual(salt.utils.gzip_util.uncompress(ret['data']), b'b' * 10)
+            # The gzipped chunk is shared with the other MWorkers
+            self.assertEqual(
+                len(os.listdir(os.path.join(cachedir, 'file_chunks'))), 1)
+
+            # A new version of the file is read again
+            with salt.utils.files.fopen(fpath, 'wb') as fp_:
+                fp_.write(b'c' * 15)
+            os.utime(fpath, (0, 0))
+            ret = roots.serve_file(
+                {'saltenv': 'base', 'path': 'chunked', 'loc': 10}, fnd)
+            self.assertEqual(ret['data'], b'c' * 5)
+
+    def test_chunk_cache_prune(self):
+        cachedir = tempfile.mkdtemp(dir=RUNTIME_VARS.TMP)
+        self.addCleanup(salt.utils.files.rm_rf, cachedir)
+        paths = []
+        for name in ('first', 'second', 'third'):
+            fpath = os.path.join(cachedir, name)
+            with salt.utils.files.fopen(fpath, 'wb') as fp_:
+                fp_.write(os.urandom(1024))
+            paths.append(fpath)
+        cache = salt.fileserver.ChunkCache({'file_buffer_size': 1024,
+                                            'fileserver_chunk_cache': 1,
+                                            'cachedir': cachedir})
+        chunk_dir = os.path.join(cachedir, 'file_chunks')
+        for fpath in paths:
+            cache.read(fpath, 0, gzip=1)
+        self.assertEqual(len(os.listdir(chunk_dir)), 3)
+
+        # The chunks of deleted and changed files are pruned
+        os.remove(paths[0])
+        with salt.utils.files.fopen(paths[1], 'wb') as fp_:
+            fp_.write(b'changed')
+        cache.prune()
+        self.assertEqual(len(cache._disk_chunks()), 1)
+
+        # The least recently used chunks go when they don't fit
+        cache.read(paths[1], 0, gzip=1)
+        third = salt.utils.hashutils.get_hash(paths[2])
+        for _, _, path in cache._disk_chunks():
+            if third in path:
+                os.utime(path, (0, 0))
+        cache.max_disk_size = 1024
+        cache.prune()
+        chunks = cache._disk_chunks()
+        self.assertEqual(len(chunks), 1)
+        self.assertIn(salt.utils.hashutils.get_hash(paths[1]), chunks[0][2])
+
+        # The MWorkers don't store chunks which don't fit until the next prune
+        worker = salt.fileserver.ChunkCache({'file_buffer_size': 1024,
+                                             'fileserver_chunk_cache': 1,
+                                             'fileserver_chunk_cache_disk': 1,
+                                             'cachedir': cachedir})
+        worker.max_disk_size = 1024
+        worker.read(paths[2], 0, gzip=1)
+        self.assertEqual(len(cache._disk_chunks()), 1)
+
+        # clear_cache empties the chunk cache
+        with patch('salt.loader.fileserver', MagicMock(return_value={})):
+            fileserver = salt.fileserver.Fileserver(
+                {'cachedir': cachedir, 'fileserver_backend': []})
+        cleared, errors = fileserver.clear_cache()
+        self.assertEqual(errors, [])
+        self.assertEqual(cleared, ['The fileserver chunk cache was successfully cleared'])
+        self.assertFalse(os.path.exists(chunk_dir))
+
     def test_envs(self):
         opts = {'file_roots': copy.copy(self.opts['file_roots'])}
         opts['file_roots'][UNICODE_ENVNAME] = opts['file_roots']['base']
@@ -9,6 +9,9 @@
 # Import Python Libs
 from __future__ import absolute_import, print_function, unicode_literals
 import copy
+import os
+import shutil
+import tempfile
 import textwrap
 
 # Import Salt Testing Libs
@@ -20,6 +23,7 @@ from tests.support.mock import Mock, MagicMock, patch, NO_MOCK, NO_MOCK_REASON
 from salt.ext import six
 from salt.exceptions import CommandExecutionError, SaltInvocationError
 import salt.modules.aptpkg as aptpkg
+import salt.utils.files
 
 try:
     import pytest
@@ -319,7 +323,8 @@ class AptPkgTestCase(TestCase, LoaderModuleMockMixin):
     @patch('salt.modules.aptpkg.__salt__', {'cmd.run_all': MagicMock(return_value={'retcode': 0,
                                                                                    'stdout': APT_Q_UPDATE}),
                                             'config.get': MagicMock(return_value=False)})
-    def test_refresh_db(self):
+    @patch('salt.utils.pkg.clear_inventory')
+    def test_refresh_db(self, clear_inventory):
         '''
         Test - Updates the APT database to latest packages based upon repositories.
         '''
@@ -331,6 +336,8 @@ class AptPkgTestCase(TestCase, LoaderModuleMockMixin):
             'http://security.ubuntu.com trusty-security/main i386 Packages': True
         }
         assert aptpkg.refresh_db() == refresh_db
+        # the stored apt-cache dump is dropped with the old package lists
+        assert clear_inventory.call_args[0][1] == 'apt_repo'
 
     @patch('salt.utils.pkg.clear_rtag', MagicMock())
     @patch('salt.modules.aptpkg.__salt__', {'cmd.run_all': MagicMock(return_value={'retcode': 0,
@@ -510,6 +517,49 @@ class AptPkgTestCase(TestCase, LoaderModuleMockMixin):
             self.assert_called_once(refresh_mock)
             refresh_mock.reset_mock()
 
+    def test_list_pkgs_inventory(self):
+        '''
+        Test that list_pkgs reuses the persistent inventory across jobs until
+        the dpkg status file changes
+        '''
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir, ignore_errors=True)
+        status = os.path.join(tmpdir, 'status')
+        with salt.utils.files.fopen(status, 'w') as fp_:
+            fp_.write('1')
+
+        def _add_pkg(pkgs, name, version):
+            pkgs.setdefault(name, []).append(version)
+
+        dpkg_mock = MagicMock(return_value=(
+            'install ok installed wget 1.15-1ubuntu1.14.04.2 amd64\n'
+            'deinstall ok config-files mc 3:4.8.1-2ubuntu1 amd64'))
+        patches = {
+            'cmd.run_stdout': dpkg_mock,
+            'pkg_resource.add_pkg': _add_pkg,
+            'pkg_resource.sort_pkglist': MagicMock(),
+            'pkg_resource.stringify': MagicMock(),
+        }
+        with patch.dict(aptpkg.__salt__, patches), \
+                patch.dict(aptpkg.__opts__, {'cachedir': tmpdir}), \
+                patch.dict(aptpkg.__grains__, {'cpuarch': 'x86_64', 'osarch': 'amd64'}), \
+                patch.object(aptpkg, 'DPKG_STATUS', status):
+            expected = {'wget': ['1.15-1ubuntu1.14.04.2']}
+            self.assertEqual(aptpkg.list_pkgs(), expected)
+            # A new job starts with an empty context
+            aptpkg.__context__.clear()
+            self.assertEqual(aptpkg.list_pkgs(), expected)
+            aptpkg.__context__.clear()
+            self.assertEqual(aptpkg.list_pkgs(removed=True),
+                             {'mc': ['3:4.8.1-2ubuntu1']})
+            self.assertEqual(dpkg_mock.call_count, 1)
+
+            with salt.utils.files.fopen(status, 'a') as fp_:
+                fp_.write('2')
+            aptpkg.__context__.clear()
+            self.assertEqual(aptpkg.list_pkgs(), expected)
+            self.assertEqual(dpkg_mock.call_count, 2)
+
 
 @skipIf(pytest is None, 'PyTest is missing')
 class AptUtilsTestCase(TestCase, LoaderModuleMockMixin):
@@ -11,6 +11,7 @@ from tests.support.mixins import LoaderModuleMockMixin
 from tests.support.unit import TestCase, skipIf
 from tests.support.mock import (
     patch,
+    MagicMock,
     NO_MOCK,
     NO_MOCK_REASON
 )
@@ -122,3 +123,19 @@ class MineTestCase(TestCase, LoaderModuleMockMixin):
                                      ('172.17.42.1:80', 'abcdefhjhi1234567899'),
                                      ('192.168.0.1:80', 'abcdefhjhi1234567899'),
                                  ])}}})
+
+    def test_get_mine_views_etag(self):
+        '''
+        Test that mine.get sends the etag of its last result and reuses that
+        result when the master reports it unchanged
+        '''
+        replies = [{'__mine_etag__': 'abc', '__mine_data__': {'web': '10.0.0.1'}},
+                   {'__mine_etag__': 'abc'}]
+        mine_get = MagicMock(side_effect=replies)
+        with patch.dict(mine.__opts__, {'file_client': 'remote', 'id': 'web'}), \
+                patch.dict(mine.__context__, {}), \
+                patch.object(mine, '_mine_get', mine_get):
+            self.assertEqual(mine.get('*', 'ip_addrs'), {'web': '10.0.0.1'})
+            self.assertEqual(mine.get('*', 'ip_addrs', exclude_minion=True), {})
+        self.assertIsNone(mine_get.call_args_list[0][0][0]['if_none_match'])
+        self.assertEqual(mine_get.call_args_list[1][0][0]['if_none_match'], 'abc')
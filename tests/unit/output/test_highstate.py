@@ -109,6 +109,25 @@ class JsonTestCase(TestCase, LoaderModuleMockMixin):
         self.assertIn('Failed:    0', ret)
         self.assertIn('Total states run:     1', ret)
 
+    def test_stream_output(self):
+        minion_ret = self.data['data']['master'][
+            'salt_|-call_sleep_state_|-call_sleep_state_|-state']['changes']['ret']
+        ret = list(highstate.stream(iter([
+            {'minion': minion_ret['minion']},
+            {'sub_minion': minion_ret['sub_minion']},
+            {'bad_minion': ['Rendering SLS failed']},
+        ])))
+        self.assertEqual(len(ret), 4)
+        self.assertIn('Summary for minion', ret[0])
+        self.assertIn('Summary for sub_minion', ret[1])
+        self.assertIn('Data failed to compile', ret[2])
+        self.assertIn('Summary for 3 minions', ret[3])
+        self.assertIn('Succeeded:                 2 (changed=2)', ret[3])
+        self.assertIn('Failed:                    0', ret[3])
+        self.assertIn('Minions failed to compile: 1', ret[3])
+        self.assertIn('Total states run:          2', ret[3])
+        self.assertIn('Total run time:      110.282 ms', ret[3])
+
 
 # this should all pass the above tests
 class JsonNestedTestCase(TestCase, LoaderModuleMockMixin):
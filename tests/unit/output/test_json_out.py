@@ -69,3 +69,10 @@ class JsonTestCase(TestCase, LoaderModuleMockMixin):
                 expected = '{\n    "example": "one",\n    "test": "Д"\n}'
             self.assertEqual(json_out.output(decoded), expected)
             self.assertEqual(json_out.output(encoded), expected)
+
+    def test_stream_output(self):
+        with patch.dict(json_out.__opts__, {'output_indent': 'pretty'}):
+            ret = list(json_out.stream(iter([{'minion1': True},
+                                             {'minion2': {'a': 1}}])))
+            self.assertEqual(ret, ['{"minion1": true}',
+                                   '{"minion2": {"a": 1}}'])
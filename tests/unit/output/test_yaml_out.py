@@ -36,3 +36,9 @@ class YamlTestCase(TestCase, LoaderModuleMockMixin):
             ret = yaml.output(self.data)
             expect = '{example: one, test: two}\n'
             self.assertEqual(expect, ret)
+
+    def test_stream_output(self):
+        ret = list(yaml.stream(iter([{'minion1': self.data},
+                                     {'minion2': True}])))
+        self.assertEqual(ret, ['---\nminion1:\n  example: one\n  test: two\n',
+                               '---\nminion2: true\n'])
@@ -8,6 +8,7 @@ Unit tests for the Default Job Cache (local_cache).
 
 # Import Python libs
 from __future__ import absolute_import, print_function, unicode_literals
+import datetime
 import os
 import shutil
 import time
@@ -310,6 +311,27 @@ class Local_CacheTest(TestCase, AdaptedConfigurationTestCaseMixin, LoaderModuleM
                                   self.JOB_CACHE_DIR_FILES,
                                   status='present')
 
+    def test_store_jobs(self):
+        '''
+        test to ensure a batch of returns is written with one returner call
+        '''
+        opts = self.get_temp_config('master')
+        opts['cachedir'] = self.TMP_CACHE_DIR
+        loads = [{'fun_args': [], 'jid': '20160603132323715452',
+                  'return': True, 'retcode': 0, 'success': True,
+                  'cmd': '_return', 'fun': 'test.ping', 'id': minion}
+                 for minion in ('minion', 'sub_minion')]
+
+        # The returns must not be stored one by one
+        with patch.object(salt.utils.job, 'store_job',
+                          MagicMock(side_effect=AssertionError)):
+            self.assertEqual(salt.utils.job.store_jobs(opts, loads), None)
+        self._check_dir_files('Dir/file does not exist: ',
+                              self.JOB_CACHE_DIR_FILES + [
+                                  os.path.join(self.JID_DIR, 'sub_minion', 'return.p')],
+                              status='present')
+        self.assertEqual(local_cache.clean_old_jobs(), None)
+
     def test_empty_jid_dir(self):
         '''
         test to ensure removal of empty jid dir
@@ -353,3 +375,68 @@ class Local_CacheTest(TestCase, AdaptedConfigurationTestCaseMixin, LoaderModuleM
         self._check_dir_files('new_jid_dir was not removed',
                               self.EMPTY_JID_DIR,
                               status='removed')
+
+
+class LocalCacheGetJidsFilterTestCase(TestCase, LoaderModuleMockMixin):
+    '''
+    Test the paged and filtered job listing of the local cache
+    '''
+    def setup_loader_modules(self):
+        self.tmp_cachedir = tempfile.mkdtemp(dir=RUNTIME_VARS.TMP)
+        self.addCleanup(shutil.rmtree, self.tmp_cachedir, ignore_errors=True)
+        return {local_cache: {'__opts__': {'cachedir': self.tmp_cachedir,
+                                           'hash_type': 'sha256'}}}
+
+    def setUp(self):
+        jobs = [
+            ('20190101000000000000', 'test.ping', 'root', 'web1', True),
+            ('20190102000000000000', 'state.apply', 'alice', ['web1', 'db1'], True),
+            ('20190103000000000000', 'saltutil.find_job', 'root', 'db1', True),
+            ('20190104000000000000', 'state.apply', 'bob', 'db1', False),
+            ('20190105000000000000', 'test.ping', 'alice', 'web2', True),
+        ]
+        for jid, fun, user, tgt, prep in jobs:
+            if prep:
+                local_cache.prep_jid(passed_jid=jid)
+            local_cache.save_load(jid, {'jid': jid, 'fun': fun, 'user': user,
+                                        'tgt': tgt, 'arg': []})
+
+    def _jids(self, jobs):
+        return [job['JID'] for job in jobs]
+
+    def test_get_jids_filter_count(self):
+        self.assertEqual(
+            self._jids(local_cache.get_jids_filter(2)),
+            ['20190104000000000000', '20190105000000000000'])
+        self.assertEqual(
+            self._jids(local_cache.get_jids_filter(10, filter_find_job=False)),
+            ['20190101000000000000', '20190102000000000000',
+             '20190103000000000000', '20190104000000000000',
+             '20190105000000000000'])
+
+    def test_get_jids_filter_cursor(self):
+        self.assertEqual(
+            self._jids(local_cache.get_jids_filter(2, cursor='20190104000000000000')),
+            ['20190101000000000000', '20190102000000000000'])
+        self.assertEqual(
+            local_cache.get_jids_filter(2, cursor='20190101000000000000'), [])
+
+    def test_get_jids_filter_filters(self):
+        self.assertEqual(
+            self._jids(local_cache.get_jids_filter(fun='state.*')),
+            ['20190102000000000000', '20190104000000000000'])
+        self.assertEqual(
+            self._jids(local_cache.get_jids_filter(user='alice', tgt='web*')),
+            ['20190102000000000000', '20190105000000000000'])
+        self.assertEqual(
+            self._jids(local_cache.get_jids_filter(
+                start_time=datetime.datetime(2019, 1, 2),
+                end_time=datetime.datetime(2019, 1, 4))),
+            ['20190102000000000000', '20190104000000000000'])
+
+    def test_get_jids_filter_endtime(self):
+        local_cache.update_endtime('20190105000000000000', '2019, Jan 05 00:00:10.000000')
+        with patch.dict(local_cache.__opts__, {'job_cache_store_endtime': True}):
+            jobs = local_cache.get_jids_filter(2)
+        self.assertEqual(jobs[1]['EndTime'], '2019, Jan 05 00:00:10.000000')
+        self.assertNotIn('EndTime', jobs[0])
@@ -18,6 +18,10 @@ from tests.support.mock import (
 # Import Salt Libs
 import salt.runners.jobs as jobs
 import salt.minion
+import salt.utils.jid
+
+# Import 3rd-party libs
+from salt.ext.six.moves import range  # pylint: disable=import-error,redefined-builtin
 
 
 @skipIf(NO_MOCK, NO_MOCK_REASON)
@@ -78,3 +82,87 @@ class JobsTest(TestCase, LoaderModuleMockMixin):
 
             self.assertEqual(jobs.list_jobs(search_target='non-existant'),
                              returns['non-existant'])
+
+    def test_list_jobs_page(self):
+        '''
+        test jobs.list_jobs_page and jobs.list_jobs with a returner which
+        filters and pages the jobs itself
+        '''
+        loads = dict(
+            ('2016052403550{0}000000'.format(idx),
+             {'fun': 'test.ping', 'tgt': 'node-{0}'.format(idx), 'arg': []})
+            for idx in range(5)
+        )
+
+        calls = []
+
+        def get_jids_filter(count=None, filter_find_job=True, start_time=None,
+                            end_time=None, fun=None, user=None, tgt=None,
+                            cursor=None):
+            calls.append(count)
+            low, high = salt.utils.jid.jid_bounds(start_time, end_time, cursor)
+            return salt.utils.jid.filter_jobs(
+                ((jid, loads[jid]) for jid in sorted(loads, reverse=True)
+                 if salt.utils.jid.in_jid_bounds(jid, low, high)),
+                count=count, fun=fun, user=user, tgt=tgt)
+
+        class MockMasterMinion(object):
+
+            returners = {'local_cache.get_jids_filter': get_jids_filter}
+
+            def __init__(self, *args, **kwargs):
+                pass
+
+        with patch.object(salt.minion, 'MasterMinion', MockMasterMinion):
+            page = jobs.list_jobs_page(limit=2)
+            self.assertEqual(sorted(page['jobs']),
+                             ['20160524035503000000', '20160524035504000000'])
+            self.assertEqual(page['cursor'], '20160524035503000000')
+            page = jobs.list_jobs_page(limit=2, cursor=page['cursor'])
+            self.assertEqual(sorted(page['jobs']),
+                             ['20160524035501000000', '20160524035502000000'])
+            page = jobs.list_jobs_page(limit=2, cursor=page['cursor'])
+            self.assertEqual(list(page['jobs']), ['20160524035500000000'])
+            self.assertIsNone(page['cursor'])
+
+            self.assertEqual(
+                jobs.list_jobs_page(search_target='node-[13]')['jobs']['20160524035503000000']['Target'],
+                'node-3')
+            # list_jobs fetches all of the jobs at once
+            del calls[:]
+            self.assertEqual(sorted(jobs.list_jobs()), sorted(loads))
+            self.assertEqual(calls, [None])
+            self.assertEqual(list(jobs.list_jobs(search_target='node-4')),
+                             ['20160524035504000000'])
+
+    def test_list_jobs_page_fallback(self):
+        '''
+        test jobs.list_jobs_page with a returner which can only list all of
+        the jobs
+        '''
+        jids = dict(
+            ('2016052403550{0}000000'.format(idx),
+             {'Function': 'test.ping', 'Target': 'node-{0}'.format(idx),
+              'StartTime': '2016, May 24 03:55:0{0}.000000'.format(idx)})
+            for idx in range(5)
+        )
+        jids['20160524035505000000'] = dict(jids['20160524035504000000'],
+                                            Function='saltutil.find_job')
+
+        class MockMasterMinion(object):
+
+            returners = {'local_cache.get_jids': lambda: dict(jids)}
+
+            def __init__(self, *args, **kwargs):
+                pass
+
+        with patch.object(salt.minion, 'MasterMinion', MockMasterMinion):
+            page = jobs.list_jobs_page(limit=3)
+            self.assertEqual(sorted(page['jobs']),
+                             ['20160524035502000000', '20160524035503000000',
+                              '20160524035504000000'])
+            self.assertEqual(page['cursor'], '20160524035502000000')
+            page = jobs.list_jobs_page(limit=3, cursor=page['cursor'])
+            self.assertEqual(sorted(page['jobs']),
+                             ['20160524035500000000', '20160524035501000000'])
+            self.assertIsNone(page['cursor'])
@@ -6,6 +6,8 @@ from datetime import datetime
 import os
 import pprint
 import shutil
+import stat
+import tempfile
 
 try:
     from dateutil.relativedelta import relativedelta
@@ -17,6 +19,7 @@ NO_DATEUTIL_REASON = 'python-dateutil is not installed'
 
 # Import Salt Testing libs
 from tests.support.mixins import LoaderModuleMockMixin
+from tests.support.runtests import RUNTIME_VARS
 from tests.support.unit import skipIf, TestCase
 from tests.support.mock import (
     NO_MOCK,
@@ -29,8 +32,10 @@ from tests.support.mock import (
 
 # Import salt libs
 import salt.utils.files
+import salt.utils.hashutils
 import salt.utils.json
 import salt.utils.platform
+import salt.utils.url
 import salt.utils.yaml
 import salt.states.file as filestate
 import salt.serializers.yaml as yamlserializer
@@ -2032,6 +2037,165 @@ class TestFileTidied(TestCase):
         assert filestate.tidied(name='/bad-directory-name/') == exp
 
 
+@skipIf(not hasattr(os, 'scandir') or salt.utils.platform.is_windows(),
+        'The recursive permissions fast path needs os.scandir')
+class TestRecursePerms(TestCase, LoaderModuleMockMixin):
+    def setup_loader_modules(self):
+        self.uid = os.getuid()
+        self.gid = os.getgid()
+        return {
+            filestate: {
+                '__opts__': {'test': False, 'file_recurse_workers': 0},
+                '__salt__': {
+                    'file.user_to_uid': lambda user: self.uid if user == 'me' else '',
+                    'file.group_to_gid': lambda group: self.gid if group == 'us' else '',
+                },
+            }
+        }
+
+    def setUp(self):
+        self.top = tempfile.mkdtemp(dir=RUNTIME_VARS.TMP)
+        self.addCleanup(shutil.rmtree, self.top, ignore_errors=True)
+        for sub in ('a', 'a/b', 'c', 'd'):
+            os.mkdir(os.path.join(self.top, sub), 0o700)
+        for fname in ('f', 'a/f', 'a/b/f', 'c/f'):
+            with salt.utils.files.fopen(os.path.join(self.top, fname), 'w'):
+                pass
+            os.chmod(os.path.join(self.top, fname), 0o600)
+        os.chmod(os.path.join(self.top, 'd'), 0o755)
+        os.symlink('f', os.path.join(self.top, 'link'))
+
+    def _mode(self, path):
+        return stat.S_IMODE(os.stat(os.path.join(self.top, path)).st_mode)
+
+    def _check(self, **kwargs):
+        ids = filestate._recurse_ids('me', 'us')
+        self.assertEqual(ids, (self.uid, self.gid))
+        return filestate._check_recurse_perms(
+            self.top, 'me', 'us', '0755', '0644', ids, **kwargs)
+
+    def test_recurse_ids_unknown_user(self):
+        self.assertIsNone(filestate._recurse_ids('nobody-here', None))
+        self.assertEqual(filestate._recurse_ids(None, 'us'), (None, self.gid))
+
+    def test_check_and_enforce(self):
+        join = lambda path: os.path.join(self.top, path)
+        changes = self._check()
+        self.assertEqual(
+            sorted(changes),
+            [join(x) for x in ('a', 'a/b', 'a/b/f', 'a/f', 'c', 'c/f', 'f')])
+        self.assertEqual(changes[join('a')], {'mode': '0755'})
+        self.assertEqual(changes[join('f')], {'mode': '0644'})
+
+        self.assertEqual(
+            sorted(self._check(max_depth=0)), [join('f')])
+        self.assertEqual(
+            sorted(self._check(check_files=False)),
+            [join(x) for x in ('a', 'a/b', 'c')])
+
+        ret = {'changes': {}, 'result': True, 'comment': ''}
+        errors = filestate._enforce_recurse_perms(
+            sorted(changes), ret, 'me', 'us', '0755', '0644',
+            (self.uid, self.gid))
+        self.assertEqual(errors, [])
+        self.assertEqual(ret['changes'], {'mode': '0644'})
+        self.assertEqual(self._mode('a/b'), 0o755)
+        self.assertEqual(self._mode('a/b/f'), 0o644)
+        self.assertEqual(self._check(), {})
+
+    def test_check_threaded(self):
+        with patch.dict(filestate.__opts__, {'file_recurse_workers': 4}):
+            threaded = self._check()
+        self.assertEqual(threaded, self._check())
+        self.assertEqual(len(threaded), 7)
+
+
+@skipIf(salt.utils.platform.is_windows(), 'The manifest mode is not supported on Windows')
+class TestRecurseManifest(TestCase, LoaderModuleMockMixin):
+    def setup_loader_modules(self):
+        self.tmp = tempfile.mkdtemp(dir=RUNTIME_VARS.TMP)
+        self.addCleanup(shutil.rmtree, self.tmp, ignore_errors=True)
+        return {
+            filestate: {
+                '__opts__': {'test': False,
+                             'cachedir': os.path.join(self.tmp, 'cache'),
+                             'file_recurse_workers': 2},
+                '__salt__': {},
+            }
+        }
+
+    def setUp(self):
+        self.src = os.path.join(self.tmp, 'src')
+        self.dest = os.path.join(self.tmp, 'dest')
+        os.makedirs(os.path.join(self.src, 'files'))
+        os.makedirs(self.dest)
+        self.manifest = {}
+        for fname, data in (('new', 'new data'), ('same', 'same data'), ('diff', 'abc')):
+            self._write(os.path.join(self.src, 'files', fname), data)
+            self.manifest['files/' + fname] = {
+                'hsum': salt.utils.hashutils.get_hash(
+                    os.path.join(self.src, 'files', fname), 'sha256'),
+                'hash_type': 'sha256',
+                'size': len(data),
+                'mode': 0o644}
+        self._write(os.path.join(self.dest, 'same'), 'same data')
+        self._write(os.path.join(self.dest, 'diff'), 'wxyz')
+
+    def _write(self, path, data):
+        with salt.utils.files.fopen(path, 'w') as fp_:
+            fp_.write(data)
+
+    def _manage(self):
+        src = self.src
+
+        class FakeClient(object):
+            def cache_file(self, source, saltenv):
+                return os.path.join(src, salt.utils.url.parse(source)[0])
+
+            def destroy(self):
+                pass
+
+        files = [(os.path.join(self.dest, fname),
+                  salt.utils.url.create('files/' + fname, saltenv='base'))
+                 for fname in ('new', 'same', 'diff')]
+        get_hash = MagicMock(side_effect=salt.utils.hashutils.get_hash)
+        with patch('salt.fileclient.get_file_client', MagicMock(return_value=FakeClient())), \
+                patch('salt.utils.hashutils.get_hash', get_hash):
+            ret = filestate._manage_manifest_files(
+                self.dest, files, self.manifest, 'base', None, None, '0600', (None, None))
+        hashed = [args[0] for args, _ in get_hash.call_args_list]
+        return ret, hashed
+
+    def test_manage_manifest_files(self):
+        join = lambda fname: os.path.join(self.dest, fname)
+        (changes, comments, fallback, perms), hashed = self._manage()
+        self.assertEqual(changes, {join('new'): {'diff': 'New file'},
+                                   join('diff'): {'diff': 'Replace file'}})
+        self.assertEqual((comments, fallback), ({}, []))
+        self.assertEqual(perms, {'mode': '0600'})
+        # Only the file with the same size is hashed locally
+        self.assertIn(join('same'), hashed)
+        self.assertNotIn(join('diff'), hashed)
+        for fname in ('new', 'same', 'diff'):
+            with salt.utils.files.fopen(join(fname)) as fp_:
+                with salt.utils.files.fopen(os.path.join(self.src, 'files', fname)) as sfp:
+                    self.assertEqual(fp_.read(), sfp.read())
+            self.assertEqual(stat.S_IMODE(os.stat(join(fname)).st_mode), 0o600)
+
+        # Nothing changed, the recorded mtimes spare hashing the local files
+        (changes, comments, fallback, perms), hashed = self._manage()
+        self.assertEqual((changes, comments, fallback, perms), ({}, {}, [], {}))
+        self.assertFalse([path for path in hashed if path.startswith(self.dest)])
+
+    def test_manage_manifest_files_test_mode(self):
+        with patch.dict(filestate.__opts__, {'test': True}):
+            (changes, comments, fallback, perms), _ = self._manage()
+        self.assertEqual(sorted(changes), [os.path.join(self.dest, 'diff'),
+                                           os.path.join(self.dest, 'new')])
+        self.assertEqual(perms, {'mode': '0600'})
+        self.assertFalse(os.path.exists(os.path.join(self.dest, 'new')))
+
+
 @skipIf(not salt.utils.platform.is_linux(), 'Selinux only supported on linux')
 class TestSelinux(TestCase, LoaderModuleMockMixin):
     def setup_loader_modules(self):
@@ -235,3 +235,46 @@ class PkgTestCase(TestCase, LoaderModuleMockMixin):
         for installed_versions, operator, version, expected_result in test_parameters:
             msg = "installed_versions: {}, operator: {}, version: {}, expected_result: {}".format(installed_versions, operator, version, expected_result)
             self.assertEqual(expected_result, pkg._fulfills_version_spec(installed_versions, operator, version), msg)
+
+    def test_mod_aggregate(self):
+        '''
+        Test that only pkg chunks of the same function and options are merged
+        '''
+        def _chunk(name, fun='installed', **kwargs):
+            chunk = {'state': 'pkg', 'fun': fun, '__id__': name, 'name': name,
+                     'order': 10000}
+            chunk.update(kwargs)
+            return chunk
+
+        low = _chunk('pkga')
+        chunks = [low,
+                  _chunk('pkgb', version='2.0.2', order=10001),
+                  _chunk('pkgc', fun='latest'),
+                  _chunk('pkgd', refresh=True),
+                  _chunk('pkge', fromrepo='epel'),
+                  _chunk('pkgf', pkgs=['pkgg', {'pkgh': '1.0'}])]
+        gen_tag = MagicMock(side_effect=lambda chunk: chunk['name'])
+        with patch.dict(pkg.__utils__, {'state.gen_tag': gen_tag}):
+            low = pkg.mod_aggregate(low, chunks, {})
+        self.assertEqual(low['pkgs'],
+                         ['pkga', {'pkgb': '2.0.2'}, 'pkgg', {'pkgh': '1.0'}])
+        self.assertEqual([chunk['name'] for chunk in chunks if '__agg__' in chunk],
+                         ['pkga', 'pkgb', 'pkgf'])
+        # The version stays, in case the chunk has to run by itself
+        self.assertEqual(chunks[1]['version'], '2.0.2')
+
+    def test_mod_aggregate_ret(self):
+        '''
+        Test the result of a merged pkg chunk
+        '''
+        agg_ret = {'name': 'pkga', 'result': True, 'comment': '',
+                   'changes': dict((name, self.pkgs[name]) for name in ('pkga', 'pkgb'))}
+        ret = pkg.mod_aggregate_ret({'name': 'pkgb', 'fun': 'installed'}, agg_ret)
+        self.assertTrue(ret['result'])
+        self.assertEqual(ret['changes'], {'pkgb': self.pkgs['pkgb']})
+        ret = pkg.mod_aggregate_ret(
+            {'name': 'foo', 'pkgs': ['pkgc', {'pkga': '2.0.1'}]}, agg_ret)
+        self.assertEqual(ret['changes'], {'pkga': self.pkgs['pkga']})
+
+        agg_ret['result'] = False
+        self.assertIsNone(pkg.mod_aggregate_ret({'name': 'pkgb'}, agg_ret))
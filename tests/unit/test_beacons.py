@@ -11,6 +11,7 @@ from tests.support.unit import skipIf, TestCase
 from tests.support.mock import (
     NO_MOCK,
     NO_MOCK_REASON,
+    MagicMock,
     patch)
 
 # Import Salt Libs
@@ -45,3 +46,27 @@ class BeaconsTestCase(TestCase, LoaderModuleMockMixin):
                           'data': {'id': u'minion', u'apache2': u'Stopped'},
                           'beacon_name': 'ps'}]
             self.assertEqual(ret, _expected)
+
+    def test_batch_event(self):
+        '''
+        Test that all the beacons which fired are sent as one event
+        '''
+        mock_opts = salt.config.DEFAULT_MINION_OPTS.copy()
+        mock_opts['id'] = 'minion'
+        mock_opts['__role'] = 'minion'
+        mock_opts['beacons_batch_event'] = True
+        mock_opts['beacons'] = {'watch_apache': [{'processes': {'apache2': 'stopped'}},
+                                                 {'beacon_module': 'ps'}],
+                                'watch_nginx': [{'processes': {'nginx': 'stopped'}},
+                                                {'beacon_module': 'ps'}]}
+        with patch.dict(beacons.__opts__, mock_opts), \
+                patch('salt.utils.psutil_compat.process_iter',
+                      MagicMock(return_value=[])) as process_iter:
+            ret = salt.beacons.Beacon(mock_opts, []).process(mock_opts['beacons'], mock_opts['grains'])
+        self.assertEqual(len(ret), 1)
+        self.assertEqual(ret[0]['tag'], 'salt/beacon/minion/batch/')
+        self.assertEqual(
+            sorted(event['tag'] for event in ret[0]['data']['events']),
+            ['salt/beacon/minion/watch_apache/', 'salt/beacon/minion/watch_nginx/'])
+        # Both ps beacons share the same process listing
+        self.assertEqual(process_iter.call_count, 1)
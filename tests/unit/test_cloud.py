@@ -5,7 +5,10 @@
 
 # Import Python libs
 from __future__ import absolute_import
+import copy
 import os
+import shutil
+import tempfile
 
 # Import Salt Testing libs
 from tests.support.runtests import RUNTIME_VARS
@@ -208,3 +211,135 @@ class MapConfTest(TestCase):
             # ie, the provider->profile->map inheritance works as expected
             map_data = cloud_map.map_data()
             self.assertEqual(map_data, merged_profile)
+
+    def test_map_provider_aliases(self):
+        '''
+        Only the providers used by the profiles of the map are listed
+        '''
+        with patch('salt.config.check_driver_dependencies', MagicMock(return_value=True)), \
+                patch('salt.cloud.Map.read', MagicMock(return_value=EXAMPLE_MAP)):
+            opts = salt.config.cloud_config(os.path.join(RUNTIME_VARS.TMP_CONF_DIR, 'cloud'))
+            opts.update({
+                'providers': EXAMPLE_PROVIDERS,
+                'profiles': EXAMPLE_PROFILES
+            })
+            cloud_map = salt.cloud.Map(opts)
+            self.assertEqual(cloud_map.map_provider_aliases(),
+                             set(['nyc_vcenter', 'nj_vcenter']))
+            cloud_map.rendered_map = {'nyc-vm': {'db1': {'name': 'db1'}},
+                                      'missing': {'db4': {}}}
+            self.assertEqual(cloud_map.map_provider_aliases(), set(['nyc_vcenter']))
+
+
+class QueryCacheTest(TestCase):
+    '''
+    Validate the persistent cache of provider listings
+    '''
+    def setUp(self):
+        self.cachedir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cachedir, ignore_errors=True)
+        with patch('salt.config.check_driver_dependencies', MagicMock(return_value=True)):
+            self.opts = salt.config.cloud_config(os.path.join(RUNTIME_VARS.TMP_CONF_DIR, 'cloud'))
+        self.opts.update({'cachedir': self.cachedir,
+                          'query_cache_ttl': 60,
+                          'providers': copy.deepcopy(EXAMPLE_PROVIDERS)})
+        self.cache = salt.cloud.QueryCache(self.opts)
+        self.nodes = {'db1': {'name': 'db1', 'state': 'running'},
+                      'db2': {'name': 'db2', 'state': 'stopped'}}
+
+    def test_store_fetch(self):
+        self.assertIsNone(self.cache.fetch('nj_vcenter', 'vmware', 'list_nodes'))
+        self.cache.store('nj_vcenter', 'vmware', 'list_nodes', self.nodes, 1000)
+        with patch('time.time', MagicMock(return_value=1030)):
+            self.assertEqual(
+                self.cache.fetch('nj_vcenter', 'vmware', 'list_nodes'), self.nodes)
+            self.assertIsNone(self.cache.fetch('nj_vcenter', 'vmware', 'list_nodes_min'))
+        with patch('time.time', MagicMock(return_value=1100)):
+            self.assertIsNone(self.cache.fetch('nj_vcenter', 'vmware', 'list_nodes'))
+            self.opts['query_cache_first'] = True
+            self.assertEqual(
+                self.cache.fetch('nj_vcenter', 'vmware', 'list_nodes'), self.nodes)
+
+    def test_provider_ttl(self):
+        self.opts['providers']['nj_vcenter']['vmware']['query_cache_ttl'] = 0
+        self.cache.store('nj_vcenter', 'vmware', 'list_nodes', self.nodes, 1000)
+        self.cache.store('nyc_vcenter', 'vmware', 'list_nodes', self.nodes, 1000)
+        with patch('time.time', MagicMock(return_value=1030)):
+            self.assertIsNone(self.cache.fetch('nj_vcenter', 'vmware', 'list_nodes'))
+            self.assertEqual(
+                self.cache.fetch('nyc_vcenter', 'vmware', 'list_nodes'), self.nodes)
+
+    def test_create_destroy(self):
+        with patch('time.time', MagicMock(return_value=1010)):
+            # Destroyed before the listing was requested, already reflected
+            self.cache.update('nj_vcenter', 'vmware', 'db0')
+        self.cache.store('nj_vcenter', 'vmware', 'list_nodes', self.nodes, 1020)
+        with patch('time.time', MagicMock(return_value=1030)):
+            self.cache.update('nj_vcenter', 'vmware', 'db3',
+                              salt.cloud._query_cache_node('db3', {'id': 3, 'deploy_kwargs': {}}))
+            self.cache.update('nj_vcenter', 'vmware', 'db1')
+        with patch('time.time', MagicMock(return_value=1040)):
+            self.assertEqual(
+                self.cache.fetch('nj_vcenter', 'vmware', 'list_nodes'),
+                {'db2': {'name': 'db2', 'state': 'stopped'},
+                 'db3': {'id': 3, 'name': 'db3', 'state': 'running'}})
+        self.assertEqual(
+            sorted(self.cache.cache.list('cloud/queries/nj_vcenter/vmware/changes')),
+            ['db1', 'db3'])
+        # A new listing replaces the recorded changes
+        self.cache.store('nj_vcenter', 'vmware', 'list_nodes', self.nodes, 1050)
+        self.assertEqual(
+            self.cache.cache.list('cloud/queries/nj_vcenter/vmware/changes'), [])
+
+    def test_changes_shared_by_queries(self):
+        self.cache.store('nj_vcenter', 'vmware', 'list_nodes', self.nodes, 1020)
+        self.cache.store('nj_vcenter', 'vmware', 'list_nodes_min', self.nodes, 1020)
+        with patch('time.time', MagicMock(return_value=1030)):
+            self.cache.update('nj_vcenter', 'vmware', 'db1')
+        # Listing one query again keeps the change for the older listings
+        self.cache.store('nj_vcenter', 'vmware', 'list_nodes', {}, 1040)
+        with patch('time.time', MagicMock(return_value=1050)):
+            self.assertEqual(
+                self.cache.fetch('nj_vcenter', 'vmware', 'list_nodes_min'),
+                {'db2': {'name': 'db2', 'state': 'stopped'}})
+        self.cache.store('nj_vcenter', 'vmware', 'list_nodes_min', {}, 1040)
+        self.assertEqual(
+            self.cache.cache.list('cloud/queries/nj_vcenter/vmware/changes'), [])
+
+    def test_create_drops_full_listings(self):
+        for query in ('list_nodes', 'list_nodes_full', 'list_nodes_select'):
+            self.cache.store('nj_vcenter', 'vmware', query, self.nodes, 1020)
+        with patch('time.time', MagicMock(return_value=1030)):
+            self.cache.update('nj_vcenter', 'vmware', 'db3',
+                              salt.cloud._query_cache_node('db3', {'id': 3}))
+            self.assertIsNone(self.cache.fetch('nj_vcenter', 'vmware', 'list_nodes_full'))
+            self.assertIsNone(self.cache.fetch('nj_vcenter', 'vmware', 'list_nodes_select'))
+            self.assertIn('db3', self.cache.fetch('nj_vcenter', 'vmware', 'list_nodes'))
+            # Destroying a VM applies to every listing
+            self.cache.store('nj_vcenter', 'vmware', 'list_nodes_full', self.nodes, 1030)
+            self.cache.update('nj_vcenter', 'vmware', 'db2')
+            self.assertNotIn('db2', self.cache.fetch('nj_vcenter', 'vmware', 'list_nodes_full'))
+
+
+@skipIf(NO_MOCK, NO_MOCK_REASON)
+class DeferredDeployTest(TestCase):
+    '''
+    Validate the deploys left to a parallel map run
+    '''
+    def test_sync_after_deploy(self):
+        opts = {'sync_after_install': 'all'}
+        sync = MagicMock(return_value=True)
+        with patch('salt.utils.cloud.run_deferred_deploy',
+                   MagicMock(side_effect=[{'deployed': True},
+                                          {'Error': {'Not Deployed': 'no'}}])), \
+                patch.object(salt.cloud, '_sync_after_install', sync), \
+                patch('salt.utils.crypt.reinit_crypto', MagicMock()):
+            self.assertEqual(
+                salt.cloud.deploy_multiprocessing(
+                    {'opts': opts, 'name': 'db1', 'deploy_kwargs': {}}),
+                {'deployed': True})
+            sync.assert_called_once_with(opts, 'db1')
+            # A failed deploy is not synced
+            salt.cloud.deploy_multiprocessing(
+                {'opts': opts, 'name': 'db2', 'deploy_kwargs': {}})
+            sync.assert_called_once_with(opts, 'db1')
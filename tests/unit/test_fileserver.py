@@ -8,6 +8,7 @@ from __future__ import absolute_import, print_function, unicode_literals
 
 # Import Salt Testing libs
 from tests.support.unit import TestCase
+from tests.support.mock import MagicMock, patch
 
 from salt import fileserver
 
@@ -28,3 +29,24 @@ class MapDiffTestCase(TestCase):
         map1 = {'file1': 12345}
         map2 = {'file1': 1234}
         assert fileserver.diff_mtime_map(map1, map2) is True
+
+
+class FileManifestTestCase(TestCase):
+    def test_file_manifest(self):
+        fs_ = fileserver.Fileserver.__new__(fileserver.Fileserver)
+        hashes = {
+            'files/a': ({'hsum': 'aaa', 'hash_type': 'sha256'},
+                        [0o100640, 0, 0, 0, 0, 0, 12, 0, 0, 0]),
+            'files/b': ({'hsum': 'bbb', 'hash_type': 'sha256'}, None),
+            'files/gone': ('', None),
+        }
+        file_list = MagicMock(return_value=sorted(hashes))
+        with patch.object(fs_, 'file_list', file_list), \
+                patch.object(fs_, 'file_hash_and_stat',
+                             lambda load: hashes[load['path']]):
+            ret = fs_.file_manifest({'saltenv': 'base', 'prefix': 'files/'})
+        file_list.assert_called_once_with({'saltenv': 'base', 'prefix': 'files/'})
+        self.assertEqual(ret, {
+            'files/a': {'hsum': 'aaa', 'hash_type': 'sha256', 'size': 12, 'mode': 0o640},
+            'files/b': {'hsum': 'bbb', 'hash_type': 'sha256', 'size': None, 'mode': None},
+        })
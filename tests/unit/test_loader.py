@@ -19,6 +19,7 @@ import shutil
 import sys
 import tempfile
 import textwrap
+import time
 
 # Import Salt Testing libs
 from tests.support.runtests import RUNTIME_VARS
@@ -1267,3 +1268,102 @@ class LazyLoaderOptimizationOrderTest(TestCase):
         basename = os.path.basename(filename)
         expected = 'lazyloadertest.py' if six.PY3 else 'lazyloadertest.pyc'
         assert basename == expected, basename
+
+
+class LazyLoaderDiscoveryCacheTest(TestCase):
+    '''
+    Test the persistent module discovery cache of the loader
+    '''
+    @classmethod
+    def setUpClass(cls):
+        cls.opts = salt.config.minion_config(None)
+        cls.opts['grains'] = salt.loader.grains(cls.opts)
+
+    def setUp(self):
+        self.module_dir = tempfile.mkdtemp(dir=RUNTIME_VARS.TMP)
+        self.cachedir = tempfile.mkdtemp(dir=RUNTIME_VARS.TMP)
+        self.addCleanup(shutil.rmtree, self.module_dir, ignore_errors=True)
+        self.addCleanup(shutil.rmtree, self.cachedir, ignore_errors=True)
+        modules = {
+            'discoverypkg': textwrap.dedent('''\
+                __virtualname__ = 'discovery'
+
+                def __virtual__():
+                    return __virtualname__
+
+                def ping():
+                    return True
+                '''),
+            'discoveryno': textwrap.dedent('''\
+                def __virtual__():
+                    return (False, 'not on this system')
+
+                def ping():
+                    return False
+                '''),
+            'discoveryopt': textwrap.dedent('''\
+                def __virtual__():
+                    return 'discovery.enabled' in __opts__
+
+                def ping():
+                    return True
+                '''),
+        }
+        for name, content in six.iteritems(modules):
+            with salt.utils.files.fopen(os.path.join(self.module_dir, name + '.py'), 'w') as fh:
+                fh.write(content)
+
+    def _get_loader(self, **kwargs):
+        opts = copy.deepcopy(self.opts)
+        opts['cachedir'] = self.cachedir
+        opts['loader_cache'] = True
+        opts.update(kwargs)
+        return salt.loader.LazyLoader([self.module_dir], opts, tag='module')
+
+    def test_discovery_cache(self):
+        loader = self._get_loader()
+        self.assertTrue(loader['discovery.ping']())
+        self.assertNotIn('discoveryno.ping', loader)
+        self.assertTrue(os.listdir(os.path.join(self.cachedir, 'loader')))
+
+        with patch.object(salt.loader.LazyLoader, '_scan_file_mapping') as scan, \
+                patch.object(salt.loader.LazyLoader, '_process_virtual',
+                             side_effect=salt.loader.LazyLoader._process_virtual,
+                             autospec=True) as virtual:
+            loader = self._get_loader()
+            # the provider of the virtual name is tried first
+            self.assertEqual(next(loader._iter_files('discovery')), 'discoverypkg')
+            self.assertTrue(loader['discovery.ping']())
+            # the known-false module is not imported again
+            self.assertNotIn('discoveryno.ping', loader)
+            self.assertEqual(
+                loader.missing_fun_string('discoveryno.ping'),
+                '\'discoveryno\' __virtual__ returned False: not on this system')
+        scan.assert_not_called()
+        self.assertEqual(
+            [call[0][2] for call in virtual.call_args_list],
+            ['discoverypkg'])
+
+    def test_discovery_cache_invalidated(self):
+        self._get_loader()._load_all()
+        # a new module changes the mtime of the module dir
+        time.sleep(0.01)
+        with salt.utils.files.fopen(os.path.join(self.module_dir, 'discoverynew.py'), 'w') as fh:
+            fh.write('def ping():\n    return True\n')
+        os.utime(self.module_dir, None)
+        loader = self._get_loader()
+        self.assertIn('discoverynew', loader.file_mapping)
+        self.assertTrue(loader['discoverynew.ping']())
+
+    def test_discovery_cache_opts_change(self):
+        loader = self._get_loader()
+        self.assertNotIn('discoveryopt.ping', loader)
+        # the remembered failure does not outlive the config it was made with
+        loader = self._get_loader(**{'discovery.enabled': True})
+        self.assertTrue(loader['discoveryopt.ping']())
+        # volatile options do not invalidate the cache
+        with patch.object(salt.loader.LazyLoader, '_scan_file_mapping') as scan:
+            loader = self._get_loader(**{'discovery.enabled': True,
+                                         'master_ip': '10.0.0.1'})
+            self.assertTrue(loader['discoveryopt.ping']())
+        scan.assert_not_called()
@@ -7,18 +7,25 @@
 from __future__ import absolute_import
 import copy
 import os
+import shutil
+import tempfile
 
 # Import Salt Testing libs
 from tests.support.unit import TestCase, skipIf
 from tests.support.mock import NO_MOCK, NO_MOCK_REASON, patch, MagicMock
 from tests.support.mixins import AdaptedConfigurationTestCaseMixin
 from tests.support.helpers import skip_if_not_root
+from tests.support.runtests import RUNTIME_VARS
 # Import salt libs
 import salt.minion
+import salt.utils.files
 import salt.utils.event as event
+import salt.utils.minion
+import salt.utils.syndic
 from salt.exceptions import SaltSystemExit, SaltMasterUnresolvableError
 import salt.syspaths
 import tornado
+import tornado.concurrent
 import tornado.testing
 from salt.ext.six.moves import range
 
@@ -234,6 +241,71 @@ class MinionTestCase(TestCase, AdaptedConfigurationTestCaseMixin):
             finally:
                 minion.destroy()
 
+    def test_jid_queue_persist(self):
+        '''
+        Tests that the jid queue is bounded and, when minion_jid_queue_persist
+        is set, restored from the cachedir so re-delivered jids are ignored.
+        '''
+        cachedir = tempfile.mkdtemp(dir=RUNTIME_VARS.TMP)
+        self.addCleanup(shutil.rmtree, cachedir, ignore_errors=True)
+        opts = {'cachedir': cachedir,
+                'minion_jid_queue_hwm': 2,
+                'minion_jid_queue_persist': True}
+        queue = salt.utils.minion.jid_queue(opts)
+        self.assertTrue(queue.add('1'))
+        self.assertFalse(queue.add('1'))
+        self.assertTrue(queue.add('2'))
+        self.assertTrue(queue.add('3'))
+        self.assertEqual(queue, ['2', '3'])
+        self.assertNotIn('1', queue)
+
+        restored = salt.utils.minion.jid_queue(opts)
+        self.assertEqual(restored, ['2', '3'])
+        self.assertFalse(restored.add('3'))
+        self.assertIs(salt.utils.minion.jid_queue(opts, restored), restored)
+
+        # The additions are appended, the file is compacted at twice the hwm
+        path = os.path.join(cachedir, 'jid_queue')
+        restored.add('4')
+        with salt.utils.files.fopen(path) as fp_:
+            self.assertEqual(fp_.read().split(), ['1', '2', '3', '4'])
+        restored.add('5')
+        with salt.utils.files.fopen(path) as fp_:
+            self.assertEqual(fp_.read().split(), ['4', '5'])
+        self.assertEqual(salt.utils.minion.jid_queue(opts), ['4', '5'])
+
+    def test_syndic_handle_decoded_payload_duplicate_jid(self):
+        '''
+        Tests that a syndic forwards a re-delivered publish only once.
+        '''
+        syndic = MagicMock(opts={'timeout': 5},
+                           jid_queue=salt.utils.minion.JidQueue(10))
+        data = {'jid': '1', 'fun': 'test.ping'}
+        salt.minion.Syndic._handle_decoded_payload(syndic, dict(data))
+        salt.minion.Syndic._handle_decoded_payload(syndic, dict(data))
+        self.assertEqual(syndic.syndic_cmd.call_count, 1)
+
+    def test_syndic_manager_resends_unknown_delta(self):
+        '''
+        Tests that a delta-encoded return the master could not restore is
+        queued again in full.
+        '''
+        encoder = salt.utils.syndic.DeltaEncoder()
+        encoder.bases[('m1', 'state.apply')] = ('base', {})
+        syndic_future = tornado.concurrent.Future()
+        syndic_future.set_result(MagicMock(delta_encoder=encoder))
+        manager = MagicMock(delayed=[], _syndics={'master1': syndic_future})
+        job_ret = {'__jid__': '1', '__fun__': 'state.apply',
+                   '__load__': {'fun': 'state.apply'},
+                   'm1': {'return': {}}, 'm2': {'return': {}}}
+        salt.minion.SyndicManager._handle_pub_reply(
+            manager, 'master1', [None, {'resend': [['1', 'm1']]}], [job_ret])
+        self.assertEqual(manager.delayed, [{'__jid__': '1',
+                                            '__fun__': 'state.apply',
+                                            '__load__': {},
+                                            'm1': {'return': {}}}])
+        self.assertEqual(encoder.bases, {})
+
     def test_beacons_before_connect(self):
         '''
         Tests that the 'beacons_before_connect' option causes the beacons to be initialized before connect.
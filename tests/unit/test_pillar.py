@@ -13,6 +13,8 @@ import os
 import shutil
 import tempfile
 import textwrap
+import threading
+import time
 
 # Import Salt Testing libs
 from tests.support.runtests import RUNTIME_VARS
@@ -21,6 +23,7 @@ from tests.support.unit import skipIf, TestCase
 from tests.support.mock import NO_MOCK, NO_MOCK_REASON, MagicMock, patch
 
 # Import salt libs
+import salt.config
 import salt.exceptions
 import salt.fileclient
 import salt.pillar
@@ -127,6 +130,182 @@ class PillarTestCase(TestCase):
                                                      'fake_pillar',
                                                      arg='foo')
 
+    @with_tempdir()
+    def test_ext_pillar_cache_ttl(self, tempdir):
+        opts = {
+            'optimization_order': [0, 1, 2],
+            'renderer': 'json',
+            'renderer_blacklist': [],
+            'renderer_whitelist': [],
+            'state_top': '',
+            'pillar_roots': {'base': []},
+            'file_roots': {'base': []},
+            'extension_modules': '',
+            'cachedir': tempdir,
+            'cache': 'localfs',
+            'ext_pillar_cache_ttl': {'cached_ext_pillar': 300},
+        }
+        cached_func = MagicMock(return_value={'foo': 'bar'})
+        uncached_func = MagicMock(return_value={'baz': 'qux'})
+        ext_pillars = {'cached_ext_pillar': cached_func,
+                       'uncached_ext_pillar': uncached_func}
+        for _ in range(2):
+            with patch('salt.loader.pillars',
+                       MagicMock(return_value=ext_pillars)):
+                pillar = salt.pillar.Pillar(opts, {}, 'mocked-minion', 'base')
+            with patch('salt.utils.args.get_function_argspec',
+                       MagicMock(return_value=MagicMock(args=[]))):
+                for key in ext_pillars:
+                    pillar._cached_external_pillar_data({}, {'arg': 'foo'}, key)
+        self.assertEqual(cached_func.call_count, 1)
+        self.assertEqual(uncached_func.call_count, 2)
+        self.assertEqual(
+            pillar.source_cache.stats['ext_pillar:cached_ext_pillar']['hits'],
+            1)
+        self.assertEqual(
+            pillar.source_cache.stats['ext_pillar:uncached_ext_pillar']['misses'],
+            1)
+
+    @with_tempdir()
+    def test_source_cache_prune(self, tempdir):
+        opts = salt.config.DEFAULT_MASTER_OPTS.copy()
+        opts.update({'cachedir': tempdir,
+                     'pillar_source_cache_max_entries': 2})
+        cache = salt.pillar.PillarSourceCache(opts)
+        for idx in range(4):
+            cache.store('sls', 'key{0}'.format(idx), idx)
+            os.utime(os.path.join(tempdir, cache.bank, 'sls',
+                                  'key{0}.p'.format(idx)),
+                     (1000 + idx, 1000 + idx))
+        cache.prune('sls')
+        self.assertEqual(sorted(cache.cache.list('/'.join((cache.bank, 'sls')))),
+                         ['key2', 'key3'])
+        # Expired entries are removed when they are looked up
+        with patch('time.time', MagicMock(return_value=time.time() + 60)):
+            self.assertEqual(cache.fetch('sls', 'key3', 30), (False, None))
+        self.assertEqual(cache.cache.list('/'.join((cache.bank, 'sls'))),
+                         ['key2'])
+
+    @with_tempdir()
+    def test_sls_cache_skips_template_dependencies(self, tempdir):
+        opts = {
+            'optimization_order': [0, 1, 2],
+            'renderer': 'yaml',
+            'renderer_blacklist': [],
+            'renderer_whitelist': [],
+            'state_top': '',
+            'pillar_roots': {'base': []},
+            'file_roots': {'base': []},
+            'extension_modules': '',
+            'cachedir': tempdir,
+            'cache': 'localfs',
+            'pillar_sls_cache': True,
+        }
+        plain = os.path.join(tempdir, 'plain.sls')
+        with fopen(plain, 'w') as fp_:
+            fp_.write('foo: bar\n')
+        including = os.path.join(tempdir, 'including.sls')
+        with fopen(including, 'w') as fp_:
+            fp_.write('{% import_yaml "defaults.yaml" as defaults %}\n'
+                      'foo: {{ defaults.foo }}\n')
+        pillar = salt.pillar.Pillar(opts, {}, 'mocked-minion', 'base')
+        self.assertIsNotNone(
+            pillar._sls_cache_key(plain, 'base', 'plain', {}))
+        self.assertIsNone(
+            pillar._sls_cache_key(including, 'base', 'including', {}))
+
+    def test_ext_pillar_concurrent(self):
+        opts = {
+            'optimization_order': [0, 1, 2],
+            'renderer': 'json',
+            'renderer_blacklist': [],
+            'renderer_whitelist': [],
+            'state_top': '',
+            'pillar_roots': {'base': []},
+            'file_roots': {'base': []},
+            'extension_modules': '',
+            'ext_pillar': [
+                {'first': {}},
+                {'sequential': {}},
+                {'slow': {}},
+                {'broken': {}},
+                {'ignored': {}},
+            ],
+            'ext_pillar_workers': 4,
+            'ext_pillar_concurrent': {
+                'first': {},
+                'slow': {'timeout': 5},
+                'broken': {},
+                'ignored': {'on_error': 'ignore'},
+            },
+        }
+        first_started = threading.Event()
+        slow_started = threading.Event()
+
+        def _first(minion_id, pillar):
+            # Each of these two only finishes once the other one has been
+            # started, a serial run would time out waiting.
+            pillar['first_was_here'] = True
+            first_started.set()
+            return {'key': 'first',
+                    'first': pillar.get('sls'),
+                    'first_overlapped': slow_started.wait(5)}
+
+        def _sequential(minion_id, pillar):
+            return {'key': 'sequential', 'seen': pillar.get('first')}
+
+        def _slow(minion_id, pillar):
+            slow_started.set()
+            return {'key': 'slow', 'slow_overlapped': first_started.wait(5),
+                    'slow_saw_first': 'first_was_here' in pillar}
+
+        def _fail(minion_id, pillar):
+            raise Exception('boom')
+
+        ext_pillars = {'first': _first, 'sequential': _sequential,
+                       'slow': _slow, 'broken': _fail, 'ignored': _fail}
+        with patch('salt.loader.pillars',
+                   MagicMock(return_value=ext_pillars)):
+            pillar = salt.pillar.Pillar(opts, {}, 'mocked-minion', 'base')
+        ret, errors = pillar.ext_pillar({'sls': 'data'})
+        # Results are merged in the configured order
+        self.assertEqual(ret['key'], 'slow')
+        self.assertEqual(ret['first'], 'data')
+        self.assertEqual(ret['seen'], 'data')
+        self.assertTrue(ret['first_overlapped'])
+        self.assertTrue(ret['slow_overlapped'])
+        # Changes one source made to its pillar argument stay there
+        self.assertFalse(ret['slow_saw_first'])
+        self.assertEqual(errors, ['Failed to load ext_pillar broken: boom'])
+
+    def test_ext_pillar_concurrent_timeout(self):
+        opts = {
+            'optimization_order': [0, 1, 2],
+            'renderer': 'json',
+            'renderer_blacklist': [],
+            'renderer_whitelist': [],
+            'state_top': '',
+            'pillar_roots': {'base': []},
+            'file_roots': {'base': []},
+            'extension_modules': '',
+            'ext_pillar': [{'hung': {}}],
+            'ext_pillar_workers': 2,
+            'ext_pillar_concurrent': {'hung': {'timeout': 0.1}},
+        }
+        event = threading.Event()
+        ext_pillars = {'hung': lambda minion_id, pillar: event.wait(5)}
+        with patch('salt.loader.pillars',
+                   MagicMock(return_value=ext_pillars)):
+            pillar = salt.pillar.Pillar(opts, {}, 'mocked-minion', 'base')
+        try:
+            ret, errors = pillar.ext_pillar({'sls': 'data'})
+        finally:
+            event.set()
+        self.assertEqual(ret, {'sls': 'data'})
+        self.assertEqual(
+            errors,
+            ['Failed to load ext_pillar hung: Timed out after 0.1 seconds'])
+
     def test_ext_pillar_no_extra_minion_data_val_list(self):
         opts = {
             'optimization_order': [0, 1, 2],
@@ -682,6 +861,65 @@ generic:
             self.assertEqual(compiled_pillar['foo1'], 'bar1')
             self.assertEqual(compiled_pillar['foo2'], 'bar2')
 
+    @with_tempdir()
+    def test_include_with_sls_cache(self, tempdir):
+        opts = {
+            'optimization_order': [0, 1, 2],
+            'renderer': 'yaml',
+            'renderer_blacklist': [],
+            'renderer_whitelist': [],
+            'state_top': '',
+            'pillar_roots': [],
+            'extension_modules': '',
+            'saltenv': 'base',
+            'file_roots': [],
+            'cachedir': tempdir,
+            'cache': 'localfs',
+            'pillar_sls_cache': True,
+        }
+        grains = {'os': 'Ubuntu'}
+        sls_files = self._setup_test_include_sls(tempdir)
+        fc_mock = MockFileclient(
+            cache_file=sls_files['top']['dest'],
+            get_state=sls_files,
+            list_states=['top', 'test.init', 'test.sub1',
+                         'test.sub2', 'test.sub_wildcard_1'],
+        )
+
+        def _compile():
+            with patch.object(salt.fileclient, 'get_file_client',
+                              MagicMock(return_value=fc_mock)):
+                pillar = salt.pillar.Pillar(opts, grains, 'minion', 'base')
+                pillar.matchers['confirm_top.confirm_top'] = \
+                    lambda *x, **y: True
+                return pillar.compile_pillar(), pillar.source_cache.stats
+
+        compiled_pillar, stats = _compile()
+        self.assertEqual(compiled_pillar['foo1'], 'bar1')
+        self.assertEqual(sum(x['hits'] for x in stats.values()), 0)
+        self.assertEqual(stats['sls:base:test.sub1']['misses'], 1)
+
+        # Nothing has changed, so every SLS file is served from the cache
+        compiled_pillar, stats = _compile()
+        self.assertEqual(compiled_pillar['foo1'], 'bar1')
+        self.assertEqual(compiled_pillar['foo_wildcard'], 'bar_wildcard')
+        self.assertEqual(sum(x['misses'] for x in stats.values()), 0)
+
+        # Only the changed SLS file is re-rendered
+        with fopen(sls_files['test.sub1']['dest'], 'w') as fp_:
+            fp_.write('foo1: changed')
+        compiled_pillar, stats = _compile()
+        self.assertEqual(compiled_pillar['foo1'], 'changed')
+        self.assertEqual(compiled_pillar['foo2'], 'bar2')
+        self.assertEqual(
+            [x for x in stats if stats[x]['misses']],
+            ['sls:base:test.sub1'])
+
+        # A change in grains invalidates the cached results
+        grains['os'] = 'Debian'
+        compiled_pillar, stats = _compile()
+        self.assertEqual(sum(x['hits'] for x in stats.values()), 0)
+
     def _setup_test_include_sls(self, tempdir):
         top_file = tempfile.NamedTemporaryFile(dir=tempdir, delete=False)
         top_file.write(b'''
@@ -981,7 +1219,8 @@ class RemotePillarTestCase(TestCase):
              'saltenv': 'fake_env',
              'pillarenv': 'fake_pillar_env',
              'pillar_override': {},
-             'extra_minion_data': {'path_to_add': 'fake_data'}},
+             'extra_minion_data': {'path_to_add': 'fake_data'},
+             'pillar_busy_retry': True},
             dictkey='pillar')
 
 
@@ -1034,5 +1273,6 @@ class AsyncRemotePillarTestCase(TestCase):
              'saltenv': 'fake_env',
              'pillarenv': 'fake_pillar_env',
              'pillar_override': {},
-             'extra_minion_data': {'path_to_add': 'fake_data'}},
+             'extra_minion_data': {'path_to_add': 'fake_data'},
+             'pillar_busy_retry': True},
             dictkey='pillar')
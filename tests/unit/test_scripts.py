@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+'''
+    tests.unit.test_scripts
+    ~~~~~~~~~~~~~~~~~~~~~~~
+
+    Keep the CLI entry points cheap to import
+'''
+
+# Import Python libs
+from __future__ import absolute_import
+import sys
+
+# Import Salt Testing libs
+from tests.support.unit import TestCase, skipIf
+from tests.support import importtime
+
+
+@skipIf(sys.version_info < (3, 7), '-X importtime requires Python 3.7+')
+class ScriptsImportBudgetTestCase(TestCase):
+    '''
+    The CLI entry modules must not pull in crypto, transport, the loader or
+    the templating stack until a command actually needs them.
+    '''
+
+    def _assert_no_deferred_imports(self, module):
+        _, imported = importtime.measure(module)
+        self.assertIn(module, imported)
+        self.assertEqual(importtime.deferred_imports(imported), [])
+
+    def test_salt_call_imports(self):
+        self._assert_no_deferred_imports('salt.cli.call')
+
+    def test_salt_key_imports(self):
+        self._assert_no_deferred_imports('salt.cli.key')
+
+    def test_salt_run_imports(self):
+        self._assert_no_deferred_imports('salt.cli.run')
+
+    def test_salt_imports(self):
+        self._assert_no_deferred_imports('salt.cli.salt')
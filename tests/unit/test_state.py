@@ -508,3 +508,68 @@ class StateFormatSlotsTestCase(TestCase, AdaptedConfigurationTestCaseMixin):
             self.state_obj.format_slots(cdata)
         mock.assert_called_once_with('fun_arg', fun_key='fun_val')
         self.assertEqual(cdata, {'args': ['arg'], 'kwargs': {'key': 'value1thing~'}})
+
+
+class StateAggregateTestCase(TestCase, AdaptedConfigurationTestCaseMixin):
+    '''
+    TestCase for the aggregation of state chunks
+    '''
+    def setUp(self):
+        with patch('salt.state.State._gather_pillar'):
+            minion_opts = self.get_temp_config('minion')
+            self.state_obj = salt.state.State(minion_opts)
+
+    @staticmethod
+    def _chunk(name, **kwargs):
+        chunk = {'state': 'pkg', 'fun': 'installed', '__id__': name,
+                 'name': name, '__sls__': 'pkgs', '__env__': 'base'}
+        chunk.update(kwargs)
+        return chunk
+
+    @staticmethod
+    def _mod_aggregate(low, chunks, running):
+        low['pkgs'] = []
+        for chunk in chunks:
+            low['pkgs'].append(chunk['name'])
+            chunk['__agg__'] = True
+        return low
+
+    def test_mod_aggregate_candidates(self):
+        '''
+        Only chunks whose requisites are met and which are not conditional
+        are handed to the mod_aggregate function
+        '''
+        chunks = [self._chunk('a'),
+                  self._chunk('b'),
+                  self._chunk('c', onchanges=[{'file': 'conf'}]),
+                  self._chunk('d', require=[{'cmd': 'setup'}]),
+                  self._chunk('e', require=[{'cmd': 'done'}]),
+                  self._chunk('f', aggregate=False),
+                  {'state': 'cmd', 'fun': 'run', '__id__': 'done',
+                   'name': 'done', '__sls__': 'pkgs', '__env__': 'base'},
+                  {'state': 'cmd', 'fun': 'run', '__id__': 'setup',
+                   'name': 'setup', '__sls__': 'pkgs', '__env__': 'base'}]
+        running = {salt.state._gen_tag(chunks[6]): {'result': True, 'changes': {}}}
+        states = {'pkg.mod_aggregate': self._mod_aggregate,
+                  'pkg.mod_aggregate_ret': MagicMock(return_value={'result': True})}
+        with patch.dict(self.state_obj.functions,
+                        {'config.option': MagicMock(return_value=True)}), \
+                patch.object(self.state_obj, 'states', states):
+            low = self.state_obj._mod_aggregate(chunks[0], running, chunks)
+            self.assertEqual(low['pkgs'], ['a', 'b', 'e'])
+            self.assertTrue(low['__agg__'])
+            tag = salt.state._gen_tag(low)
+            self.assertEqual(
+                self.state_obj.aggregated,
+                dict((salt.state._gen_tag(chunks[idx]), tag) for idx in (1, 4)))
+
+            # The merged chunks are answered once the aggregated chunk ran
+            self.assertIsNone(self.state_obj._aggregated_ret(chunks[1], running))
+            running[tag] = {'result': True, 'changes': {}}
+            self.assertEqual(self.state_obj._aggregated_ret(chunks[1], running),
+                             {'result': True})
+            states['pkg.mod_aggregate_ret'].assert_called_once_with(chunks[1], running[tag])
+            self.assertIsNone(self.state_obj._aggregated_ret(chunks[2], running))
+
+            # A conditional chunk does not aggregate the others
+            self.assertNotIn('pkgs', self.state_obj._mod_aggregate(chunks[2], running, chunks))
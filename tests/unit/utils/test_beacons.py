@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+'''
+Unit tests for salt.utils.beacons
+'''
+
+# Import Python libs
+from __future__ import absolute_import, print_function, unicode_literals
+
+# Import Salt Testing libs
+from tests.support.unit import TestCase
+from tests.support.mock import MagicMock
+
+# Import Salt libs
+import salt.utils.beacons
+
+
+class SamplerTestCase(TestCase):
+    '''
+    Test the sharing of beacon samples
+    '''
+    def test_sample_once_per_tick(self):
+        sampler = salt.utils.beacons.Sampler()
+        func = MagicMock(side_effect=lambda *args: len(args))
+        with sampler.tick():
+            self.assertEqual(sampler.sample('metric', func), 0)
+            self.assertEqual(sampler.sample('metric', func), 0)
+            self.assertEqual(sampler.sample('metric', func, '/'), 1)
+            self.assertEqual(sampler.sample('metric', func, '/'), 1)
+        self.assertEqual(func.call_count, 2)
+        with sampler.tick():
+            sampler.sample('metric', func)
+        self.assertEqual(func.call_count, 3)
+
+    def test_sample_outside_tick(self):
+        sampler = salt.utils.beacons.Sampler()
+        func = MagicMock(return_value=1)
+        sampler.sample('metric', func)
+        sampler.sample('metric', func)
+        self.assertEqual(func.call_count, 2)
+
+    def test_sample_error_not_kept(self):
+        sampler = salt.utils.beacons.Sampler()
+        func = MagicMock(side_effect=[OSError(), 1])
+        with sampler.tick():
+            self.assertRaises(OSError, sampler.sample, 'metric', func)
+            self.assertEqual(sampler.sample('metric', func), 1)
+
+    def test_parse_percent(self):
+        self.assertEqual(salt.utils.beacons.parse_percent('63%'), 63.0)
+        self.assertEqual(salt.utils.beacons.parse_percent(' 7.5 % '), 7.5)
+        self.assertEqual(salt.utils.beacons.parse_percent(40), 40.0)
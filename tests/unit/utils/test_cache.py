@@ -22,6 +22,7 @@ import salt.config
 import salt.loader
 import salt.payload
 import salt.utils.data
+import salt.utils.decorators
 import salt.utils.files
 import salt.utils.cache as cache
 
@@ -454,3 +455,72 @@ class CacheDiskTestCase(TestCase):
             self.assertNotIn('foo', cd2)
         finally:
             shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+class ExecCacheTestCase(TestCase):
+    '''
+    Test case for salt.utils.cache.ExecCache
+    '''
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir, ignore_errors=True)
+        self.opts = {'cachedir': self.tmpdir,
+                     'serial': 'msgpack',
+                     'exec_cache_ttl': {},
+                     'exec_cache_invalidate': {'pkg.install': ['pkg.*']}}
+        self.calls = []
+
+    def _func(self, name='foo'):
+        def list_pkgs(*args, **kwargs):
+            self.calls.append((args, kwargs))
+            return {name: len(self.calls)}
+        return list_pkgs
+
+    def test_uncached_functions_are_not_wrapped(self):
+        func = self._func()
+        self.assertIs(cache.ExecCache(self.opts).wrap('pkg.list_pkgs', func), func)
+
+    def test_cached_result_is_shared(self):
+        func = salt.utils.decorators.exec_cache(ttl=60)(self._func())
+        first = cache.ExecCache(self.opts).wrap('pkg.list_pkgs', func)
+        # A second loader, e.g. in another job process, uses the same cache
+        second = cache.ExecCache(self.opts).wrap('pkg.list_pkgs', func)
+        self.assertEqual(first(__pub_jid='1'), {'foo': 1})
+        self.assertEqual(second(__pub_jid='2'), {'foo': 1})
+        self.assertEqual(second(versions_as_list=True), {'foo': 2})
+        self.assertEqual(len(self.calls), 2)
+
+    def test_ttl_expiry_and_override(self):
+        self.opts['exec_cache_ttl'] = {'pkg.*': 0.1}
+        func = salt.utils.decorators.exec_cache(ttl=60)(self._func())
+        wrapped = cache.ExecCache(self.opts).wrap('pkg.list_pkgs', func)
+        wrapped()
+        wrapped()
+        self.assertEqual(len(self.calls), 1)
+        time.sleep(0.2)
+        wrapped()
+        self.assertEqual(len(self.calls), 2)
+
+    def test_invalidation(self):
+        exec_cache = cache.ExecCache(self.opts)
+        cached = exec_cache.wrap(
+            'pkg.list_pkgs',
+            salt.utils.decorators.exec_cache(ttl=60)(self._func()))
+        disk = exec_cache.wrap(
+            'disk.usage',
+            salt.utils.decorators.exec_cache(ttl=60)(self._func()))
+        install = exec_cache.wrap('pkg.install', self._func())
+        wipe = exec_cache.wrap(
+            'disk.wipe',
+            salt.utils.decorators.invalidates_exec_cache('disk.*')(self._func()))
+
+        cached()
+        disk()
+        install('vim')
+        self.assertEqual(cached(), {'foo': 4})
+        self.assertEqual(disk(), {'foo': 2})
+        wipe()
+        self.assertEqual(disk(), {'foo': 6})
+
+        exec_cache.invalidate()
+        self.assertFalse(os.listdir(exec_cache.cache_dir))
@@ -12,6 +12,7 @@
 # Import Python libs
 from __future__ import absolute_import, print_function, unicode_literals
 import os
+import socket
 import tempfile
 
 # Import Salt Testing libs
@@ -139,3 +140,31 @@ class CloudUtilsTestCase(TestCase):
 
         # tmp file removed
         self.assertFalse(cloud.check_key_path_and_mode('foo', key_file))
+
+    def test_backoff_delay(self):
+        for trycount in range(1, 10):
+            delay = cloud.backoff_delay(trycount, interval=1, max_interval=10)
+            expected = min(10, 2 ** (trycount - 1))
+            self.assertTrue(expected / 2.0 <= delay <= expected)
+        # A configured interval above max_interval is not lowered
+        for trycount in range(1, 5):
+            delay = cloud.backoff_delay(trycount, interval=30, max_interval=10)
+            self.assertTrue(15 <= delay <= 30)
+
+    def test_readiness_waiter(self):
+        listening = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        closed = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        try:
+            listening.bind(('127.0.0.1', 0))
+            listening.listen(5)
+            closed.bind(('127.0.0.1', 0))
+            waiter = cloud.ReadinessWaiter(interval=0.1, max_interval=0.2)
+            waiter.add('up', '127.0.0.1', listening.getsockname()[1])
+            waiter.add('down', '127.0.0.1', closed.getsockname()[1], timeout=0.5)
+            ready = []
+            self.assertEqual(waiter.run(callback=ready.append),
+                             {'up': True, 'down': False})
+            self.assertEqual(ready, ['up'])
+        finally:
+            listening.close()
+            closed.close()
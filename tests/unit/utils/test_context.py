@@ -8,16 +8,19 @@ from __future__ import absolute_import
 import tornado.stack_context
 import tornado.gen
 from tornado.testing import AsyncTestCase, gen_test
+import copy
+import pickle
+import sys
 import threading
 import time
 
 # Import Salt Testing libs
-from tests.support.unit import TestCase
+from tests.support.unit import TestCase, skipIf
 from salt.ext.six.moves import range
 
 # Import Salt libs
 import salt.utils.json
-from salt.utils.context import ContextDict, NamespacedDictWrapper
+from salt.utils.context import ContextDict, CopyOnWriteDict, NamespacedDictWrapper
 
 
 class ContextDictTests(AsyncTestCase):
@@ -194,3 +197,83 @@ class NamespacedDictWrapperTests(TestCase):
         self._dict['prefix'] = {'foo': {'bar': 'baz'}}
         w = NamespacedDictWrapper(self._dict, ('prefix', 'foo'))
         self.assertEqual(salt.utils.json.dumps(w), '{"bar": "baz"}')
+
+
+class CopyOnWriteDictTests(TestCase):
+
+    def setUp(self):
+        self.base = {'id': 'master',
+                     'file_roots': {'base': ['/srv/salt']},
+                     'ext_pillar': [{'cmd_yaml': 'cat /tmp/pillar.yaml'}]}
+        self.orig = copy.deepcopy(self.base)
+
+    def test_overrides(self):
+        cow = CopyOnWriteDict(self.base, id='minion')
+        self.assertEqual(cow['id'], 'minion')
+        cow['file_client'] = 'local'
+        del cow['ext_pillar']
+        self.assertEqual(cow.get('ext_pillar'), None)
+        self.assertEqual(self.base, self.orig)
+
+    def test_nested_mutation_does_not_leak(self):
+        cow = CopyOnWriteDict(self.base)
+        cow['file_roots']['dev'] = ['/srv/dev']
+        cow.get('ext_pillar').append({'git': 'master'})
+        cow.setdefault('file_roots', {})['base'].append('/srv/more')
+        self.assertEqual(self.base, self.orig)
+        # The copy is only made once
+        self.assertIs(cow['file_roots'], cow['file_roots'])
+        self.assertIn('dev', cow['file_roots'])
+
+    def test_untouched_values_are_shared(self):
+        cow = CopyOnWriteDict(self.base)
+        self.assertIs(dict.__getitem__(cow, 'file_roots'), self.base['file_roots'])
+        # Handing the values out copies them
+        cow.items()
+        self.assertIsNot(dict.__getitem__(cow, 'file_roots'), self.base['file_roots'])
+
+    def test_layered(self):
+        cow = CopyOnWriteDict(self.base)
+        cow['file_roots']['dev'] = ['/srv/dev']
+        child = cow.copy()
+        child['file_roots']['qa'] = ['/srv/qa']
+        self.assertIsInstance(child, CopyOnWriteDict)
+        self.assertNotIn('qa', cow['file_roots'])
+        self.assertIn('dev', child['file_roots'])
+
+    def test_dict_conversion(self):
+        cow = CopyOnWriteDict(self.base)
+        for converted in (dict(cow), dict(**cow), {'id': None}):
+            converted.update(cow)
+            self.assertIsNot(converted['file_roots'], self.base['file_roots'])
+            converted['file_roots']['dev'] = ['/srv/dev']
+        self.assertEqual(self.base, self.orig)
+
+    def test_view(self):
+        cow = CopyOnWriteDict(self.base, id='minion')
+        view = cow.view(exclude=('id',))
+        self.assertNotIn('id', view)
+        self.assertNotIn('ext_pillar', cow._owned)
+        # The values are shared with the dict the view was taken from
+        self.assertIs(view['file_roots'], cow['file_roots'])
+        self.assertIs(cow['ext_pillar'], view['ext_pillar'])
+        view['file_roots']['dev'] = ['/srv/dev']
+        self.assertIn('dev', cow['file_roots'])
+        self.assertEqual(self.base, self.orig)
+        # but not the values set after the view was taken
+        view = cow.view()
+        cow['file_roots'] = {}
+        self.assertIn('dev', view['file_roots'])
+
+    def test_serialization(self):
+        cow = CopyOnWriteDict(self.base, id='minion')
+        expected = dict(self.orig, id='minion')
+        self.assertEqual(copy.deepcopy(cow), expected)
+        self.assertEqual(pickle.loads(pickle.dumps(cow)), expected)
+        self.assertEqual(salt.utils.json.loads(salt.utils.json.dumps(cow)), expected)
+
+    @skipIf(sys.version_info < (3, 4), 'tracemalloc requires Python 3.4+')
+    def test_pillar_compile_allocation(self):
+        from tests.support import pillaralloc
+        self.assertLess(pillaralloc.measure(5, overlay=True),
+                        pillaralloc.measure(5, overlay=False))
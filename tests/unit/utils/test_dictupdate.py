@@ -3,6 +3,7 @@
 # Import python libs
 from __future__ import absolute_import, print_function, unicode_literals
 import copy
+import random
 
 # Import Salt Testing libs
 from tests.support.unit import TestCase
@@ -10,6 +11,7 @@ from tests.support.unit import TestCase
 # Import Salt libs
 import salt.utils.dictupdate as dictupdate
 from salt.utils.odict import OrderedDict
+from salt.serializers.yamlex import AggregatedMap, AggregatedSequence
 from salt.exceptions import SaltInvocationError
 
 
@@ -202,6 +204,77 @@ class UtilDictMergeTestCase(TestCase):
         self.assertEqual({'A': [['B'], ['b', 'c']], 'C': {'D': 'E', 'F': {'I': 'J', 'G': 'H'}}}, ret)
 
 
+class UtilDictMergeInPlaceTestCase(TestCase):
+    '''
+    The in place merges must give the same results as the copying ones, on
+    randomly generated pillar-like data
+    '''
+    KEYS = ('a', 'b', 'c', 'd')
+    RUNS = 300
+
+    def setUp(self):
+        self.rand = random.Random(4200)
+
+    def _value(self, depth, aggregated):
+        kind = self.rand.randint(0, 5 if depth > 0 else 1)
+        if kind == 0:
+            return self.rand.choice((None, 1, 2, 'x', 'y', True))
+        if kind == 1:
+            return self.rand.choice((list, AggregatedSequence if aggregated else list))(
+                self._value(0, aggregated) for _ in range(self.rand.randint(0, 3)))
+        return self._mapping(depth - 1, aggregated)
+
+    def _mapping(self, depth, aggregated=False):
+        classes = [dict, OrderedDict]
+        if aggregated:
+            classes.append(AggregatedMap)
+        ret = self.rand.choice(classes)()
+        for key in self.rand.sample(self.KEYS, self.rand.randint(0, len(self.KEYS))):
+            ret[key] = self._value(depth, aggregated)
+        return ret
+
+    def _typed(self, data):
+        # Compare the types along with the values
+        if isinstance(data, dict):
+            return (type(data).__name__,
+                    [(key, self._typed(val)) for key, val in data.items()])
+        if isinstance(data, list):
+            return (type(data).__name__, [self._typed(val) for val in data])
+        return data
+
+    def _check(self, strategy, aggregated=False, **kwargs):
+        for _ in range(self.RUNS):
+            sources = [self._mapping(3, aggregated) for _ in range(4)]
+            orig = copy.deepcopy(sources)
+            expected = {}
+            acc = {}
+            for source in sources:
+                expected = dictupdate.merge(expected, source, strategy, **kwargs)
+                acc = dictupdate.merge(acc, source, strategy, in_place=True, **kwargs)
+                self.assertEqual(self._typed(acc), self._typed(expected))
+            # The merged sources are left untouched
+            self.assertEqual(self._typed(sources), self._typed(orig))
+
+    def test_recurse(self):
+        self._check('recurse')
+
+    def test_recurse_merge_lists(self):
+        self._check('recurse', merge_lists=True)
+
+    def test_overwrite(self):
+        self._check('overwrite')
+
+    def test_aggregate(self):
+        self._check('aggregate', aggregated=True)
+
+    def test_recurse_does_not_share_sources(self):
+        source = {'a': {'b': [1]}}
+        acc = dictupdate.merge({}, source, 'recurse', in_place=True)
+        acc = dictupdate.merge(acc, {'a': {'c': 2}}, 'recurse', in_place=True)
+        acc['a']['b'].append(2)
+        self.assertEqual(source, {'a': {'b': [1]}})
+
+
 class UtilDeepDictUpdateTestCase(TestCase):
 
     dict1 = {'A': 'B', 'C': {'D': 'E', 'F': {'G': 'H', 'I': 'J'}}}
@@ -325,3 +325,48 @@ class TestAsyncEventPublisher(AsyncTestCase):
         self.assertEqual(self.tag, 'evt1')
         self.data.pop('_stamp')  # drop the stamp
         self.assertEqual(self.data, {'data': 'foo1'})
+
+
+class TestEventReturnWriter(TestCase):
+    def setUp(self):
+        self.spill_dir = os.path.join(RUNTIME_VARS.TMP, 'test-event-return')
+        self.addCleanup(shutil.rmtree, self.spill_dir, ignore_errors=True)
+        self.written = []
+
+    def test_spill_and_replay(self):
+        '''Test batches that do not fit the queue are journaled and replayed'''
+        writer = salt.utils.event.EventReturnWriter(
+            'test', self.written.extend, maxsize=1, spill_dir=self.spill_dir)
+        writer.put([{'tag': 'a'}])
+        writer.put([{'tag': 'b'}, {'tag': 'c'}])
+        stats = writer.get_stats()
+        self.assertEqual(stats['queue_depth'], 1)
+        self.assertEqual(stats['journal_depth'], 1)
+        self.assertEqual(stats['spilled'], 2)
+
+        # the queued batch is journaled as well if the writer never ran
+        writer.stop(timeout=0)
+        self.assertEqual(writer.get_stats()['journal_depth'], 2)
+
+        writer = salt.utils.event.EventReturnWriter(
+            'test', self.written.extend, maxsize=1, spill_dir=self.spill_dir)
+        writer.start()
+        writer.stop()
+        self.assertEqual(sorted(evt['tag'] for evt in self.written), ['a', 'b', 'c'])
+        self.assertEqual(writer.get_stats()['journal_depth'], 0)
+        self.assertEqual(writer.get_stats()['written'], 3)
+
+    def test_returner_error(self):
+        '''Test a failing returner does not stop the writer'''
+        def returner(events):
+            if events[0]['tag'] == 'bad':
+                raise Exception('boom')
+            self.written.extend(events)
+
+        writer = salt.utils.event.EventReturnWriter('test', returner)
+        writer.start()
+        writer.put([{'tag': 'bad'}])
+        writer.put([{'tag': 'good'}])
+        writer.stop()
+        self.assertEqual(self.written, [{'tag': 'good'}])
+        self.assertEqual(writer.get_stats()['errors'], 1)
@@ -90,3 +90,87 @@ class TestGitFSProvider(TestCase):
                                 role_class,
                                 *args,
                                 **kwargs)
+
+
+class _FakeRemote(object):
+    '''
+    Stand-in for a GitProvider instance, which only implements what is needed
+    by GitBase.fetch_remotes()
+    '''
+    def __init__(self, id_, result=None, exc=None):
+        self.id = id_
+        self.update_interval = 60
+        self.result = result
+        self.exc = exc
+        self.fetch_error = None
+        self.fetch_bytes = None
+        self.fetch_failures = 0
+        self.fetch_retry_after = 0
+        self.calls = 0
+
+    def fetch(self):
+        self.calls += 1
+        self.fetch_error = None
+        self.fetch_bytes = 1024
+        if self.exc is not None:
+            raise self.exc
+        return self.result
+
+
+@skipIf(NO_MOCK, NO_MOCK_REASON)
+class TestGitBaseFetchRemotes(TestCase):
+
+    def _get_gitfs(self, remotes, **opts):
+        gitfs_opts = dict(OPTS, gitfs_provider='pygit2', **opts)
+        with patch.object(salt.utils.gitfs.GitFS, 'verify_pygit2',
+                          MagicMock(return_value=True)):
+            gitfs = salt.utils.gitfs.GitFS(gitfs_opts, {}, init_remotes=False)
+        gitfs.remotes = remotes
+        return gitfs
+
+    def test_fetch_remotes_concurrent(self):
+        '''
+        Ensure that all remotes are fetched when using multiple workers, and
+        that per-remote statistics are recorded
+        '''
+        remotes = [_FakeRemote('remote{0}'.format(x), result=x == 2)
+                   for x in range(5)]
+        gitfs = self._get_gitfs(remotes, gitfs_fetch_workers=3)
+        self.assertTrue(gitfs.fetch_remotes())
+        self.assertEqual([x.calls for x in remotes], [1] * 5)
+        self.assertEqual(sorted(gitfs.fetch_stats), [x.id for x in remotes])
+        for remote in remotes:
+            stats = gitfs.fetch_stats[remote.id]
+            self.assertEqual(stats['changed'], remote.id == 'remote2')
+            self.assertEqual(stats['bytes'], 1024)
+            self.assertEqual(stats['failures'], 0)
+            self.assertIn('duration', stats)
+
+    def test_fetch_remotes_backoff(self):
+        '''
+        Ensure that a remote which repeatedly fails is skipped until its
+        backoff expires, without affecting the other remotes
+        '''
+        good = _FakeRemote('good', result=True)
+        bad = _FakeRemote('bad', exc=Exception('unreachable'))
+        gitfs = self._get_gitfs([good, bad], gitfs_fetch_backoff=300)
+
+        gitfs.fetch_remotes()
+        self.assertEqual(gitfs.fetch_stats['bad']['error'], 'unreachable')
+        self.assertNotIn('retry_after', gitfs.fetch_stats['bad'])
+
+        gitfs.fetch_remotes()
+        self.assertEqual(gitfs.fetch_stats['bad']['failures'], 2)
+        self.assertEqual(gitfs.fetch_stats['bad']['retry_after'], 120)
+
+        gitfs.fetch_remotes()
+        self.assertTrue(gitfs.fetch_stats['bad']['skipped'])
+        self.assertEqual((good.calls, bad.calls), (3, 2))
+
+        # Once the backoff has expired and the remote recovers, it is fetched
+        # again and its failure count is reset.
+        bad.fetch_retry_after = 0
+        bad.exc = None
+        gitfs.fetch_remotes()
+        self.assertEqual(bad.calls, 3)
+        self.assertEqual(gitfs.fetch_stats['bad']['failures'], 0)
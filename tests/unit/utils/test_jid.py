@@ -19,6 +19,32 @@ from tests.support.mock import (
 
 
 class JidTestCase(TestCase):
+    def test_jid_bounds(self):
+        low, high = salt.utils.jid.jid_bounds(
+            start_time=datetime.datetime(2019, 1, 2),
+            end_time=datetime.datetime(2019, 1, 4),
+            cursor='20190103000000000000')
+        self.assertEqual(low, '20190102000000000000')
+        self.assertEqual(high, '20190103000000000000')
+        self.assertEqual(salt.utils.jid.jid_bounds(), (None, None))
+        _, high = salt.utils.jid.jid_bounds(end_time=datetime.datetime(2019, 1, 4))
+        self.assertTrue(salt.utils.jid.in_jid_bounds('20190104000000000000_1234', high=high))
+        self.assertFalse(salt.utils.jid.in_jid_bounds('20190104000000000001', high=high))
+
+    def test_filter_jobs(self):
+        jobs = [
+            ('20190103000000000000', {'fun': 'saltutil.find_job', 'tgt': 'web1'}),
+            ('20190102000000000000', {'fun': 'test.ping', 'tgt': ['web1', 'db1'], 'user': 'alice'}),
+            ('20190101000000000000', {'fun': 'state.apply', 'tgt': 'web2'}),
+        ]
+        ret = salt.utils.jid.filter_jobs(jobs, count=1)
+        self.assertEqual([job['JID'] for job in ret], ['20190102000000000000'])
+        ret = salt.utils.jid.filter_jobs(jobs, tgt='web*', filter_find_job=False)
+        self.assertEqual([job['JID'] for job in ret],
+                         ['20190101000000000000', '20190102000000000000', '20190103000000000000'])
+        ret = salt.utils.jid.filter_jobs(jobs, fun='test.*,state.*', user='root')
+        self.assertEqual([job['JID'] for job in ret], ['20190101000000000000'])
+
     def test_jid_to_time(self):
         test_jid = 20131219110700123489
         expected_jid = '2013, Dec 19 11:07:00.123489'
@@ -1,14 +1,22 @@
 # -*- coding: utf-8 -*-
 # Import Python Libs
 from __future__ import absolute_import
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+import time
 
 # Import Salt Testing Libs
 from tests.support.unit import TestCase, skipIf
 from tests.support.mock import (
+    MagicMock,
     patch,
     mock_open,
 )
 
+import salt.utils.files
 import salt.utils.master as master
 
 try:
@@ -104,3 +112,99 @@ class MasterUtilsIsPidHealthy(TestCase):
         m_fopen = mock_open(side_effect=OSError)
         with patch('salt.utils.files.fopen', m_fopen):
             assert master.is_pid_healthy(12345) is False
+
+
+class PillarCompilePoolTestCase(TestCase):
+
+    def setUp(self):
+        self.cachedir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cachedir, ignore_errors=True)
+        self.opts = {'cachedir': self.cachedir}
+        self.load = {'id': 'minion', 'grains': {'os': 'Linux'},
+                     'saltenv': 'base'}
+
+    def test_request_key(self):
+        key = master.PillarCompilePool.request_key(self.load)
+        self.assertEqual(key, master.PillarCompilePool.request_key(
+            dict(self.load, grains={'os': 'Linux'})))
+        self.assertNotEqual(key, master.PillarCompilePool.request_key(
+            dict(self.load, pillarenv='dev')))
+        self.assertNotEqual(key, master.PillarCompilePool.request_key(
+            dict(self.load, grains={'os': 'Windows'})))
+
+    def test_compile_coalesced(self):
+        '''
+        A request which arrives while an identical compile is running gets the
+        result of that compile instead of compiling again
+        '''
+        started = threading.Event()
+        finish = threading.Event()
+
+        def _slow_compile():
+            started.set()
+            finish.wait(5)
+            return {'foo': 'bar'}
+
+        second_compile = MagicMock(return_value={'foo': 'baz'})
+        results = []
+        pool = master.PillarCompilePool(self.opts)
+        first = threading.Thread(
+            target=lambda: results.append(
+                pool.compile(self.load, _slow_compile)))
+        first.start()
+        started.wait(5)
+        second = threading.Thread(
+            target=lambda: results.append(
+                master.PillarCompilePool(self.opts).compile(
+                    self.load, second_compile)))
+        second.start()
+        finish.set()
+        first.join()
+        second.join()
+        self.assertEqual(results, [{'foo': 'bar'}, {'foo': 'bar'}])
+        second_compile.assert_not_called()
+        # The shared result is gone once it has been read
+        self.assertEqual(
+            [x for x in os.listdir(pool.cachedir) if not x.endswith('.lk')], [])
+
+        # A later request compiles the pillar again, without a waiter its
+        # result is never written to disk
+        self.assertEqual(pool.compile(self.load, second_compile),
+                         {'foo': 'baz'})
+        self.assertEqual(
+            [x for x in os.listdir(pool.cachedir) if not x.endswith('.lk')], [])
+
+    def test_compile_busy(self):
+        '''
+        A request which cannot get a compile slot before its timeout returns
+        None, and one with no timeout waits for a slot
+        '''
+        slots = multiprocessing.BoundedSemaphore(1)
+        pool = master.PillarCompilePool(self.opts, slots)
+        compile_func = MagicMock(return_value={'foo': 'bar'})
+        slots.acquire()
+        self.assertIsNone(pool.compile(self.load, compile_func, timeout=0.1))
+        compile_func.assert_not_called()
+        threading.Timer(0.1, slots.release).start()
+        self.assertEqual(pool.compile(self.load, compile_func),
+                         {'foo': 'bar'})
+
+    @skipIf(not salt.utils.files.is_fcntl_available(), 'Requires fcntl')
+    def test_clean_locks(self):
+        '''
+        Only lock files which are old and not held are removed
+        '''
+        pool = master.PillarCompilePool(self.opts)
+        held = os.path.join(pool.cachedir, 'held.lk')
+        stale = os.path.join(pool.cachedir, 'stale.lk')
+        fresh = os.path.join(pool.cachedir, 'fresh.lk')
+        for path in (held, stale, fresh):
+            with salt.utils.files.fopen(path, 'a'):
+                pass
+        for path in (held, stale):
+            os.utime(path, (time.time() - 3600, time.time() - 3600))
+        with salt.utils.files.fopen(held, 'a') as lock_fh:
+            self.assertTrue(pool._lock(lock_fh, None))
+            pool.clean()
+        self.assertEqual(sorted(os.listdir(pool.cachedir)),
+                         ['fresh.lk', 'held.lk'])
@@ -1,9 +1,13 @@
 # -*- coding: utf-8 -*-
 
 from __future__ import absolute_import, unicode_literals, print_function
+import os
+import shutil
+import tempfile
 
 from tests.support.unit import TestCase, skipIf
 from tests.support.mock import MagicMock, patch, NO_MOCK, NO_MOCK_REASON
+import salt.utils.files
 import salt.utils.pkg
 from salt.utils.pkg import rpm
 
@@ -47,6 +51,52 @@ class PkgUtilsTestCase(TestCase):
             self.assertEqual(test_parameter[2], verstr)
 
 
+class PkgInventoryTestCase(TestCase):
+    '''
+    TestCase for the persistent package inventory
+    '''
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir, ignore_errors=True)
+        self.opts = {'cachedir': os.path.join(self.tmpdir, 'cache')}
+        self.db = os.path.join(self.tmpdir, 'status')
+        with salt.utils.files.fopen(self.db, 'w') as fp_:
+            fp_.write('Package: foo\n')
+
+    def test_inventory_roundtrip(self):
+        data = {'installed': {'foo': ['1.0']}, 'removed': {}}
+        stamp = salt.utils.pkg.inventory_stamp([self.db, self.db + '.missing'])
+        self.assertEqual(len(stamp), 1)
+        self.assertIsNone(salt.utils.pkg.read_inventory(self.opts, 'dpkg', stamp))
+        salt.utils.pkg.write_inventory(self.opts, 'dpkg', stamp, data)
+        self.assertEqual(
+            salt.utils.pkg.read_inventory(
+                self.opts, 'dpkg', salt.utils.pkg.inventory_stamp([self.db])),
+            data)
+
+        # Any change to the package database invalidates the inventory
+        with salt.utils.files.fopen(self.db, 'a') as fp_:
+            fp_.write('Package: bar\n')
+        self.assertIsNone(
+            salt.utils.pkg.read_inventory(
+                self.opts, 'dpkg', salt.utils.pkg.inventory_stamp([self.db])))
+
+        salt.utils.pkg.clear_inventory(self.opts, 'dpkg')
+        self.assertFalse(
+            os.path.exists(salt.utils.pkg.inventory_path(self.opts, 'dpkg')))
+        salt.utils.pkg.clear_inventory(self.opts, 'dpkg')
+
+    def test_inventory_disabled(self):
+        stamp = salt.utils.pkg.inventory_stamp([self.db])
+        self.opts['pkg_inventory_cache'] = False
+        salt.utils.pkg.write_inventory(self.opts, 'dpkg', stamp, {'foo': '1'})
+        self.assertFalse(
+            os.path.exists(salt.utils.pkg.inventory_path(self.opts, 'dpkg')))
+        self.assertIsNone(salt.utils.pkg.inventory_stamp([self.db + '.missing']))
+        salt.utils.pkg.write_inventory(self.opts, 'dpkg', None, {'foo': '1'})
+        self.assertFalse(os.path.isdir(self.opts['cachedir']))
+
+
 @skipIf(NO_MOCK, NO_MOCK_REASON)
 class PkgRPMTestCase(TestCase):
     '''
@@ -396,6 +396,41 @@ class ScheduleTestCase(TestCase):
         self.schedule.eval()
         self.assertTrue(self.schedule.opts['schedule']['testjob']['_next_fire_time'] > now)
 
+    def test_eval_only_due_jobs(self):
+        '''
+        Tests that eval only looks at the jobs whose next fire time has come
+        until the schedule changes
+        '''
+        self.schedule.opts.update({'pillar': {'schedule': {}}})
+        self.schedule.opts.update({'schedule': {'fast': {'function': 'test.ping',
+                                                         'seconds': 60},
+                                                'slow': {'function': 'test.ping',
+                                                         'seconds': 3600}}})
+        now = datetime.datetime.now()
+        self.schedule.eval(now)
+        fire_times = dict((job, self.schedule.opts['schedule'][job]['_next_fire_time'])
+                          for job in ('fast', 'slow'))
+
+        with patch.object(self.schedule, '_run_job') as run_job, \
+                patch.object(self.schedule, '_check_max_running',
+                             side_effect=lambda func, data, opts, now: data):
+            # Nothing is due, no job is looked at
+            self.assertEqual(self.schedule._due_jobs(self.schedule._get_schedule(),
+                                                     now + datetime.timedelta(seconds=30)),
+                             set())
+            self.schedule.eval(now + datetime.timedelta(seconds=60))
+            self.assertEqual([call[0][1]['name'] for call in run_job.call_args_list], ['fast'])
+            self.assertGreater(self.schedule.opts['schedule']['fast']['_next_fire_time'],
+                               fire_times['fast'])
+            self.assertEqual(self.schedule.opts['schedule']['slow']['_next_fire_time'],
+                             fire_times['slow'])
+
+            # Changing a job makes eval look at every job again
+            self.schedule.disable_job('slow', persist=False)
+            self.assertIsNone(self.schedule._fire_heap)
+            self.schedule.eval(now + datetime.timedelta(seconds=61))
+            self.assertTrue(self.schedule.opts['schedule']['slow']['_skipped'])
+
     def test_eval_schedule_invalid_arguments(self):
         '''
         Tests eval if the schedule if data contains error
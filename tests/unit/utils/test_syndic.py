@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+'''
+Unit tests for salt.utils.syndic
+'''
+
+# Import Python libs
+from __future__ import absolute_import, print_function, unicode_literals
+import copy
+
+# Import Salt Testing libs
+from tests.support.unit import TestCase
+
+# Import Salt libs
+import salt.utils.syndic
+
+
+class FakeCache(object):
+    def __init__(self):
+        self.data = {}
+
+    def store(self, bank, key, data):
+        self.data[(bank, key)] = copy.deepcopy(data)
+
+    def fetch(self, bank, key):
+        return copy.deepcopy(self.data.get((bank, key), {}))
+
+
+def _state(result, comment, start_time, duration):
+    return {'__run_num__': 0,
+            '__id__': 'foo',
+            'result': result,
+            'comment': comment,
+            'changes': {},
+            'start_time': start_time,
+            'duration': duration}
+
+
+def _load(minions, fun='state.apply', **states):
+    return {'id': 'syndic1',
+            'jid': '20190101000000000000',
+            'fun': fun,
+            'load': {'fun': fun},
+            'return': dict((minion, {'return': copy.deepcopy(states), 'retcode': 0})
+                           for minion in minions)}
+
+
+class SyndicReturnTestCase(TestCase):
+    '''
+    Test the packing of syndic return batches
+    '''
+    def setUp(self):
+        self.opts = {'id': 'syndic1', 'serial': 'msgpack'}
+
+    def test_chunk_loads(self):
+        loads = [_load(['m1', 'm2', 'm3']), _load(['m4'])]
+        chunks = salt.utils.syndic.chunk_loads(loads, 2)
+        self.assertEqual(
+            [[sorted(load['return']) for load in chunk] for chunk in chunks],
+            [[['m1', 'm2']], [['m3'], ['m4']]])
+        # Only the first part of a split load carries the job load
+        self.assertEqual(chunks[0][0]['load'], {'fun': 'state.apply'})
+        self.assertEqual(chunks[1][0]['load'], {})
+        self.assertEqual(salt.utils.syndic.chunk_loads(loads, 0), [loads])
+
+    def test_pack_unpack_compressed(self):
+        self.opts['syndic_return_compression'] = 'zlib'
+        loads = [_load(['m1', 'm2'], a=_state(True, 'ok', '1', 1.0))]
+        payloads = salt.utils.syndic.pack(self.opts, loads)
+        self.assertEqual(len(payloads), 1)
+        self.assertEqual(payloads[0]['compression'], 'zlib')
+        self.assertEqual(salt.utils.syndic.unpack(self.opts, payloads[0]), loads)
+
+    def test_pack_unpack_plain(self):
+        loads = [_load(['m1'], a=_state(True, 'ok', '1', 1.0))]
+        payloads = salt.utils.syndic.pack(self.opts, loads)
+        self.assertEqual(payloads, [{'cmd': '_syndic_return', 'load': loads}])
+        self.assertEqual(salt.utils.syndic.unpack(self.opts, payloads[0]), loads)
+
+    def test_delta_roundtrip(self):
+        encoder = salt.utils.syndic.DeltaEncoder()
+        decoder = salt.utils.syndic.DeltaDecoder(FakeCache(), 'syndic1')
+
+        first = _load(['m1'], a=_state(True, 'ok', '1', 1.0), b=_state(True, 'ok', '1', 2.0))
+        encoded = encoder.encode(first)
+        self.assertIn(salt.utils.syndic.BASE_KEY, encoded['return']['m1'])
+        self.assertEqual(decoder.decode(encoded), [])
+        self.assertEqual(encoded['return'], first['return'])
+
+        second = _load(['m1'], a=_state(True, 'ok', '2', 3.0), b=_state(False, 'bad', '2', 4.0))
+        encoded = encoder.encode(second)
+        delta = encoded['return']['m1']['return'][salt.utils.syndic.DELTA_KEY]
+        self.assertEqual(delta['same'], {'a': {'start_time': '2', 'duration': 3.0}})
+        self.assertEqual(list(delta['new']), ['b'])
+        self.assertEqual(decoder.decode(encoded), [])
+        self.assertEqual(encoded['return'], second['return'])
+
+    def test_delta_missing_base(self):
+        encoder = salt.utils.syndic.DeltaEncoder()
+        decoder = salt.utils.syndic.DeltaDecoder(FakeCache(), 'syndic1')
+        encoder.encode(_load(['m1'], a=_state(True, 'ok', '1', 1.0)))
+        encoded = encoder.encode(_load(['m1', 'm2'], a=_state(True, 'ok', '2', 1.0)))
+        # m1 is delta-encoded against a run this master never stored
+        self.assertEqual(decoder.decode(encoded), ['m1'])
+        self.assertEqual(list(encoded['return']), ['m2'])
+        encoder.forget('m1', 'state.apply')
+        encoded = encoder.encode(_load(['m1'], a=_state(True, 'ok', '3', 1.0)))
+        self.assertIn(salt.utils.syndic.BASE_KEY, encoded['return']['m1'])
+
+    def test_non_state_returns_untouched(self):
+        encoder = salt.utils.syndic.DeltaEncoder()
+        load = _load(['m1'], fun='test.ping')
+        load['return']['m1']['return'] = True
+        self.assertIs(encoder.encode(load), load)